@@ -0,0 +1,909 @@
+"""
+Columnar execution backends for the DataAnalyzer checks.
+
+ArrowAnalyzer (pyarrow.compute, one thread per column) and PolarsAnalyzer (Polars'
+multi-threaded query engine) offer the same check API as DataAnalyzer for
+completeness, statistical summary, outliers, integrity, text, temporal, correlation
+and metadata quality, and return the same results. They accept a pandas DataFrame or
+their native table (pyarrow.Table / polars.DataFrame); converting once and passing the
+native table saves the conversion on every call.
+
+Example:
+    analyzer = get_analyzer("arrow")
+    table = analyzer.to_native(df)
+    analyzer.statistical_summary(table)
+"""
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from data_analyzer import DataAnalyzer
+from text_quality import text_quality
+
+BACKENDS = ('pandas', 'arrow', 'polars')
+
+_SUMMARY_INDEX = ['count', 'mean', 'std', 'min', '25%', '50%', '75%', 'max']
+
+
+def get_analyzer(backend: str = 'pandas', **options):
+    """
+    Return the analyzer of an execution backend.
+
+    Parameters:
+        backend (str): 'pandas' (DataAnalyzer itself), 'arrow' or 'polars'.
+        **options: Options of the backend's analyzer, e.g. threads=8.
+
+    Returns:
+        DataAnalyzer, ArrowAnalyzer or PolarsAnalyzer.
+    """
+    if backend == 'pandas':
+        return DataAnalyzer
+    if backend == 'arrow':
+        return ArrowAnalyzer(**options)
+    if backend == 'polars':
+        return PolarsAnalyzer(**options)
+    raise ValueError(f"Invalid backend. Use one of {', '.join(BACKENDS)}.")
+
+
+class _Unsupported(Exception):
+    # Raised for frames the engine cannot represent; the check then runs on pandas.
+    pass
+
+
+def _falls_back(method):
+    # Run the DataAnalyzer check of the same name when a pandas frame can't be converted
+    # (e.g. object columns mixing strings and numbers) or the check needs pandas' semantics.
+    @functools.wraps(method)
+    def run(self, df, *args, **kwargs):
+        try:
+            return method(self, df, *args, **kwargs)
+        except _Unsupported:
+            if not isinstance(df, pd.DataFrame):
+                df = df.to_pandas()
+            return getattr(DataAnalyzer, method.__name__)(df, *args, **kwargs)
+    return run
+
+
+def _check_convertible(df: pd.DataFrame) -> None:
+    # Column labels must be unique strings, and nullable numbers (Int64, Float64) keep
+    # pd.NA in pandas' results, which the engines can't reproduce.
+    if not df.columns.is_unique or not all(isinstance(c, str) for c in df.columns):
+        raise _Unsupported()
+    if any(not isinstance(dtype, np.dtype) for dtype in df.select_dtypes(include=[np.number]).dtypes):
+        raise _Unsupported()
+
+
+def _pandas_numeric(df: pd.DataFrame) -> List[bool]:
+    # Whether each column counts as numeric for DataAnalyzer (select_dtypes(include=[np.number]))
+    numeric = set(df.select_dtypes(include=[np.number]).columns)
+    return [column in numeric for column in df.columns]
+
+
+def _completeness(non_null: int, total: int) -> float:
+    # As DataAnalyzer computes it: NumPy rounds the float64 ratio half to even after scaling,
+    # which differs from Python's round() on ties such as 0.90775.
+    return np.round(np.float64(non_null) / total, 4)
+
+
+def _pairwise_correlation(values: np.ndarray, present: np.ndarray, names: List[str]) -> pd.DataFrame:
+    # Pearson correlation over pairwise complete observations, as DataFrame.corr() computes it,
+    # from a few matrix products instead of one pass per pair. Columns are centred first so the
+    # sums of products don't cancel.
+    present = present.astype(np.float64)
+    counts = present.sum(axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        means = np.where(counts > 0, np.nansum(values, axis=0) / counts, 0.0)
+    x = np.where(present > 0, values - means, 0.0)
+    if present.all():
+        n = float(len(values))
+        sxy = x.T @ x
+        cov = sxy - np.outer(x.sum(axis=0), x.sum(axis=0)) / n
+        sxx = np.diag(cov)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            corr = cov / np.sqrt(np.outer(sxx, sxx))
+        corr[:, sxx <= 0] = np.nan
+        corr[sxx <= 0, :] = np.nan
+    else:
+        n = present.T @ present
+        sx = x.T @ present  # sx[i, j]: sum of column i over the rows where j is present too
+        sxy = x.T @ x
+        sxx = (x * x).T @ present
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cov = sxy - sx * sx.T / n
+            var_i = sxx - sx * sx / n
+            var_j = var_i.T
+            corr = cov / np.sqrt(var_i * var_j)
+        corr[(n < 2) | (var_i <= 0) | (var_j <= 0)] = np.nan
+    corr = np.clip(corr, -1.0, 1.0)
+    diagonal = np.diag_indices_from(corr)
+    corr[diagonal] = np.where(np.isnan(np.diag(corr)), np.nan, 1.0)
+    return pd.DataFrame(corr, index=names, columns=names)
+
+
+def _temporal_result(take: Callable[[np.ndarray], list], parsed_ok: np.ndarray, missing: np.ndarray,
+                     blank: np.ndarray, date_format: Optional[str], column: str) -> dict:
+    # The temporal_validation entry of a column, given which values parsed; take(rows)
+    # returns the column's values at the given rows
+    unparseable = ~parsed_ok & ~missing & ~blank
+    missing = missing | (blank & ~parsed_ok)
+    count = int(unparseable.sum())
+    if count:
+        print(f"Column {column}: {count} values don't match the date format {date_format}.")
+    return {
+        "valid": count == 0 and bool((~missing).any()),
+        "format": date_format,
+        "parsed": int(len(parsed_ok) - missing.sum() - count),
+        "missing": int(missing.sum()),
+        "unparseable": count,
+        "unparseable_samples": take(np.flatnonzero(unparseable)[:5]),
+    }
+
+
+def _pandas_verdict(values: pd.Series, rows: np.ndarray, date_format: str) -> np.ndarray:
+    # Whether DataAnalyzer parses the given rows with the format
+    if not len(rows):
+        return np.zeros(0, dtype=bool)
+    subset = pd.Series(values.iloc[rows].to_numpy(dtype=object), dtype=object)
+    return DataAnalyzer._parse_with_format(subset, date_format).notna().to_numpy()
+
+
+class ArrowAnalyzer:
+    """
+    DataAnalyzer checks on pyarrow.compute.
+
+    Arrow kernels release the GIL, so independent columns are processed on a thread pool.
+    """
+
+    def __init__(self, threads: Optional[int] = None):
+        """
+        Parameters:
+            threads (int, optional): Columns processed at once; defaults to pyarrow's CPU count.
+        """
+        import pyarrow as pa
+
+        self.threads = threads or pa.cpu_count()
+
+    @staticmethod
+    def to_native(df):
+        """
+        Convert a pandas DataFrame to a pyarrow.Table the checks can be run on repeatedly.
+
+        Float NaN becomes null, so missing values are counted as pandas counts them.
+
+        Parameters:
+            df (pd.DataFrame or pyarrow.Table): The dataset.
+
+        Returns:
+            pyarrow.Table: The dataset.
+        """
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        if isinstance(df, pa.Table):
+            columns = []
+            for column in df.columns:
+                if pa.types.is_floating(column.type) and pc.any(pc.is_nan(column)).as_py():
+                    column = pc.if_else(pc.is_nan(column), pa.scalar(None, column.type), column)
+                columns.append(column)
+            return pa.table(columns, names=df.column_names)
+        _check_convertible(df)
+        try:
+            return pa.Table.from_pandas(df, preserve_index=False)
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+            raise _Unsupported() from None
+
+    def _map(self, func, items):
+        items = list(items)
+        if self.threads > 1 and len(items) > 1:
+            with ThreadPoolExecutor(max_workers=min(self.threads, len(items))) as pool:
+                return list(pool.map(func, items))
+        return [func(item) for item in items]
+
+    @staticmethod
+    def _numeric_columns(df, table) -> List[str]:
+        import pyarrow as pa
+
+        if isinstance(df, pd.DataFrame):
+            return [c for c, numeric in zip(df.columns, _pandas_numeric(df)) if numeric]
+        return [name for name, column in zip(table.column_names, table.columns)
+                if pa.types.is_integer(column.type) or pa.types.is_floating(column.type)]
+
+    @_falls_back
+    def calculate_completeness_score(self, df) -> float:
+        table = self.to_native(df)
+        if table.num_rows == 0 or table.num_columns == 0:
+            return 0.0
+        nulls = sum(column.null_count for column in table.columns)
+        total = table.num_rows * table.num_columns
+        return _completeness(total - nulls, total)
+
+    def _column_stats(self, table, names: List[str], quantiles: List[float], ddof: int = 1,
+                      moments: bool = True) -> pd.DataFrame:
+        # count, mean, std, min, max (NaN without moments) and the quantiles per column
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        def stats(name):
+            column = table.column(name).cast(pa.float64())
+            row = {"count": float(column.length() - column.null_count)}
+            if moments:
+                row["mean"], row["std"] = pc.mean(column).as_py(), pc.stddev(column, ddof=ddof).as_py()
+                extremes = pc.min_max(column)
+                row["min"], row["max"] = extremes["min"].as_py(), extremes["max"].as_py()
+            if row["count"] and quantiles:
+                row.update(zip(quantiles, pc.quantile(column, q=quantiles, interpolation='linear').to_pylist()))
+            return row
+
+        frame = pd.DataFrame(self._map(stats, names), index=names)
+        return frame.reindex(columns=["count", "mean", "std", "min", "max"] + quantiles).astype(np.float64)
+
+    @_falls_back
+    def statistical_summary(self, df) -> pd.DataFrame:
+        import pyarrow as pa
+
+        table = self.to_native(df)
+        names = self._numeric_columns(df, table)
+        if not names or any(pa.types.is_timestamp(t) or pa.types.is_date(t) or pa.types.is_duration(t)
+                            for t in table.schema.types):
+            raise _Unsupported()  # describe() then covers text or datetime columns too
+        stats = self._column_stats(table, names, [0.25, 0.5, 0.75], ddof=1)
+        stats = stats.rename(columns={0.25: '25%', 0.5: '50%', 0.75: '75%'})
+        return stats[_SUMMARY_INDEX].T
+
+    @_falls_back
+    def outlier_bounds(self, df, method: str = 'IQR') -> pd.DataFrame:
+        table = self.to_native(df)
+        names = self._numeric_columns(df, table)
+        if method == 'IQR':
+            stats = self._column_stats(table, names, [0.25, 0.75], moments=False)
+            q1, q3 = stats[0.25], stats[0.75]
+            lower, upper = q1 - 1.5 * (q3 - q1), q3 + 1.5 * (q3 - q1)
+        elif method == 'zscore':
+            stats = self._column_stats(table, names, [], ddof=0)
+            lower, upper = stats["mean"] - 3 * stats["std"], stats["mean"] + 3 * stats["std"]
+        else:
+            raise ValueError("Invalid method. Use 'IQR' or 'zscore'.")
+        return pd.DataFrame({"lower": lower, "upper": upper}, index=pd.Index(names))
+
+    @_falls_back
+    def outlier_mask(self, df, method: str = 'IQR', bounds=None) -> pd.DataFrame:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        table = self.to_native(df)
+        index = df.index if isinstance(df, pd.DataFrame) else pd.RangeIndex(table.num_rows)
+        zscore = bounds is None and method == 'zscore'
+        if bounds is None and not zscore:
+            if method != 'IQR':
+                raise ValueError("Invalid method. Use 'IQR' or 'zscore'.")
+            bounds = self.outlier_bounds(df if isinstance(df, pd.DataFrame) else table, method='IQR')
+        elif isinstance(bounds, dict):
+            bounds = pd.DataFrame.from_dict(bounds, orient='index')
+        if zscore:
+            names = self._numeric_columns(df, table)
+        else:
+            names = [column for column in bounds.index if column in table.column_names]
+
+        def flags(name):
+            column = table.column(name).cast(pa.float64())
+            if zscore:
+                # Same rule as DataAnalyzer: |x - mean| / std > 3, with the population std
+                std = pc.stddev(column, ddof=0).as_py()
+                mean = pc.mean(column).as_py()
+                if std is None:
+                    return np.zeros(table.num_rows, dtype=bool)
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    z = pc.abs(pc.divide(pc.subtract(column, mean), std))
+                hit = pc.greater(z, 3.0)
+            else:
+                lower, upper = bounds.at[name, "lower"], bounds.at[name, "upper"]
+                hit = pc.or_(pc.less(column, lower), pc.greater(column, upper))
+            return pc.fill_null(hit, False).to_numpy(zero_copy_only=False)
+
+        return pd.DataFrame(dict(zip(names, self._map(flags, names))), index=index, columns=names)
+
+    @staticmethod
+    def _is_unique(column) -> bool:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        if column.null_count > 1:
+            return False
+        if column.null_count == 0 and len(column) > 1 and (pa.types.is_integer(column.type)
+                                                           or pa.types.is_timestamp(column.type)):
+            # Keys are usually ascending, which settles it without hashing
+            if pc.all(pc.greater(column.slice(1), column.slice(0, len(column) - 1))).as_py():
+                return True
+        return len(pc.unique(column)) == len(column)
+
+    @_falls_back
+    def integrity_checks(self, df, key_columns: List[str]) -> bool:
+        table = self.to_native(df)
+        passed = True
+        for column in key_columns:
+            if column not in table.column_names:
+                print(f"Key column {column} not found in dataset.")
+                passed = False
+            elif not self._is_unique(table.column(column)):
+                print(f"Duplicates found in key column: {column}")
+                passed = False
+        return passed
+
+    @_falls_back
+    def text_data_analysis(self, df, text_columns: List[str]) -> Dict[str, Dict[str, int]]:
+        import pyarrow as pa
+
+        table = self.to_native(df)
+        present = [column for column in text_columns if column in table.column_names]
+        for column in text_columns:
+            if column not in table.column_names:
+                print(f"Text column {column} not found in dataset.")
+        def profile(column):
+            values = table.column(column)
+            if isinstance(df, pd.DataFrame) and not (pa.types.is_string(values.type)
+                                                     or pa.types.is_large_string(values.type)):
+                return text_quality(df[column])
+            # Arrow strings become pandas' Arrow-backed string columns without copying the data.
+            return text_quality(values.to_pandas())
+
+        profiles = self._map(profile, present)
+        return dict(zip(present, profiles))
+
+    @_falls_back
+    def temporal_validation(self, df, date_columns: List[str]) -> Dict[str, dict]:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        table = self.to_native(df)
+        results = {}
+        for column in date_columns:
+            if column not in table.column_names:
+                print(f"Date column {column} not found in dataset.")
+                results[column] = {"valid": False, "format": None, "parsed": 0, "missing": 0,
+                                   "unparseable": 0, "unparseable_samples": []}
+                continue
+            values = table.column(column)
+            if pa.types.is_dictionary(values.type):
+                values = values.cast(values.type.value_type)
+            if not (pa.types.is_string(values.type) or pa.types.is_large_string(values.type)
+                    or pa.types.is_timestamp(values.type) or pa.types.is_date(values.type)):
+                # Numbers (epoch offsets) and other types are parsed the pandas way
+                results.update(DataAnalyzer.temporal_validation(pa.table({column: values}).to_pandas(), [column]))
+                continue
+            missing = values.is_null().to_numpy(zero_copy_only=False)
+            take = lambda rows, values=values: values.take(rows).to_pylist()
+            if not (pa.types.is_string(values.type) or pa.types.is_large_string(values.type)):
+                results[column] = _temporal_result(take, ~missing, missing, np.zeros_like(missing), None, column)
+                continue
+
+            present = np.flatnonzero(~missing)
+            positions = np.unique(np.linspace(0, len(present) - 1, min(1000, len(present))).astype(int))
+            sample = pd.Series(values.take(present[positions]).to_pylist(), dtype=object) if len(present) else \
+                pd.Series([], dtype=object)
+            date_format = DataAnalyzer.infer_date_format(sample, sample_size=len(sample) or 1)
+            if date_format is not None and '%z' in date_format:
+                results.update(DataAnalyzer.temporal_validation(pa.table({column: values}).to_pandas(), [column]))
+                continue
+            # Date columns repeat their values, so each distinct value is checked once.
+            text = values.cast(pa.string())
+            uniques = pc.unique(text).drop_null()
+            blank_u = pc.equal(pc.utf8_trim_whitespace(uniques), '').to_numpy(zero_copy_only=False)
+            ok_u = np.zeros(len(uniques), dtype=bool)
+            if date_format is not None:
+                # Accept only values that format back to themselves and lie in pandas' datetime
+                # range; pandas decides the rest (unpadded fields, day overflow, whitespace).
+                try:
+                    parsed = pc.strptime(uniques, format=date_format, unit='s', error_is_null=True)
+                    year = pc.year(parsed)
+                    same = pc.and_(pc.equal(pc.strftime(parsed, format=date_format), uniques),
+                                   pc.and_(pc.greater(year, 1677), pc.less(year, 2262)))
+                    ok_u = pc.fill_null(same, False).to_numpy(zero_copy_only=False).copy()
+                except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+                    pass  # A directive Arrow lacks
+                doubtful = np.flatnonzero(~ok_u & ~blank_u)
+                ok_u[doubtful] = _pandas_verdict(uniques.to_pandas(), doubtful, date_format)
+            parsed_ok = pc.is_in(text, value_set=uniques.filter(pa.array(ok_u))).to_numpy(zero_copy_only=False)
+            blank = pc.is_in(text, value_set=uniques.filter(pa.array(blank_u))).to_numpy(zero_copy_only=False)
+            results[column] = _temporal_result(take, parsed_ok, missing, blank, date_format, column)
+        return results
+
+    @_falls_back
+    def multivariate_analysis(self, df, top_k: int = None, threshold: float = None,
+                              tile_size: int = None) -> pd.DataFrame:
+        import pyarrow as pa
+
+        table = self.to_native(df)
+        names = self._numeric_columns(df, table)
+        if not names or table.num_rows == 0:
+            print("No numeric columns found for correlation analysis.")
+            return pd.DataFrame()
+        columns = self._map(lambda name: table.column(name).cast(pa.float64()), names)
+        if top_k is not None or threshold is not None or tile_size is not None:
+            numeric = pd.DataFrame({name: column.to_numpy() for name, column in zip(names, columns)})
+            return DataAnalyzer.multivariate_analysis(numeric, top_k=top_k, threshold=threshold, tile_size=tile_size)
+        values = np.column_stack([column.to_numpy() for column in columns])
+        present = np.column_stack([column.is_valid().to_numpy(zero_copy_only=False) for column in columns])
+        return _pairwise_correlation(values, present, names)
+
+    @_falls_back
+    def calculate_metadata_quality_score(self, df, column_descriptions=None) -> float:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        table = self.to_native(df)
+        if table.num_rows == 0 or table.num_columns == 0:
+            return 0.0
+        names = table.column_names
+        num_columns = len(names)
+        total_score = sum(1 for col in names if col and "Unnamed" not in col)
+        max_score = num_columns
+
+        if isinstance(df, pd.DataFrame):
+            # Decided from the pandas dtypes, as cheap as it gets
+            total_score += sum(1 for i in range(num_columns) if DataAnalyzer._is_type_consistent(df.iloc[:, i]))
+        else:
+            # A column has one Python type in pandas unless it mixes values with missing ones;
+            # numbers (integers with nulls become floats) absorb them as NaN.
+            total_score += sum(1 for column in table.columns
+                               if pa.types.is_integer(column.type) or pa.types.is_floating(column.type)
+                               or column.null_count == 0 or pa.types.is_null(column.type))
+        max_score += num_columns
+
+        # Duplicate columns, compared as pandas compares them (1 == 1.0 == True; categories by value)
+        def comparable(column):
+            if pa.types.is_dictionary(column.type):
+                column = column.cast(column.type.value_type)
+            if pa.types.is_integer(column.type) or pa.types.is_floating(column.type) \
+                    or pa.types.is_boolean(column.type):
+                column = column.cast(pa.float64())
+            elif pa.types.is_large_string(column.type):
+                column = column.cast(pa.string())
+            return column.combine_chunks() if isinstance(column, pa.ChunkedArray) else column
+
+        columns = self._map(comparable, table.columns)
+
+        def bucket(column):
+            key = (str(column.type), column.null_count)
+            if pa.types.is_floating(column.type):
+                key += (pc.sum(column).as_py(), pc.min(column).as_py(), pc.max(column).as_py())
+            elif pa.types.is_string(column.type):
+                key += (pc.sum(pc.utf8_length(column)).as_py(),)
+            return key
+
+        buckets = {}
+        for position, key in enumerate(self._map(bucket, columns)):
+            buckets.setdefault(key, []).append(position)
+        duplicates = 0
+        for members in buckets.values():
+            distinct = []
+            for i in members:
+                if any(columns[i].equals(columns[j]) for j in distinct):
+                    duplicates += 1
+                else:
+                    distinct.append(i)
+        total_score += num_columns - duplicates
+        max_score += num_columns
+
+        if column_descriptions:
+            total_score += sum(1 for col in names if col in column_descriptions and column_descriptions[col])
+            max_score += num_columns
+        return total_score / max_score if max_score > 0 else 0.0
+
+
+class PolarsAnalyzer:
+    """
+    DataAnalyzer checks on Polars, whose expressions run multi-threaded across columns.
+    """
+
+    def __init__(self, threads: Optional[int] = None):
+        """
+        Parameters:
+            threads (int, optional): Ignored beyond documentation: Polars sizes its thread pool
+                                     once per process (POLARS_MAX_THREADS).
+        """
+        try:
+            import polars  # noqa: F401
+        except ImportError:
+            raise ImportError("polars is not installed; use the 'arrow' or 'pandas' backend.") from None
+        self.threads = threads
+
+    @staticmethod
+    def to_native(df):
+        """
+        Convert a pandas DataFrame to a polars.DataFrame the checks can be run on repeatedly.
+
+        Float NaN becomes null, so missing values are counted as pandas counts them.
+
+        Parameters:
+            df (pd.DataFrame or polars.DataFrame): The dataset.
+
+        Returns:
+            polars.DataFrame: The dataset.
+        """
+        import polars as pl
+
+        if isinstance(df, pl.DataFrame):
+            floats = [name for name, dtype in df.schema.items() if dtype.is_float()]
+            return df.with_columns(pl.col(floats).fill_nan(None)) if floats else df
+        _check_convertible(df)
+        try:
+            return pl.from_pandas(df, nan_to_null=True)
+        except Exception:
+            raise _Unsupported() from None
+
+    @staticmethod
+    def _numeric_columns(df, frame) -> List[str]:
+        if isinstance(df, pd.DataFrame):
+            return [c for c, numeric in zip(df.columns, _pandas_numeric(df)) if numeric]
+        return [name for name, dtype in frame.schema.items() if dtype.is_integer() or dtype.is_float()]
+
+    @_falls_back
+    def calculate_completeness_score(self, df) -> float:
+        frame = self.to_native(df)
+        if frame.height == 0 or frame.width == 0:
+            return 0.0
+        nulls = int(frame.null_count().sum_horizontal()[0])
+        total = frame.height * frame.width
+        return _completeness(total - nulls, total)
+
+    def _column_stats(self, frame, names: List[str], quantiles: List[float], ddof: int = 1,
+                      moments: bool = True) -> pd.DataFrame:
+        # See ArrowAnalyzer._column_stats
+        import polars as pl
+
+        fields = ["count", "mean", "std", "min", "max"]
+        stats = pd.DataFrame(np.nan, index=names, columns=fields + quantiles, dtype=np.float64)
+        if not names:
+            return stats
+        exprs = []
+        for i, name in enumerate(names):
+            column = pl.col(name).cast(pl.Float64)
+            exprs.append(column.count().cast(pl.Float64).alias(f"{i}:count"))
+            if moments:
+                exprs += [column.mean().alias(f"{i}:mean"), column.std(ddof=ddof).alias(f"{i}:std"),
+                          column.min().alias(f"{i}:min"), column.max().alias(f"{i}:max")]
+        row = frame.select(exprs).row(0, named=True)
+        for i, name in enumerate(names):
+            for field in fields if moments else fields[:1]:
+                stats.at[name, field] = row[f"{i}:{field}"]
+        if not quantiles:
+            return stats
+
+        # Linear quantiles from one sort per column: gather the order statistics around
+        # q * (n - 1) and interpolate between them
+        exprs, positions = [], {}
+        for i, name in enumerate(names):
+            n = int(stats.at[name, "count"])
+            if n:
+                position = np.array(quantiles) * (n - 1)
+                ranks = sorted(set(np.floor(position).astype(int)) | set(np.ceil(position).astype(int)))
+                positions[name] = (position, ranks)
+                exprs.append(pl.col(name).cast(pl.Float64).drop_nulls().sort().gather(ranks).implode().alias(str(i)))
+        if exprs:
+            ordered = frame.select(exprs).row(0)
+            for name, values in zip(positions, ordered):
+                position, ranks = positions[name]
+                value = dict(zip(ranks, values))
+                low, high = np.floor(position).astype(int), np.ceil(position).astype(int)
+                below, above = np.array([value[r] for r in low]), np.array([value[r] for r in high])
+                stats.loc[name, quantiles] = below + (above - below) * (position - low)
+        return stats
+
+    @_falls_back
+    def statistical_summary(self, df) -> pd.DataFrame:
+        frame = self.to_native(df)
+        names = self._numeric_columns(df, frame)
+        if not names or any(dtype.is_temporal() for dtype in frame.dtypes):
+            raise _Unsupported()  # describe() then covers text or datetime columns too
+        stats = self._column_stats(frame, names, [0.25, 0.5, 0.75], ddof=1)
+        stats = stats.rename(columns={0.25: '25%', 0.5: '50%', 0.75: '75%'})
+        return stats[_SUMMARY_INDEX].T
+
+    @_falls_back
+    def outlier_bounds(self, df, method: str = 'IQR') -> pd.DataFrame:
+        frame = self.to_native(df)
+        names = self._numeric_columns(df, frame)
+        if method == 'IQR':
+            stats = self._column_stats(frame, names, [0.25, 0.75], moments=False)
+            q1, q3 = stats[0.25], stats[0.75]
+            lower, upper = q1 - 1.5 * (q3 - q1), q3 + 1.5 * (q3 - q1)
+        elif method == 'zscore':
+            stats = self._column_stats(frame, names, [], ddof=0)
+            lower, upper = stats["mean"] - 3 * stats["std"], stats["mean"] + 3 * stats["std"]
+        else:
+            raise ValueError("Invalid method. Use 'IQR' or 'zscore'.")
+        return pd.DataFrame({"lower": lower, "upper": upper}, index=pd.Index(names))
+
+    @_falls_back
+    def outlier_mask(self, df, method: str = 'IQR', bounds=None) -> pd.DataFrame:
+        import polars as pl
+
+        frame = self.to_native(df)
+        index = df.index if isinstance(df, pd.DataFrame) else pd.RangeIndex(frame.height)
+        if bounds is None and method == 'zscore':
+            names = self._numeric_columns(df, frame)
+            exprs = []
+            for name in names:
+                column = pl.col(name).cast(pl.Float64)
+                z = ((column - column.mean()) / column.std(ddof=0)).abs()
+                exprs.append((z > 3).fill_null(False).alias(name))
+        else:
+            if bounds is None:
+                if method != 'IQR':
+                    raise ValueError("Invalid method. Use 'IQR' or 'zscore'.")
+                bounds = self.outlier_bounds(df if isinstance(df, pd.DataFrame) else frame, method='IQR')
+            elif isinstance(bounds, dict):
+                bounds = pd.DataFrame.from_dict(bounds, orient='index')
+            names = [column for column in bounds.index if column in frame.columns]
+            exprs = []
+            for name in names:
+                column = pl.col(name).cast(pl.Float64)
+                lower, upper = float(bounds.at[name, "lower"]), float(bounds.at[name, "upper"])
+                # Comparisons with a NaN bound are False, as in pandas
+                exprs.append(((column < lower) | (column > upper)).fill_null(False).alias(name))
+        if not exprs:
+            return pd.DataFrame(index=index)
+        flags = frame.select(exprs)
+        return pd.DataFrame({name: flags[name].to_numpy() for name in names}, index=index, columns=names)
+
+    @_falls_back
+    def integrity_checks(self, df, key_columns: List[str]) -> bool:
+        import polars as pl
+
+        frame = self.to_native(df)
+        present = [column for column in key_columns if column in frame.columns]
+        unique = frame.select([pl.col(c).n_unique() for c in present]).row(0) if present else ()
+        distinct = dict(zip(present, unique))
+        passed = True
+        for column in key_columns:
+            if column not in frame.columns:
+                print(f"Key column {column} not found in dataset.")
+                passed = False
+            elif distinct[column] < frame.height:
+                print(f"Duplicates found in key column: {column}")
+                passed = False
+        return passed
+
+    @_falls_back
+    def text_data_analysis(self, df, text_columns: List[str]) -> Dict[str, Dict[str, int]]:
+        import polars as pl
+        import pyarrow as pa
+
+        frame = self.to_native(df)
+        results = {}
+        for column in text_columns:
+            if column in frame.columns and isinstance(df, pd.DataFrame) and frame[column].dtype != pl.String:
+                results[column] = text_quality(df[column])
+            elif column in frame.columns:
+                values = frame[column].to_arrow()
+                if pa.types.is_string_view(values.type):
+                    values = values.cast(pa.large_string())
+                results[column] = text_quality(values.to_pandas())
+            else:
+                print(f"Text column {column} not found in dataset.")
+        return results
+
+    @_falls_back
+    def temporal_validation(self, df, date_columns: List[str]) -> Dict[str, dict]:
+        import polars as pl
+
+        frame = self.to_native(df)
+        results = {}
+        for column in date_columns:
+            if column not in frame.columns:
+                print(f"Date column {column} not found in dataset.")
+                results[column] = {"valid": False, "format": None, "parsed": 0, "missing": 0,
+                                   "unparseable": 0, "unparseable_samples": []}
+                continue
+            values = frame[column]
+            if values.dtype == pl.Categorical or values.dtype == pl.Enum:
+                values = values.cast(pl.String)
+            if values.dtype not in (pl.String, pl.Date) and not isinstance(values.dtype, pl.Datetime):
+                results.update(DataAnalyzer.temporal_validation(pd.DataFrame({column: values.to_pandas()}), [column]))
+                continue
+            missing = values.is_null().to_numpy()
+            take = lambda rows, values=values: values.gather(rows).to_list()
+            if values.dtype != pl.String:
+                results[column] = _temporal_result(take, ~missing, missing, np.zeros_like(missing), None, column)
+                continue
+
+            present = values.drop_nulls()
+            positions = np.unique(np.linspace(0, len(present) - 1, min(1000, len(present))).astype(int))
+            sample = pd.Series(present.gather(positions).to_list() if len(present) else [], dtype=object)
+            date_format = DataAnalyzer.infer_date_format(sample, sample_size=len(sample) or 1)
+            if date_format is not None and '%z' in date_format:
+                results.update(DataAnalyzer.temporal_validation(pd.DataFrame({column: values.to_pandas()}), [column]))
+                continue
+            # As in ArrowAnalyzer: distinct values are checked once, and those that don't
+            # format back to themselves go to pandas.
+            uniques = present.unique()
+            blank_u = (uniques.str.strip_chars() == '').to_numpy()
+            ok_u = np.zeros(len(uniques), dtype=bool)
+            if date_format is not None:
+                try:
+                    parsed = uniques.str.strptime(pl.Datetime('us'), date_format, strict=False)
+                    same = ((parsed.dt.strftime(date_format) == uniques)
+                            & (parsed.dt.year() > 1677) & (parsed.dt.year() < 2262)).fill_null(False)
+                    ok_u = same.to_numpy().copy()
+                except pl.exceptions.PolarsError:
+                    pass  # A directive Polars lacks
+                doubtful = np.flatnonzero(~ok_u & ~blank_u)
+                ok_u[doubtful] = _pandas_verdict(uniques.to_pandas(), doubtful, date_format)
+            parsed_ok = values.is_in(uniques.filter(pl.Series(ok_u))).fill_null(False).to_numpy()
+            blank = values.is_in(uniques.filter(pl.Series(blank_u))).fill_null(False).to_numpy()
+            results[column] = _temporal_result(take, parsed_ok, missing, blank, date_format, column)
+        return results
+
+    @_falls_back
+    def multivariate_analysis(self, df, top_k: int = None, threshold: float = None,
+                              tile_size: int = None) -> pd.DataFrame:
+        import polars as pl
+
+        frame = self.to_native(df)
+        names = self._numeric_columns(df, frame)
+        if not names or frame.height == 0:
+            print("No numeric columns found for correlation analysis.")
+            return pd.DataFrame()
+        numeric = frame.select([pl.col(name).cast(pl.Float64) for name in names])
+        if top_k is not None or threshold is not None or tile_size is not None:
+            return DataAnalyzer.multivariate_analysis(numeric.to_pandas(), top_k=top_k, threshold=threshold,
+                                                      tile_size=tile_size)
+        present = numeric.select(pl.all().is_not_null()).to_numpy()
+        values = numeric.to_numpy()
+        return _pairwise_correlation(values, present, names)
+
+    @_falls_back
+    def calculate_metadata_quality_score(self, df, column_descriptions=None) -> float:
+        import polars as pl
+
+        frame = self.to_native(df)
+        if frame.height == 0 or frame.width == 0:
+            return 0.0
+        names = frame.columns
+        num_columns = len(names)
+        total_score = sum(1 for col in names if col and "Unnamed" not in col)
+        max_score = num_columns
+
+        # See ArrowAnalyzer.calculate_metadata_quality_score
+        if isinstance(df, pd.DataFrame):
+            total_score += sum(1 for i in range(num_columns) if DataAnalyzer._is_type_consistent(df.iloc[:, i]))
+        else:
+            nulls = frame.null_count().row(0)
+            total_score += sum(1 for dtype, count in zip(frame.dtypes, nulls)
+                               if dtype.is_integer() or dtype.is_float() or count == 0 or dtype == pl.Null)
+        max_score += num_columns
+
+        def comparable(series):
+            if series.dtype == pl.Categorical or series.dtype == pl.Enum:
+                return series.cast(pl.String)
+            if series.dtype.is_numeric() or series.dtype == pl.Boolean:
+                return series.cast(pl.Float64)
+            return series
+
+        columns = [comparable(frame[name]) for name in names]
+        keys = []
+        for series in columns:
+            key = (str(series.dtype), series.null_count())
+            if series.dtype == pl.Float64:
+                key += (series.sum(), series.min(), series.max())
+            elif series.dtype == pl.String:
+                key += (series.str.len_bytes().sum(),)
+            keys.append(key)
+        buckets = {}
+        for position, key in enumerate(keys):
+            buckets.setdefault(key, []).append(position)
+        duplicates = 0
+        for members in buckets.values():
+            distinct = []
+            for i in members:
+                if any(columns[i].equals(columns[j], check_names=False, null_equal=True) for j in distinct):
+                    duplicates += 1
+                else:
+                    distinct.append(i)
+        total_score += num_columns - duplicates
+        max_score += num_columns
+
+        if column_descriptions:
+            total_score += sum(1 for col in names if col in column_descriptions and column_descriptions[col])
+            max_score += num_columns
+        return total_score / max_score if max_score > 0 else 0.0
+
+
+def parity_report(df: pd.DataFrame, backend: str, text_columns: Optional[List[str]] = None,
+                  date_columns: Optional[List[str]] = None, key_columns: Optional[List[str]] = None,
+                  rtol: float = 1e-9) -> List[Tuple[str, bool, str]]:
+    """
+    Run every covered check on pandas and on a backend and compare the results.
+
+    Parameters:
+        df (pd.DataFrame): The dataset.
+        backend (str): 'arrow' or 'polars'.
+        text_columns (List[str], optional): Columns for text_data_analysis (default: string columns).
+        date_columns (List[str], optional): Columns for temporal_validation (default: none).
+        key_columns (List[str], optional): Columns for integrity_checks (default: the first column).
+        rtol (float): Relative tolerance for floating-point results.
+
+    Returns:
+        List[Tuple[str, bool, str]]: (check, equal, detail) per check and input form
+            ('pandas' input and the backend's 'native' table).
+    """
+    import contextlib
+    import io
+
+    analyzer = get_analyzer(backend)
+    if text_columns is None:
+        text_columns = [c for c in df.columns
+                        if df[c].dtype == object or isinstance(df[c].dtype, pd.StringDtype)]
+    key_columns = key_columns if key_columns is not None else list(df.columns[:1])
+    date_columns = date_columns or []
+    checks = {
+        "calculate_completeness_score": lambda a, d: a.calculate_completeness_score(d),
+        "statistical_summary": lambda a, d: a.statistical_summary(d),
+        "outlier_bounds[IQR]": lambda a, d: a.outlier_bounds(d, method='IQR'),
+        "outlier_bounds[zscore]": lambda a, d: a.outlier_bounds(d, method='zscore'),
+        "outlier_mask[IQR]": lambda a, d: a.outlier_mask(d, method='IQR'),
+        "outlier_mask[zscore]": lambda a, d: a.outlier_mask(d, method='zscore'),
+        "integrity_checks": lambda a, d: a.integrity_checks(d, key_columns),
+        "text_data_analysis": lambda a, d: a.text_data_analysis(d, text_columns),
+        "temporal_validation": lambda a, d: a.temporal_validation(d, date_columns),
+        "multivariate_analysis": lambda a, d: a.multivariate_analysis(d),
+        "calculate_metadata_quality_score": lambda a, d: a.calculate_metadata_quality_score(d),
+    }
+    report = []
+    forms = [("pandas", df, df)]
+    try:
+        native = analyzer.to_native(df)
+        # A native table is checked against DataAnalyzer on its own pandas conversion
+        # (e.g. an object column of ints and None arrives as int64 with nulls).
+        forms.append(("native", native, native.to_pandas()))
+    except _Unsupported:
+        pass  # Checked on pandas, through the fallback
+    with contextlib.redirect_stdout(io.StringIO()):
+        for name, check in checks.items():
+            for form, data, reference in forms:
+                try:
+                    expected = check(DataAnalyzer, reference)
+                    actual = check(analyzer, data)
+                    equal, detail = _same(expected, actual, rtol)
+                except Exception as e:
+                    equal, detail = False, f"{type(e).__name__}: {e}"
+                report.append((f"{name}[{form}]", equal, detail))
+    return report
+
+
+def _same(expected, actual, rtol: float) -> Tuple[bool, str]:
+    # Compare check results: frames and numbers to a relative tolerance, the rest exactly
+    if isinstance(expected, pd.DataFrame):
+        if not isinstance(actual, pd.DataFrame):
+            return False, f"expected a DataFrame, got {type(actual).__name__}"
+        try:
+            pd.testing.assert_frame_equal(expected, actual, check_dtype=False, check_index_type=False,
+                                          check_column_type=False, rtol=rtol, atol=rtol)
+        except AssertionError as e:
+            return False, str(e).strip().splitlines()[0]
+        return True, ""
+    if isinstance(expected, dict):
+        if not isinstance(actual, dict) or set(expected) != set(actual):
+            return False, "keys differ"
+        for key in expected:
+            equal, detail = _same(expected[key], actual[key], rtol)
+            if not equal:
+                return False, f"{key}: {detail}"
+        return True, ""
+    if isinstance(expected, (float, np.floating)) and not isinstance(expected, bool):
+        equal = bool(np.isclose(expected, actual, rtol=rtol, atol=rtol, equal_nan=True))
+        return equal, "" if equal else f"{expected!r} != {actual!r}"
+    equal = expected == actual
+    return bool(equal), "" if equal else f"{expected!r} != {actual!r}"
+
+
+# Example usage (replace with your actual dataset URL)
+if __name__ == "__main__":
+    url = "ted_talks_en.csv"  # Replace with a valid URL or file path
+    df = pd.read_csv(url)
+    for backend in ("arrow", "polars"):
+        for check, equal, detail in parity_report(df, backend):
+            print(f"{backend:7s} {check:48s} {'ok' if equal else 'DIFFERS ' + detail}")
@@ -0,0 +1,373 @@
+"""
+Headless batch scoring over many datasets.
+
+Example:
+    python batch_score.py "data/*.csv" --manifest sources.txt --output results.jsonl --workers 8 --timeout 600
+    python batch_score.py "data/*.csv" --output results.parquet --resume
+    python batch_score.py "data/*.csv" --output results.jsonl --store profiles.sqlite
+    python batch_score.py "data/*.csv" --output results.jsonl --rules rules.json
+"""
+import argparse
+import glob
+import json
+import os
+import signal
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Iterable, List, Optional, Set
+
+from data_analyzer import DataAnalyzer
+from data_fetcher import DataFetcher
+from profile_store import ProfileStore, column_profile, streaming_column_profile
+from rule_engine import RuleEngine, load_rules, validity_score
+from trust_score_calculator import TrustScoreCalculator
+
+
+class ScoringTimeout(BaseException):
+    # BaseException so that broad `except Exception` handlers in the pipeline don't swallow it.
+    pass
+
+
+def _raise_timeout(signum, frame):
+    raise ScoringTimeout()
+
+
+def score_source(source: str,
+                 chunksize: Optional[int] = None,
+                 weights: Optional[List[float]] = None,
+                 snapshot_dir: Optional[str] = None,
+                 store_path: Optional[str] = None,
+                 rules: Optional[List[dict]] = None) -> Dict:
+    """
+    Run DataFetcher -> DataAnalyzer -> TrustScoreCalculator on one source.
+
+    Parameters:
+        source (str): Path or URL of the dataset.
+        chunksize (int, optional): Profile the source in a single streaming pass with this many rows per chunk.
+        weights (List[float], optional): (alpha, beta, gamma) to use instead of the default weights.
+        snapshot_dir (str, optional): Directory of columnar snapshots reused across runs.
+        store_path (str, optional): SQLite profile store (see profile_store.ProfileStore). Content
+                                    already profiled there is not read again, and every run is recorded.
+        rules (List[dict], optional): Declarative rules (see rule_engine.py) evaluated in the same
+                                      pass as the profile; the share that passed scales the trust score.
+
+    Returns:
+        Dict: The scores and the dataset's shape; with a store, also the profile id and
+              whether the stored profile was reused; with rules, the validity score and
+              the violations per rule.
+    """
+    fetcher = DataFetcher(source, snapshot_dir=snapshot_dir)
+    store = ProfileStore(store_path) if store_path else None
+    engine = RuleEngine(rules) if rules else None
+    try:
+        profile = version = content_hash = None
+        column_stats = df = rule_report = None
+        if store is not None:
+            profile, version, content_hash = store.lookup(fetcher)
+        if profile is not None:
+            metadata = fetcher.get_metadata()
+            rows, columns = profile["rows"], profile["columns"]
+            completeness_score = profile["completeness_score"]
+            metadata_quality_score = profile["metadata_quality_score"]
+            if engine is not None:
+                # Rule results are stored per rule set; a new rule set still needs one pass.
+                rule_report = profile["checks"].get(f"rules:{engine.fingerprint()}")
+                if rule_report is None:
+                    for chunk in fetcher.iter_chunks(chunksize=chunksize or 100_000):
+                        engine.update(chunk)
+        elif chunksize:
+            from streaming_profiler import StreamingProfiler
+
+            chunks = fetcher.iter_chunks(chunksize=chunksize)
+            profiler = StreamingProfiler.profile(engine.tap(chunks) if engine is not None else chunks)
+            metadata = fetcher.get_metadata()
+            if profiler.rows == 0:
+                raise ValueError("No data could be fetched from the source.")
+            rows, columns = profiler.rows, len(profiler.columns)
+            completeness_score = profiler.calculate_completeness_score()
+            metadata_quality_score = profiler.calculate_metadata_quality_score()
+            if store is not None:
+                column_stats = streaming_column_profile(profiler)
+        else:
+            df, metadata = fetcher.fetch_data()
+            if df.empty:
+                raise ValueError("No data could be fetched from the source.")
+            rows, columns = df.shape
+            completeness_score = DataAnalyzer.calculate_completeness_score(df)
+            metadata_quality_score = DataAnalyzer.calculate_metadata_quality_score(df)
+            if store is not None:
+                column_stats = column_profile(df)
+            if engine is not None:
+                engine.update(df)
+        if engine is not None and rule_report is None:
+            rule_report = engine.report()
+        checks = {f"rules:{engine.fingerprint()}": rule_report} if engine is not None else None
+
+        profile_id = None
+        if store is not None:
+            if profile is not None:
+                profile_id = profile["id"]
+                store.add_checks(profile_id, checks)
+            elif content_hash is not None or df is not None:
+                profile_id = store.save_profile(source, content_hash or store.frame_hash(df), rows, columns,
+                                                completeness_score, metadata_quality_score, checks=checks,
+                                                column_stats=column_stats, version=version)
+            if profile_id is not None:
+                metadata = {**metadata, "last_update_time": store.last_update_time(source, profile_id, metadata)}
+        update_score = DataAnalyzer.calculate_update_score(metadata)
+
+        calculator = TrustScoreCalculator()
+        if weights:
+            calculator.alpha, calculator.beta, calculator.gamma = weights
+        validity = validity_score(rule_report) if rule_report is not None else None
+        trust_score = calculator.calculate_trust_score(completeness_score, update_score, metadata_quality_score,
+                                                       validity_score=validity)
+        record = {
+            "rows": int(rows),
+            "columns": int(columns),
+            "completeness_score": float(completeness_score),
+            "update_score": float(update_score),
+            "metadata_quality_score": float(metadata_quality_score),
+            "trust_score": float(trust_score),
+        }
+        if rule_report is not None:
+            record.update(validity_score=validity,
+                          rule_violations={name: result["violations"] for name, result in rule_report.items()})
+        if profile_id is not None:
+            store.record_run(profile_id, update_score, trust_score, weights=calculator.weights)
+            record.update(profile_id=profile_id, reused=profile is not None)
+        return record
+    finally:
+        if store is not None:
+            store.close()
+
+
+def score_task(source: str, timeout: Optional[float], chunksize: Optional[int], weights: Optional[List[float]],
+               snapshot_dir: Optional[str] = None, store_path: Optional[str] = None,
+               rules: Optional[List[dict]] = None) -> Dict:
+    """
+    Score one source in a worker process, turning failures into the record's status.
+
+    SIGALRM interrupts a source that runs past its timeout (where the platform has it).
+    The other arguments are passed through to score_source.
+
+    Parameters:
+        source (str): Path or URL of the dataset.
+        timeout (float, optional): Seconds before the source is given up as 'timeout'.
+
+    Returns:
+        Dict: source, status ('ok', 'error' or 'timeout'), error, elapsed_seconds and,
+              when scoring succeeded, the score_source fields.
+    """
+    record = {"source": source, "status": "ok", "error": None}
+    start = time.perf_counter()
+    use_alarm = bool(timeout) and hasattr(signal, "SIGALRM")
+    if use_alarm:
+        previous = signal.signal(signal.SIGALRM, _raise_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        record.update(score_source(source, chunksize=chunksize, weights=weights,
+                                   snapshot_dir=snapshot_dir, store_path=store_path, rules=rules))
+    except ScoringTimeout:
+        record.update(status="timeout", error=f"Scoring exceeded {timeout} seconds.")
+    except Exception as e:
+        record.update(status="error", error=f"{type(e).__name__}: {e}")
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous)
+    record["elapsed_seconds"] = round(time.perf_counter() - start, 4)
+    return record
+
+
+def collect_sources(patterns: Iterable[str], manifest: Optional[str] = None) -> List[str]:
+    """
+    Expand glob patterns and manifest entries into an ordered, de-duplicated source list.
+
+    Parameters:
+        patterns (Iterable[str]): Glob patterns, file paths or URLs.
+        manifest (str, optional): File with one source per line; blank lines and '#' comments are ignored.
+
+    Returns:
+        List[str]: The sources to score.
+    """
+    entries = list(patterns)
+    if manifest:
+        with open(manifest, encoding="utf-8") as f:
+            entries += [line.strip() for line in f if line.strip() and not line.lstrip().startswith("#")]
+
+    sources = []
+    for entry in entries:
+        matches = sorted(glob.glob(entry)) if glob.has_magic(entry) else [entry]
+        sources.extend(matches)
+    return list(dict.fromkeys(sources))
+
+
+def _journal_path(output: str) -> str:
+    return output if output.endswith(".jsonl") else output + ".journal.jsonl"
+
+
+def _read_journal(path: str) -> List[Dict]:
+    records = []
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    pass  # A line cut short by a crash
+    return records
+
+
+def _write_parquet(records: List[Dict], output: str, row_group_size: int = 1000) -> None:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    latest = list({record["source"]: record for record in records}.values())
+    # One schema over every record: failed sources have no score fields, and the
+    # writer's schema is fixed for the whole file.
+    names = list(dict.fromkeys(name for record in latest for name in record))
+    schema = pa.schema([(name, pa.array([record.get(name) for record in latest]).type) for name in names])
+    tmp_path = output + ".tmp"
+    writer = None
+    try:
+        for start in range(0, len(latest), row_group_size):
+            table = pa.Table.from_pylist(latest[start:start + row_group_size], schema=schema)
+            if writer is None:
+                writer = pq.ParquetWriter(tmp_path, schema)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+    if writer is not None:
+        os.replace(tmp_path, output)
+
+
+def run_batch(sources: List[str],
+              output: str,
+              workers: Optional[int] = None,
+              timeout: Optional[float] = None,
+              resume: bool = False,
+              chunksize: Optional[int] = None,
+              weights: Optional[List[float]] = None,
+              snapshot_dir: Optional[str] = None,
+              store_path: Optional[str] = None,
+              rules: Optional[List[dict]] = None) -> Dict[str, int]:
+    """
+    Score sources on a process pool, streaming one JSON record per source as it finishes.
+
+    Results are appended to a JSONL journal (the output itself for .jsonl outputs),
+    which also lets a restarted run with resume=True skip sources already scored.
+    Sources that failed are retried on resume, so the last record per source wins.
+    If a worker process dies (e.g. killed for memory), the sources in flight on it are
+    recorded as errors and the pool is restarted for the remaining sources.
+    For .parquet outputs the journal is converted once all sources are done.
+
+    Parameters:
+        sources (List[str]): Paths or URLs to score.
+        output (str): Result file, '.jsonl' or '.parquet'.
+        workers (int, optional): Number of worker processes; defaults to the CPU count.
+        timeout (float, optional): Per-source timeout in seconds.
+        resume (bool): Keep previous results and skip sources that were scored successfully.
+        chunksize (int, optional): Profile sources in streaming mode with this many rows per chunk.
+        weights (List[float], optional): (alpha, beta, gamma) for the trust score.
+        snapshot_dir (str, optional): Directory of columnar snapshots reused across runs.
+        store_path (str, optional): SQLite profile store recording every run (see score_source).
+        rules (List[dict], optional): Declarative rules checked on every source (see score_source).
+
+    Returns:
+        Dict[str, int]: Number of records per status, plus 'skipped'.
+    """
+    journal = _journal_path(output)
+    done: Set[str] = set()
+    if resume:
+        done = {record["source"] for record in _read_journal(journal) if record.get("status") == "ok"}
+    elif os.path.exists(journal):
+        os.remove(journal)
+
+    pending = [source for source in sources if source not in done]
+    summary = {"ok": 0, "error": 0, "timeout": 0, "skipped": len(sources) - len(pending)}
+    print(f"Scoring {len(pending)} sources ({summary['skipped']} already done).", file=sys.stderr)
+
+    workers = workers or os.cpu_count() or 1
+    pool = ProcessPoolExecutor(max_workers=workers)
+    try:
+        with open(journal, "a", encoding="utf-8") as out:
+            queue = iter(pending)
+            in_flight = {}  # future -> (source, submit time, pool)
+            while True:
+                # Keep a bounded window of tasks so thousands of sources don't all queue up front.
+                for source in queue:
+                    future = pool.submit(score_task, source, timeout, chunksize, weights, snapshot_dir,
+                                         store_path, rules)
+                    in_flight[future] = (source, time.perf_counter(), pool)
+                    if len(in_flight) >= workers * 2:
+                        break
+                if not in_flight:
+                    break
+                finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                broken = False
+                for future in finished:
+                    source, submitted, owner = in_flight.pop(future)
+                    try:
+                        record = future.result()
+                    except BrokenProcessPool as e:
+                        broken = broken or owner is pool
+                        record = {"source": source, "status": "error", "error": f"{type(e).__name__}: {e}",
+                                  "elapsed_seconds": round(time.perf_counter() - submitted, 4)}
+                    out.write(json.dumps(record) + "\n")
+                    out.flush()
+                    summary[record["status"]] += 1
+                    print(f"[{record['status']}] {record['source']} ({record['elapsed_seconds']}s)", file=sys.stderr)
+                if broken:
+                    # A worker died; the pool can't run anything more, so start a new one.
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    pool = ProcessPoolExecutor(max_workers=workers)
+    finally:
+        pool.shutdown(cancel_futures=True)
+
+    if output.endswith(".parquet"):
+        _write_parquet(_read_journal(journal), output)
+    return summary
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Score many datasets without the Streamlit UI.")
+    parser.add_argument("sources", nargs="*", help="Glob patterns, file paths or URLs to score.")
+    parser.add_argument("--manifest", help="File listing one source per line.")
+    parser.add_argument("--output", required=True, help="Result file (.jsonl or .parquet).")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count).")
+    parser.add_argument("--timeout", type=float, default=None, help="Per-source timeout in seconds.")
+    parser.add_argument("--resume", action="store_true", help="Skip sources already scored in the output.")
+    parser.add_argument("--chunksize", type=int, default=None,
+                        help="Profile each source in one streaming pass with this many rows per chunk.")
+    parser.add_argument("--weights", help="Comma-separated alpha,beta,gamma for the trust score.")
+    parser.add_argument("--snapshot-dir", help="Keep columnar snapshots here so unchanged files load without reparsing.")
+    parser.add_argument("--store", help="SQLite profile store: record every run and skip re-profiling unchanged content.")
+    parser.add_argument("--rules", help="JSON file of declarative rules; their pass rate scales the trust score.")
+    args = parser.parse_args(argv)
+
+    sources = collect_sources(args.sources, args.manifest)
+    if not sources:
+        parser.error("No sources given.")
+    weights = [float(w) for w in args.weights.split(",")] if args.weights else None
+    if weights is not None and len(weights) != 3:
+        parser.error("--weights needs exactly three values.")
+    try:
+        rules = load_rules(args.rules) if args.rules else None
+        if rules:
+            RuleEngine(rules)  # Report a malformed rule here rather than once per source
+    except (OSError, ValueError) as e:
+        parser.error(f"--rules: {e}")
+
+    summary = run_batch(sources, args.output, workers=args.workers, timeout=args.timeout,
+                        resume=args.resume, chunksize=args.chunksize, weights=weights,
+                        snapshot_dir=args.snapshot_dir, store_path=args.store, rules=rules)
+    print(json.dumps(summary), file=sys.stderr)
+    return 0 if summary["error"] == 0 and summary["timeout"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,573 @@
+import argparse
+import contextlib
+import gc
+import io
+import itertools
+import json
+import os
+import platform
+import re
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import warnings
+from typing import Callable, Dict, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from analyzer_backends import get_analyzer
+from check_runner import run_checks
+from data_analyzer import DataAnalyzer
+from data_fetcher import DataFetcher
+from rule_engine import RuleEngine
+from trust_score_calculator import METRIC_COLUMNS, TrustScoreCalculator
+
+# Column kinds cycled through for each dtype mix; 'flag' columns hold Yes/No values.
+DTYPE_MIXES = {
+    "numeric": ["int", "float"],
+    "string": ["string"],
+    "mixed": ["int", "float", "string", "flag", "date"],
+}
+
+
+def generate_dataset(rows: int,
+                     columns: int = 10,
+                     null_rate: float = 0.05,
+                     dtype_mix: str = "mixed",
+                     cardinality: int = 100,
+                     seed: int = 0) -> pd.DataFrame:
+    """
+    Generate a synthetic dataset shaped like a parsed CSV.
+
+    The first column, 'id', is a unique integer key without nulls. The other columns
+    cycle through the kinds of the chosen dtype mix: 'int', 'float', 'string' (drawn
+    from `cardinality` distinct values), 'flag' (Yes/No) and 'date' (ISO date strings).
+
+    Parameters:
+        rows (int): Number of rows.
+        columns (int): Number of columns, including 'id'.
+        null_rate (float): Share of missing cells in every column except 'id'.
+        dtype_mix (str): 'numeric', 'string' or 'mixed'.
+        cardinality (int): Distinct values of each string column.
+        seed (int): Random seed.
+
+    Returns:
+        pd.DataFrame: The generated dataset.
+    """
+    if dtype_mix not in DTYPE_MIXES:
+        raise ValueError(f"Invalid dtype mix. Use one of {sorted(DTYPE_MIXES)}.")
+    rng = np.random.default_rng(seed)
+    kinds = DTYPE_MIXES[dtype_mix]
+    vocabulary = np.array([f"value-{i:x}" + "x" * (i % 7) for i in range(max(cardinality, 1))], dtype=object)
+    days = pd.date_range("2015-01-01", periods=3650, freq="D").strftime("%Y-%m-%d").to_numpy(dtype=object)
+
+    data = {"id": np.arange(rows, dtype=np.int64)}
+    for i in range(1, columns):
+        kind = kinds[(i - 1) % len(kinds)]
+        if kind == "int":
+            values = rng.integers(0, 1000, size=rows).astype(np.float64 if null_rate else np.int64)
+        elif kind == "float":
+            values = rng.normal(100.0, 15.0, size=rows)
+        elif kind == "string":
+            values = vocabulary[rng.integers(0, len(vocabulary), size=rows)]
+        elif kind == "flag":
+            values = np.where(rng.random(rows) < 0.5, "Yes", "No").astype(object)
+        else:
+            values = days[rng.integers(0, len(days), size=rows)]
+        if null_rate:
+            values = values.copy()
+            values[rng.random(rows) < null_rate] = np.nan
+        data[f"{kind}_{i}"] = values
+    return pd.DataFrame(data)
+
+
+class BenchmarkContext:
+    """Inputs shared by the benchmark cases of one scenario."""
+
+    def __init__(self, df: pd.DataFrame, csv_path: str):
+        self.df = df
+        self.csv_path = csv_path
+        self.schema = {column: str(dtype) for column, dtype in df.dtypes.items() if isinstance(dtype, np.dtype)}
+        self.text_columns = [c for c in df.columns if c.startswith(("string_", "flag_"))]
+        self.date_columns = [c for c in df.columns if c.startswith("date_")]
+        numeric = [c for c in df.columns if c.startswith(("float_", "int_"))]
+        self.numeric_column = numeric[0] if numeric else "id"
+        self.metadata = {"last_update_time": (pd.Timestamp.now() - pd.Timedelta(days=3)).isoformat()}
+        rng = np.random.default_rng(1)
+        metrics = rng.random((max(len(df), 4), 3))
+        self.training = pd.DataFrame(metrics, columns=METRIC_COLUMNS)
+        self.training["trustworthiness"] = metrics @ np.array([0.5, 0.2, 0.3]) + rng.normal(0, 0.02, len(metrics))
+        self._native = {}
+
+    def native(self, backend: str):
+        """The dataset converted once to a backend's table (see analyzer_backends)."""
+        if backend not in self._native:
+            self._native[backend] = get_analyzer(backend).to_native(self.df)
+        return self._native[backend]
+
+
+def _fetch(ctx: BenchmarkContext, **kwargs) -> Callable[[], object]:
+    return lambda: DataFetcher(ctx.csv_path).fetch_data(**kwargs)
+
+
+def _optimized_score(ctx: BenchmarkContext, solver: str) -> Callable[[], object]:
+    def run():
+        if solver == "exact":
+            from trust_score_calculator import _WEIGHTS_CACHE
+            _WEIGHTS_CACHE.clear()  # Time the fit, not a cache hit
+        return TrustScoreCalculator().calculate_trust_score(0.9, 0.8, 0.7, method="optimized", df=ctx.training,
+                                                            solver=solver)
+    return run
+
+
+def _uncached(func: Callable[[], object]) -> Callable[[], object]:
+    # Time the parsing, not a hit in the parsed-dates cache
+    def run():
+        DataAnalyzer.clear_parsed_dates()
+        return func()
+    return run
+
+
+def _backend(ctx: BenchmarkContext, backend: str, check: str) -> Callable[[], object]:
+    # A check on a backend's native table, converted before timing
+    analyzer, data = get_analyzer(backend), ctx.native(backend)
+    return lambda: BACKEND_CHECKS[check](analyzer, data, ctx)
+
+
+def _many_rules(ctx: BenchmarkContext, per_column: int = 8) -> List[dict]:
+    # Several rules of each kind on every column, as a large declarative rule set would have
+    rules = []
+    for column in ctx.df.columns:
+        for i in range(per_column):
+            name = f"{column}-{i}"
+            if column == "id" or column.startswith(("int_", "float_")):
+                rules.append({"name": name, "type": "range", "column": column, "min": 10 * i, "max": 900 - i})
+            elif column.startswith("date_"):
+                rules.append({"name": name, "type": "compare", "left": column, "op": ">=",
+                              "value": f"{2015 + i}-01-01", "as": "date"})
+            elif i % 2:
+                rules.append({"name": name, "type": "regex", "column": column, "pattern": f"value-[0-{i}a-f]+x*"})
+            else:
+                rules.append({"name": name, "type": "allowed", "column": column,
+                              "values": ["Yes", "No"] + [f"value-{j:x}" for j in range(i * 8)]})
+    numeric = [c for c in ctx.df.columns if c.startswith(("int_", "float_"))]
+    for left, right in zip(numeric, numeric[1:]):
+        rules.append({"name": f"{left}<={right}", "type": "compare", "left": left, "op": "<=", "right": right})
+    return rules
+
+
+def _all_checks(ctx: BenchmarkContext, mode: str) -> Callable[[], object]:
+    return lambda: run_checks(ctx.df, mode=mode, metadata=ctx.metadata, expected_schema=ctx.schema,
+                              key_columns=["id"], text_columns=ctx.text_columns, date_columns=ctx.date_columns,
+                              distribution_column=ctx.numeric_column)
+
+
+# Benchmark name -> factory returning the call to time for a scenario.
+CASES: Dict[str, Callable[[BenchmarkContext], Callable[[], object]]] = {
+    "DataAnalyzer.schema_validation": lambda ctx: lambda: DataAnalyzer.schema_validation(ctx.df, ctx.schema),
+    "DataAnalyzer.detect_outliers": lambda ctx: lambda: DataAnalyzer.detect_outliers(ctx.df),
+    "DataAnalyzer.outlier_bounds": lambda ctx: lambda: DataAnalyzer.outlier_bounds(ctx.df),
+    "DataAnalyzer.outlier_mask": lambda ctx: lambda: DataAnalyzer.outlier_mask(ctx.df),
+    "DataAnalyzer.integrity_checks": lambda ctx: lambda: DataAnalyzer.integrity_checks(ctx.df, ["id"]),
+    "DataAnalyzer.integrity_report": lambda ctx: lambda: DataAnalyzer.integrity_report(
+        ctx.df, ["id", ctx.text_columns[0]] if ctx.text_columns else ["id"],
+        foreign_keys=[(["id"], ctx.df.iloc[::2], ["id"])]),
+    "DataAnalyzer.statistical_summary": lambda ctx: lambda: DataAnalyzer.statistical_summary(ctx.df),
+    "DataAnalyzer.validate_distribution": lambda ctx: lambda: DataAnalyzer.validate_distribution(
+        ctx.df, ctx.numeric_column),
+    "DataAnalyzer.validate_distributions": lambda ctx: lambda: DataAnalyzer.validate_distributions(ctx.df),
+    "DataAnalyzer.validate_distributions[uniform]": lambda ctx: lambda: DataAnalyzer.validate_distributions(
+        ctx.df, expected_distribution='uniform'),
+    "DataAnalyzer.text_data_analysis": lambda ctx: lambda: DataAnalyzer.text_data_analysis(ctx.df, ctx.text_columns),
+    "DataAnalyzer.text_data_analysis[categorical]": lambda ctx: lambda: DataAnalyzer.text_data_analysis(
+        ctx.df[ctx.text_columns].astype("category"), ctx.text_columns),
+    "DataAnalyzer.temporal_validation": lambda ctx: _uncached(lambda: DataAnalyzer.temporal_validation(
+        ctx.df, ctx.date_columns)),
+    "DataAnalyzer.infer_date_format": lambda ctx: lambda: [DataAnalyzer.infer_date_format(ctx.df[column])
+                                                          for column in ctx.date_columns],
+    "DataAnalyzer.parse_dates": lambda ctx: _uncached(lambda: [DataAnalyzer.parse_dates(ctx.df, column)
+                                                               for column in ctx.date_columns]),
+    "DataAnalyzer.temporal_consistency_checks": lambda ctx: _uncached(lambda: [
+        DataAnalyzer.temporal_consistency_checks(ctx.df, column, max_gap="7D") for column in ctx.date_columns]),
+    "DataAnalyzer.multivariate_analysis": lambda ctx: lambda: DataAnalyzer.multivariate_analysis(ctx.df),
+    "DataAnalyzer.multivariate_analysis[tiled]": lambda ctx: lambda: DataAnalyzer.multivariate_analysis(
+        ctx.df, tile_size=256),
+    "DataAnalyzer.multivariate_analysis[top-k]": lambda ctx: lambda: DataAnalyzer.multivariate_analysis(
+        ctx.df, top_k=20),
+    "DataAnalyzer.context_specific_checks": lambda ctx: lambda: DataAnalyzer.context_specific_checks(
+        ctx.df, "finance"),
+    "RuleEngine.update[many rules]": lambda ctx: lambda: RuleEngine(_many_rules(ctx)).update(ctx.df).report(),
+    "DataAnalyzer.calculate_completeness_score": lambda ctx: lambda: DataAnalyzer.calculate_completeness_score(
+        ctx.df),
+    "DataAnalyzer.calculate_update_score": lambda ctx: lambda: DataAnalyzer.calculate_update_score(ctx.metadata),
+    "DataAnalyzer.calculate_metadata_quality_score": lambda ctx: lambda: (
+        DataAnalyzer.calculate_metadata_quality_score(ctx.df)),
+    "DataAnalyzer.sampled_analysis": lambda ctx: lambda: DataAnalyzer.sampled_analysis(
+        DataFetcher(ctx.csv_path), time_budget=2.0, seed=0),
+    "run_checks[serial]": lambda ctx: _all_checks(ctx, "serial"),
+    "run_checks[thread]": lambda ctx: _all_checks(ctx, "thread"),
+    "run_checks[auto]": lambda ctx: _all_checks(ctx, "auto"),
+    "DataFetcher.fetch_data": lambda ctx: _fetch(ctx),
+    "DataFetcher.fetch_data[compact]": lambda ctx: _fetch(ctx, compact=True),
+    "TrustScoreCalculator.calculate_trust_score[default]": lambda ctx: lambda: (
+        TrustScoreCalculator().calculate_trust_score(0.9, 0.8, 0.7, method="default")),
+    "TrustScoreCalculator.calculate_trust_score[optimized-exact]": lambda ctx: _optimized_score(ctx, "exact"),
+    "TrustScoreCalculator.calculate_trust_score[optimized-slsqp]": lambda ctx: _optimized_score(ctx, "slsqp"),
+}
+
+# The checks analyzer_backends runs on Arrow and Polars, timed against the DataAnalyzer cases above.
+BACKEND_CHECKS: Dict[str, Callable[[object, object, BenchmarkContext], object]] = {
+    "calculate_completeness_score": lambda analyzer, data, ctx: analyzer.calculate_completeness_score(data),
+    "statistical_summary": lambda analyzer, data, ctx: analyzer.statistical_summary(data),
+    "outlier_mask": lambda analyzer, data, ctx: analyzer.outlier_mask(data),
+    "integrity_checks": lambda analyzer, data, ctx: analyzer.integrity_checks(data, ["id"]),
+    "text_data_analysis": lambda analyzer, data, ctx: analyzer.text_data_analysis(data, ctx.text_columns),
+    "temporal_validation": lambda analyzer, data, ctx: analyzer.temporal_validation(data, ctx.date_columns),
+    "multivariate_analysis": lambda analyzer, data, ctx: analyzer.multivariate_analysis(data),
+    "calculate_metadata_quality_score": lambda analyzer, data, ctx: analyzer.calculate_metadata_quality_score(data),
+}
+
+
+def available_backends() -> List[str]:
+    """The analyzer_backends engines installed here, besides pandas."""
+    backends = ["arrow"]
+    try:
+        get_analyzer("polars")
+        backends.append("polars")
+    except ImportError:
+        pass
+    return backends
+
+
+def _add_backend_cases() -> None:
+    for backend in available_backends():
+        prefix = {"arrow": "ArrowAnalyzer", "polars": "PolarsAnalyzer"}[backend]
+        CASES[f"{prefix}.to_native"] = lambda ctx, backend=backend: lambda: get_analyzer(backend).to_native(ctx.df)
+        for check in BACKEND_CHECKS:
+            CASES[f"{prefix}.{check}"] = lambda ctx, backend=backend, check=check: _backend(ctx, backend, check)
+
+
+_add_backend_cases()
+
+
+def uncovered_methods() -> List[str]:
+    """Public DataAnalyzer methods without a benchmark case."""
+    covered = {name.split("[")[0] for name in CASES}
+    return [f"DataAnalyzer.{name}" for name in dir(DataAnalyzer)
+            if not name.startswith("_") and callable(getattr(DataAnalyzer, name))
+            and f"DataAnalyzer.{name}" not in covered]
+
+
+def measure(func: Callable[[], object], repeat: int = 3) -> Dict[str, float]:
+    """
+    Time a call (best of `repeat`) and measure its peak traced allocation in a separate run,
+    since tracing slows Python code down.
+
+    Parameters:
+        func (Callable[[], object]): The call to measure.
+        repeat (int): Timed runs.
+
+    Returns:
+        Dict[str, float]: 'seconds' (fastest run) and 'peak_bytes' (above the memory in use before the call).
+    """
+    times = []
+    for _ in range(max(repeat, 1)):
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"seconds": min(times), "peak_bytes": max(peak - before, 0)}
+
+
+def scenarios(rows: List[int], columns: List[int], null_rates: List[float], dtype_mixes: List[str],
+              cardinalities: List[int]) -> Iterator[Dict[str, object]]:
+    for r, c, n, m, k in itertools.product(rows, columns, null_rates, dtype_mixes, cardinalities):
+        yield {"rows": r, "columns": c, "null_rate": n, "dtype_mix": m, "cardinality": k}
+
+
+def scenario_key(params: Dict[str, object]) -> str:
+    return ",".join(f"{name}={params[name]}" for name in ("rows", "columns", "null_rate", "dtype_mix", "cardinality"))
+
+
+def write_csv(path: str, params: Dict[str, object], chunk_rows: int = 1_000_000) -> None:
+    # Written in chunks so that files far larger than the in-memory frame can be produced.
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        for i, start in enumerate(range(0, max(params["rows"], 1), chunk_rows)):
+            n = min(chunk_rows, params["rows"] - start)
+            chunk = generate_dataset(n, params["columns"], params["null_rate"], params["dtype_mix"],
+                                     params["cardinality"], seed=i)
+            chunk["id"] += start
+            chunk.to_csv(f, index=False, header=(i == 0))
+
+
+def run_benchmarks(grid: List[Dict[str, object]], repeat: int = 3, only: Optional[str] = None) -> List[dict]:
+    """
+    Run every benchmark case for every scenario of the grid.
+
+    Parameters:
+        grid (List[Dict[str, object]]): Scenario parameters (see generate_dataset).
+        repeat (int): Timed runs per case.
+        only (str, optional): Regular expression selecting benchmark names.
+
+    Returns:
+        List[dict]: One record per benchmark and scenario with 'seconds' and 'peak_bytes',
+                    or 'error' if the call raised.
+    """
+    results = []
+    names = [name for name in CASES if not only or re.search(only, name)]
+    with tempfile.TemporaryDirectory() as tmp:
+        # Warm up on a tiny scenario so first-call costs (lazy imports, caches) aren't timed.
+        warmup_path = os.path.join(tmp, "warmup.csv")
+        warmup = dict(grid[0], rows=100) if grid else None
+        if warmup:
+            write_csv(warmup_path, warmup)
+            ctx = BenchmarkContext(generate_dataset(100, warmup["columns"], warmup["null_rate"],
+                                                    warmup["dtype_mix"], warmup["cardinality"]), warmup_path)
+            for name in names:
+                with contextlib.redirect_stdout(io.StringIO()), warnings.catch_warnings():
+                    warnings.simplefilter("ignore")
+                    with contextlib.suppress(Exception):
+                        CASES[name](ctx)()
+
+        for params in grid:
+            key = scenario_key(params)
+            print(f"Scenario {key}", file=sys.stderr)
+            csv_path = os.path.join(tmp, "dataset.csv")
+            write_csv(csv_path, params)
+            ctx = BenchmarkContext(generate_dataset(params["rows"], params["columns"], params["null_rate"],
+                                                    params["dtype_mix"], params["cardinality"]), csv_path)
+            for name in names:
+                record = {"benchmark": name, "scenario": key, "params": params}
+                try:
+                    # Checks print their findings; keep the report readable.
+                    with contextlib.redirect_stdout(io.StringIO()), warnings.catch_warnings():
+                        warnings.simplefilter("ignore")
+                        record.update(measure(CASES[name](ctx), repeat))
+                except Exception as e:
+                    record["error"] = f"{type(e).__name__}: {e}"
+                results.append(record)
+                status = record.get("error") or f"{record['seconds'] * 1000:10.2f} ms {record['peak_bytes'] / 2 ** 20:9.1f} MiB"
+                print(f"  {name:62s} {status}", file=sys.stderr)
+            del ctx
+            gc.collect()
+    return results
+
+
+# Modules that batch workers, the scoring service and the Streamlit app import at startup,
+# and dependencies that importing them must leave for the checks that need them.
+IMPORT_MODULES = ["data_fetcher", "data_analyzer", "trust_score_calculator", "streaming_profiler",
+                  "check_runner", "batch_score", "scoring_service"]
+DEFERRED_IMPORTS = ["scipy", "sklearn", "requests", "streamlit"]
+
+
+def _import_run(statement: str, deferred: Optional[List[str]] = None) -> subprocess.CompletedProcess:
+    deferred = DEFERRED_IMPORTS if deferred is None else deferred
+    probe = f"{statement}; import sys; print(sorted(m for m in {deferred!r} if m in sys.modules))"
+    return subprocess.run([sys.executable, "-X", "importtime", "-c", probe], capture_output=True, text=True,
+                          cwd=os.path.dirname(os.path.abspath(__file__)))
+
+
+def _cumulative_seconds(importtime: str, module: str) -> Optional[float]:
+    # -X importtime lines: "import time: <self us> | <cumulative us> | <indented module name>"
+    for line in importtime.splitlines():
+        parts = line.split("|")
+        if len(parts) == 3 and parts[2].strip() == module:
+            return int(parts[1]) / 1e6
+    return None
+
+
+def import_times(modules: Optional[List[str]] = None, runs: int = 3,
+                 deferred: Optional[List[str]] = None) -> List[dict]:
+    """
+    Measure the import of each module in fresh interpreters with python -X importtime.
+
+    Parameters:
+        modules (List[str], optional): Modules to import; defaults to IMPORT_MODULES.
+        runs (int): Interpreters started per module (the fastest counts).
+        deferred (List[str], optional): Modules to look for after the import; defaults to DEFERRED_IMPORTS.
+
+    Returns:
+        List[dict]: Per module: 'seconds' (cumulative import time), 'overhead_seconds'
+                    (beyond importing pandas alone), 'deferred' (the deferred modules
+                    that the import loaded) and 'output' (anything it printed), or 'error'.
+    """
+    pandas_seconds = min(_cumulative_seconds(_import_run("import pandas").stderr, "pandas") or 0.0
+                         for _ in range(max(runs, 1)))
+    records = []
+    for module in modules or IMPORT_MODULES:
+        record = {"module": module}
+        timings = []
+        for _ in range(max(runs, 1)):
+            run = _import_run(f"import {module}", deferred)
+            if run.returncode != 0:
+                record["error"] = run.stderr.strip().splitlines()[-1]
+                break
+            timings.append(_cumulative_seconds(run.stderr, module))
+            output = run.stdout.strip().splitlines()
+            record["deferred"] = json.loads(output[-1].replace("'", '"'))
+            record["output"] = "\n".join(output[:-1])
+        if "error" not in record:
+            record["seconds"] = min(timings)
+            record["overhead_seconds"] = max(record["seconds"] - pandas_seconds, 0.0)
+        records.append(record)
+    return records
+
+
+def check_import_budget(budget_seconds: float, modules: Optional[List[str]] = None, runs: int = 3) -> List[dict]:
+    """
+    Import-time budget check: importing a module may take at most budget_seconds on top
+    of pandas, must not load any of DEFERRED_IMPORTS and must not print anything.
+
+    Returns:
+        List[dict]: The import_times records with a 'status' of 'ok', 'slow',
+                    'eager-import', 'side-effect' or 'error'.
+    """
+    records = import_times(modules, runs)
+    for record in records:
+        if "error" in record:
+            record["status"] = "error"
+        elif record["output"]:
+            record["status"] = "side-effect"
+        elif record["deferred"]:
+            record["status"] = "eager-import"
+        elif record["overhead_seconds"] > budget_seconds:
+            record["status"] = "slow"
+        else:
+            record["status"] = "ok"
+    return records
+
+
+def environment() -> Dict[str, str]:
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cpus": str(os.cpu_count()),
+        "created": pd.Timestamp.now().isoformat(timespec="seconds"),
+    }
+
+
+def compare(results: List[dict], baseline: List[dict], tolerance: float = 0.25, memory_tolerance: float = 0.25,
+            min_seconds: float = 0.005) -> List[dict]:
+    """
+    Compare results with a baseline run.
+
+    A benchmark regresses when it is more than `tolerance` slower (and slower by at least
+    `min_seconds`, to ignore timer noise on tiny calls) or uses more than `memory_tolerance`
+    more peak memory (and at least 1 MiB more).
+
+    Parameters:
+        results (List[dict]): Records from run_benchmarks.
+        baseline (List[dict]): Records of the baseline file.
+        tolerance (float): Allowed relative slowdown.
+        memory_tolerance (float): Allowed relative growth of peak memory.
+        min_seconds (float): Smallest absolute slowdown counted as a regression.
+
+    Returns:
+        List[dict]: Per benchmark and scenario, the two measurements, their ratios and a
+                    'status' of 'ok', 'regression', 'improvement', 'new' or 'error'.
+    """
+    previous = {(r["benchmark"], r["scenario"]): r for r in baseline}
+    comparison = []
+    for record in results:
+        old = previous.get((record["benchmark"], record["scenario"]))
+        row = {"benchmark": record["benchmark"], "scenario": record["scenario"]}
+        if "error" in record:
+            row["status"] = "error"
+        elif old is None or "error" in old:
+            row["status"] = "new"
+        else:
+            time_ratio = record["seconds"] / max(old["seconds"], 1e-9)
+            memory_ratio = (record["peak_bytes"] + 1) / (old["peak_bytes"] + 1)
+            slower = time_ratio > 1 + tolerance and record["seconds"] - old["seconds"] >= min_seconds
+            bigger = memory_ratio > 1 + memory_tolerance and record["peak_bytes"] - old["peak_bytes"] >= 2 ** 20
+            faster = time_ratio < 1 / (1 + tolerance) and old["seconds"] - record["seconds"] >= min_seconds
+            row.update(seconds=record["seconds"], baseline_seconds=old["seconds"], time_ratio=round(time_ratio, 3),
+                       peak_bytes=record["peak_bytes"], baseline_peak_bytes=old["peak_bytes"],
+                       memory_ratio=round(memory_ratio, 3))
+            row["status"] = "regression" if slower or bigger else "improvement" if faster else "ok"
+        comparison.append(row)
+    return comparison
+
+
+def _parse_list(text: str, cast) -> list:
+    return [cast(float(v)) if cast is int else cast(v) for v in text.split(",") if v]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the checks on synthetic datasets.")
+    parser.add_argument("--rows", default="1e3,1e4,1e5",
+                        help="Comma-separated row counts, e.g. 1e3,1e5,1e7 (up to 1e8 with enough memory).")
+    parser.add_argument("--columns", default="10", help="Comma-separated column counts.")
+    parser.add_argument("--null-rate", default="0.05", help="Comma-separated shares of missing cells.")
+    parser.add_argument("--dtype-mix", default="mixed", help=f"Comma-separated mixes: {', '.join(DTYPE_MIXES)}.")
+    parser.add_argument("--cardinality", default="100", help="Comma-separated distinct values per string column.")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per benchmark (the fastest counts).")
+    parser.add_argument("--only", help="Regular expression selecting benchmark names.")
+    parser.add_argument("--output", help="Write the results to this JSON file, e.g. to use as a baseline.")
+    parser.add_argument("--compare", help="Baseline JSON file to compare against; regressions exit with status 1.")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative slowdown (default 0.25).")
+    parser.add_argument("--memory-tolerance", type=float, default=0.25,
+                        help="Allowed relative growth of peak memory (default 0.25).")
+    parser.add_argument("--import-budget", type=float, default=None,
+                        help="Instead of benchmarking, check that each startup module imports within this many "
+                             "milliseconds beyond pandas, without side effects or deferred heavy dependencies.")
+    args = parser.parse_args(argv)
+
+    if args.import_budget is not None:
+        records = check_import_budget(args.import_budget / 1000, runs=args.repeat)
+        for record in records:
+            detail = record.get("error") or (f"{record['seconds'] * 1000:8.1f} ms "
+                                             f"(+{record['overhead_seconds'] * 1000:.1f} ms over pandas)")
+            if record.get("deferred"):
+                detail += f" loads {', '.join(record['deferred'])}"
+            if record.get("output"):
+                detail += f" prints {record['output'][:60]!r}"
+            print(f"{record['status'].upper():12s} {record['module']:28s} {detail}")
+        return 0 if all(record["status"] == "ok" for record in records) else 1
+
+    grid = list(scenarios(_parse_list(args.rows, int), _parse_list(args.columns, int),
+                          _parse_list(args.null_rate, float), _parse_list(args.dtype_mix, str),
+                          _parse_list(args.cardinality, int)))
+    for name in uncovered_methods():
+        print(f"Warning: {name} has no benchmark case.", file=sys.stderr)
+
+    results = run_benchmarks(grid, repeat=args.repeat, only=args.only)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"environment": environment(), "results": results}, f, indent=1)
+
+    if not args.compare:
+        return 1 if any("error" in r for r in results) else 0
+    with open(args.compare, encoding="utf-8") as f:
+        baseline = json.load(f)
+    comparison = compare(results, baseline["results"], args.tolerance, args.memory_tolerance)
+    if baseline.get("environment", {}).get("platform") != platform.platform():
+        print("Warning: the baseline was recorded on a different platform.", file=sys.stderr)
+    for row in comparison:
+        if row["status"] in ("regression", "improvement"):
+            print(f"{row['status'].upper():12s} {row['benchmark']} [{row['scenario']}] "
+                  f"time x{row['time_ratio']} memory x{row['memory_ratio']}")
+        elif row["status"] == "error":
+            print(f"ERROR        {row['benchmark']} [{row['scenario']}]")
+    counts = pd.Series([row["status"] for row in comparison]).value_counts().to_dict()
+    print(json.dumps(counts))
+    return 1 if counts.get("regression") or counts.get("error") else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
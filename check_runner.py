@@ -0,0 +1,327 @@
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from data_analyzer import DataAnalyzer
+
+
+class Check:
+    """
+    One DataAnalyzer check in a plan: the method to call on the frame and its keyword arguments.
+
+    gil_bound marks checks whose time is spent in Python-level loops over object values
+    (type inspection, date parsing); these only overlap with other checks when they run
+    in a separate process.
+    """
+
+    def __init__(self, name: str, method: str, kwargs: Optional[dict] = None,
+                 uses_frame: bool = True, gil_bound: bool = False):
+        self.name = name
+        self.method = method
+        self.kwargs = dict(kwargs or {})
+        self.uses_frame = uses_frame
+        self.gil_bound = gil_bound
+
+    def run(self, df: pd.DataFrame):
+        method = getattr(DataAnalyzer, self.method)
+        return method(df, **self.kwargs) if self.uses_frame else method(**self.kwargs)
+
+    def __repr__(self) -> str:
+        return f"Check({self.name!r}, {self.method!r})"
+
+
+class CheckReport:
+    """
+    Results of a run_checks call: one entry per check in results (or errors, if it
+    raised), the wall time of each check, and the wall time of the whole run.
+    """
+
+    def __init__(self, mode: str):
+        self.mode = mode
+        self.results: Dict[str, object] = {}
+        self.errors: Dict[str, str] = {}
+        self.seconds: Dict[str, float] = {}
+        self.executors: Dict[str, str] = {}
+        self.wall_seconds = 0.0
+
+    def __getitem__(self, name: str):
+        return self.results[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.results
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    @property
+    def serial_seconds(self) -> float:
+        """Sum of the per-check times, i.e. roughly what a sequential run would take."""
+        return float(sum(self.seconds.values()))
+
+    def timings(self) -> pd.DataFrame:
+        """
+        Per-check timings, slowest first.
+
+        Returns:
+            pd.DataFrame: seconds, executor ('thread', 'process' or 'serial') and ok per check.
+        """
+        timings = pd.DataFrame({
+            "seconds": pd.Series(self.seconds, dtype=float),
+            "executor": pd.Series(self.executors, dtype=object),
+        })
+        timings["ok"] = [name not in self.errors for name in timings.index]
+        return timings.sort_values("seconds", ascending=False)
+
+    def to_dict(self) -> dict:
+        return {
+            "mode": self.mode,
+            "wall_seconds": self.wall_seconds,
+            "serial_seconds": self.serial_seconds,
+            "results": dict(self.results),
+            "errors": dict(self.errors),
+            "seconds": dict(self.seconds),
+        }
+
+
+def build_plan(df: pd.DataFrame,
+               metadata: Optional[dict] = None,
+               expected_schema: Optional[Dict[str, str]] = None,
+               key_columns: Optional[List[str]] = None,
+               text_columns: Optional[List[str]] = None,
+               date_columns: Optional[List[str]] = None,
+               distribution_column: Optional[str] = None,
+               expected_distribution: str = 'normal',
+               outlier_method: str = 'IQR',
+               column_descriptions=None) -> List[Check]:
+    """
+    List the checks that apply to a frame. None of them depends on another's result, so
+    they can run in any order or all at once.
+
+    Checks that need an input which was not given (a schema, key columns, date columns,
+    a distribution column, metadata) are left out. Text columns default to the frame's
+    object and string columns.
+
+    Parameters:
+        df (pd.DataFrame): The dataset to check.
+        metadata (dict, optional): Metadata for the update score.
+        expected_schema (Dict[str, str], optional): Schema for schema_validation.
+        key_columns (List[str], optional): Columns for integrity_checks.
+        text_columns (List[str], optional): Columns for text_data_analysis.
+        date_columns (List[str], optional): Columns for temporal_validation.
+        distribution_column (str, optional): Column for validate_distribution.
+        expected_distribution (str): 'normal' or 'uniform'.
+        outlier_method (str): 'IQR' or 'zscore'.
+        column_descriptions (optional): Passed to calculate_metadata_quality_score.
+
+    Returns:
+        List[Check]: The plan.
+    """
+    if text_columns is None:
+        text_columns = [column for column in df.columns
+                        if pd.api.types.is_object_dtype(df[column].dtype)
+                        or pd.api.types.is_string_dtype(df[column].dtype)]
+    plan = []
+    if expected_schema:
+        plan.append(Check("schema", "schema_validation", {"expected_schema": expected_schema}))
+    plan.append(Check("outliers", "detect_outliers", {"method": outlier_method}))
+    if key_columns:
+        plan.append(Check("integrity", "integrity_checks", {"key_columns": list(key_columns)}))
+    plan.append(Check("summary", "statistical_summary"))
+    if distribution_column is not None:
+        plan.append(Check("distribution", "validate_distribution",
+                          {"column": distribution_column, "expected_distribution": expected_distribution}))
+    if text_columns:
+        plan.append(Check("text", "text_data_analysis", {"text_columns": list(text_columns)}))
+    if date_columns:
+        plan.append(Check("temporal", "temporal_validation", {"date_columns": list(date_columns)}, gil_bound=True))
+    plan.append(Check("correlation", "multivariate_analysis"))
+    plan.append(Check("completeness_score", "calculate_completeness_score"))
+    if metadata is not None:
+        plan.append(Check("update_score", "calculate_update_score", {"metadata": metadata}, uses_frame=False))
+    plan.append(Check("metadata_quality_score", "calculate_metadata_quality_score",
+                      {"column_descriptions": column_descriptions}, gil_bound=True))
+    return plan
+
+
+def _timed(check: Check, df: Optional[pd.DataFrame] = None):
+    # Runs in the worker; returns (result, error, seconds) so one failing check
+    # doesn't take the others down with it.
+    frame = _WORKER_FRAME if df is None else df
+    started = time.perf_counter()
+    try:
+        return check.run(frame), None, time.perf_counter() - started
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}", time.perf_counter() - started
+
+
+# Shared memory layout of a frame
+
+def _share_frame(df: pd.DataFrame):
+    """
+    Copy the frame's numeric, boolean and datetime columns into shared memory blocks.
+    Other columns (object, string, categorical) can't be viewed in place from another
+    process and are pickled into the layout instead.
+
+    Returns:
+        (List[SharedMemory], dict): The blocks (to close and unlink when done) and the
+                                    layout workers rebuild the frame from.
+    """
+    blocks, columns = [], []
+    for position in range(df.shape[1]):
+        column = df.iloc[:, position]
+        if isinstance(column.dtype, np.dtype) and column.dtype.kind in "biufcmM" and len(column):
+            values = column.to_numpy()
+            block = SharedMemory(create=True, size=values.nbytes)
+            np.ndarray(values.shape, dtype=values.dtype, buffer=block.buf)[:] = values
+            blocks.append(block)
+            columns.append(("shared", block.name, values.dtype.str, len(values)))
+        else:
+            columns.append(("pickled", column))
+    return blocks, {"names": list(df.columns), "index": df.index, "columns": columns}
+
+
+def _attach(name: str) -> SharedMemory:
+    # Workers share the parent's resource tracker, so attaching only re-registers a block
+    # the parent already tracks; the parent unlinks it once the pool is done.
+    if sys.version_info >= (3, 13):
+        return SharedMemory(name=name, track=False)
+    return SharedMemory(name=name)
+
+
+_WORKER_FRAME = None
+_WORKER_BLOCKS: List[SharedMemory] = []
+
+
+def _load_frame(layout: dict) -> None:
+    # Process pool initializer: view the shared columns in place, once per worker.
+    global _WORKER_FRAME
+    data = {}
+    for position, column in enumerate(layout["columns"]):
+        if column[0] == "shared":
+            _, name, dtype, length = column
+            block = _attach(name)
+            _WORKER_BLOCKS.append(block)
+            data[position] = np.ndarray((length,), dtype=np.dtype(dtype), buffer=block.buf)
+        else:
+            data[position] = column[1].array
+    frame = pd.DataFrame(data, copy=False)
+    frame.index = layout["index"]
+    frame.columns = layout["names"]
+    _WORKER_FRAME = frame
+
+
+def run_checks(df: pd.DataFrame,
+               plan: Optional[List[Check]] = None,
+               mode: str = 'auto',
+               max_workers: Optional[int] = None,
+               process_min_rows: int = 200_000,
+               **plan_options) -> CheckReport:
+    """
+    Run independent DataAnalyzer checks on one frame concurrently.
+
+    Modes:
+        'thread': every check on a thread pool. numpy and most of pandas' numeric kernels
+                  release the GIL, so numeric checks overlap.
+        'process': every check on a process pool; the workers view the numeric columns
+                   through shared memory instead of each receiving a copy.
+        'auto': GIL-bound checks (see Check.gil_bound) on a process pool and the rest on a
+                thread pool, both at once. Frames with fewer than process_min_rows rows,
+                and machines with a single CPU, use threads only, since starting
+                processes would cost more than it saves.
+        'serial': one after another in the calling thread (for comparison).
+
+    Parameters:
+        df (pd.DataFrame): The dataset to check.
+        plan (List[Check], optional): Checks to run; defaults to build_plan(df, **plan_options).
+        mode (str): 'auto', 'thread', 'process' or 'serial'.
+        max_workers (int, optional): Workers per pool; defaults to one per check, capped at the CPU count.
+        process_min_rows (int): Smallest frame for which 'auto' starts processes.
+        **plan_options: Passed to build_plan.
+
+    Returns:
+        CheckReport: Results, errors and timings of all checks.
+    """
+    if mode not in ('auto', 'thread', 'process', 'serial'):
+        raise ValueError("Invalid mode. Use 'auto', 'thread', 'process' or 'serial'.")
+    if plan is None:
+        plan = build_plan(df, **plan_options)
+    report = CheckReport(mode)
+    started = time.perf_counter()
+
+    if mode == 'serial':
+        for check in plan:
+            outcome = _timed(check, df)
+            _record(report, check, outcome, 'serial')
+        report.wall_seconds = time.perf_counter() - started
+        return report
+
+    cpus = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1
+    workers = max_workers or cpus
+    if mode == 'process' or (mode == 'auto' and len(df) >= process_min_rows and workers > 1):
+        in_process = [check for check in plan if mode == 'process' or check.gil_bound]
+    else:
+        in_process = []
+    in_threads = [check for check in plan if check not in in_process]
+
+    blocks = []
+    thread_pool = process_pool = None
+    try:
+        futures = {}
+        if in_process:
+            blocks, layout = _share_frame(df)
+            process_pool = ProcessPoolExecutor(max_workers=min(workers, len(in_process)),
+                                               initializer=_load_frame, initargs=(layout,))
+            for check in in_process:
+                futures[process_pool.submit(_timed, check)] = (check, 'process')
+        if in_threads:
+            thread_pool = ThreadPoolExecutor(max_workers=min(workers, len(in_threads)))
+            for check in in_threads:
+                futures[thread_pool.submit(_timed, check, df)] = (check, 'thread')
+        for future in as_completed(futures):
+            check, executor = futures[future]
+            try:
+                outcome = future.result()
+            except Exception as e:  # e.g. a worker process died or the result couldn't be pickled
+                outcome = (None, f"{type(e).__name__}: {e}", float('nan'))
+            _record(report, check, outcome, executor)
+    finally:
+        for pool in (thread_pool, process_pool):
+            if pool is not None:
+                pool.shutdown()
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+    report.wall_seconds = time.perf_counter() - started
+    return report
+
+
+def _record(report: CheckReport, check: Check, outcome: tuple, executor: str) -> None:
+    result, error, seconds = outcome
+    if error is None:
+        report.results[check.name] = result
+    else:
+        print(f"Check {check.name} failed: {error}")
+        report.errors[check.name] = error
+    report.seconds[check.name] = seconds
+    report.executors[check.name] = executor
+
+
+# Example usage (replace with your actual dataset URL)
+if __name__ == "__main__":
+    from data_fetcher import DataFetcher
+
+    df, metadata = DataFetcher("shopping_trends.csv").fetch_data()
+    report = run_checks(df, metadata=metadata, key_columns=["Customer ID"],
+                        distribution_column="Age", expected_distribution='uniform')
+    print(report.timings())
+    print(f"Wall time: {report.wall_seconds:.3f}s (sum of checks: {report.serial_seconds:.3f}s)")
+    print("Trust score inputs:", report["completeness_score"], report["update_score"],
+          report["metadata_quality_score"])
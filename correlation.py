@@ -0,0 +1,352 @@
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+def _numeric(df: pd.DataFrame) -> pd.DataFrame:
+    return df.select_dtypes(include=[np.number])
+
+
+def _as_matrix(numeric_df: pd.DataFrame, shift: np.ndarray, dtype) -> np.ndarray:
+    """
+    Column-major copy of the numeric columns minus a per-column shift, in the compute
+    dtype. Missing values stay NaN. Shifting by (roughly) the mean first keeps float32
+    products accurate.
+    """
+    values = np.empty(numeric_df.shape, dtype=dtype, order='F')
+    for position in range(numeric_df.shape[1]):
+        column = numeric_df.iloc[:, position].to_numpy(dtype=np.float64, na_value=np.nan)
+        values[:, position] = column - shift[position]
+    return values
+
+
+def _column_means(numeric_df: pd.DataFrame) -> np.ndarray:
+    return np.nan_to_num(numeric_df.mean().to_numpy(dtype=np.float64))
+
+
+def _tiles(columns: int, tile_size: int) -> List[slice]:
+    return [slice(start, min(start + tile_size, columns)) for start in range(0, columns, tile_size)]
+
+
+def _tile_moments(values: np.ndarray, a: slice, b: slice, row_block: int) -> Tuple[np.ndarray, ...]:
+    """
+    Pairwise-complete co-moments of column tiles a and b, accumulated in float64 over
+    blocks of rows whose products are computed in the matrix's dtype.
+
+    Returns:
+        (n, sa, sb, c, qa, qb): For each pair (i in a, j in b), over the rows where both
+        are present: the row count, the sums of i and of j, the sum of i*j, and the sums
+        of i**2 and of j**2.
+    """
+    shape = (a.stop - a.start, b.stop - b.start)
+    n, sa, sb, c, qa, qb = (np.zeros(shape) for _ in range(6))
+    for start in range(0, len(values), row_block):
+        xa = values[start:start + row_block, a]
+        xb = values[start:start + row_block, b]
+        present_a, present_b = ~np.isnan(xa), ~np.isnan(xb)
+        if present_a.all() and present_b.all():
+            # No missing values: the masked products reduce to column sums.
+            n += len(xa)
+            sa += xa.sum(axis=0, dtype=np.float64)[:, None]
+            sb += xb.sum(axis=0, dtype=np.float64)[None, :]
+            qa += np.square(xa).sum(axis=0, dtype=np.float64)[:, None]
+            qb += np.square(xb).sum(axis=0, dtype=np.float64)[None, :]
+            c += xa.T @ xb
+            continue
+        xa, xb = np.where(present_a, xa, 0), np.where(present_b, xb, 0)
+        present_a, present_b = present_a.astype(values.dtype), present_b.astype(values.dtype)
+        n += present_a.T @ present_b
+        sa += xa.T @ present_b
+        sb += present_a.T @ xb
+        c += xa.T @ xb
+        qa += np.square(xa).T @ present_b
+        qb += present_a.T @ np.square(xb)
+    return n, sa, sb, c, qa, qb
+
+
+def _correlation(n, sa, sb, c, qa, qb, constant_a, constant_b) -> np.ndarray:
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cov = c - sa * sb / n
+        var_a = qa - sa * sa / n
+        var_b = qb - sb * sb / n
+        r = np.clip(cov / np.sqrt(var_a * var_b), -1.0, 1.0)
+    undefined = (n < 2) | ~(var_a > 0) | ~(var_b > 0) | constant_a[:, None] | constant_b[None, :]
+    r[undefined] = np.nan
+    return r
+
+
+class _PairCollector:
+    # Keeps the pairs above a threshold and/or the top_k pairs by absolute correlation,
+    # pruning as tiles come in so memory stays O(top_k) rather than O(p**2).
+
+    def __init__(self, top_k: Optional[int], threshold: Optional[float]):
+        self.top_k = top_k
+        self.threshold = threshold
+        self.parts: List[Tuple[np.ndarray, ...]] = []
+        self.size = 0
+
+    def add(self, first: np.ndarray, second: np.ndarray, r: np.ndarray, n: np.ndarray) -> None:
+        keep = ~np.isnan(r)
+        if self.threshold is not None:
+            keep &= np.abs(r) >= self.threshold
+        if not keep.any():
+            return
+        self.parts.append((first[keep], second[keep], r[keep], n[keep]))
+        self.size += int(keep.sum())
+        if self.top_k is not None and self.size > 4 * self.top_k:
+            self._prune()
+
+    def _prune(self) -> None:
+        first, second, r, n = (np.concatenate(part) for part in zip(*self.parts))
+        if self.top_k is not None and len(r) > self.top_k:
+            best = np.argpartition(-np.abs(r), self.top_k - 1)[:self.top_k]
+            first, second, r, n = first[best], second[best], r[best], n[best]
+        self.parts = [(first, second, r, n)]
+        self.size = len(r)
+
+    def frame(self, names: List[str]) -> pd.DataFrame:
+        if not self.parts:
+            return pd.DataFrame({"column_a": pd.Series(dtype=object), "column_b": pd.Series(dtype=object),
+                                 "correlation": pd.Series(dtype=float), "observations": pd.Series(dtype=int)})
+        self._prune()
+        first, second, r, n = self.parts[0]
+        order = np.argsort(-np.abs(r), kind='stable')
+        names = np.asarray(names, dtype=object)
+        return pd.DataFrame({
+            "column_a": names[first[order]],
+            "column_b": names[second[order]],
+            "correlation": r[order].astype(np.float64),
+            "observations": n[order].astype(np.int64),
+        })
+
+
+def _collect_tile(collector: _PairCollector, a: slice, b: slice, r: np.ndarray, n: np.ndarray) -> None:
+    first, second = np.meshgrid(np.arange(a.start, a.stop), np.arange(b.start, b.stop), indexing='ij')
+    upper = first < second  # Each unordered pair once, no self-pairs
+    collector.add(first[upper], second[upper], r[upper], n[upper])
+
+
+def tiled_correlation(df: pd.DataFrame,
+                      top_k: Optional[int] = None,
+                      threshold: Optional[float] = None,
+                      tile_size: int = 256,
+                      row_block: int = 16384,
+                      dtype=np.float32) -> pd.DataFrame:
+    """
+    Pearson correlation of the numeric columns, computed tile by tile.
+
+    Columns are split into tiles of tile_size and each pair of tiles is multiplied in
+    dtype (float32 by default: half the memory and about twice the BLAS throughput of
+    float64, with correlations accurate to roughly 1e-6). Missing values are handled
+    pairwise, as DataFrame.corr() does.
+
+    With top_k or threshold, only the matching column pairs are kept while the tiles
+    are processed, so the p x p matrix is never held in memory.
+
+    Parameters:
+        df (pd.DataFrame): The dataset to analyze.
+        top_k (int, optional): Return only the k pairs with the largest absolute correlation.
+        threshold (float, optional): Return only pairs with absolute correlation >= threshold.
+        tile_size (int): Columns per tile.
+        row_block (int): Rows per matrix product.
+        dtype: Compute dtype, np.float32 or np.float64.
+
+    Returns:
+        pd.DataFrame: The correlation matrix, or with top_k/threshold the pairs as rows of
+                      column_a, column_b, correlation and observations, strongest first.
+    """
+    numeric_df = _numeric(df)
+    names = list(numeric_df.columns)
+    values = _as_matrix(numeric_df, _column_means(numeric_df), dtype)
+    constant = ~(numeric_df.max().to_numpy(dtype=np.float64) > numeric_df.min().to_numpy(dtype=np.float64))
+    sparse = top_k is not None or threshold is not None
+    collector = _PairCollector(top_k, threshold) if sparse else None
+    dense = None if sparse else np.full((len(names), len(names)), np.nan, dtype=dtype)
+
+    tiles = _tiles(len(names), tile_size)
+    for i, a in enumerate(tiles):
+        for b in tiles[i:]:
+            n, sa, sb, c, qa, qb = _tile_moments(values, a, b, row_block)
+            r = _correlation(n, sa, sb, c, qa, qb, constant[a], constant[b])
+            if sparse:
+                _collect_tile(collector, a, b, r, n)
+            else:
+                dense[a, b] = r
+                dense[b, a] = r.T
+    if sparse:
+        return collector.frame(names)
+    diagonal = np.arange(len(names))
+    dense[diagonal, diagonal] = np.where(np.isnan(dense[diagonal, diagonal]), np.nan, 1.0)
+    return pd.DataFrame(dense, index=names, columns=names)
+
+
+class CovarianceAccumulator:
+    """
+    Mergeable pairwise-complete co-moments of the numeric columns of a chunked dataset.
+
+    Feed it chunks (e.g. from DataFetcher.iter_chunks) and read the covariance or
+    correlation matrix, or just the strongest pairs, at the end. Chunks are multiplied in
+    column tiles in the compute dtype and accumulated in float64. The state holds four
+    p x p float64 matrices, i.e. 32 * p**2 bytes (128 MB for 2,000 columns).
+    """
+
+    def __init__(self, tile_size: int = 256, row_block: int = 16384, dtype=np.float32):
+        self.tile_size = tile_size
+        self.row_block = row_block
+        self.dtype = dtype
+        self.columns: Optional[List[str]] = None
+        self.rows = 0
+
+    def _init_state(self, columns: List[str], shift: np.ndarray) -> None:
+        p = len(columns)
+        self.columns = columns
+        self.shift = shift
+        self.n = np.zeros((p, p))
+        self.s = np.zeros((p, p))  # s[i, j]: sum of column i over the rows where j is present too
+        self.c = np.zeros((p, p))
+        self.q = np.zeros((p, p))  # q[i, j]: sum of column i squared, same rows
+        self.min = np.full(p, np.nan)
+        self.max = np.full(p, np.nan)
+
+    def update(self, chunk: pd.DataFrame) -> "CovarianceAccumulator":
+        """
+        Fold one chunk of rows in. The numeric columns of the first chunk fix the column
+        set; later chunks missing one of them count as missing values there.
+
+        Returns:
+            CovarianceAccumulator: self, for chaining.
+        """
+        if self.columns is None:
+            numeric_df = _numeric(chunk)
+            self._init_state(list(numeric_df.columns), _column_means(numeric_df))
+        numeric_df = chunk.reindex(columns=self.columns)
+        self.rows += len(chunk)
+        if not len(chunk):
+            return self
+        with np.errstate(all='ignore'):
+            self.min = np.fmin(self.min, numeric_df.min().to_numpy(dtype=np.float64))
+            self.max = np.fmax(self.max, numeric_df.max().to_numpy(dtype=np.float64))
+        values = _as_matrix(numeric_df, self.shift, self.dtype)
+        tiles = _tiles(len(self.columns), self.tile_size)
+        for i, a in enumerate(tiles):
+            for b in tiles[i:]:
+                n, sa, sb, c, qa, qb = _tile_moments(values, a, b, self.row_block)
+                self.n[a, b] += n
+                self.s[a, b] += sa
+                self.c[a, b] += c
+                self.q[a, b] += qa
+                if a != b:
+                    self.n[b, a] += n.T
+                    self.s[b, a] += sb.T
+                    self.c[b, a] += c.T
+                    self.q[b, a] += qb.T
+        return self
+
+    def merge(self, other: "CovarianceAccumulator") -> "CovarianceAccumulator":
+        """
+        Merge another accumulator over the same columns.
+
+        Returns:
+            CovarianceAccumulator: self, for chaining.
+        """
+        if other.columns is None:
+            self.rows += other.rows
+            return self
+        if self.columns is None:
+            self._init_state(list(other.columns), other.shift.copy())
+        elif list(other.columns) != list(self.columns):
+            raise ValueError("Cannot merge accumulators over different columns.")
+        # Re-express the other's sums relative to this shift: x - mine = (x - theirs) + d.
+        d = other.shift - self.shift
+        self.c += other.c + other.s * d[None, :] + other.s.T * d[:, None] + other.n * np.outer(d, d)
+        self.q += other.q + 2 * other.s * d[:, None] + other.n * (d ** 2)[:, None]
+        self.s += other.s + other.n * d[:, None]
+        self.n += other.n
+        self.min = np.fmin(self.min, other.min)
+        self.max = np.fmax(self.max, other.max)
+        self.rows += other.rows
+        return self
+
+    @classmethod
+    def profile(cls, chunks: Iterable[pd.DataFrame], **kwargs) -> "CovarianceAccumulator":
+        """
+        Build an accumulator from an iterable of chunks, e.g. DataFetcher.iter_chunks().
+
+        Returns:
+            CovarianceAccumulator: The populated accumulator.
+        """
+        accumulator = cls(**kwargs)
+        for chunk in chunks:
+            accumulator.update(chunk)
+        return accumulator
+
+    def _constant(self) -> np.ndarray:
+        return ~(self.max > self.min)
+
+    def _moments(self, a: slice, b: slice) -> Tuple[np.ndarray, ...]:
+        return self.n[a, b], self.s[a, b], self.s[b, a].T, self.c[a, b], self.q[a, b], self.q[b, a].T
+
+    def covariance(self) -> pd.DataFrame:
+        """
+        Pairwise-complete sample covariance matrix, as DataFrame.cov() computes it.
+
+        Returns:
+            pd.DataFrame: Covariance of every pair of numeric columns.
+        """
+        if self.columns is None:
+            return pd.DataFrame()
+        n, sa, sb, c, _, _ = self._moments(slice(None), slice(None))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cov = (c - sa * sb / n) / (n - 1)
+        cov[n < 2] = np.nan
+        return pd.DataFrame(cov, index=self.columns, columns=self.columns)
+
+    def correlation(self) -> pd.DataFrame:
+        """
+        Pairwise-complete Pearson correlation matrix, as DataFrame.corr() computes it.
+
+        Returns:
+            pd.DataFrame: Correlation of every pair of numeric columns.
+        """
+        if self.columns is None:
+            return pd.DataFrame()
+        constant = self._constant()
+        r = _correlation(*self._moments(slice(None), slice(None)), constant, constant)
+        diagonal = np.arange(len(self.columns))
+        r[diagonal, diagonal] = np.where(np.isnan(r[diagonal, diagonal]), np.nan, 1.0)
+        return pd.DataFrame(r, index=self.columns, columns=self.columns)
+
+    def pairs(self, top_k: Optional[int] = None, threshold: Optional[float] = None) -> pd.DataFrame:
+        """
+        The most strongly correlated column pairs, without building the full matrix.
+
+        Parameters:
+            top_k (int, optional): Keep only the k pairs with the largest absolute correlation.
+            threshold (float, optional): Keep only pairs with absolute correlation >= threshold.
+
+        Returns:
+            pd.DataFrame: column_a, column_b, correlation and observations, strongest first.
+        """
+        collector = _PairCollector(top_k, threshold)
+        if self.columns is None:
+            return collector.frame([])
+        constant = self._constant()
+        tiles = _tiles(len(self.columns), self.tile_size)
+        for i, a in enumerate(tiles):
+            for b in tiles[i:]:
+                moments = self._moments(a, b)
+                _collect_tile(collector, a, b, _correlation(*moments, constant[a], constant[b]), moments[0])
+        return collector.frame(self.columns)
+
+
+# Example usage (replace with your actual dataset URL)
+if __name__ == "__main__":
+    from data_fetcher import DataFetcher
+
+    fetcher = DataFetcher("shopping_trends.csv")
+    df, _ = fetcher.fetch_data()
+    print("Top pairs:\n", tiled_correlation(df, top_k=5))
+    accumulator = CovarianceAccumulator.profile(fetcher.iter_chunks(chunksize=1000))
+    print("Streaming correlation:\n", accumulator.correlation())
+    print("Pairs with |r| >= 0.01:\n", accumulator.pairs(threshold=0.01))
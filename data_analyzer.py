@@ -1,16 +1,51 @@
 import pandas as pd
 import numpy as np
-from scipy.stats import zscore
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime
+from collections import OrderedDict
+import threading
+import warnings
+import weakref
 import math
 
+try:
+    from pandas.tseries.api import guess_datetime_format
+except ImportError:  # pandas < 2.2
+    from pandas._libs.tslibs.parsing import guess_datetime_format
+
+from correlation import tiled_correlation
+from distribution_tests import distribution_table
+from sketches import column_digest, value_hashes
+from text_quality import text_quality
+
+# Formats tried after pandas' own guesses when inferring a date column's format.
+DATE_FORMATS = [
+    "%Y-%m-%d", "%Y-%m-%d %H:%M:%S", "%Y-%m-%dT%H:%M:%S", "%Y/%m/%d", "%Y%m%d",
+    "%d/%m/%Y", "%m/%d/%Y", "%d-%m-%Y", "%m-%d-%Y", "%d.%m.%Y",
+    "%d/%m/%Y %H:%M", "%m/%d/%Y %H:%M", "%d %b %Y", "%b %d, %Y", "%d %B %Y", "%B %d, %Y",
+]
+
+# Fixed-width numeric fields that _parse_fixed_width reads straight from the bytes.
+_FIXED_WIDTH_FIELDS = {"%Y": 4, "%m": 2, "%d": 2, "%H": 2, "%M": 2, "%S": 2}
+_DAYS_IN_MONTH = np.array([31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])
+
+# Parsed date columns per frame, so that the temporal checks on one frame parse each
+# column once. Keyed on id(frame) and dropped when the frame is garbage collected, so a
+# cache never outlives its frame; within a frame, on the identity of the column's values.
+# Entries hold a reference to the source values, which keeps that identity from being reused.
+_PARSED_DATES: Dict[int, OrderedDict] = {}
+_PARSED_DATES_MAX = 16  # Per frame
+_PARSED_DATES_LOCK = threading.Lock()
+
 class DataAnalyzer:
     @staticmethod
     def schema_validation(df: pd.DataFrame, expected_schema: Dict[str, str]) -> bool:
         """
         Validates the dataset against a predefined schema.
 
+        A frame loaded in compact mode (see data_fetcher.load_compact_csv) also matches
+        the dtypes a default load would have given its narrowed or categorized columns.
+
         Parameters:
             df (pd.DataFrame): The dataset to validate.
             expected_schema (Dict[str, str]): A dictionary mapping column names to expected data types.
@@ -18,15 +53,27 @@ class DataAnalyzer:
         Returns:
             bool: True if the schema matches, False otherwise.
         """
+        default_dtypes = df.attrs.get("compact_dtypes", {})
         for column, dtype in expected_schema.items():
             if column not in df.columns:
                 print(f"Missing column: {column}")
                 return False
-            if not np.issubdtype(df[column].dtype, np.dtype(dtype)):
-                print(f"Column {column} has incorrect type: expected {dtype}, got {df[column].dtype}")
+            actual = df[column].dtype
+            if not (DataAnalyzer._dtype_matches(actual, dtype) or (
+                    column in default_dtypes and DataAnalyzer._dtype_matches(default_dtypes[column], dtype))):
+                print(f"Column {column} has incorrect type: expected {dtype}, got {actual}")
                 return False
         return True
 
+    @staticmethod
+    def _dtype_matches(actual, expected) -> bool:
+        actual, expected = pd.api.types.pandas_dtype(actual), pd.api.types.pandas_dtype(expected)
+        if isinstance(actual, np.dtype) and isinstance(expected, np.dtype):
+            return np.issubdtype(actual, expected)
+        if isinstance(actual, pd.StringDtype) and expected == object:
+            return True  # Text loads as str since pandas 3 and as object before
+        return actual == expected
+
     @staticmethod #show in UI
     def detect_outliers(df: pd.DataFrame, method: str = 'IQR') -> Dict[str, List[int]]:
         """
@@ -37,31 +84,77 @@ class DataAnalyzer:
             method (str): Method to detect outliers ('IQR' or 'zscore').
 
         Returns:
-            Dict[str, List[int]]: Dictionary mapping column names to indices of rows with outliers.
+            Dict[str, List[int]]: Dictionary mapping column names to index labels of rows with outliers.
         """
+        mask = DataAnalyzer.outlier_mask(df, method=method)
         outliers = {}
-        for column in df.select_dtypes(include=[np.number]).columns:
-            if method == 'IQR':
-                Q1 = df[column].quantile(0.25)
-                Q3 = df[column].quantile(0.75)
-                IQR = Q3 - Q1
-                lower_bound = Q1 - 1.5 * IQR
-                upper_bound = Q3 + 1.5 * IQR
-                outlier_indices = df[(df[column] < lower_bound) | (df[column] > upper_bound)].index.tolist()
-            elif method == 'zscore':
-                z_scores = zscore(df[column].dropna())
-                outlier_indices = np.where(np.abs(z_scores) > 3)[0].tolist()
-            else:
-                raise ValueError("Invalid method. Use 'IQR' or 'zscore'.")
+        for column in mask.columns:
+            outlier_indices = df.index[mask[column].to_numpy()].tolist()
             if outlier_indices:
                 outliers[column] = outlier_indices
         return outliers
 
+    @staticmethod
+    def outlier_bounds(df: pd.DataFrame, method: str = 'IQR') -> pd.DataFrame:
+        """
+        Computes outlier bounds for every numerical column in one vectorized pass.
+
+        Parameters:
+            df (pd.DataFrame): The dataset to analyze.
+            method (str): Method to detect outliers ('IQR' or 'zscore').
+
+        Returns:
+            pd.DataFrame: 'lower' and 'upper' bounds indexed by column name.
+        """
+        numeric_df = df.select_dtypes(include=[np.number])
+        if method == 'IQR':
+            quartiles = numeric_df.quantile([0.25, 0.75])
+            q1, q3 = quartiles.iloc[0], quartiles.iloc[1]
+            lower, upper = q1 - 1.5 * (q3 - q1), q3 + 1.5 * (q3 - q1)
+        elif method == 'zscore':
+            mean, std = numeric_df.mean(), numeric_df.std(ddof=0)
+            lower, upper = mean - 3 * std, mean + 3 * std
+        else:
+            raise ValueError("Invalid method. Use 'IQR' or 'zscore'.")
+        return pd.DataFrame({"lower": lower, "upper": upper}, index=numeric_df.columns)
+
+    @staticmethod
+    def outlier_mask(df: pd.DataFrame, method: str = 'IQR', bounds=None) -> pd.DataFrame:
+        """
+        Flags outliers in numerical columns as a boolean mask aligned with the dataset's index.
+
+        Parameters:
+            df (pd.DataFrame): The dataset to analyze.
+            method (str): Method to detect outliers ('IQR' or 'zscore').
+            bounds (pd.DataFrame or dict, optional): Precomputed 'lower'/'upper' bounds per column,
+                e.g. from StreamingProfiler.outlier_bounds(). Computed from df when omitted.
+
+        Returns:
+            pd.DataFrame: True where a value is an outlier (never for missing values); one bool
+                          column per numerical column.
+                          `mask.sum()` gives the outlier count per column.
+        """
+        if bounds is None:
+            numeric_df = df.select_dtypes(include=[np.number])
+            if method == 'zscore':
+                # Same rule as |scipy.stats.zscore(column.dropna())| > 3
+                z_scores = (numeric_df - numeric_df.mean()) / numeric_df.std(ddof=0)
+                return (z_scores.abs() > 3).fillna(False).astype(bool)
+            bounds = DataAnalyzer.outlier_bounds(numeric_df, method=method)
+        elif isinstance(bounds, dict):
+            bounds = pd.DataFrame.from_dict(bounds, orient='index')
+        numeric_df = df[[column for column in bounds.index if column in df.columns]]
+        mask = numeric_df.lt(bounds["lower"], axis=1) | numeric_df.gt(bounds["upper"], axis=1)
+        return mask.fillna(False).astype(bool)  # Nullable columns give <NA> for missing values
+
     @staticmethod
     def integrity_checks(df: pd.DataFrame, key_columns: List[str]) -> bool:
         """
         Performs integrity checks such as uniqueness of key columns.
 
+        Every key column is checked and every failure printed. For composite keys,
+        foreign keys and duplicate counts use integrity_report.
+
         Parameters:
             df (pd.DataFrame): The dataset to analyze.
             key_columns (List[str]): Columns that should have unique values.
@@ -69,14 +162,45 @@ class DataAnalyzer:
         Returns:
             bool: True if all integrity checks pass, False otherwise.
         """
+        passed = True
         for column in key_columns:
             if column not in df.columns:
                 print(f"Key column {column} not found in dataset.")
-                return False
-            if df[column].duplicated().any():
+                passed = False
+            elif df[column].duplicated().any():
                 print(f"Duplicates found in key column: {column}")
-                return False
-        return True
+                passed = False
+        return passed
+
+    @staticmethod
+    def integrity_report(df: pd.DataFrame, primary_key: List[str] = None,
+                         foreign_keys: List[Tuple[List[str], pd.DataFrame, List[str]]] = None,
+                         partitions: int = 16, sample_size: int = 10) -> Dict[str, dict]:
+        """
+        Checks a composite primary key and foreign keys into other datasets, reporting
+        counts and sample offending keys per constraint (see integrity_engine.py, which
+        also handles datasets larger than memory).
+
+        Parameters:
+            df (pd.DataFrame): The dataset to analyze.
+            primary_key (List[str], optional): Columns whose combined values should be present and unique.
+            foreign_keys (list, optional): (columns, parent DataFrame, parent columns) per foreign key.
+            partitions (int): Hash partitions spilled to disk.
+            sample_size (int): Offending keys reported per constraint.
+
+        Returns:
+            Dict[str, dict]: Constraint name -> report.
+        """
+        from integrity_engine import IntegrityEngine
+
+        engine = IntegrityEngine(partitions=partitions, sample_size=sample_size)
+        sources = {"dataset": df}
+        if primary_key:
+            engine.primary_key("dataset", primary_key)
+        for i, (columns, parent, parent_columns) in enumerate(foreign_keys or []):
+            sources[f"parent{i}"] = parent
+            engine.foreign_key("dataset", columns, f"parent{i}", parent_columns)
+        return engine.run(sources)
 
     @staticmethod #show in UI
     def statistical_summary(df: pd.DataFrame) -> pd.DataFrame:
@@ -96,6 +220,10 @@ class DataAnalyzer:
         """
         Validates the distribution of a column.
 
+        The expected distribution is fitted to the column (mean and standard deviation,
+        or its range) and tested with Anderson-Darling, on a random subsample of 5,000
+        values for larger columns; see validate_distributions.
+
         Parameters:
             df (pd.DataFrame): The dataset to analyze.
             column (str): The column to validate.
@@ -104,112 +232,340 @@ class DataAnalyzer:
         Returns:
             bool: True if the distribution matches the expectation, False otherwise.
         """
-        from scipy.stats import shapiro, kstest
-
-        data = df[column].dropna()
-        if expected_distribution == 'normal':
-            stat, p_value = shapiro(data)
-        elif expected_distribution == 'uniform':
-            stat, p_value = kstest(data, 'uniform')
-        else:
-            raise ValueError("Invalid expected distribution. Use 'normal' or 'uniform'.")
-
-        if p_value < 0.05:
+        passed = distribution_table(df, [column], expected_distribution)["passed"].iloc[0]
+        if not passed:
             print(f"Column {column} does not follow the expected {expected_distribution} distribution.")
             return False
         return True
 
+    @staticmethod
+    def validate_distributions(df: pd.DataFrame, columns: List[str] = None, expected_distribution: str = 'normal',
+                               max_samples: int = 5000, alpha: float = 0.05) -> pd.DataFrame:
+        """
+        Validates the distribution of several numeric columns in one call.
+
+        Parameters:
+            df (pd.DataFrame): The dataset to analyze.
+            columns (List[str], optional): Columns to validate; defaults to all numeric columns.
+            expected_distribution (str): Expected distribution ('normal', 'uniform').
+            max_samples (int): Columns with more values are tested on a random subsample of this size.
+            alpha (float): Significance level.
+
+        Returns:
+            pd.DataFrame: Fitted parameters, KS and Anderson-Darling statistics and p-values,
+                          and 'passed' per column (see distribution_tests.distribution_table).
+        """
+        return distribution_table(df, columns, expected_distribution, max_samples=max_samples, alpha=alpha)
+
     @staticmethod
     def text_data_analysis(df: pd.DataFrame, text_columns: List[str]) -> Dict[str, Dict[str, int]]:
         """
         Analyzes text columns for quality.
 
+        Each column is profiled in one vectorized pass over its Arrow (or categorical)
+        storage; see text_quality.text_quality for all the fields.
+
         Parameters:
             df (pd.DataFrame): The dataset to analyze.
             text_columns (List[str]): List of text columns to analyze.
 
         Returns:
-            Dict[str, Dict[str, int]]: Analysis results per column.
+            Dict[str, Dict[str, int]]: Analysis results per column: 'missing', 'empty'
+                (empty or whitespace-only), 'unique' (estimated unless the column is
+                categorical), length statistics and whitespace/encoding anomaly counts.
         """
         results = {}
+        default_dtypes = df.attrs.get("compact_dtypes", {})
         for column in text_columns:
             if column in df.columns:
-                results[column] = {
-                    "missing": df[column].isna().sum(),
-                    "empty": (df[column].str.strip() == '').sum(),
-                    "unique": df[column].nunique()
-                }
+                series = df[column]
+                if column in default_dtypes and pd.api.types.is_bool_dtype(series.dtype):
+                    # A Yes/No column loaded as booleans in compact mode is profiled as its text
+                    series = pd.Series(pd.Categorical.from_codes(series.to_numpy(dtype=np.int8), ["No", "Yes"]),
+                                       index=series.index, name=column)
+                # Compact-mode categories report the same estimated distinct count as the text would
+                results[column] = text_quality(series, exact_categories=column not in default_dtypes)
             else:
                 print(f"Text column {column} not found in dataset.")
         return results
 
     @staticmethod
-    def temporal_validation(df: pd.DataFrame, date_columns: List[str]) -> Dict[str, bool]:
+    def temporal_validation(df: pd.DataFrame, date_columns: List[str]) -> Dict[str, dict]:
         """
         Validates date columns for consistency.
 
+        Each column's format is inferred once from a sample and the whole column is then
+        parsed with that format; values that don't match are counted rather than
+        failing the column. The parsed columns are cached for temporal_consistency_checks.
+
         Parameters:
             df (pd.DataFrame): The dataset to analyze.
             date_columns (List[str]): List of date columns to validate.
 
         Returns:
-            Dict[str, bool]: Validation results per column.
+            Dict[str, dict]: Per column: 'valid' (every present value parsed), 'format',
+                             'parsed', 'missing' and 'unparseable' counts, and up to five
+                             'unparseable_samples'.
         """
         results = {}
         for column in date_columns:
-            if column in df.columns:
-                try:
-                    pd.to_datetime(df[column])  # Validate format
-                    results[column] = True
-                except Exception as e:
-                    print(f"Error in column {column}: {e}")
-                    results[column] = False
-            else:
+            if column not in df.columns:
                 print(f"Date column {column} not found in dataset.")
-                results[column] = False
+                results[column] = {"valid": False, "format": None, "parsed": 0, "missing": 0,
+                                   "unparseable": 0, "unparseable_samples": []}
+                continue
+            parsed, date_format = DataAnalyzer.parse_dates(df, column)
+            missing = df[column].isna().to_numpy()
+            unparseable = parsed.isna().to_numpy() & ~missing
+            if unparseable.any() and not pd.api.types.is_numeric_dtype(df[column].dtype):
+                # Blank strings count as missing, not as bad dates
+                blank = df[column][unparseable].astype(str).str.strip() == ''
+                missing = missing.copy()
+                missing[np.flatnonzero(unparseable)[blank.to_numpy()]] = True
+                unparseable &= ~missing
+            count = int(unparseable.sum())
+            if count:
+                print(f"Column {column}: {count} values don't match the date format {date_format}.")
+            results[column] = {
+                "valid": count == 0 and bool((~missing).any()),
+                "format": date_format,
+                "parsed": int(len(parsed) - missing.sum() - count),
+                "missing": int(missing.sum()),
+                "unparseable": count,
+                "unparseable_samples": df[column][unparseable].head(5).tolist(),
+            }
         return results
 
     @staticmethod
-    def multivariate_analysis(df: pd.DataFrame) -> pd.DataFrame:
+    def infer_date_format(series: pd.Series, sample_size: int = 1000) -> Optional[str]:
+        """
+        Infers the strftime format of a text date column from a sample of its values.
+
+        Candidates are pandas' guesses for a few values plus DATE_FORMATS; the one that
+        parses most of the sample wins (e.g. %d/%m/%Y over %m/%d/%Y once a day above
+        12 appears).
+
+        Parameters:
+            series (pd.Series): Column of date strings.
+            sample_size (int): Number of values to try the candidates on.
+
+        Returns:
+            Optional[str]: The format, or None if no candidate parses any sampled value.
+        """
+        values = series.dropna()
+        if values.empty:
+            return None
+        positions = np.unique(np.linspace(0, len(values) - 1, min(sample_size, len(values))).astype(int))
+        sample = values.iloc[positions].astype(str).str.strip()
+        sample = sample[sample != '']
+        if sample.empty:
+            return None
+
+        candidates = []
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            for value in sample.iloc[:20]:
+                for dayfirst in (False, True):
+                    guess = guess_datetime_format(value, dayfirst=dayfirst)
+                    if guess and guess not in candidates:
+                        candidates.append(guess)
+        candidates += [f for f in DATE_FORMATS if f not in candidates]
+
+        best, best_count = None, 0
+        for date_format in candidates:
+            parsed = pd.to_datetime(sample, format=date_format, errors='coerce', utc='%z' in date_format)
+            count = int(parsed.notna().sum())
+            if count > best_count:
+                best, best_count = date_format, count
+                if count == len(sample):
+                    break
+        return best
+
+    @staticmethod
+    def parse_dates(df: pd.DataFrame, column: str, date_format: str = None) -> Tuple[pd.Series, Optional[str]]:
+        """
+        Parses a date column with a single, inferred format. Results are cached with
+        the frame, so repeated checks on the same frame reuse the parsed column (as long
+        as the column isn't modified in place); see clear_parsed_dates.
+
+        Parameters:
+            df (pd.DataFrame): The dataset.
+            column (str): The date column.
+            date_format (str, optional): strftime format to use instead of inferring one.
+
+        Returns:
+            Tuple[pd.Series, Optional[str]]: The parsed column (NaT where missing or
+                                             unparseable) and the format used.
+        """
+        series = df[column]
+        if pd.api.types.is_datetime64_any_dtype(series.dtype):
+            return series, None
+
+        values = series.array
+        if isinstance(values, pd.arrays.NumpyExtensionArray):
+            values = values.to_numpy()
+            identity = (values.__array_interface__["data"][0], values.strides)
+        else:
+            identity = (id(values),)
+        key = identity + (len(values), str(series.dtype), date_format)
+        with _PARSED_DATES_LOCK:
+            cache = _PARSED_DATES.get(id(df))
+            if cache is not None and key in cache:
+                cache.move_to_end(key)
+                _, parsed, used_format = cache[key]
+                return parsed.rename(series.name), used_format
+
+        if pd.api.types.is_numeric_dtype(series.dtype):
+            used_format = None
+            parsed = pd.to_datetime(series, errors='coerce')
+        else:
+            used_format = date_format or DataAnalyzer.infer_date_format(series)
+            if used_format is None:
+                parsed = pd.Series(pd.NaT, index=series.index, name=series.name, dtype='datetime64[ns]')
+            else:
+                parsed = DataAnalyzer._parse_with_format(series, used_format)
+
+        with _PARSED_DATES_LOCK:
+            cache = _PARSED_DATES.get(id(df))
+            if cache is None:
+                cache = _PARSED_DATES[id(df)] = OrderedDict()
+                weakref.finalize(df, _PARSED_DATES.pop, id(df), None)
+            cache[key] = (series.array, parsed, used_format)
+            while len(cache) > _PARSED_DATES_MAX:
+                cache.popitem(last=False)
+        return parsed, used_format
+
+    @staticmethod
+    def clear_parsed_dates(df: pd.DataFrame = None) -> None:
+        """
+        Drops the parsed date columns cached by parse_dates, for one frame or for all.
+
+        Parameters:
+            df (pd.DataFrame, optional): The frame whose cache to drop; all frames when omitted.
+        """
+        with _PARSED_DATES_LOCK:
+            if df is None:
+                _PARSED_DATES.clear()
+            else:
+                _PARSED_DATES.pop(id(df), None)
+
+    @staticmethod
+    def temporal_consistency_checks(df: pd.DataFrame, column: str, max_gap=None, now=None,
+                                    date_format: str = None) -> dict:
+        """
+        Ordering and freshness checks on a date column: monotonicity, gaps between
+        consecutive timestamps and rows dated in the future.
+
+        Parameters:
+            df (pd.DataFrame): The dataset.
+            column (str): The date column (parsed once, see parse_dates).
+            max_gap (str or pd.Timedelta, optional): Gaps longer than this are counted, e.g. '1D'.
+            now (pd.Timestamp, optional): Reference time for future rows and age; defaults to now.
+            date_format (str, optional): Format to use instead of inferring one.
+
+        Returns:
+            dict: 'rows' (parsed timestamps), 'monotonic_increasing', 'out_of_order_rows'
+                  (rows earlier than the row before them), 'duplicate_timestamps',
+                  'earliest', 'latest', 'median_gap', 'largest_gap', 'largest_gap_start',
+                  'gaps_over_max' (None without max_gap), 'future_rows' and 'age'
+                  (now minus the latest timestamp).
+        """
+        parsed, _ = DataAnalyzer.parse_dates(df, column, date_format)
+        if parsed.dt.tz is not None:
+            parsed = parsed.dt.tz_convert(None)  # Compare in UTC
+        now = pd.Timestamp.now(tz='UTC') if now is None else pd.Timestamp(now)
+        if now.tz is not None:
+            now = now.tz_convert(None)
+
+        values = parsed.dropna().to_numpy()
+        result = {"rows": len(values), "monotonic_increasing": True, "out_of_order_rows": 0,
+                  "duplicate_timestamps": 0, "earliest": None, "latest": None, "median_gap": None,
+                  "largest_gap": None, "largest_gap_start": None,
+                  "gaps_over_max": None if max_gap is None else 0, "future_rows": 0, "age": None}
+        if not len(values):
+            return result
+
+        steps = np.diff(values)
+        out_of_order = int((steps < np.timedelta64(0)).sum())
+        ordered = values if out_of_order == 0 else np.sort(values)
+        gaps = steps if out_of_order == 0 else np.diff(ordered)
+        latest = pd.Timestamp(ordered[-1])
+        result.update({
+            "monotonic_increasing": out_of_order == 0,
+            "out_of_order_rows": out_of_order,
+            "duplicate_timestamps": int((gaps == np.timedelta64(0)).sum()),
+            "earliest": pd.Timestamp(ordered[0]),
+            "latest": latest,
+            "future_rows": int((values > np.datetime64(now.to_datetime64())).sum()),
+            "age": now - latest,
+        })
+        if len(gaps):
+            largest = int(np.argmax(gaps))
+            result.update({
+                "median_gap": pd.Timedelta(np.median(gaps.astype(np.int64)), unit=np.datetime_data(gaps.dtype)[0]),
+                "largest_gap": pd.Timedelta(gaps[largest]),
+                "largest_gap_start": pd.Timestamp(ordered[largest]),
+            })
+            if max_gap is not None:
+                result["gaps_over_max"] = int((gaps > pd.Timedelta(max_gap).to_timedelta64()).sum())
+        return result
+
+    @staticmethod
+    def multivariate_analysis(df: pd.DataFrame, top_k: int = None, threshold: float = None,
+                              tile_size: int = None) -> pd.DataFrame:
         """
         Analyzes correlations between numerical columns.
 
+        Any of top_k, threshold or tile_size switches to the tiled float32 computation of
+        correlation.tiled_correlation, which scales to thousands of columns; top_k and
+        threshold also return only the strongest pairs instead of the full matrix.
+
         Parameters:
             df (pd.DataFrame): The dataset to analyze.
+            top_k (int, optional): Return only the k most correlated column pairs.
+            threshold (float, optional): Return only pairs with absolute correlation >= threshold.
+            tile_size (int, optional): Columns per tile (default 256 in the tiled mode).
 
         Returns:
-            pd.DataFrame: Correlation matrix of numerical columns.
+            pd.DataFrame: Correlation matrix of numerical columns, or with top_k/threshold
+                          one row per pair (column_a, column_b, correlation, observations).
         """
         numeric_df = df.select_dtypes(include=[np.number])  # Select only numeric columns
         if numeric_df.empty:
             print("No numeric columns found for correlation analysis.")
             return pd.DataFrame()
-        return numeric_df.corr()
+        if top_k is None and threshold is None and tile_size is None:
+            return numeric_df.corr()
+        return tiled_correlation(numeric_df, top_k=top_k, threshold=threshold, tile_size=tile_size or 256)
 
     @staticmethod
-    def context_specific_checks(df: pd.DataFrame, context: str = 'general') -> None:
+    def context_specific_checks(df: pd.DataFrame, context: str = 'general',
+                                rules: List[dict] = None) -> Dict[str, dict]:
         """
         Performs context-specific validation checks.
 
+        The context's built-in rules and any extra rules are evaluated together by a
+        RuleEngine in one pass over the data (see rule_engine.py for the rule format).
+
         Parameters:
             df (pd.DataFrame): The dataset to analyze.
             context (str): The context of the dataset ('general', 'geo', 'finance').
+            rules (List[dict], optional): Additional declarative rules to check.
 
         Returns:
-            None
-        """
-        if context == 'geo':
-            if 'latitude' in df.columns and 'longitude' in df.columns:
-                invalid_lat = df[(df['latitude'] < -90) | (df['latitude'] > 90)]
-                invalid_lon = df[(df['longitude'] < -180) | (df['longitude'] > 180)]
-                print(f"Invalid latitudes: {len(invalid_lat)}")
-                print(f"Invalid longitudes: {len(invalid_lon)}")
-        elif context == 'finance':
-            if 'price' in df.columns:
-                negative_prices = df[df['price'] < 0]
-                print(f"Negative prices: {len(negative_prices)}")
-        else:
+            Dict[str, dict]: Violation counts and sample row numbers per rule name.
+        """
+        from rule_engine import CONTEXT_RULES, RuleEngine
+
+        rules = list(CONTEXT_RULES.get(context, [])) + list(rules or [])
+        if not rules:
             print("No specific checks implemented for this context.")
+            return {}
+        report = RuleEngine(rules).update(df).report()
+        for name, result in report.items():
+            if not result["missing_columns"]:
+                print(f"{name}: {result['violations']}")
+        return report
     
     #-------------------Checked by ALoha-------------------
 
@@ -274,7 +630,7 @@ class DataAnalyzer:
             return 0.5  
 
     @staticmethod
-    def calculate_metadata_quality_score(df: pd.DataFrame, column_descriptions=None) -> float:
+    def calculate_metadata_quality_score(df: pd.DataFrame, column_descriptions=None, fast: bool = True) -> float:
         """
         Calculate a metadata quality score for a given DataFrame.
         
@@ -282,6 +638,8 @@ class DataAnalyzer:
             df (pd.DataFrame): The input DataFrame.
             column_descriptions (dict, optional): A dictionary of column names to their descriptions.
                                                   Example: {'col1': 'Description of col1', 'col2': 'Description of col2'}
+            fast (bool): Use the vectorized type and duplicate checks (default). False runs the
+                         original per-cell type check and transposed duplicate search.
 
         Returns:
             float: Metadata quality score in the range [0, 1].
@@ -299,12 +657,20 @@ class DataAnalyzer:
         max_score += num_columns  # Maximum score for all columns having meaningful names
 
         # 2. Check data type consistency
-        consistent_data_types = sum(1 for col in df.columns if df[col].apply(type).nunique() == 1)
+        if fast:
+            consistent_data_types = sum(
+                1 for i in range(num_columns) if DataAnalyzer._is_type_consistent(df.iloc[:, i])
+            )
+        else:
+            consistent_data_types = sum(1 for col in df.columns if df[col].apply(type).nunique() == 1)
         total_score += consistent_data_types
         max_score += num_columns  # Each column can get a point for consistency
 
         # 3. Check for duplicate columns
-        duplicate_columns = df.T.duplicated().sum()
+        if fast:
+            duplicate_columns = DataAnalyzer._count_duplicate_columns(df)
+        else:
+            duplicate_columns = df.T.duplicated().sum()
         total_score += (num_columns - duplicate_columns)  # Deduct points for duplicates
         max_score += num_columns  # Each column ideally is unique
 
@@ -317,6 +683,191 @@ class DataAnalyzer:
         # Normalize score to a range of 0 to 1
         return total_score / max_score if max_score > 0 else 0.0
 
+    @staticmethod
+    def sampled_analysis(fetcher, time_budget: float = 5.0, target_error: float = None, **options) -> dict:
+        """
+        Estimate the completeness and metadata quality scores, outlier rates and summary
+        statistics from a sample, with confidence intervals.
+
+        The sample is streamed from the DataFetcher and grows until the time budget is
+        spent or both score intervals are within target_error of the estimate.
+
+        Args:
+            fetcher (DataFetcher): The dataset's source.
+            time_budget (float): Wall-clock seconds to spend, or None for no limit.
+            target_error (float, optional): Wanted half-width of the score intervals.
+            **options: Further SampledAnalysis options, e.g. confidence=0.99, method='zscore'
+                       or column_descriptions.
+
+        Returns:
+            dict: Estimates and intervals, see SampledAnalysis.run.
+        """
+        from sampling import SampledAnalysis  # sampling builds on DataAnalyzer
+
+        return SampledAnalysis(fetcher, time_budget=time_budget, target_error=target_error, **options).run()
+
+    @staticmethod
+    def _is_type_consistent(series: pd.Series) -> bool:
+        # Same answer as `series.apply(type).nunique() == 1`, decided from the dtype where possible.
+        if len(series) == 0:
+            return False
+        dtype = series.dtype
+        if isinstance(dtype, np.dtype):
+            if dtype.kind in 'iufcb':
+                return True  # Missing floats are NaN, which is a float too
+            if dtype.kind in 'mM':
+                return DataAnalyzer._all_or_none_missing(series)  # NaT has its own type
+            if dtype == object:
+                inferred = pd.api.types.infer_dtype(series, skipna=False)
+                if inferred == 'string':
+                    return True
+                return len(set(map(type, series.to_numpy()))) == 1
+        elif isinstance(dtype, pd.StringDtype):
+            return DataAnalyzer._all_or_none_missing(series)
+        elif isinstance(dtype, pd.CategoricalDtype):
+            codes = series.cat.codes.to_numpy()
+            used = series.cat.categories.take(np.unique(codes[codes >= 0]))
+            types = set(map(type, used))
+            if (codes < 0).any():
+                types.add(float)
+            return len(types) == 1
+        return series.apply(type).nunique() == 1
+
+    @staticmethod
+    def _all_or_none_missing(series: pd.Series) -> bool:
+        # For dtypes whose missing value has a type of its own (NaT, NA): a single type either way
+        missing = int(series.isna().sum())
+        return missing == 0 or missing == len(series)
+
+    @staticmethod
+    def _parse_with_format(series: pd.Series, date_format: str) -> pd.Series:
+        # Columns that repeat their values (e.g. dates without a time) are parsed once
+        # per distinct value and expanded.
+        sample = series.iloc[:1000].dropna()
+        if len(series) > 1000 and len(sample) and sample.nunique() <= len(sample) // 2:
+            codes, uniques = pd.factorize(series)
+            parsed = DataAnalyzer._parse_with_format(pd.Series(uniques), date_format)
+            return pd.Series(pd.Index(parsed).take(codes, allow_fill=True), index=series.index, name=series.name)
+        parsed = DataAnalyzer._parse_fixed_width(series, date_format)
+        if parsed is None:
+            parsed = pd.to_datetime(series, format=date_format, errors='coerce', utc='%z' in date_format)
+        return parsed
+
+    @staticmethod
+    def _parse_fixed_width(series: pd.Series, date_format: str) -> Optional[pd.Series]:
+        """
+        Parses formats made only of zero-padded numeric fields (%Y %m %d %H %M %S) and
+        literal separators, e.g. '%d/%m/%Y %H:%M:%S', by reading the digits at fixed byte
+        offsets. pandas parses such non-ISO formats one string at a time through strptime,
+        which is an order of magnitude slower.
+
+        Values that don't fit the fixed layout (other lengths, unpadded fields, non-ASCII)
+        go through pd.to_datetime with the format.
+
+        Returns:
+            Optional[pd.Series]: The parsed column, or None if the format has other directives.
+        """
+        fields, literals, width, i = [], [], 0, 0
+        while i < len(date_format):
+            if date_format[i] == '%':
+                directive = date_format[i:i + 2]
+                if directive not in _FIXED_WIDTH_FIELDS:
+                    return None
+                fields.append((directive, width, _FIXED_WIDTH_FIELDS[directive]))
+                width += _FIXED_WIDTH_FIELDS[directive]
+                i += 2
+            else:
+                literals.append((width, ord(date_format[i])))
+                width += 1
+                i += 1
+        if not {"%Y", "%m", "%d"} <= {field[0] for field in fields} or len(fields) != len({f[0] for f in fields}):
+            return None
+
+        values = series.to_numpy(dtype=object, na_value=None)
+        if series.dtype != object or pd.api.types.infer_dtype(series, skipna=True) in ('string', 'empty'):
+            lengths = series.str.len().to_numpy(dtype=np.float64, na_value=np.nan)
+        else:
+            # Mixed object column: only strings have a fixed layout; the rest go through pandas
+            lengths = np.fromiter((len(v) if isinstance(v, str) else np.nan for v in values),
+                                  dtype=np.float64, count=len(values))
+        candidates = np.flatnonzero(lengths == width)
+        try:
+            raw = values[candidates].astype(f'S{width}')
+        except UnicodeEncodeError:
+            return None
+        chars = raw.view(np.uint8).reshape(len(raw), width)
+        digits = chars - np.uint8(48)
+        ok = np.ones(len(raw), dtype=bool)
+        for offset, char in literals:
+            ok &= chars[:, offset] == char
+        parts = {}
+        for directive, offset, size in fields:
+            ok &= (digits[:, offset:offset + size] < 10).all(axis=1)
+            number = np.zeros(len(raw), dtype=np.int64)
+            for k in range(offset, offset + size):
+                number = number * 10 + digits[:, k]
+            parts[directive] = number
+        year, month, day = parts["%Y"], parts["%m"], parts["%d"]
+        hour, minute, second = (parts.get(f, np.zeros(len(raw), dtype=np.int64)) for f in ("%H", "%M", "%S"))
+        leap = (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+        month_ok = (month >= 1) & (month <= 12)
+        last_day = _DAYS_IN_MONTH[np.where(month_ok, month, 1) - 1] + ((month == 2) & leap)
+        ok &= month_ok & (day >= 1) & (day <= last_day) & (hour < 24) & (minute < 60) & (second < 60)
+        ok &= (year > 1677) & (year < 2262)  # Range of datetime64[ns]
+
+        # Days since 1970-01-01 from the civil date (proleptic Gregorian)
+        y = year - (month <= 2)
+        era = y // 400
+        year_of_era = y - era * 400
+        day_of_year = (153 * np.where(month > 2, month - 3, month + 9) + 2) // 5 + day - 1
+        day_of_era = year_of_era * 365 + year_of_era // 4 - year_of_era // 100 + day_of_year
+        seconds = (era * 146097 + day_of_era - 719468) * 86400 + hour * 3600 + minute * 60 + second
+
+        result = np.full(len(series), np.datetime64('NaT'), dtype='datetime64[ns]')
+        result[candidates[ok]] = (seconds[ok] * 1_000_000_000).astype('datetime64[ns]')
+        rest = np.ones(len(series), dtype=bool)
+        rest[candidates[ok]] = False
+        rest &= ~series.isna().to_numpy()
+        if rest.any():
+            result[rest] = pd.to_datetime(series[rest], format=date_format, errors='coerce').to_numpy(
+                dtype='datetime64[ns]')
+        return pd.Series(result, index=series.index, name=series.name)
+
+    @staticmethod
+    def _column_hashes(column: pd.Series) -> np.ndarray:
+        # Per-value hashes under which columns that df.T.duplicated() treats as equal collide.
+        if column.dtype == object and pd.api.types.infer_dtype(column, skipna=True) in (
+                'integer', 'floating', 'mixed-integer-float', 'boolean', 'decimal'):
+            column = pd.to_numeric(column, errors='coerce')  # Hash 1 and 1.0 alike
+        hashes = value_hashes(column)
+        missing = column.isna().to_numpy()
+        if missing.any():
+            hashes = np.where(missing, np.uint64(0), hashes)  # NaN, None, NaT and NA are all equal there
+        return hashes
+
+    @staticmethod
+    def _count_duplicate_columns(df: pd.DataFrame) -> int:
+        # Same answer as `df.T.duplicated().sum()`: bucket columns by a content hash,
+        # then confirm candidates value by value to rule out hash collisions.
+        buckets = {}
+        for i in range(df.shape[1]):
+            key = column_digest(DataAnalyzer._column_hashes(df.iloc[:, i])).digest()
+            buckets.setdefault(key, []).append(i)
+
+        duplicates = 0
+        for members in buckets.values():
+            distinct = []
+            for i in members:
+                values = df.iloc[:, i].to_numpy(dtype=object)
+                nulls = pd.isna(values)
+                for other_values, other_nulls in distinct:
+                    if np.array_equal(nulls, other_nulls) and bool((values[~nulls] == other_values[~other_nulls]).all()):
+                        duplicates += 1
+                        break
+                else:
+                    distinct.append((values, nulls))
+        return duplicates
+
 # Example usage (replace with your actual dataset)
 if __name__ == "__main__":
     url = "ted_talks_en.csv"  # Replace with a valid URL or file path
@@ -329,5 +880,6 @@ if __name__ == "__main__":
     print("Statistical Summary:\n", dataAnalyser.statistical_summary(df))
     print("Text Data Analysis:", dataAnalyser.text_data_analysis(df, ["description"]))
     print("Temporal Validation:", dataAnalyser.temporal_validation(df, ["date_column"]))
+    print("Temporal Consistency:", dataAnalyser.temporal_consistency_checks(df, "date_column", max_gap="1D"))
     print("Correlation Matrix:\n", dataAnalyser.multivariate_analysis(df))
     print("Outliers:", dataAnalyser.detect_outliers(df, method='IQR'))
@@ -1,46 +1,82 @@
+import hashlib
+import io
+import os
+from email.utils import parsedate_to_datetime
+import numpy as np
 import pandas as pd
-import requests
-from typing import Tuple
+from typing import Iterator, List, Optional, Tuple
 
 class DataFetcher:
-    def __init__(self, source_url: str):
+    def __init__(self, source_url: str, snapshot_dir: Optional[str] = None, http_cache_dir: Optional[str] = None,
+                 **http_options):
         """
         Initialize the DataFetcher with the source URL.
         
         Parameters:
             source_url (str): URL of the dataset (can be a CSV file or an API endpoint).
+            snapshot_dir (str, optional): Directory for columnar snapshots of parsed local CSV files.
+                                          Requires pyarrow; without it snapshots are skipped.
+            http_cache_dir (str, optional): Directory of API responses revalidated with ETag/Last-Modified.
+            **http_options: Further HttpSource options for API endpoints, e.g. page_param='page',
+                            max_in_flight=8, records_key='data' or timeout=60.
         """
         self.source_url = source_url
+        self.snapshot_dir = snapshot_dir
+        self.http_cache_dir = http_cache_dir
+        self.http_options = http_options
         self.df = None
         self.metadata = {}
 
-    def fetch_data(self) -> Tuple[pd.DataFrame, dict]:
+    def fetch_data(self,
+                   columns: Optional[List[str]] = None,
+                   compact: bool = False,
+                   downcast_floats: bool = False) -> Tuple[pd.DataFrame, dict]:
         """
         Fetch the dataset and metadata based on the source URL.
 
+        With a snapshot_dir, a local CSV is parsed once and saved as an uncompressed
+        Arrow (Feather) file; later loads of the same file version memory-map that
+        snapshot instead of reparsing the text.
+
+        Parameters:
+            columns (List[str], optional): Load only these columns (CSV sources).
+            compact (bool): Load CSV sources with memory-compact dtypes (see load_compact_csv).
+                            The memory saved is reported under metadata['memory'].
+            downcast_floats (bool): In compact mode, also store floats as float32 where that is
+                                    lossless. Off by default: pandas then accumulates means and
+                                    variances in float32, so summaries differ in the last digits.
+
         Returns:
             Tuple[pd.DataFrame, dict]:
                 - df: Pandas DataFrame containing the dataset.
                 - metadata: Dictionary containing the dataset's metadata.
         """
         try:
+            memory = None
+            last_modified = None
             if self.source_url.endswith('.csv'):
                 # If the source is a CSV file
-                self.df = pd.read_csv(self.source_url, encoding='utf-8')
+                snapshot = self.snapshot_path(variant="compact" if compact else "")
+                if snapshot and os.path.exists(snapshot):
+                    self.df = self._read_snapshot(snapshot, columns)
+                else:
+                    if compact:
+                        self.df, memory = load_compact_csv(self.source_url, downcast_floats=downcast_floats)
+                    else:
+                        self.df = pd.read_csv(self.source_url, encoding='utf-8')
+                    if snapshot:
+                        self._write_snapshot(self.df, snapshot)
+                    if columns is not None:
+                        self.df = self.df[columns]
             else:
                 # If the source is an API endpoint, assume JSON response
-                response = requests.get(self.source_url)
-                response.raise_for_status()
-                data = response.json()
-                self.df = pd.DataFrame(data)
-
-            # Extract basic metadata
-            self.metadata = {
-                "title": self.source_url.split('/')[-1],  # Use the filename or last part of the URL as the title
-                "description": "Dataset fetched from the given source URL.",
-                "source": self.source_url,
-                "last_update_time": pd.Timestamp.now().isoformat()  # Current timestamp as the update time
-            }
+                source = self._http_source()
+                self.df = source.fetch()
+                last_modified = source.last_modified
+
+            self.metadata = self._build_metadata(last_modified)
+            if memory is not None:
+                self.metadata["memory"] = memory
 
             return self.df, self.metadata
 
@@ -48,13 +84,193 @@ class DataFetcher:
             print(f"An error occurred while fetching the dataset: {e}")
             return pd.DataFrame(), {}
 
+    def iter_chunks(self, chunksize: int = 100_000) -> Iterator[pd.DataFrame]:
+        """
+        Stream the dataset in chunks of rows instead of loading it in full.
+
+        CSV sources are read lazily, so memory is bounded by the chunk size.
+        API sources are parsed incrementally into record batches of at most chunksize rows.
+
+        Parameters:
+            chunksize (int): Number of rows per chunk.
+
+        Yields:
+            pd.DataFrame: Consecutive slices of the dataset.
+        """
+        if self.source_url.endswith('.csv'):
+            self.metadata = self._build_metadata()
+            snapshot = self.snapshot_path()
+            if snapshot and os.path.exists(snapshot):
+                table = self._open_snapshot(snapshot)
+                for offset in range(0, table.num_rows, chunksize):
+                    yield table.slice(offset, chunksize).to_pandas()
+                return
+            with pd.read_csv(self.source_url, encoding='utf-8', chunksize=chunksize) as reader:
+                for chunk in reader:
+                    yield chunk
+        else:
+            self.metadata = self._build_metadata()
+            source = self._http_source(batch_size=chunksize)
+            for batch in source.iter_batches():
+                yield batch
+            self.metadata = self._build_metadata(source.last_modified)
+
+    def preview(self):
+        """
+        Open the dataset for paging without loading it (see data_preview.DataPreview).
+
+        A local CSV is paged from its columnar snapshot if one exists, otherwise by
+        seeking into the file itself. API sources are fetched in full.
+
+        Returns:
+            DataPreview: The pager; the source's metadata is available from get_metadata().
+        """
+        from data_preview import DataPreview
+
+        if self.source_url.endswith('.csv') and os.path.exists(self.source_url):
+            self.metadata = self._build_metadata()
+            snapshot = self.snapshot_path()
+            if snapshot and os.path.exists(snapshot):
+                return DataPreview(table=self._open_snapshot(snapshot))
+            return DataPreview(csv_path=self.source_url)
+        df, _ = self.fetch_data()
+        return DataPreview(frame=df)
+
+    def _http_source(self, **overrides):
+        from http_source import HttpSource
+
+        options = {**self.http_options, **overrides}
+        return HttpSource(self.source_url, cache_dir=self.http_cache_dir, **options)
+
+    def fingerprint(self, content_hash: bool = False) -> Optional[str]:
+        """
+        Identify the current version of the source without fetching it.
+
+        Local files are identified by path, modification time and size (or by a hash
+        of their content). URLs are identified by the ETag or Last-Modified header of
+        a HEAD request.
+
+        Parameters:
+            content_hash (bool): Hash the file's bytes instead of trusting mtime and size.
+
+        Returns:
+            Optional[str]: A string that changes whenever the source changes, or None if
+                           the source cannot be identified (e.g. a URL without validators).
+        """
+        try:
+            if os.path.exists(self.source_url):
+                path = os.path.abspath(self.source_url)
+                if content_hash:
+                    digest = hashlib.blake2b(digest_size=16)
+                    with open(path, 'rb') as f:
+                        for block in iter(lambda: f.read(1 << 20), b''):
+                            digest.update(block)
+                    return f"{path}:blake2b:{digest.hexdigest()}"
+                stat = os.stat(path)
+                return f"{path}:{stat.st_mtime_ns}:{stat.st_size}"
+
+            from http_source import get_session
+
+            response = get_session().head(self.source_url, allow_redirects=True, timeout=10)
+            response.raise_for_status()
+            validator = response.headers.get('ETag') or response.headers.get('Last-Modified')
+            return f"{self.source_url}:{validator}" if validator else None
+        except Exception as e:
+            print(f"An error occurred while fingerprinting the dataset: {e}")
+            return None
+
+    def snapshot_path(self, variant: str = "") -> Optional[str]:
+        """
+        Path of the columnar snapshot of the file's current version, which may not exist yet.
+        Snapshots are named <stem>-<path hash>-<version hash>.arrow.
+
+        Parameters:
+            variant (str): "" for the plain snapshot, "compact" for the one of compact loads.
+
+        Returns:
+            Optional[str]: The path, or None without a snapshot_dir, a local file or pyarrow.
+        """
+        if not self.snapshot_dir or not os.path.exists(self.source_url):
+            return None
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            print("pyarrow is not installed; columnar snapshots are disabled.")
+            return None
+        path = os.path.abspath(self.source_url)
+        source = hashlib.blake2b(path.encode(), digest_size=4).hexdigest()
+        version = hashlib.blake2b((self.fingerprint() + variant).encode(), digest_size=8).hexdigest()
+        stem = os.path.splitext(os.path.basename(path))[0]
+        return os.path.join(self.snapshot_dir, f"{stem}-{source}-{version}.arrow")
+
+    def _write_snapshot(self, df: pd.DataFrame, path: str) -> None:
+        import pyarrow.feather as feather
+
+        try:
+            os.makedirs(self.snapshot_dir, exist_ok=True)
+            tmp_path = path + ".tmp"
+            # Uncompressed so that later loads can memory-map the buffers without copying.
+            feather.write_feather(df, tmp_path, compression='uncompressed')
+            os.replace(tmp_path, path)
+            # Drop snapshots of older versions of the same file.
+            prefix = os.path.basename(path).rsplit('-', 1)[0] + '-'
+            keep = {os.path.basename(path), os.path.basename(self.snapshot_path("compact")),
+                    os.path.basename(self.snapshot_path(""))}
+            for name in os.listdir(self.snapshot_dir):
+                if name not in keep and name.startswith(prefix) and name.endswith('.arrow'):
+                    os.remove(os.path.join(self.snapshot_dir, name))
+        except Exception as e:
+            print(f"Could not write a snapshot of the dataset: {e}")
+
+    @staticmethod
+    def _open_snapshot(path: str, columns: Optional[List[str]] = None):
+        import pyarrow.feather as feather
+
+        return feather.read_table(path, columns=columns, memory_map=True)
+
+    def _read_snapshot(self, path: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        return self._open_snapshot(path, columns).to_pandas()
+
+    def _build_metadata(self, last_modified: Optional[str] = None) -> dict:
+        # Extract basic metadata
+        metadata = {
+            "title": self.source_url.split('/')[-1],  # Use the filename or last part of the URL as the title
+            "description": "Dataset fetched from the given source URL.",
+            "source": self.source_url,
+        }
+        # When the data last changed: a local file's modification time, or the API's Last-Modified
+        # header. Without either, the update time is unknown (see profile_store for run history).
+        if os.path.exists(self.source_url):
+            metadata["last_update_time"] = pd.Timestamp.fromtimestamp(os.path.getmtime(self.source_url)).isoformat()
+        elif last_modified:
+            try:
+                modified = parsedate_to_datetime(last_modified).astimezone().replace(tzinfo=None)
+                metadata["last_update_time"] = modified.isoformat()
+            except (TypeError, ValueError):
+                pass
+        return metadata
+
     def get_metadata(self) -> dict:
         """
-        Return the metadata of the fetched dataset.
+        Return the metadata of the fetched dataset, or the metadata available
+        without fetching it if nothing has been fetched yet.
         
         Returns:
             dict: Metadata information about the dataset.
         """
+        if not self.metadata:
+            self.metadata = self._build_metadata()
+        return self.metadata
+
+    def refresh_metadata(self) -> dict:
+        """
+        Rebuild the metadata available without fetching the dataset, e.g. the current
+        modification time of a local file, and keep it as the fetcher's metadata.
+
+        Returns:
+            dict: Metadata information about the dataset.
+        """
+        self.metadata = self._build_metadata()
         return self.metadata
 
     def get_dataset(self) -> pd.DataFrame:
@@ -66,6 +282,179 @@ class DataFetcher:
         """
         return self.df
 
+def load_compact_csv(path: str,
+                     sample_rows: int = 10_000,
+                     max_categories: int = 1_000,
+                     downcast_floats: bool = False) -> Tuple[pd.DataFrame, dict]:
+    """
+    Load a CSV with memory-compact dtypes chosen from a sample of the file.
+
+    - String columns with few distinct values in the sample are read as 'category'.
+    - Columns holding only 'Yes'/'No' (and no missing values) become bool.
+    - Integers are stored in the smallest signed width that holds the column's actual range.
+    - Floats are stored as float32 only with downcast_floats and only if no value changes.
+
+    Widths are decided from the full column after parsing, so a sample that misses a large
+    value cannot cause an overflow. The dtypes a default load would have given the changed
+    columns are kept in df.attrs['compact_dtypes'], which DataAnalyzer uses to give the same
+    schema and text results as on the default frame.
+
+    Parameters:
+        path (str): Path of the CSV file.
+        sample_rows (int): Rows to sample when choosing which string columns to categorize.
+        max_categories (int): Largest number of distinct sample values for a 'category' column.
+        downcast_floats (bool): Allow lossless float64 -> float32 conversion.
+
+    Returns:
+        Tuple[pd.DataFrame, dict]:
+            - df: The compact DataFrame.
+            - memory: Bytes used, an estimate of the default load's bytes, and the bytes saved.
+    """
+    sample = pd.read_csv(path, encoding='utf-8', nrows=sample_rows)
+    dtypes = {}
+    for column in sample.columns:
+        values = sample[column]
+        if pd.api.types.is_object_dtype(values.dtype) or isinstance(values.dtype, pd.StringDtype):
+            distinct = values.nunique()
+            if distinct <= max_categories and distinct <= 0.5 * max(len(values), 1):
+                dtypes[column] = 'category'
+
+    df = pd.read_csv(path, encoding='utf-8', dtype=dtypes)
+    default_dtypes = {column: str(sample[column].dtype) for column in dtypes}
+    for column in df.columns:
+        values = df[column]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            if set(values.cat.categories) <= {'Yes', 'No'} and not values.hasnans:
+                df[column] = (values == 'Yes').to_numpy()
+        elif pd.api.types.is_integer_dtype(values.dtype):
+            df[column] = pd.to_numeric(values, downcast='integer')
+        elif downcast_floats and values.dtype == np.float64:
+            narrow = values.astype(np.float32)
+            if np.array_equal(narrow.to_numpy(np.float64), values.to_numpy(), equal_nan=True):
+                df[column] = narrow
+        if df[column].dtype != values.dtype and column not in default_dtypes:
+            default_dtypes[column] = str(values.dtype)
+    df.attrs["compact_dtypes"] = default_dtypes
+
+    rows = max(len(sample), 1)
+    default_bytes = int(sample.memory_usage(index=True, deep=True).sum() / rows * len(df))
+    compact_bytes = int(df.memory_usage(index=True, deep=True).sum())
+    return df, {
+        "compact_bytes": compact_bytes,
+        "default_bytes_estimate": default_bytes,
+        "saved_bytes": max(default_bytes - compact_bytes, 0),
+    }
+
+def read_csv_header(path: str) -> Tuple[List[str], int]:
+    """
+    Read the column names of a CSV file and the byte offset where its data starts.
+
+    Parameters:
+        path (str): Path of the CSV file.
+
+    Returns:
+        Tuple[List[str], int]: Column names (as pandas would name them) and the header's length in bytes.
+    """
+    with open(path, 'rb') as f:
+        header = f.readline()
+    names = list(pd.read_csv(io.BytesIO(header), encoding='utf-8', nrows=0).columns)
+    return names, len(header)
+
+
+def iter_csv_blocks(path: str,
+                    names: List[str],
+                    start: int,
+                    block_bytes: int = 64 * 1024 ** 2) -> Iterator[Tuple[pd.DataFrame, int]]:
+    """
+    Parse a CSV file from a byte offset in blocks that end on line boundaries.
+
+    A trailing line without a newline (e.g. one being appended right now) is left
+    unread. Quoted fields containing newlines are not supported.
+
+    Parameters:
+        path (str): Path of the CSV file.
+        names (List[str]): Column names, as returned by read_csv_header.
+        start (int): Byte offset of the first data line to parse.
+        block_bytes (int): Approximate bytes parsed per block.
+
+    Yields:
+        Tuple[pd.DataFrame, int]: The parsed rows and the byte offset just past them.
+    """
+    with open(path, 'rb') as f:
+        f.seek(start)
+        offset = start
+        carry = b''
+        while True:
+            block = f.read(block_bytes)
+            if not block:
+                return
+            data = carry + block
+            end = data.rfind(b'\n') + 1
+            if end == 0:
+                carry = data  # A single line longer than the block; keep reading
+                continue
+            carry = data[end:]
+            chunk = pd.read_csv(io.BytesIO(data[:end]), encoding='utf-8', header=None, names=names)
+            offset += end
+            yield chunk, offset
+
+def read_csv_sample_block(path: str,
+                          data_start: int,
+                          offset: int,
+                          block_bytes: int) -> Tuple[bytes, np.ndarray]:
+    """
+    Read the complete lines of a CSV file that lie inside [offset, offset + block_bytes).
+
+    A line starting at byte s with length L (newline included) is returned exactly
+    when s - block_bytes + L <= offset <= s, so for a uniformly drawn offset every
+    line is picked with probability proportional to block_bytes - L + 1. Blank
+    lines are dropped, as pd.read_csv would skip them. Quoted fields containing
+    newlines are not supported.
+
+    Parameters:
+        path (str): Path of the CSV file.
+        data_start (int): Byte offset of the first data line (see read_csv_header).
+        offset (int): Start of the block; may lie before data_start.
+        block_bytes (int): Length of the block in bytes.
+
+    Returns:
+        Tuple[bytes, np.ndarray]: The lines, newline-terminated, and the byte length of each.
+    """
+    begin = max(offset, data_start)
+    stop = offset + block_bytes
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if begin >= min(stop, size):
+            return b'', np.empty(0, dtype=np.int64)
+        if begin > data_start:
+            # Skip the rest of the line that byte begin - 1 belongs to
+            f.seek(begin - 1)
+            data = f.read(stop - begin + 1)
+            first = data.find(b'\n')
+            data = data[first + 1:] if first != -1 else b''
+        else:
+            f.seek(begin)
+            data = f.read(stop - begin)
+    if stop < size or data.endswith(b'\n'):
+        data = data[:data.rfind(b'\n') + 1]
+        tail = 0
+    else:
+        tail = len(data) - (data.rfind(b'\n') + 1)  # Last line of a file without a final newline
+        data += b'\n'
+    if not data:
+        return b'', np.empty(0, dtype=np.int64)
+
+    ends = np.flatnonzero(np.frombuffer(data, dtype=np.uint8) == ord('\n'))
+    starts = np.concatenate([[0], ends[:-1] + 1]).astype(np.int64)
+    lengths = ends - starts + 1
+    if tail:
+        lengths[-1] = tail
+    blank = (ends == starts) | ((ends == starts + 1) & (np.frombuffer(data, dtype=np.uint8)[starts] == ord('\r')))
+    if blank.any():
+        data = b''.join(data[s:e + 1] for s, e in zip(starts[~blank], ends[~blank]))
+        lengths = lengths[~blank]
+    return data, lengths
+
 # Example usage (replace with your actual dataset URL)
 if __name__ == "__main__":
     url = "shopping_trends.csv"  # Replace with a valid URL or path
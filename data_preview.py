@@ -0,0 +1,362 @@
+import io
+import operator
+import threading
+from typing import Any, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from data_fetcher import iter_csv_blocks, read_csv_header
+
+FILTER_OPERATORS = ('==', '!=', '<', '<=', '>', '>=', 'contains')
+
+_PANDAS_OPERATORS = {'==': operator.eq, '!=': operator.ne, '<': operator.lt,
+                     '<=': operator.le, '>': operator.gt, '>=': operator.ge}
+_ARROW_FUNCTIONS = {'==': 'equal', '!=': 'not_equal', '<': 'less',
+                    '<=': 'less_equal', '>': 'greater', '>=': 'greater_equal'}
+
+
+class DataPreview:
+    """
+    Pages of rows from a dataset, filtered and sorted on the server, without loading it whole.
+
+    Three backends, by what is available:
+    - an Arrow table (a memory-mapped snapshot): rows are taken by position, filters are
+      evaluated with pyarrow.compute and sorted pages come from a top-k selection;
+    - a CSV file: the byte offset of every index_stride-th row is recorded as far as pages
+      have been requested, so a page is read by seeking to the nearest recorded row. Filtered
+      or sorted pages stream the file in blocks and keep only the rows up to the page;
+    - a DataFrame, for sources that are only available in memory (e.g. API endpoints).
+
+    Row labels are the rows' positions in the dataset. The last filtered or sorted query is
+    remembered, so paging through its results doesn't repeat the scan. Quoted CSV fields
+    containing newlines are not supported.
+    """
+
+    def __init__(self, table=None, csv_path: Optional[str] = None, frame: Optional[pd.DataFrame] = None,
+                 index_stride: int = 10_000, block_bytes: int = 16 * 1024 ** 2):
+        """
+        Parameters:
+            table (pyarrow.Table, optional): The dataset as an Arrow table.
+            csv_path (str, optional): Path of the dataset as a CSV file.
+            frame (pd.DataFrame, optional): The dataset in memory.
+            index_stride (int): Rows between recorded byte offsets of a CSV file.
+            block_bytes (int): Bytes read per block when scanning a CSV file.
+        """
+        if sum(source is not None for source in (table, csv_path, frame)) != 1:
+            raise ValueError("Pass exactly one of table, csv_path or frame.")
+        self.table = table
+        self.csv_path = csv_path
+        self.frame = frame
+        self.index_stride = index_stride
+        self.block_bytes = block_bytes
+        self._lock = threading.Lock()
+        self._last = None  # (query, rows, total) of the last filtered or sorted page
+        if csv_path is not None:
+            self._names, self._data_start = read_csv_header(csv_path)
+            self._checkpoints = []  # Byte offsets of rows 0, index_stride, 2 * index_stride, ...
+            self._indexed_rows = 0
+            self._scan_offset = self._data_start
+            self._complete = False
+
+    @property
+    def columns(self) -> List[str]:
+        if self.table is not None:
+            return list(self.table.column_names)
+        if self.csv_path is not None:
+            return list(self._names)
+        return list(self.frame.columns)
+
+    @property
+    def num_rows(self) -> Optional[int]:
+        """Number of rows, or None while a CSV file hasn't been read to the end."""
+        if self.table is not None:
+            return self.table.num_rows
+        if self.csv_path is not None:
+            return self._indexed_rows if self._complete else None
+        return len(self.frame)
+
+    @property
+    def rows_seen(self) -> int:
+        """Number of rows known to exist so far."""
+        if self.csv_path is not None:
+            return self._indexed_rows
+        return self.num_rows
+
+    def page(self, page: int, page_size: int = 50,
+             filters: Optional[Sequence[Tuple[str, str, Any]]] = None,
+             sort_by: Optional[str] = None,
+             ascending: bool = True) -> Tuple[pd.DataFrame, Optional[int]]:
+        """
+        Return one page of rows.
+
+        Filters compare a column with a value: numeric columns numerically (the value is
+        converted to a number), other columns by their text. 'contains' matches a substring
+        of the text. Missing values never match. Sorting is stable and puts missing values last.
+
+        Parameters:
+            page (int): Zero-based page number.
+            page_size (int): Rows per page.
+            filters (List[Tuple[str, str, Any]], optional): (column, operator, value) conditions
+                that must all hold; operators are those in FILTER_OPERATORS.
+            sort_by (str, optional): Column to sort by; defaults to file order.
+            ascending (bool): Sort order.
+
+        Returns:
+            Tuple[pd.DataFrame, Optional[int]]:
+                - rows: The page, labelled by row position (empty past the last page).
+                - total: Number of matching rows, or None if not known without a full scan.
+        """
+        filters = [tuple(condition) for condition in (filters or [])]
+        for column, op, _ in filters:
+            if op not in FILTER_OPERATORS:
+                raise ValueError(f"Unknown filter operator {op!r}. Use one of {', '.join(FILTER_OPERATORS)}.")
+            if column not in self.columns:
+                raise ValueError(f"Unknown column {column!r}.")
+        if sort_by is not None and sort_by not in self.columns:
+            raise ValueError(f"Unknown column {sort_by!r}.")
+        start = max(int(page), 0) * page_size
+        with self._lock:
+            if self.table is not None:
+                return self._arrow_page(start, page_size, filters, sort_by, ascending)
+            if self.csv_path is not None:
+                return self._csv_page(start, page_size, filters, sort_by, ascending)
+            return self._frame_page(start, page_size, filters, sort_by, ascending)
+
+    def _stale(self, query, needed: int) -> bool:
+        # Whether the last query's rows can't serve the first `needed` rows of this one
+        if self._last is None or self._last[0] != query:
+            return True
+        _, rows, total = self._last
+        return len(rows) < needed and (total is None or len(rows) < total)
+
+    # Arrow tables
+
+    def _arrow_page(self, start, page_size, filters, sort_by, ascending):
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        if not filters and sort_by is None:
+            rows = np.arange(start, min(start + page_size, self.table.num_rows))
+            return self._arrow_take(rows), self.table.num_rows
+
+        query = (tuple(filters), sort_by, ascending)
+        needed = start + page_size
+        if self._stale(query, needed):
+            ids = None
+            if filters:
+                mask = _arrow_mask(self.table, filters).to_numpy(zero_copy_only=False)
+                ids = np.flatnonzero(mask).astype(np.int64)
+            total = self.table.num_rows if ids is None else len(ids)
+            if sort_by is None:
+                rows = ids
+            else:
+                keys = self.table.column(sort_by)
+                if pa.types.is_dictionary(keys.type):
+                    keys = keys.cast(keys.type.value_type)
+                if ids is not None:
+                    keys = keys.take(pa.array(ids))
+                # Remember a few pages ahead; ties keep file order
+                k = min(2 * needed, total)
+                order = 'ascending' if ascending else 'descending'
+                positions = np.empty(0, dtype=np.int64)
+                if k:
+                    ranked = pa.table({'key': keys, 'row': pa.array(np.arange(total))})
+                    positions = pc.select_k_unstable(
+                        ranked, k, sort_keys=[('key', order), ('row', 'ascending')]).to_numpy().astype(np.int64)
+                rows = positions if ids is None else ids[positions]
+            self._last = (query, rows, total)
+        _, rows, total = self._last
+        return self._arrow_take(rows[start:needed]), total
+
+    def _arrow_take(self, rows: np.ndarray) -> pd.DataFrame:
+        frame = self.table.take(rows).to_pandas()
+        frame.index = pd.Index(rows)
+        return frame
+
+    # CSV files
+
+    def _line_blocks(self, offset: int, block_bytes: int):
+        # Yield (offset, data, starts, ends) per block of whole lines read from a line start:
+        # the block's bytes and the positions of its non-blank lines within them
+        with open(self.csv_path, 'rb') as f:
+            f.seek(offset)
+            carry = b''
+            while True:
+                block = f.read(block_bytes)
+                data = carry + block
+                if not block:
+                    if not data:
+                        return
+                    data += b'\n'  # Last line of a file without a final newline
+                    carry = b''
+                else:
+                    end = data.rfind(b'\n') + 1
+                    if end == 0:
+                        carry = data  # A single line longer than the block; keep reading
+                        continue
+                    data, carry = data[:end], data[end:]
+                buffer = np.frombuffer(data, dtype=np.uint8)
+                ends = np.flatnonzero(buffer == ord('\n'))
+                starts = np.concatenate(([0], ends[:-1] + 1))
+                blank = (ends == starts) | ((ends == starts + 1) & (buffer[starts] == ord('\r')))
+                yield offset, data, starts[~blank], ends[~blank]
+                offset += len(data)
+                if not block:
+                    return
+
+    def _extend_index(self, rows: int) -> None:
+        # Record row offsets until at least `rows` rows are indexed or the file ends
+        if self._complete or self._indexed_rows >= rows:
+            return
+        for offset, data, starts, _ in self._line_blocks(self._scan_offset, self.block_bytes):
+            numbers = self._indexed_rows + np.arange(len(starts))
+            self._checkpoints.append(offset + starts[numbers % self.index_stride == 0])
+            self._indexed_rows += len(starts)
+            self._scan_offset = offset + len(data)
+            if self._indexed_rows >= rows:
+                return
+        self._complete = True
+
+    def _csv_rows(self, start: int, count: int) -> pd.DataFrame:
+        # Seek to the recorded row before start and read count rows from there
+        self._extend_index(start + count + 1)
+        count = max(min(count, self._indexed_rows - start), 0)
+        if not count:
+            return self._parse(b'', start)
+        checkpoint = start // self.index_stride
+        offset = int(np.concatenate(self._checkpoints)[checkpoint])
+        skip = start - checkpoint * self.index_stride
+        lines = []
+        for _, data, starts, ends in self._line_blocks(offset, 1024 ** 2):
+            take = slice(min(skip, len(starts)), min(skip + count - len(lines), len(starts)))
+            lines.extend(data[s:e + 1] for s, e in zip(starts[take], ends[take]))
+            skip = max(skip - len(starts), 0)
+            if len(lines) == count:
+                break
+        return self._parse(b''.join(lines), start)
+
+    def _parse(self, data: bytes, start: int) -> pd.DataFrame:
+        if not data:
+            return pd.DataFrame(columns=self._names)
+        frame = pd.read_csv(io.BytesIO(data), encoding='utf-8', header=None, names=self._names)
+        frame.index = pd.RangeIndex(start, start + len(frame))
+        return frame
+
+    def _csv_page(self, start, page_size, filters, sort_by, ascending):
+        if not filters and sort_by is None:
+            return self._csv_rows(start, page_size), self.num_rows
+
+        query = (tuple(filters), sort_by, ascending)
+        needed = start + page_size
+        if self._stale(query, needed):
+            # Keep the first (or, sorted, the smallest) k matching rows seen so far
+            k = 2 * needed
+            kept = pd.DataFrame(columns=self._names)
+            matched = 0
+            row = 0
+            total = None
+            for chunk, _ in iter_csv_blocks(self.csv_path, self._names, self._data_start, self.block_bytes):
+                chunk.index = pd.RangeIndex(row, row + len(chunk))
+                row += len(chunk)
+                if filters:
+                    chunk = chunk[_frame_mask(chunk, filters)]
+                matched += len(chunk)
+                kept = pd.concat([kept, chunk]) if len(kept) else chunk
+                if sort_by is not None:
+                    kept = _sort_frame(kept, sort_by, ascending).head(k)
+                elif len(kept) >= k:
+                    kept = kept.head(k)
+                    break
+            else:
+                total = matched
+            self._last = (query, kept, total)
+        _, kept, total = self._last
+        return kept.iloc[start:needed], total
+
+    # DataFrames
+
+    def _frame_page(self, start, page_size, filters, sort_by, ascending):
+        if not filters and sort_by is None:
+            return self.frame.iloc[start:start + page_size], len(self.frame)
+        query = (tuple(filters), sort_by, ascending)
+        if self._stale(query, 0):
+            rows = self.frame
+            if filters:
+                rows = rows[_frame_mask(rows, filters)]
+            if sort_by is not None:
+                rows = _sort_frame(rows, sort_by, ascending)
+            self._last = (query, rows, len(rows))
+        _, rows, total = self._last
+        return rows.iloc[start:start + page_size], total
+
+
+def _is_number(dtype) -> bool:
+    return pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)
+
+
+def _number(column: str, value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Column {column!r} is numeric; {value!r} is not a number.") from None
+
+
+def _frame_mask(df: pd.DataFrame, filters) -> np.ndarray:
+    mask = np.ones(len(df), dtype=bool)
+    for column, op, value in filters:
+        values = df[column]
+        present = values.notna().to_numpy()
+        if op != 'contains' and _is_number(values.dtype):
+            hit = _PANDAS_OPERATORS[op](values, _number(column, value))
+        else:
+            text = values.astype(str)
+            if op == 'contains':
+                hit = text.str.contains(str(value), regex=False)
+            else:
+                hit = _PANDAS_OPERATORS[op](text, str(value))
+        mask &= present & hit.to_numpy(dtype=bool, na_value=False)
+    return mask
+
+
+def _sort_frame(df: pd.DataFrame, column: str, ascending: bool) -> pd.DataFrame:
+    return df.sort_values(column, ascending=ascending, kind='stable', na_position='last')
+
+
+def _arrow_mask(table, filters):
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    mask = None
+    for column, op, value in filters:
+        values = table.column(column)
+        if pa.types.is_dictionary(values.type):
+            values = values.cast(values.type.value_type)
+        number = pa.types.is_integer(values.type) or pa.types.is_floating(values.type) \
+            or pa.types.is_decimal(values.type)
+        if op != 'contains' and number:
+            hit = getattr(pc, _ARROW_FUNCTIONS[op])(values.cast(pa.float64()), _number(column, value))
+        else:
+            if pa.types.is_boolean(values.type):
+                # Spell booleans the way pandas prints them
+                values = pc.if_else(values, 'True', 'False')
+            elif not (pa.types.is_string(values.type) or pa.types.is_large_string(values.type)):
+                values = values.cast(pa.string())
+            if op == 'contains':
+                hit = pc.match_substring(values, str(value))
+            else:
+                hit = getattr(pc, _ARROW_FUNCTIONS[op])(values, pa.scalar(str(value), values.type))
+        hit = pc.fill_null(hit, False)
+        mask = hit if mask is None else pc.and_(mask, hit)
+    return mask
+
+
+# Example usage (replace with your actual dataset URL)
+if __name__ == "__main__":
+    preview = DataPreview(csv_path="shopping_trends.csv")
+    rows, total = preview.page(0, page_size=10)
+    print(rows)
+    rows, total = preview.page(1, page_size=10, filters=[("Age", ">=", 60)], sort_by="Purchase Amount (USD)",
+                               ascending=False)
+    print(f"{total} matching rows")
+    print(rows)
@@ -0,0 +1,245 @@
+import math
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+DISTRIBUTIONS = ('normal', 'uniform')
+
+TABLE_COLUMNS = ["count", "tested", "method", "loc", "scale", "skewness", "kurtosis",
+                 "ks_statistic", "ks_p_value", "ad_statistic", "ad_p_value", "p_value", "passed"]
+
+
+def fit_parameters(expected_distribution: str, count: int, mean: float, std: float,
+                   minimum: float, maximum: float):
+    """
+    Parameters of the expected distribution scaled to the column.
+
+    Normal: the column's mean and standard deviation. Uniform: the column's range
+    widened by one average gap at each end (the unbiased estimate of the endpoints),
+    so the smallest and largest values don't sit exactly on the boundary.
+
+    Returns:
+        (float, float): loc and scale, as in scipy.stats.
+    """
+    if expected_distribution == 'normal':
+        return mean, std
+    if expected_distribution == 'uniform':
+        gap = (maximum - minimum) / (count - 1) if count > 1 else 0.0
+        return minimum - gap, (maximum - minimum) + 2 * gap
+    raise ValueError("Invalid expected distribution. Use 'normal' or 'uniform'.")
+
+
+def _fitted_cdf(expected_distribution: str, values: np.ndarray, loc: float, scale: float) -> np.ndarray:
+    if expected_distribution == 'normal':
+        from scipy.special import ndtr
+        return ndtr((values - loc) / scale)
+    return np.clip((values - loc) / scale, 0.0, 1.0)
+
+
+def _ad_segments(u: np.ndarray, ecdf: np.ndarray) -> float:
+    # Integral of (Fn - u)^2 / (u (1 - u)) du over [0, 1], where the empirical CDF Fn is
+    # a step function: ecdf[j] on [u[j], u[j + 1]), 0 before u[0] and 1 from u[-1] on.
+    # Per step, (c - u)^2 / (u (1 - u)) = c^2 / u + (1 - c)^2 / (1 - u) - 1.
+    lower = np.concatenate(([0.0], u))
+    upper = np.concatenate((u, [1.0]))
+    c = np.concatenate(([0.0], ecdf))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        left = np.where(c > 0, c * c * (np.log(upper) - np.log(lower)), 0.0)
+        right = np.where(c < 1, (1 - c) ** 2 * (np.log1p(-upper) - np.log1p(-lower)), 0.0)
+    return float(np.sum(left - right - (upper - lower)))
+
+
+def _ad_p_value(statistic: float, n: int, estimated: bool) -> float:
+    if not np.isfinite(statistic):
+        return 0.0
+    if estimated:
+        # Normal mean and variance estimated from the tested values (D'Agostino and Stephens, 1986)
+        a = statistic * (1 + 0.75 / n + 2.25 / n ** 2)
+        if a >= 0.6:
+            p = math.exp(1.2937 - 5.709 * a + 0.0186 * a * a)
+        elif a >= 0.34:
+            p = math.exp(0.9177 - 4.279 * a - 1.38 * a * a)
+        elif a >= 0.2:
+            p = 1 - math.exp(-8.318 + 42.796 * a - 59.938 * a * a)
+        else:
+            p = 1 - math.exp(-13.436 + 101.14 * a - 223.73 * a * a)
+        return float(min(max(p, 0.0), 1.0))
+    # Fully specified distribution: asymptotic null distribution (Marsaglia and Marsaglia, 2004)
+    z = statistic
+    if z <= 0:
+        return 1.0
+    if z < 2:
+        cdf = math.exp(-1.2337141 / z) / math.sqrt(z) * (
+            2.00012 + (0.247105 - (0.0649821 - (0.0347962 - (0.011672 - 0.00168691 * z) * z) * z) * z) * z)
+    else:
+        cdf = math.exp(-math.exp(1.0776 - (2.30695 - (0.43424 - (0.082433 - (0.008056 - 0.0003146 * z)
+                                                                   * z) * z) * z) * z))
+    return float(min(max(1.0 - cdf, 0.0), 1.0))
+
+
+def ecdf_tests(values: np.ndarray, ecdf: np.ndarray, n: int, expected_distribution: str,
+               loc: float, scale: float, fitted_to_sample: bool = True) -> Dict[str, float]:
+    """
+    Kolmogorov-Smirnov and Anderson-Darling tests of an empirical CDF against the
+    fitted distribution.
+
+    The empirical CDF is given as sorted points, so the same code serves a full
+    sample (every value with ecdf = rank / n) and a quantile sketch's retained items.
+
+    Parameters:
+        values (np.ndarray): Sorted distinct values.
+        ecdf (np.ndarray): Fraction of values <= each value.
+        n (int): Sample size the p-values are computed for.
+        expected_distribution (str): 'normal' or 'uniform'.
+        loc (float): Fitted location (see fit_parameters).
+        scale (float): Fitted scale.
+        fitted_to_sample (bool): Whether loc and scale were estimated from the tested
+            values themselves. Parameters fitted to a whole column and tested on a
+            small subsample of it are as good as known, which calls for a wider null
+            distribution of the normal Anderson-Darling statistic.
+
+    Returns:
+        Dict[str, float]: ks_statistic, ks_p_value, ad_statistic and ad_p_value.
+    """
+    if n < 2 or len(values) == 0 or not scale > 0:
+        return {"ks_statistic": np.nan, "ks_p_value": np.nan, "ad_statistic": np.nan, "ad_p_value": np.nan}
+    from scipy.stats import kstwo
+
+    u = _fitted_cdf(expected_distribution, np.asarray(values, dtype=np.float64), loc, scale)
+    previous = np.concatenate(([0.0], ecdf[:-1]))
+    ks = float(max(np.max(ecdf - u), np.max(u - previous), 0.0))
+    ad = n * _ad_segments(u, ecdf)
+    return {
+        "ks_statistic": ks,
+        "ks_p_value": float(kstwo.sf(ks, n)),
+        "ad_statistic": ad,
+        "ad_p_value": _ad_p_value(ad, n, estimated=fitted_to_sample and expected_distribution == 'normal'),
+    }
+
+
+def _sample_ecdf(sample: np.ndarray):
+    values, counts = np.unique(sample, return_counts=True)
+    return values, np.cumsum(counts) / len(sample)
+
+
+def _row(count: int, tested: int, method: str, loc: float, scale: float, skewness: float, kurtosis: float,
+         tests: Dict[str, float], alpha: float) -> dict:
+    # A quantile sketch's rank error is bounded uniformly, not relative to the tails that
+    # Anderson-Darling weights most, so sketch rows are decided by Kolmogorov-Smirnov.
+    p_value = tests["ks_p_value" if method == 'sketch' else "ad_p_value"]
+    return {"count": count, "tested": tested, "method": method, "loc": loc, "scale": scale,
+            "skewness": skewness, "kurtosis": kurtosis, **tests, "p_value": p_value,
+            "passed": bool(p_value >= alpha) if np.isfinite(p_value) else None}
+
+
+def distribution_table(df: pd.DataFrame, columns: Optional[List[str]] = None,
+                       expected_distribution: str = 'normal', max_samples: int = 5000,
+                       alpha: float = 0.05, seed: Optional[int] = 0) -> pd.DataFrame:
+    """
+    Test every numeric column against an expected distribution in one call.
+
+    Parameters are fitted from the whole column (see fit_parameters). Columns with more
+    than max_samples values are tested on a random subsample of that size: with millions
+    of rows any test rejects even negligible deviations, and the tests' cost stays flat.
+    The rows are drawn once and shared by all columns.
+
+    Parameters:
+        df (pd.DataFrame): The dataset.
+        columns (List[str], optional): Columns to test; defaults to all numeric columns.
+        expected_distribution (str): 'normal' or 'uniform'.
+        max_samples (int): Largest sample a test is run on.
+        alpha (float): Significance level for 'passed'.
+        seed (int, optional): Seed of the subsample.
+
+    Returns:
+        pd.DataFrame: One row per column: count, tested (sample size), method ('exact' or
+            'subsample'), fitted loc and scale, population skewness and excess kurtosis,
+            the KS and Anderson-Darling statistics and p-values, p_value (Anderson-Darling)
+            and passed (p_value >= alpha).
+    """
+    if expected_distribution not in DISTRIBUTIONS:
+        raise ValueError("Invalid expected distribution. Use 'normal' or 'uniform'.")
+    if columns is None:
+        columns = [c for c in df.columns
+                   if pd.api.types.is_numeric_dtype(df[c].dtype) and not pd.api.types.is_bool_dtype(df[c].dtype)]
+    numeric = df[list(columns)].astype(np.float64)
+    count = numeric.count()
+    mean, std = numeric.mean(), numeric.std()
+    minimum, maximum = numeric.min(), numeric.max()
+    # Population skewness and excess kurtosis, as ColumnAccumulator reports them, from
+    # pandas' sample-adjusted ones
+    n = count.astype(np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        skewness = numeric.skew() * (n - 2) / np.sqrt(n * (n - 1))
+        kurtosis = numeric.kurt() * (n - 2) * (n - 3) / ((n + 1) * (n - 1)) - 6 / (n + 1)
+    skewness, kurtosis = skewness.where(std > 0), kurtosis.where(std > 0)
+
+    subsample = len(numeric) > max_samples
+    if subsample:
+        rows = np.sort(np.random.default_rng(seed).choice(len(numeric), max_samples, replace=False))
+        sample = numeric.to_numpy()[rows]
+    else:
+        sample = numeric.to_numpy()
+
+    table = {}
+    for position, column in enumerate(columns):
+        values = sample[:, position]
+        values = values[~np.isnan(values)]
+        if len(values) < min(max_samples, count[column]) // 2:
+            # Sparse column: sample its own non-null values instead
+            values = numeric[column].dropna()
+            values = values.sample(min(max_samples, len(values)), random_state=seed).to_numpy()
+        loc, scale = fit_parameters(expected_distribution, int(count[column]), mean[column], std[column],
+                                    minimum[column], maximum[column])
+        points, ecdf = _sample_ecdf(values)
+        method = 'subsample' if len(values) < count[column] else 'exact'
+        tests = ecdf_tests(points, ecdf, len(values), expected_distribution, loc, scale,
+                           fitted_to_sample=method == 'exact')
+        table[column] = _row(int(count[column]), len(values), method, loc, scale,
+                             skewness[column], kurtosis[column], tests, alpha)
+    return pd.DataFrame.from_dict(table, orient='index', columns=TABLE_COLUMNS)
+
+
+def sketch_tests(accumulator, expected_distribution: str = 'normal', max_samples: int = 5000,
+                 alpha: float = 0.05) -> dict:
+    """
+    The distribution_table row of a streamed column, from a ColumnAccumulator's moments,
+    range and quantile sketch, i.e. without another pass over the data.
+
+    p-values are computed for min(count, max_samples) values, matching what
+    distribution_table reports for a subsample; the sketch's rank error (about 1.7 / k)
+    stays well below the KS critical value at that size for the default k.
+
+    Parameters:
+        accumulator (ColumnAccumulator): A numeric column's accumulator.
+        expected_distribution (str): 'normal' or 'uniform'.
+        max_samples (int): Sample size the p-values are computed for, at most.
+        alpha (float): Significance level for 'passed'.
+
+    Returns:
+        dict: The row, with method 'sketch' (or 'exact' while the sketch still holds every
+              value); p_value is the KS p-value for 'sketch' rows.
+    """
+    count = accumulator.count
+    loc, scale = fit_parameters(expected_distribution, count, accumulator.mean, accumulator.std(),
+                                accumulator.min, accumulator.max)
+    if count:
+        items, ecdf = accumulator.quantiles.cdf_points()
+        # Retained items can repeat; keep the last (highest) CDF value of each
+        last = np.append(items[1:] != items[:-1], True)
+        items, ecdf = items[last], ecdf[last]
+    else:
+        items = ecdf = np.empty(0)
+    tested = min(count, max_samples)
+    tests = ecdf_tests(items, ecdf, tested, expected_distribution, loc, scale, fitted_to_sample=tested == count)
+    exact = len(accumulator.quantiles.levels) == 1
+    method = 'exact' if exact and tested == count else 'sketch'
+    return _row(count, tested, method, loc, scale, accumulator.skewness(), accumulator.kurtosis(), tests, alpha)
+
+
+# Example usage (replace with your actual dataset URL)
+if __name__ == "__main__":
+    df = pd.read_csv("shopping_trends.csv")
+    print(distribution_table(df, expected_distribution='uniform'))
+    print(distribution_table(df, expected_distribution='normal'))
@@ -0,0 +1,348 @@
+import codecs
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+
+_SESSIONS: Dict[int, requests.Session] = {}
+_SESSIONS_LOCK = threading.Lock()
+
+
+def get_session(pool_size: int = 10) -> requests.Session:
+    """
+    Return a process-wide Session whose connection pool holds pool_size connections per host.
+
+    Parameters:
+        pool_size (int): Connections kept alive per host.
+
+    Returns:
+        requests.Session: A shared, pooled session.
+    """
+    with _SESSIONS_LOCK:
+        if pool_size not in _SESSIONS:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=2)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _SESSIONS[pool_size] = session
+        return _SESSIONS[pool_size]
+
+
+def iter_json_records(blocks: Iterable[bytes], encoding: str = "utf-8") -> Iterator[object]:
+    """
+    Incrementally parse a JSON body from byte blocks, yielding records as they complete.
+
+    A top-level array yields its elements one by one without buffering the whole body.
+    JSON Lines (one document per line) is handled the same way. Any other top-level
+    value is parsed once the body is complete; an object is yielded as a JsonDocument.
+
+    Parameters:
+        blocks (Iterable[bytes]): The response body, in arbitrary pieces.
+        encoding (str): Text encoding of the body.
+
+    Yields:
+        object: Parsed records.
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder(encoding)()
+    blocks = iter(blocks)
+    buffer = ""
+    pos = 0
+    mode = None  # 'array', 'lines' or 'document'
+    finished = False
+
+    def more() -> bool:
+        nonlocal buffer, pos, finished
+        if finished:
+            return False
+        block = next(blocks, None)
+        if block is None:
+            finished = True
+            buffer = buffer[pos:] + text_decoder.decode(b"", final=True)
+        else:
+            buffer = buffer[pos:] + text_decoder.decode(block)
+        pos = 0
+        return True
+
+    def skip(chars: str) -> None:
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and buffer[pos] in chars:
+                pos += 1
+            if pos < len(buffer) or not more():
+                return
+
+    skip(" \t\r\n\ufeff")
+    if pos >= len(buffer):
+        return
+    if buffer[pos] == "[":
+        mode = "array"
+        pos += 1
+    elif buffer[pos] == "{":
+        # JSON Lines if the first line holds a complete document and more documents follow
+        buffer, pos = buffer[pos:], 0  # With pos at 0, more() keeps indexes into buffer valid
+        line_end = buffer.find("\n")
+        while line_end == -1 and more():
+            line_end = buffer.find("\n")
+        mode = "document"
+        if line_end != -1:
+            try:
+                decoder.raw_decode(buffer[:line_end])
+                rest = line_end
+                while True:
+                    while rest < len(buffer) and buffer[rest] in " \t\r\n":
+                        rest += 1
+                    if rest < len(buffer) or not more():
+                        break
+                if rest < len(buffer):
+                    mode = "lines"
+            except json.JSONDecodeError:
+                pass
+    else:
+        mode = "document"
+
+    if mode == "document":
+        while more():
+            pass
+        document = json.loads(buffer[pos:])
+        if isinstance(document, dict):
+            yield JsonDocument(document)
+        else:
+            yield document
+        return
+
+    separators = " \t\r\n," if mode == "array" else " \t\r\n"
+    while True:
+        skip(separators)
+        if pos >= len(buffer):
+            if mode == "array":
+                raise ValueError("Truncated JSON array in response body.")
+            return
+        if mode == "array" and buffer[pos] == "]":
+            while more():
+                pass  # Drain the body so that a response being cached is completed
+            return
+        try:
+            record, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            if more():
+                continue  # The record is split across blocks; read on
+            raise
+        if not isinstance(record, (dict, list, str)) and (end == len(buffer) or buffer[end] not in " \t\r\n,]"):
+            if more():
+                continue  # A number cut at a block boundary (e.g. "7" of "7.5"); read on
+        pos = end
+        yield record
+
+
+class JsonDocument(dict):
+    """A top-level JSON object that was not streamed record by record (e.g. a dict of columns)."""
+
+
+def batches(records: Iterable[object], batch_size: int) -> Iterator[pd.DataFrame]:
+    """
+    Group parsed records into DataFrames of at most batch_size rows.
+
+    Parameters:
+        records (Iterable[object]): Parsed JSON records.
+        batch_size (int): Rows per DataFrame.
+
+    Yields:
+        pd.DataFrame: Record batches.
+    """
+    batch: List[object] = []
+    for record in records:
+        if isinstance(record, JsonDocument):
+            # Same as pd.DataFrame(response.json()) for a whole-document response
+            yield pd.DataFrame(dict(record))
+            continue
+        batch.append(record)
+        if len(batch) >= batch_size:
+            yield pd.DataFrame(batch)
+            batch = []
+    if batch:
+        yield pd.DataFrame(batch)
+
+
+class HttpSource:
+    """
+    JSON API source with pooled connections, on-disk revalidation caching,
+    streaming parsing into record batches and concurrent pagination.
+    """
+
+    def __init__(self,
+                 url: str,
+                 cache_dir: Optional[str] = None,
+                 timeout: float = 30.0,
+                 pool_size: int = 10,
+                 batch_size: int = 10_000,
+                 page_param: Optional[str] = None,
+                 first_page: int = 1,
+                 max_in_flight: int = 4,
+                 max_pages: Optional[int] = None,
+                 params: Optional[dict] = None,
+                 headers: Optional[dict] = None,
+                 records_key: Optional[str] = None):
+        """
+        Parameters:
+            url (str): Endpoint returning a JSON array, JSON Lines or a JSON document.
+            cache_dir (str, optional): Directory of cached bodies revalidated with ETag / Last-Modified.
+            timeout (float): Connect and read timeout in seconds.
+            pool_size (int): Connections kept alive per host.
+            batch_size (int): Rows per yielded DataFrame.
+            page_param (str, optional): Query parameter for page numbers, e.g. 'page'. Pages are
+                fetched concurrently until one comes back empty. Without it, 'next' links in the
+                Link header are followed one after another.
+            first_page (int): Number of the first page.
+            max_in_flight (int): Largest number of concurrent page requests.
+            max_pages (int, optional): Stop after this many pages.
+            params (dict, optional): Extra query parameters.
+            headers (dict, optional): Extra request headers.
+            records_key (str, optional): Key holding the records when the body is an object such as
+                {"data": [...]}. Such bodies are parsed whole rather than streamed.
+        """
+        self.url = url
+        self.cache_dir = cache_dir
+        self.timeout = timeout
+        self.batch_size = batch_size
+        self.page_param = page_param
+        self.first_page = first_page
+        self.max_in_flight = max(1, max_in_flight)
+        self.max_pages = max_pages
+        self.params = dict(params or {})
+        self.headers = dict(headers or {})
+        self.records_key = records_key
+        self.session = get_session(max(pool_size, self.max_in_flight))
+        self.last_modified = None  # Last-Modified header of the first page, once requested
+
+    def fetch(self) -> pd.DataFrame:
+        """
+        Fetch every record into one DataFrame.
+
+        Returns:
+            pd.DataFrame: All records of all pages.
+        """
+        frames = list(self.iter_batches())
+        if not frames:
+            return pd.DataFrame()
+        return frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+
+    def iter_batches(self) -> Iterator[pd.DataFrame]:
+        """
+        Stream the source as DataFrames of at most batch_size rows, in page order.
+
+        Yields:
+            pd.DataFrame: Record batches.
+        """
+        if self.page_param:
+            yield from self._iter_paged()
+            return
+        url, params, pages = self.url, self.params, 0
+        while url and (self.max_pages is None or pages < self.max_pages):
+            records, next_url = self._request(url, params)
+            yield from batches(records, self.batch_size)
+            url, params, pages = next_url, None, pages + 1
+
+    def _iter_paged(self) -> Iterator[pd.DataFrame]:
+        # Keep up to max_in_flight pages in flight and emit them in order; the first empty
+        # page ends the stream and any later pages already requested are discarded.
+        def load(page: int) -> List[object]:
+            records, _ = self._request(self.url, {**self.params, self.page_param: page})
+            return list(records)
+
+        last_page = None if self.max_pages is None else self.first_page + self.max_pages - 1
+        with ThreadPoolExecutor(max_workers=self.max_in_flight) as pool:
+            in_flight = {}
+            next_page = self.first_page
+            current = self.first_page
+            while True:
+                while len(in_flight) < self.max_in_flight and (last_page is None or next_page <= last_page):
+                    in_flight[next_page] = pool.submit(load, next_page)
+                    next_page += 1
+                if current not in in_flight:
+                    break
+                records = in_flight.pop(current).result()
+                if not records:
+                    break
+                yield from batches(records, self.batch_size)
+                current += 1
+            for future in in_flight.values():
+                future.cancel()
+
+    def _cache_paths(self, url: str, params: Optional[dict]):
+        key = hashlib.blake2b(json.dumps([url, sorted((params or {}).items())], default=str).encode(),
+                              digest_size=16).hexdigest()
+        base = os.path.join(self.cache_dir, key)
+        return base + ".json", base + ".body"
+
+    def _request(self, url: str, params: Optional[dict]):
+        # Returns (record iterator, next page URL from the Link header or None).
+        headers = dict(self.headers)
+        meta = None
+        if self.cache_dir:
+            meta_path, body_path = self._cache_paths(url, params)
+            if os.path.exists(meta_path) and os.path.exists(body_path):
+                with open(meta_path, encoding="utf-8") as f:
+                    meta = json.load(f)
+                if meta.get("etag"):
+                    headers["If-None-Match"] = meta["etag"]
+                if meta.get("last_modified"):
+                    headers["If-Modified-Since"] = meta["last_modified"]
+
+        response = self.session.get(url, params=params, headers=headers, timeout=self.timeout, stream=True)
+        if response.status_code == 304 and meta is not None:
+            response.close()
+            self.last_modified = self.last_modified or meta.get("last_modified")
+            return self._unwrap(self._read_cached(body_path, meta.get("encoding", "utf-8"))), meta.get("next")
+        response.raise_for_status()
+        self.last_modified = self.last_modified or response.headers.get("Last-Modified")
+        next_url = response.links.get("next", {}).get("url")
+        encoding = response.encoding or "utf-8"
+        if encoding.lower() == "iso-8859-1" and "json" in response.headers.get("Content-Type", ""):
+            encoding = "utf-8"  # JSON defaults to UTF-8; requests assumes Latin-1 without a charset
+        blocks = response.iter_content(chunk_size=1 << 16)
+        if self.cache_dir:
+            blocks = self._tee_to_cache(blocks, response, url, params, next_url, encoding)
+        return self._unwrap(iter_json_records(blocks, encoding=encoding)), next_url
+
+    def _unwrap(self, records: Iterator[object]) -> Iterator[object]:
+        for record in records:
+            if self.records_key and isinstance(record, JsonDocument):
+                yield from record.get(self.records_key) or []
+            else:
+                yield record
+
+    def _tee_to_cache(self, blocks, response, url, params, next_url, encoding):
+        # Write the body to the cache as it streams by; publish it only once complete.
+        meta_path, body_path = self._cache_paths(url, params)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = f"{body_path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            for block in blocks:
+                f.write(block)
+                yield block
+        os.replace(tmp_path, body_path)
+        meta = {
+            "url": url,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "next": next_url,
+            "encoding": encoding,
+        }
+        with open(meta_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+
+    @staticmethod
+    def _read_cached(body_path: str, encoding: str) -> Iterator[object]:
+        def blocks():
+            with open(body_path, "rb") as f:
+                for block in iter(lambda: f.read(1 << 16), b""):
+                    yield block
+
+        return iter_json_records(blocks(), encoding=encoding)
@@ -0,0 +1,164 @@
+import hashlib
+import os
+import pickle
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from data_analyzer import DataAnalyzer
+from data_fetcher import iter_csv_blocks, read_csv_header
+from sketches import value_hashes
+from streaming_profiler import StreamingProfiler
+
+
+class IncrementalAnalyzer:
+    """
+    Keeps a StreamingProfiler for an append-only CSV together with the byte
+    offset it has processed, so that a refresh only parses the new tail.
+
+    If the file shrank or its already-processed bytes changed (checked on the
+    head and the last processed bytes), the profile is rebuilt from scratch.
+    """
+
+    CHECK_BYTES = 64 * 1024
+
+    def __init__(self, path: str, key_columns: Optional[List[str]] = None,
+                 block_bytes: int = 64 * 1024 ** 2, sketch_k: int = 200):
+        """
+        Parameters:
+            path (str): Path of the CSV file.
+            key_columns (List[str], optional): Columns whose combined values should be unique.
+            block_bytes (int): Approximate bytes parsed per block.
+            sketch_k (int): Accuracy parameter of the quantile sketches.
+        """
+        self.path = path
+        self.key_columns = list(key_columns or [])
+        self.block_bytes = block_bytes
+        self.sketch_k = sketch_k
+        self._reset()
+
+    def _reset(self) -> None:
+        self.profiler = StreamingProfiler(sketch_k=self.sketch_k)
+        self.names: List[str] = []
+        self.offset = 0
+        self.mtime_ns = None
+        self.head_digest = None
+        self.tail_digest = None
+        self.key_hashes = np.empty(0, dtype=np.uint64)  # Sorted distinct key hashes
+        self.duplicate_keys = 0
+
+    def _digest(self, start: int, stop: int) -> Optional[str]:
+        if stop <= start:
+            return None
+        with open(self.path, 'rb') as f:
+            f.seek(start)
+            return hashlib.blake2b(f.read(stop - start), digest_size=16).hexdigest()
+
+    def _prefix_unchanged(self, size: int) -> bool:
+        if self.offset == 0 or size < self.offset:
+            return False
+        head = self._digest(0, min(self.CHECK_BYTES, self.offset))
+        tail = self._digest(max(0, self.offset - self.CHECK_BYTES), self.offset)
+        return head == self.head_digest and tail == self.tail_digest
+
+    def _key_hashes(self, chunk: pd.DataFrame) -> np.ndarray:
+        combined = np.zeros(len(chunk), dtype=np.uint64)
+        with np.errstate(over='ignore'):
+            for column in self.key_columns:
+                combined = combined * np.uint64(1000003) ^ value_hashes(chunk[column])
+        return combined
+
+    def _update_keys(self, chunk: pd.DataFrame) -> None:
+        missing = [column for column in self.key_columns if column not in chunk.columns]
+        if missing:
+            raise ValueError(f"Key columns not found in dataset: {missing}")
+        hashes = np.unique(self._key_hashes(chunk), return_counts=False)
+        new_rows = len(chunk)
+        seen_before = np.isin(hashes, self.key_hashes, assume_unique=True)
+        # Rows whose key already occurred, within this chunk or earlier
+        self.duplicate_keys += new_rows - len(hashes) + int(seen_before.sum())
+        self.key_hashes = np.union1d(self.key_hashes, hashes[~seen_before])
+
+    def refresh(self) -> Dict[str, object]:
+        """
+        Bring the profile up to date with the file.
+
+        Returns:
+            Dict[str, object]: 'mode' ('unchanged', 'incremental' or 'full') and 'new_rows'.
+        """
+        stat = os.stat(self.path)
+        if self.offset and stat.st_size == self.offset and stat.st_mtime_ns == self.mtime_ns:
+            return {"mode": "unchanged", "new_rows": 0}
+
+        if self._prefix_unchanged(stat.st_size):
+            mode = "incremental"
+        else:
+            mode = "full"
+            self._reset()
+            self.names, self.offset = read_csv_header(self.path)
+
+        rows_before = self.profiler.rows
+        for chunk, end in iter_csv_blocks(self.path, self.names, self.offset, self.block_bytes):
+            self.profiler.update(chunk)
+            if self.key_columns:
+                self._update_keys(chunk)
+            self.offset = end
+
+        self.mtime_ns = stat.st_mtime_ns
+        self.head_digest = self._digest(0, min(self.CHECK_BYTES, self.offset))
+        self.tail_digest = self._digest(max(0, self.offset - self.CHECK_BYTES), self.offset)
+        return {"mode": mode, "new_rows": self.profiler.rows - rows_before}
+
+    def calculate_completeness_score(self) -> float:
+        return self.profiler.calculate_completeness_score()
+
+    def calculate_metadata_quality_score(self, column_descriptions=None) -> float:
+        return self.profiler.calculate_metadata_quality_score(column_descriptions)
+
+    def statistical_summary(self) -> pd.DataFrame:
+        return self.profiler.statistical_summary()
+
+    def outlier_bounds(self, method: str = 'IQR') -> Dict[str, Dict[str, float]]:
+        return self.profiler.outlier_bounds(method=method)
+
+    def validate_distributions(self, columns: Optional[List[str]] = None, expected_distribution: str = 'normal',
+                               max_samples: int = 5000, alpha: float = 0.05) -> pd.DataFrame:
+        return self.profiler.validate_distributions(columns, expected_distribution, max_samples, alpha)
+
+    def text_data_analysis(self, text_columns: Optional[List[str]] = None) -> Dict[str, Dict[str, int]]:
+        return self.profiler.text_data_analysis(text_columns)
+
+    def integrity_checks(self) -> Dict[str, object]:
+        """
+        Uniqueness of the key columns over every row seen so far.
+
+        Returns:
+            Dict[str, object]: 'unique' (bool), 'duplicate_rows' and 'distinct_keys'.
+        """
+        return {
+            "unique": self.duplicate_keys == 0,
+            "duplicate_rows": self.duplicate_keys,
+            "distinct_keys": len(self.key_hashes),
+        }
+
+    def save(self, path: str) -> None:
+        """Persist the accumulated state, so a later process can refresh incrementally."""
+        with open(path, 'wb') as f:
+            pickle.dump(self, f)
+
+    @staticmethod
+    def load(path: str) -> "IncrementalAnalyzer":
+        """Load state written by save()."""
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+
+
+# Example usage (replace with your actual dataset URL)
+if __name__ == "__main__":
+    analyzer = IncrementalAnalyzer("shopping_trends.csv", key_columns=["Customer ID"])
+    print("Refresh:", analyzer.refresh())
+    print("Completeness Score:", analyzer.calculate_completeness_score())
+    print("Integrity Checks:", analyzer.integrity_checks())
+    print("Refresh:", analyzer.refresh())
+    print("Same check on the full frame:", DataAnalyzer.integrity_checks(pd.read_csv("shopping_trends.csv"), ["Customer ID"]))
@@ -0,0 +1,298 @@
+import contextlib
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+import tracemalloc
+from typing import Iterator, List, Optional
+
+import pandas as pd
+
+
+class Instrumentation:
+    """
+    Records wall time, CPU time, peak allocated memory and the rows and columns touched
+    by each step of a scoring run.
+
+    Peak memory comes from tracemalloc, which is process-wide: steps running at the same
+    time in other threads are counted too. Tracing slows allocation-heavy code down a
+    little, so it can be switched off with track_memory=False.
+    """
+
+    def __init__(self, track_memory: bool = True):
+        self.track_memory = track_memory
+        self.records: List[dict] = []
+        self._lock = threading.Lock()
+        self._local = threading.local()  # Per-thread stack of open steps, for nested peaks
+
+    @contextlib.contextmanager
+    def measure(self, step: str, detail: str = "", rows: Optional[int] = None, columns: Optional[int] = None):
+        """
+        Measure the enclosed block as one step.
+
+        The yielded record can be updated inside the block, e.g. record['rows'] = len(df)
+        once the number of rows is known.
+
+        Parameters:
+            step (str): Step name, e.g. 'DataAnalyzer.detect_outliers'.
+            detail (str): Short description of the arguments.
+            rows (int, optional): Rows touched.
+            columns (int, optional): Columns touched.
+
+        Yields:
+            dict: The step's record.
+        """
+        record = {"step": step, "detail": detail, "rows": rows, "columns": columns}
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        started_tracing = False
+        frame = None
+        if self.track_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                started_tracing = True
+            current, peak = tracemalloc.get_traced_memory()
+            if stack:
+                stack[-1]["peak"] = max(stack[-1]["peak"], peak)
+            tracemalloc.reset_peak()
+            frame = {"base": current, "peak": current}
+            stack.append(frame)
+
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield record
+        finally:
+            record["wall_seconds"] = time.perf_counter() - wall
+            record["cpu_seconds"] = time.process_time() - cpu
+            record["peak_bytes"] = None
+            if frame is not None:
+                _, peak = tracemalloc.get_traced_memory()
+                frame["peak"] = max(frame["peak"], peak)
+                stack.pop()
+                record["peak_bytes"] = frame["peak"] - frame["base"]
+                if stack:
+                    stack[-1]["peak"] = max(stack[-1]["peak"], frame["peak"])
+                if started_tracing:
+                    tracemalloc.stop()
+            self.add(record)
+
+    def add(self, record: dict) -> None:
+        """Append a finished step's record."""
+        with self._lock:
+            self.records.append(record)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.records = []
+
+    def summary(self) -> pd.DataFrame:
+        """
+        Totals per step, slowest first.
+
+        Returns:
+            pd.DataFrame: calls, wall_seconds, cpu_seconds, peak_bytes (largest), rows and
+                          columns (largest) per step.
+        """
+        columns = ["calls", "wall_seconds", "cpu_seconds", "peak_bytes", "rows", "columns"]
+        if not self.records:
+            return pd.DataFrame(columns=columns)
+        records = pd.DataFrame(self.records)
+        summary = records.groupby("step").agg(
+            calls=("step", "size"),
+            wall_seconds=("wall_seconds", "sum"),
+            cpu_seconds=("cpu_seconds", "sum"),
+            peak_bytes=("peak_bytes", "max"),
+            rows=("rows", "max"),
+            columns=("columns", "max"),
+        )
+        return summary.sort_values("wall_seconds", ascending=False)
+
+    def to_json(self) -> str:
+        """
+        Export every recorded step as JSON.
+
+        Returns:
+            str: {"records": [...]} with one object per step run.
+        """
+        with self._lock:
+            return json.dumps({"records": self.records}, default=str)
+
+    def to_openmetrics(self, prefix: str = "dataset_trust") -> str:
+        """
+        Export the per-step totals in the OpenMetrics text format.
+
+        Parameters:
+            prefix (str): Metric name prefix.
+
+        Returns:
+            str: Counters for calls, wall and CPU seconds, and gauges for peak bytes, rows
+                 and columns, labelled by step.
+        """
+        summary = self.summary()
+        metrics = [
+            ("step_calls", "counter", None, "calls", "Number of runs of the step."),
+            ("step_wall_seconds", "counter", "seconds", "wall_seconds", "Wall-clock time spent in the step."),
+            ("step_cpu_seconds", "counter", "seconds", "cpu_seconds", "CPU time spent in the step."),
+            ("step_peak_bytes", "gauge", "bytes", "peak_bytes", "Largest peak of traced allocations in the step."),
+            ("step_rows", "gauge", None, "rows", "Largest number of rows the step touched."),
+            ("step_columns", "gauge", None, "columns", "Largest number of columns the step touched."),
+        ]
+        lines = []
+        for name, kind, unit, column, help_text in metrics:
+            metric = f"{prefix}_{name}"
+            lines.append(f"# TYPE {metric} {kind}")
+            if unit:
+                lines.append(f"# UNIT {metric} {unit}")
+            lines.append(f"# HELP {metric} {help_text}")
+            sample = f"{metric}_total" if kind == "counter" else metric
+            for step, value in summary[column].items():
+                if pd.isna(value):
+                    continue
+                label = str(step).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+                lines.append(f"{sample}{{step=\"{label}\"}} {float(value):g}")
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str) -> None:
+        """
+        Write the measurements to a file: JSON for '.json', OpenMetrics text otherwise
+        (e.g. for a node_exporter textfile collector). The file is replaced atomically.
+
+        Parameters:
+            path (str): Output file.
+        """
+        text = self.to_json() if path.endswith(".json") else self.to_openmetrics()
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+
+
+def _shape(args: tuple, kwargs: dict):
+    # Rows of the first DataFrame argument; columns are those selected by a column-list
+    # (or single column name) argument if there is one, otherwise all of them.
+    values = list(args) + list(kwargs.values())
+    df = next((v for v in values if isinstance(v, pd.DataFrame)), None)
+    if df is None:
+        return None, None
+    columns = df.shape[1]
+    for value in values:
+        if isinstance(value, str) and value in df.columns:
+            columns = 1
+            break
+        if isinstance(value, (list, tuple)) and value and all(isinstance(v, str) for v in value) \
+                and set(value) <= set(df.columns):
+            columns = len(value)
+            break
+    return df.shape[0], columns
+
+
+def _detail(args: tuple, kwargs: dict) -> str:
+    parts = [repr(v) for v in args if not isinstance(v, (pd.DataFrame, pd.Series))]
+    parts += [f"{k}={v!r}" for k, v in kwargs.items() if not isinstance(v, (pd.DataFrame, pd.Series))]
+    detail = ", ".join(parts)
+    return detail if len(detail) <= 80 else detail[:77] + "..."
+
+
+class Instrumented:
+    """
+    Proxy that measures every public method call of the wrapped object (a DataFetcher,
+    DataAnalyzer, CachedAnalyzer or TrustScoreCalculator) with an Instrumentation.
+
+    Attribute reads and writes pass through to the wrapped object. Methods returning
+    iterators (e.g. DataFetcher.iter_chunks) are measured while they are consumed.
+    """
+
+    def __init__(self, target, recorder: Instrumentation, name: Optional[str] = None):
+        object.__setattr__(self, "_target", target)
+        object.__setattr__(self, "_recorder", recorder)
+        target_name = target.__name__ if inspect.isclass(target) else type(target).__name__
+        object.__setattr__(self, "_name", name or target_name)
+
+    def __setattr__(self, name: str, value) -> None:
+        setattr(self._target, name, value)
+
+    def __getattr__(self, name: str):
+        attribute = getattr(self._target, name)
+        if name.startswith('_') or not callable(attribute):
+            return attribute
+        step = f"{self._name}.{name}"
+        recorder = self._recorder
+
+        @functools.wraps(attribute)
+        def measured(*args, **kwargs):
+            if inspect.isgeneratorfunction(attribute):
+                return _measured_iterator(attribute(*args, **kwargs), recorder, step, _detail(args, kwargs))
+            rows, columns = _shape(args, kwargs)
+            with recorder.measure(step, _detail(args, kwargs), rows, columns) as record:
+                result = attribute(*args, **kwargs)
+                if rows is None:
+                    frame = result[0] if isinstance(result, tuple) and result else result
+                    if isinstance(frame, pd.DataFrame):
+                        record["rows"], record["columns"] = frame.shape
+            return result
+
+        return measured
+
+
+def _measured_iterator(iterator: Iterator, recorder: Instrumentation, step: str, detail: str) -> Iterator:
+    # Time only the work done inside the iterator, summed over all items, as one record.
+    wall = cpu = 0.0
+    rows = columns = 0
+    try:
+        while True:
+            started, started_cpu = time.perf_counter(), time.process_time()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                wall += time.perf_counter() - started
+                cpu += time.process_time() - started_cpu
+            if isinstance(item, pd.DataFrame):
+                rows += len(item)
+                columns = max(columns, item.shape[1])
+            yield item
+    finally:
+        recorder.add({"step": step, "detail": detail, "rows": rows or None, "columns": columns or None,
+                      "wall_seconds": wall, "cpu_seconds": cpu, "peak_bytes": None})
+
+
+def instrument(target, recorder: Instrumentation, name: Optional[str] = None) -> Instrumented:
+    """
+    Wrap an object so that its method calls are recorded.
+
+    Parameters:
+        target: The object (or class of static methods) to wrap.
+        recorder (Instrumentation): Where measurements go.
+        name (str, optional): Step prefix; defaults to the class name.
+
+    Returns:
+        Instrumented: A drop-in proxy for target.
+    """
+    return Instrumented(target, recorder, name)
+
+
+# Example usage (replace with your actual dataset URL)
+if __name__ == "__main__":
+    from data_analyzer import DataAnalyzer
+    from data_fetcher import DataFetcher
+    from trust_score_calculator import TrustScoreCalculator
+
+    recorder = Instrumentation()
+    fetcher = instrument(DataFetcher("shopping_trends.csv"), recorder)
+    analyzer = instrument(DataAnalyzer, recorder)
+    calculator = instrument(TrustScoreCalculator(), recorder)
+
+    df, metadata = fetcher.fetch_data()
+    completeness = analyzer.calculate_completeness_score(df)
+    update = analyzer.calculate_update_score(metadata)
+    quality = analyzer.calculate_metadata_quality_score(df)
+    analyzer.detect_outliers(df, method='IQR')
+    calculator.calculate_trust_score(completeness, update, quality)
+
+    print(recorder.summary())
+    print(recorder.to_openmetrics())
@@ -0,0 +1,333 @@
+import os
+import pickle
+import shutil
+import tempfile
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from sketches import value_hashes
+
+ROW = "__row__"  # Spilled column holding each row's position in its dataset
+
+
+def _chunks(source, chunksize: int) -> Iterator[pd.DataFrame]:
+    """Chunks of a DataFrame, a DataFetcher, a path/URL or an iterable of DataFrames."""
+    if isinstance(source, pd.DataFrame):
+        for start in range(0, max(len(source), 1), chunksize):
+            yield source.iloc[start:start + chunksize]
+    elif isinstance(source, str):
+        from data_fetcher import DataFetcher
+
+        yield from DataFetcher(source).iter_chunks(chunksize=chunksize)
+    elif hasattr(source, "iter_chunks"):
+        yield from source.iter_chunks(chunksize=chunksize)
+    else:
+        yield from source
+
+
+def _normalize(keys: pd.DataFrame) -> pd.DataFrame:
+    # Integral floats (an int column parsed as float because of missing values) go back
+    # to int64, so keys compare exactly across chunks and datasets whatever their dtype.
+    normalized = {}
+    for position, column in enumerate(keys.columns):
+        values = keys[column]
+        if pd.api.types.is_float_dtype(values.dtype):
+            array = values.to_numpy(dtype=np.float64)
+            if len(array) and np.all(np.mod(array, 1) == 0) and np.all(np.abs(array) < 2.0 ** 63):
+                values = values.astype(np.int64)
+        normalized[f"k{position}"] = values.to_numpy() if isinstance(values.dtype, np.dtype) else values.array
+    return pd.DataFrame(normalized, index=keys.index)
+
+
+def _key_hashes(keys: pd.DataFrame) -> np.ndarray:
+    combined = np.zeros(len(keys), dtype=np.uint64)
+    with np.errstate(over='ignore'):
+        for column in keys.columns:
+            combined = combined * np.uint64(1000003) ^ value_hashes(keys[column])
+    return combined
+
+
+class IntegrityEngine:
+    """
+    Primary-key (single or composite) and foreign-key checks over datasets that don't
+    fit in memory.
+
+    Each dataset is read once in chunks. The key columns of every row are hashed into
+    one of `partitions` buckets and spilled to disk, so rows with equal keys, in the
+    same or different datasets, land in the same bucket. Buckets are then checked one
+    at a time; memory is bounded by one chunk plus one bucket (about the size of the
+    keys divided by `partitions`).
+
+    Example:
+        engine = IntegrityEngine(partitions=128)
+        engine.primary_key("orders", ["order_id", "line_no"])
+        engine.foreign_key("orders", ["customer_id"], "customers", ["id"])
+        report = engine.run({"orders": "orders.csv", "customers": customers_df})
+    """
+
+    def __init__(self, partitions: int = 64, spill_dir: Optional[str] = None,
+                 chunksize: int = 100_000, sample_size: int = 10):
+        """
+        Parameters:
+            partitions (int): Number of hash buckets spilled per key.
+            spill_dir (str, optional): Directory for the temporary bucket files; defaults to the system temp dir.
+            chunksize (int): Rows read per chunk.
+            sample_size (int): Offending keys reported per constraint.
+        """
+        self.partitions = partitions
+        self.spill_dir = spill_dir
+        self.chunksize = chunksize
+        self.sample_size = sample_size
+        self.constraints: List[dict] = []
+
+    def primary_key(self, dataset: str, columns: List[str], name: Optional[str] = None) -> "IntegrityEngine":
+        """
+        Require the combined values of columns to be present and unique in dataset.
+
+        Returns:
+            IntegrityEngine: self, for chaining.
+        """
+        self.constraints.append({
+            "name": name or f"pk:{dataset}({', '.join(columns)})",
+            "type": "primary_key", "dataset": dataset, "columns": list(columns),
+        })
+        return self
+
+    def foreign_key(self, dataset: str, columns: List[str], parent: str,
+                    parent_columns: Optional[List[str]] = None, name: Optional[str] = None) -> "IntegrityEngine":
+        """
+        Require every key of dataset's columns to exist in parent's parent_columns.
+        Rows with a missing value in any of the columns are not checked, as in SQL.
+
+        Returns:
+            IntegrityEngine: self, for chaining.
+        """
+        parent_columns = list(parent_columns or columns)
+        if len(parent_columns) != len(columns):
+            raise ValueError("A foreign key needs as many parent columns as child columns.")
+        self.constraints.append({
+            "name": name or f"fk:{dataset}({', '.join(columns)})->{parent}({', '.join(parent_columns)})",
+            "type": "foreign_key", "dataset": dataset, "columns": list(columns),
+            "parent": parent, "parent_columns": parent_columns,
+        })
+        return self
+
+    def run(self, sources: Dict[str, object]) -> Dict[str, dict]:
+        """
+        Check every constraint.
+
+        Parameters:
+            sources (Dict[str, object]): Dataset name -> DataFrame, DataFetcher, path/URL or
+                                         iterable of DataFrame chunks. Each is read once.
+
+        Returns:
+            Dict[str, dict]: Constraint name -> report with 'passed', row and key counts and
+                             'samples' of offending keys (see _check_primary_key and
+                             _check_foreign_key).
+        """
+        keys: Dict[str, List[Tuple[str, ...]]] = {}
+        for constraint in self.constraints:
+            keys.setdefault(constraint["dataset"], [])
+            if tuple(constraint["columns"]) not in keys[constraint["dataset"]]:
+                keys[constraint["dataset"]].append(tuple(constraint["columns"]))
+            if constraint["type"] == "foreign_key":
+                keys.setdefault(constraint["parent"], [])
+                if tuple(constraint["parent_columns"]) not in keys[constraint["parent"]]:
+                    keys[constraint["parent"]].append(tuple(constraint["parent_columns"]))
+        missing = [dataset for dataset in keys if dataset not in sources]
+        if missing:
+            raise ValueError(f"No source given for datasets: {missing}")
+
+        if self.spill_dir:
+            os.makedirs(self.spill_dir, exist_ok=True)
+        workdir = tempfile.mkdtemp(prefix="integrity-", dir=self.spill_dir)
+        try:
+            spilled = {}
+            for number, (dataset, key_sets) in enumerate(keys.items()):
+                spilled.update(self._spill(workdir, str(number), dataset, sources[dataset], key_sets))
+            report = {}
+            for constraint in self.constraints:
+                if constraint["type"] == "primary_key":
+                    report[constraint["name"]] = self._check_primary_key(
+                        constraint, spilled[(constraint["dataset"], tuple(constraint["columns"]))])
+                else:
+                    report[constraint["name"]] = self._check_foreign_key(
+                        constraint,
+                        spilled[(constraint["dataset"], tuple(constraint["columns"]))],
+                        spilled[(constraint["parent"], tuple(constraint["parent_columns"]))])
+            return report
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    def _spill(self, workdir: str, prefix: str, dataset: str, source,
+               key_sets: List[Tuple[str, ...]]) -> Dict[tuple, dict]:
+        """
+        One pass over a dataset: write the non-null keys of each key set, with their row
+        positions, to per-bucket files, and count (and sample) rows with null keys.
+        """
+        spilled = {}
+        files = {}
+        for index, columns in enumerate(key_sets):
+            spilled[(dataset, columns)] = {
+                "paths": [os.path.join(workdir, f"{prefix}-{index}-{p}.pkl")
+                          for p in range(self.partitions)],
+                "rows": 0, "null_rows": 0, "null_samples": [],
+            }
+        try:
+            offset = 0
+            for chunk in _chunks(source, self.chunksize):
+                for columns in key_sets:
+                    state = spilled[(dataset, columns)]
+                    absent = [column for column in columns if column not in chunk.columns]
+                    if absent:
+                        raise ValueError(f"Key columns {absent} not found in dataset {dataset}.")
+                    keys = chunk[list(columns)]
+                    null = keys.isna().any(axis=1).to_numpy()
+                    state["rows"] += len(keys)
+                    if null.any():
+                        state["null_rows"] += int(null.sum())
+                        room = self.sample_size - len(state["null_samples"])
+                        if room > 0:
+                            state["null_samples"] += (offset + np.flatnonzero(null)[:room]).tolist()
+                        keys = keys[~null]
+                    if keys.empty:
+                        continue
+                    keys = _normalize(keys)
+                    keys[ROW] = offset + np.flatnonzero(~null)
+                    bucket = _key_hashes(keys.drop(columns=ROW)) % np.uint64(self.partitions)
+                    order = np.argsort(bucket, kind='stable')
+                    starts = np.r_[0, np.flatnonzero(np.diff(bucket[order])) + 1]
+                    for start, part in zip(starts, np.split(order, starts[1:])):
+                        path = state["paths"][int(bucket[order[start]])]
+                        if path not in files:
+                            files[path] = open(path, 'ab')
+                        pickle.dump(keys.iloc[part], files[path], protocol=pickle.HIGHEST_PROTOCOL)
+                offset += len(chunk)
+        finally:
+            for f in files.values():
+                f.close()
+        return spilled
+
+    @staticmethod
+    def _load(path: str) -> Optional[pd.DataFrame]:
+        if not os.path.exists(path):
+            return None
+        parts = []
+        with open(path, 'rb') as f:
+            while True:
+                try:
+                    parts.append(pickle.load(f))
+                except EOFError:
+                    break
+        return pd.concat(parts, ignore_index=True)
+
+    @staticmethod
+    def _samples(keys: pd.DataFrame, columns: List[str], counts: pd.Series) -> List[dict]:
+        # The keys in counts, with their counts and first row positions.
+        key_columns = [f"k{i}" for i in range(len(columns))]
+        wanted = pd.MultiIndex.from_frame(counts.index.to_frame(index=False)[key_columns])
+        offending = keys[pd.MultiIndex.from_frame(keys[key_columns]).isin(wanted)]
+        rows = offending.groupby(key_columns, sort=False)[ROW].agg(lambda r: sorted(r.tolist())[:5])
+        samples = []
+        for key, count in counts.items():
+            key = key if isinstance(key, tuple) else (key,)
+            samples.append({
+                "key": dict(zip(columns, [v.item() if isinstance(v, np.generic) else v for v in key])),
+                "count": int(count),
+                "rows": rows[key if len(key) > 1 else key[0]],
+            })
+        return samples
+
+    def _check_primary_key(self, constraint: dict, spilled: dict) -> dict:
+        """
+        Returns:
+            dict: 'passed'; 'rows'; 'null_rows' (rows with a missing key value);
+                  'distinct_keys'; 'duplicate_keys' (keys occurring more than once);
+                  'duplicate_rows' (rows whose key already occurred); 'samples' of
+                  duplicated keys with their count and first row positions; and
+                  'null_row_samples'.
+        """
+        key_columns = [f"k{i}" for i in range(len(constraint["columns"]))]
+        distinct = duplicate_keys = duplicate_rows = 0
+        samples = []
+        for path in spilled["paths"]:
+            keys = self._load(path)
+            if keys is None:
+                continue
+            counts = keys.groupby(key_columns, sort=False).size()
+            distinct += len(counts)
+            repeated = counts[counts > 1]
+            duplicate_keys += len(repeated)
+            duplicate_rows += int((repeated - 1).sum())
+            room = self.sample_size - len(samples)
+            if room > 0 and len(repeated):
+                samples += self._samples(keys, constraint["columns"], repeated.iloc[:room])
+        return {
+            "type": "primary_key",
+            "dataset": constraint["dataset"],
+            "columns": constraint["columns"],
+            "passed": duplicate_keys == 0 and spilled["null_rows"] == 0,
+            "rows": spilled["rows"],
+            "null_rows": spilled["null_rows"],
+            "distinct_keys": distinct,
+            "duplicate_keys": duplicate_keys,
+            "duplicate_rows": duplicate_rows,
+            "samples": samples,
+            "null_row_samples": spilled["null_samples"],
+        }
+
+    def _check_foreign_key(self, constraint: dict, spilled: dict, parent: dict) -> dict:
+        """
+        Returns:
+            dict: 'passed'; 'rows'; 'null_rows' (rows not checked because of a missing
+                  key value); 'orphan_keys' (distinct keys absent from the parent);
+                  'orphan_rows' (rows carrying one); and 'samples' of orphan keys with
+                  their count and first row positions.
+        """
+        key_columns = [f"k{i}" for i in range(len(constraint["columns"]))]
+        orphan_keys = orphan_rows = 0
+        samples = []
+        for path, parent_path in zip(spilled["paths"], parent["paths"]):
+            keys = self._load(path)
+            if keys is None:
+                continue
+            parent_keys = self._load(parent_path)
+            child_index = pd.MultiIndex.from_frame(keys[key_columns])
+            if parent_keys is None:
+                orphan = np.ones(len(keys), dtype=bool)
+            else:
+                orphan = ~child_index.isin(pd.MultiIndex.from_frame(parent_keys[key_columns]))
+            if not orphan.any():
+                continue
+            orphans = keys[orphan]
+            counts = orphans.groupby(key_columns, sort=False).size()
+            orphan_keys += len(counts)
+            orphan_rows += int(orphan.sum())
+            room = self.sample_size - len(samples)
+            if room > 0:
+                samples += self._samples(orphans, constraint["columns"], counts.iloc[:room])
+        return {
+            "type": "foreign_key",
+            "dataset": constraint["dataset"],
+            "columns": constraint["columns"],
+            "parent": constraint["parent"],
+            "parent_columns": constraint["parent_columns"],
+            "passed": orphan_rows == 0,
+            "rows": spilled["rows"],
+            "null_rows": spilled["null_rows"],
+            "orphan_keys": orphan_keys,
+            "orphan_rows": orphan_rows,
+            "samples": samples,
+        }
+
+
+# Example usage (replace with your actual dataset URL)
+if __name__ == "__main__":
+    customers = pd.read_csv("shopping_trends.csv", usecols=["Customer ID"]).iloc[:3000]
+    engine = IntegrityEngine(partitions=8, sample_size=3)
+    engine.primary_key("purchases", ["Customer ID", "Item Purchased"])
+    engine.foreign_key("purchases", ["Customer ID"], "customers", ["Customer ID"])
+    for name, result in engine.run({"purchases": "shopping_trends.csv", "customers": customers}).items():
+        print(name, result)
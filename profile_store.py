@@ -0,0 +1,521 @@
+import hashlib
+import json
+import os
+import sqlite3
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+STAT_COLUMNS = ["rows", "nulls", "distinct", "numeric", "mean", "std", "min", "max"]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS profiles (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    version TEXT,
+    first_seen TEXT NOT NULL,
+    rows INTEGER,
+    columns INTEGER,
+    completeness_score REAL,
+    metadata_quality_score REAL,
+    checks TEXT NOT NULL DEFAULT '{}',
+    UNIQUE (source, content_hash)
+);
+CREATE INDEX IF NOT EXISTS profiles_by_version ON profiles (source, version);
+CREATE TABLE IF NOT EXISTS column_stats (
+    profile_id INTEGER NOT NULL REFERENCES profiles (id),
+    column_name TEXT NOT NULL,
+    rows INTEGER,
+    nulls INTEGER,
+    distinct_count INTEGER,
+    numeric INTEGER,
+    mean REAL,
+    std REAL,
+    min REAL,
+    max REAL,
+    PRIMARY KEY (profile_id, column_name)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    profile_id INTEGER NOT NULL REFERENCES profiles (id),
+    scored_at TEXT NOT NULL,
+    update_score REAL,
+    trust_score REAL,
+    alpha REAL,
+    beta REAL,
+    gamma REAL,
+    method TEXT
+);
+CREATE INDEX IF NOT EXISTS runs_by_profile ON runs (profile_id, scored_at);
+"""
+
+
+def column_profile(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Per-column statistics of a DataFrame in the layout ProfileStore keeps.
+
+    Parameters:
+        df (pd.DataFrame): The dataset.
+
+    Returns:
+        pd.DataFrame: One row per column: rows, nulls, distinct (exact), numeric, and
+            mean, std, min and max for numeric columns.
+    """
+    numeric = [c for c in df.columns
+               if pd.api.types.is_numeric_dtype(df[c].dtype) and not pd.api.types.is_bool_dtype(df[c].dtype)]
+    stats = pd.DataFrame(index=pd.Index(df.columns, name="column"))
+    stats["rows"] = len(df)
+    stats["nulls"] = df.isna().sum()
+    stats["distinct"] = df.nunique()
+    stats["numeric"] = stats.index.isin(numeric)
+    values = df[numeric]
+    for name, column in (("mean", values.mean()), ("std", values.std()),
+                         ("min", values.min()), ("max", values.max())):
+        stats[name] = column.astype(np.float64)
+    return stats
+
+
+def streaming_column_profile(profiler) -> pd.DataFrame:
+    """
+    The column_profile of a StreamingProfiler, with its distinct-count estimates.
+
+    Parameters:
+        profiler (StreamingProfiler): A profiler that has seen the whole dataset.
+
+    Returns:
+        pd.DataFrame: Same layout as column_profile.
+    """
+    stats = profiler.column_statistics().rename(columns={"distinct_estimate": "distinct"})
+    if stats.empty:
+        return pd.DataFrame(columns=STAT_COLUMNS)
+    stats.index.name = "column"
+    stats = stats[STAT_COLUMNS].copy()
+    for name in ("mean", "std", "min", "max"):
+        stats[name] = pd.to_numeric(stats[name], errors='coerce').where(stats["numeric"])
+    return stats
+
+
+class ProfileStore:
+    """
+    Local SQLite history of dataset profiles and trust-score runs.
+
+    A profile is one version of a source's content, identified by a content hash: its
+    column statistics, content scores (completeness, metadata quality) and check outcomes.
+    Every scoring is a run against a profile, with its update score, trust score and
+    weights, so re-scoring unchanged content only looks the profile up, and history,
+    trends and diffs never touch the data itself.
+
+    Profiles are also remembered by their cheap version fingerprint (path, mtime, size),
+    so an unchanged file is recognised without hashing its bytes.
+    """
+
+    def __init__(self, path: str = "profiles.sqlite", timeout: float = 30.0):
+        """
+        Parameters:
+            path (str): SQLite database file; created if missing.
+            timeout (float): Seconds to wait for another process holding the write lock.
+        """
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(path, timeout=timeout, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        # WAL lets batch workers write while the UI reads
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "ProfileStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def lookup(self, fetcher) -> Tuple[Optional[dict], Optional[str], Optional[str]]:
+        """
+        Find the stored profile of a source's current content, without fetching it.
+
+        The source's version fingerprint is tried first; only if that is new is the
+        content hashed (a local file's bytes, or a URL's ETag / Last-Modified validator).
+
+        Parameters:
+            fetcher (DataFetcher): Fetcher of the source.
+
+        Returns:
+            Tuple[Optional[dict], Optional[str], Optional[str]]:
+                - profile: The stored profile (see get_profile), or None.
+                - version: The source's version fingerprint, or None if it has none.
+                - content_hash: The content hash, or None if it wasn't needed or can't be
+                  computed without fetching (use frame_hash on the fetched data then).
+        """
+        source = fetcher.source_url
+        version = fetcher.fingerprint()
+        if version is None:
+            return None, None, None
+        row = self.conn.execute("SELECT id FROM profiles WHERE source = ? AND version = ? ORDER BY id DESC LIMIT 1",
+                                (source, version)).fetchone()
+        if row is not None:
+            return self.get_profile(row["id"]), version, None
+        # A URL's validator already identifies its content
+        content_hash = fetcher.fingerprint(content_hash=True) if os.path.exists(source) else version
+        row = self.conn.execute("SELECT id FROM profiles WHERE source = ? AND content_hash = ?",
+                                (source, content_hash)).fetchone()
+        if row is None:
+            return None, version, content_hash
+        # Same content under a new version (e.g. a touched file): remember the version
+        with self.conn:
+            self.conn.execute("UPDATE profiles SET version = ? WHERE id = ?", (version, row["id"]))
+        return self.get_profile(row["id"]), version, content_hash
+
+    @staticmethod
+    def frame_hash(df: pd.DataFrame) -> str:
+        """
+        Content hash of a fetched DataFrame, for sources without a version of their own.
+
+        Parameters:
+            df (pd.DataFrame): The dataset.
+
+        Returns:
+            str: Hex digest of the column names, dtypes and values.
+        """
+        digest = hashlib.blake2b(repr([(str(c), str(t)) for c, t in df.dtypes.items()]).encode(), digest_size=16)
+        digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+        return f"frame:{digest.hexdigest()}"
+
+    def save_profile(self,
+                     source: str,
+                     content_hash: str,
+                     rows: int,
+                     columns: int,
+                     completeness_score: float,
+                     metadata_quality_score: float,
+                     column_stats: Optional[pd.DataFrame] = None,
+                     checks: Optional[dict] = None,
+                     version: Optional[str] = None) -> int:
+        """
+        Store the profile of one version of a source's content.
+
+        Saving the same content again keeps the existing profile and its first_seen time,
+        and merges the check outcomes into it.
+
+        Parameters:
+            source (str): Path or URL of the dataset.
+            content_hash (str): Content hash (see lookup and frame_hash).
+            rows (int): Number of rows.
+            columns (int): Number of columns.
+            completeness_score (float): Completeness score of the content.
+            metadata_quality_score (float): Metadata quality score of the content.
+            column_stats (pd.DataFrame, optional): Per-column statistics (see column_profile).
+            checks (dict, optional): JSON-serialisable check outcomes, e.g. outlier counts.
+            version (str, optional): The source's version fingerprint.
+
+        Returns:
+            int: The profile id.
+        """
+        with self.conn:
+            row = self.conn.execute("SELECT id, checks FROM profiles WHERE source = ? AND content_hash = ?",
+                                    (source, content_hash)).fetchone()
+            if row is not None:
+                self.conn.execute("UPDATE profiles SET version = COALESCE(?, version) WHERE id = ?",
+                                  (version, row["id"]))
+                self.add_checks(row["id"], checks)
+                return row["id"]
+            cursor = self.conn.execute(
+                "INSERT INTO profiles (source, content_hash, version, first_seen, rows, columns, completeness_score,"
+                " metadata_quality_score, checks) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (source, content_hash, version, _now(), int(rows), int(columns), float(completeness_score),
+                 float(metadata_quality_score), json.dumps(checks or {}, default=_json_default)))
+            profile_id = cursor.lastrowid
+            if column_stats is not None and len(column_stats):
+                stats = column_stats.reindex(columns=STAT_COLUMNS)
+                self.conn.executemany(
+                    "INSERT INTO column_stats (profile_id, column_name, rows, nulls, distinct_count, numeric,"
+                    " mean, std, min, max) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    [(profile_id, str(name), *(_sql_value(v) for v in values))
+                     for name, values in zip(stats.index, stats.itertuples(index=False))])
+            return profile_id
+
+    def add_checks(self, profile_id: int, checks: Optional[dict]) -> None:
+        """
+        Merge check outcomes into a stored profile; outcomes of the same name are replaced.
+
+        Parameters:
+            profile_id (int): The profile id.
+            checks (dict, optional): JSON-serialisable check outcomes.
+        """
+        if not checks:
+            return
+        with self.conn:
+            row = self.conn.execute("SELECT checks FROM profiles WHERE id = ?", (profile_id,)).fetchone()
+            merged = {**json.loads(row["checks"]), **checks}
+            self.conn.execute("UPDATE profiles SET checks = ? WHERE id = ?",
+                              (json.dumps(merged, default=_json_default), profile_id))
+
+    def record_run(self,
+                   profile_id: int,
+                   update_score: float,
+                   trust_score: float,
+                   weights=None,
+                   method: str = "default") -> int:
+        """
+        Record one scoring of a profile.
+
+        Parameters:
+            profile_id (int): The scored profile.
+            update_score (float): Update frequency score at the time of scoring.
+            trust_score (float): The trust score.
+            weights (Sequence[float], optional): (alpha, beta, gamma) used.
+            method (str): Trust score method.
+
+        Returns:
+            int: The run id.
+        """
+        alpha, beta, gamma = (None, None, None) if weights is None else (float(w) for w in weights)
+        with self.conn:
+            cursor = self.conn.execute(
+                "INSERT INTO runs (profile_id, scored_at, update_score, trust_score, alpha, beta, gamma, method)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (profile_id, _now(), float(update_score), float(trust_score), alpha, beta, gamma, method))
+            return cursor.lastrowid
+
+    def latest_run(self, source: str) -> Optional[dict]:
+        """
+        Return a source's most recent run.
+
+        Parameters:
+            source (str): Path or URL of the dataset.
+
+        Returns:
+            Optional[dict]: The run's columns (see history), or None if the source has no runs.
+        """
+        row = self.conn.execute(
+            "SELECT r.* FROM runs r JOIN profiles p ON p.id = r.profile_id WHERE p.source = ?"
+            " ORDER BY r.scored_at DESC, r.id DESC LIMIT 1", (source,)).fetchone()
+        return dict(row) if row is not None else None
+
+    def get_profile(self, profile_id: int) -> Optional[dict]:
+        """
+        Return a stored profile.
+
+        Parameters:
+            profile_id (int): The profile id.
+
+        Returns:
+            Optional[dict]: id, source, content_hash, version, first_seen, rows, columns,
+                completeness_score, metadata_quality_score and checks; None if unknown.
+        """
+        row = self.conn.execute("SELECT * FROM profiles WHERE id = ?", (profile_id,)).fetchone()
+        if row is None:
+            return None
+        profile = dict(row)
+        profile["checks"] = json.loads(profile["checks"])
+        return profile
+
+    def column_stats(self, profile_id: int) -> pd.DataFrame:
+        """
+        Return a profile's per-column statistics.
+
+        Parameters:
+            profile_id (int): The profile id.
+
+        Returns:
+            pd.DataFrame: Same layout as column_profile.
+        """
+        stats = pd.read_sql_query(
+            "SELECT column_name AS \"column\", rows, nulls, distinct_count AS \"distinct\", numeric, mean, std,"
+            " min, max FROM column_stats WHERE profile_id = ?", self.conn, params=(profile_id,), index_col="column")
+        stats["numeric"] = stats["numeric"].astype(bool)
+        return stats
+
+    def profiles(self, source: str) -> pd.DataFrame:
+        """
+        List the stored versions of a source, oldest first.
+
+        Parameters:
+            source (str): Path or URL of the dataset.
+
+        Returns:
+            pd.DataFrame: One row per profile, indexed by id.
+        """
+        return pd.read_sql_query(
+            "SELECT id, content_hash, first_seen, rows, columns, completeness_score, metadata_quality_score"
+            " FROM profiles WHERE source = ? ORDER BY first_seen, id", self.conn, params=(source,), index_col="id")
+
+    def history(self, source: str) -> pd.DataFrame:
+        """
+        Every run of a source with its scores, oldest first, e.g. for trend charts:
+        history(source).set_index('scored_at')['trust_score'].
+
+        Parameters:
+            source (str): Path or URL of the dataset.
+
+        Returns:
+            pd.DataFrame: One row per run: scored_at (datetime), profile_id, the four scores,
+                the weights and the method.
+        """
+        history = pd.read_sql_query(
+            "SELECT r.id AS run_id, r.scored_at, r.profile_id, p.completeness_score, r.update_score,"
+            " p.metadata_quality_score, r.trust_score, r.alpha, r.beta, r.gamma, r.method"
+            " FROM runs r JOIN profiles p ON p.id = r.profile_id WHERE p.source = ? ORDER BY r.scored_at, r.id",
+            self.conn, params=(source,))
+        history["scored_at"] = pd.to_datetime(history["scored_at"])
+        return history
+
+    def content_since(self, source: str, profile_id: int) -> Optional[str]:
+        """
+        When the source last changed to a profile, judged by its runs.
+
+        Parameters:
+            source (str): Path or URL of the dataset.
+            profile_id (int): The source's current profile.
+
+        Returns:
+            Optional[str]: ISO time of the first run in the latest unbroken series of runs
+                of this profile, or None if the latest run was of different content (or there
+                are no runs), i.e. the content has changed just now.
+        """
+        row = self.conn.execute(
+            "SELECT MIN(r.scored_at) AS since FROM runs r WHERE r.profile_id = ? AND r.scored_at > COALESCE("
+            " (SELECT MAX(o.scored_at) FROM runs o JOIN profiles p ON p.id = o.profile_id"
+            "  WHERE p.source = ? AND o.profile_id != ?), '')", (profile_id, source, profile_id)).fetchone()
+        return row["since"]
+
+    def last_update_time(self, source: str, profile_id: int, metadata: Optional[dict] = None) -> str:
+        """
+        The source's last update time for calculate_update_score: the earlier of the
+        metadata's last_update_time and the time the current content was first scored.
+
+        A touched file whose content hasn't changed keeps its older update time, and
+        sources that report no update time get one from the run history.
+
+        Parameters:
+            source (str): Path or URL of the dataset.
+            profile_id (int): The source's current profile.
+            metadata (dict, optional): The fetcher's metadata.
+
+        Returns:
+            str: ISO time.
+        """
+        times = [self.content_since(source, profile_id) or _now()]
+        if metadata and metadata.get("last_update_time"):
+            times.append(metadata["last_update_time"])
+        return min(pd.Timestamp(t) for t in times).isoformat()
+
+    def diff(self,
+             old_id: int,
+             new_id: int,
+             mean_shift: float = 0.5,
+             null_rate_change: float = 0.05,
+             distinct_change: float = 0.5) -> pd.DataFrame:
+        """
+        Compare the column statistics of two profiles, e.g. to raise drift alerts.
+
+        Parameters:
+            old_id (int): The earlier profile.
+            new_id (int): The later profile.
+            mean_shift (float): Flag numeric columns whose mean moved by more than this many
+                of the old standard deviations.
+            null_rate_change (float): Flag columns whose missing-value rate changed by more than this.
+            distinct_change (float): Flag columns whose distinct count changed by more than this
+                fraction.
+
+        Returns:
+            pd.DataFrame: One row per column of either profile: status ('added', 'removed' or
+                'kept'), old and new null rates, means, standard deviations and distinct counts,
+                mean_shift (in old standard deviations), std_ratio, distinct_change, and drift
+                (a short reason, or '' if nothing exceeds the thresholds).
+        """
+        old, new = self.column_stats(old_id), self.column_stats(new_id)
+        both = old.join(new, how="outer", lsuffix="_old", rsuffix="_new", sort=False)
+        order = list(old.index) + [c for c in new.index if c not in old.index]
+        both = both.reindex(order)
+        report = pd.DataFrame(index=both.index)
+        in_old, in_new = both.index.isin(old.index), both.index.isin(new.index)
+        report["status"] = np.where(in_old & in_new, "kept", np.where(in_old, "removed", "added"))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for side in ("old", "new"):
+                report[f"null_rate_{side}"] = both[f"nulls_{side}"] / both[f"rows_{side}"]
+            for name in ("mean", "std", "distinct"):
+                report[f"{name}_old"], report[f"{name}_new"] = both[f"{name}_old"], both[f"{name}_new"]
+            report["mean_shift"] = (both["mean_new"] - both["mean_old"]).abs() / both["std_old"]
+            report["std_ratio"] = both["std_new"] / both["std_old"]
+            report["distinct_change"] = (both["distinct_new"] - both["distinct_old"]) / both["distinct_old"]
+
+        flags = pd.DataFrame({
+            "null rate": (report["null_rate_new"] - report["null_rate_old"]).abs() > null_rate_change,
+            # Without an old spread (a constant column) any change of the mean counts
+            "mean": (report["mean_shift"] > mean_shift)
+                    | ((report["std_old"] == 0) & (report["mean_new"] != report["mean_old"])),
+            "distinct count": report["distinct_change"].abs() > distinct_change,
+        }).fillna(False).astype(bool)
+        flags = flags[report["status"] == "kept"].reindex(report.index, fill_value=False)
+        names = np.array(flags.columns)
+        report["drift"] = [", ".join(names[row]) for row in flags.to_numpy()]
+        report.loc[report["status"] != "kept", "drift"] = report["status"]
+        return report
+
+    def drift_alerts(self, source: str, **thresholds) -> pd.DataFrame:
+        """
+        The drifting columns between a source's two latest profiles.
+
+        Parameters:
+            source (str): Path or URL of the dataset.
+            **thresholds: Thresholds passed to diff.
+
+        Returns:
+            pd.DataFrame: The diff rows with a drift reason; empty if there is only one version.
+        """
+        ids = self.conn.execute("SELECT id FROM profiles WHERE source = ? ORDER BY first_seen DESC, id DESC LIMIT 2",
+                                (source,)).fetchall()
+        if len(ids) < 2:
+            return pd.DataFrame()
+        report = self.diff(ids[1]["id"], ids[0]["id"], **thresholds)
+        return report[report["drift"] != ""]
+
+
+def _now() -> str:
+    # Fixed width, so that ISO times also compare correctly as text in SQL
+    return pd.Timestamp.now().isoformat(timespec='microseconds')
+
+
+def _sql_value(value):
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return None
+    if isinstance(value, (np.bool_, bool)):
+        return int(value)
+    if isinstance(value, np.integer):
+        return int(value)
+    if isinstance(value, np.floating):
+        return None if np.isnan(value) else float(value)
+    return value
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (pd.Series, pd.DataFrame)):
+        return value.to_dict()
+    raise TypeError(f"{type(value).__name__} is not JSON serialisable")
+
+
+# Example usage (replace with your actual dataset URL)
+if __name__ == "__main__":
+    from data_analyzer import DataAnalyzer
+    from data_fetcher import DataFetcher
+
+    fetcher = DataFetcher("shopping_trends.csv")
+    with ProfileStore("profiles.sqlite") as store:
+        profile, version, content_hash = store.lookup(fetcher)
+        if profile is None:
+            df, metadata = fetcher.fetch_data()
+            profile_id = store.save_profile(fetcher.source_url, content_hash or store.frame_hash(df), len(df),
+                                            df.shape[1], DataAnalyzer.calculate_completeness_score(df),
+                                            DataAnalyzer.calculate_metadata_quality_score(df),
+                                            column_stats=column_profile(df), version=version)
+            profile = store.get_profile(profile_id)
+        print("Profile:", profile)
+        print(store.history(fetcher.source_url))
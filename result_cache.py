@@ -0,0 +1,192 @@
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+import numpy as np
+import pandas as pd
+
+from data_analyzer import DataAnalyzer
+from sketches import column_digest
+
+
+def estimate_size(value: Any) -> int:
+    """
+    Approximate the memory held by a cached value, in bytes.
+
+    Object columns are sized from a sample of their values rather than with
+    memory_usage(deep=True), which would visit every string.
+
+    Parameters:
+        value (Any): The value to size.
+
+    Returns:
+        int: Estimated size in bytes.
+    """
+    if isinstance(value, pd.Series):
+        value = value.to_frame()
+    if isinstance(value, pd.DataFrame):
+        size = int(value.memory_usage(index=True, deep=False).sum())
+        for i in range(value.shape[1]):
+            column = value.iloc[:, i]
+            if column.dtype == object or isinstance(column.dtype, pd.StringDtype):
+                sample = column.iloc[:1000].dropna()
+                if len(sample):
+                    size += int(sum(sys.getsizeof(v) for v in sample) / len(sample) * len(column))
+        return size
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple, set)):
+        return sys.getsizeof(value) + sum(estimate_size(v) for v in value)
+    return sys.getsizeof(value)
+
+
+class ResultCache:
+    """
+    Thread-safe LRU cache with a memory cap, shared across Streamlit reruns.
+
+    Keys should start with a source fingerprint (see DataFetcher.fingerprint) so
+    that entries for an old version of a source are simply never hit again and
+    age out. Cached objects are returned as-is; callers must not mutate them.
+    """
+
+    def __init__(self, max_bytes: int = 512 * 1024 ** 2, max_entries: int = 256):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key -> (value, size)
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+            self.misses += 1
+            return default
+
+    def put(self, key: Hashable, value: Any) -> None:
+        size = estimate_size(value)
+        with self._lock:
+            self.pop(key)
+            if size > self.max_bytes:
+                return  # Larger than the whole cache; don't evict everything for it
+            self._entries[key] = (value, size)
+            self.bytes += size
+            while self.bytes > self.max_bytes or len(self._entries) > self.max_entries:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.bytes -= evicted_size
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            if key not in self._entries:
+                return default
+            value, size = self._entries.pop(key)
+            self.bytes -= size
+            return value
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Return the cached value for key, computing and storing it on a miss.
+
+        Parameters:
+            key (Hashable): Cache key.
+            compute (Callable[[], Any]): Produces the value on a miss.
+
+        Returns:
+            Any: The cached or freshly computed value.
+        """
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def stats(self) -> dict:
+        return {"entries": len(self._entries), "bytes": self.bytes, "hits": self.hits, "misses": self.misses}
+
+
+# Module-level cache: imported modules survive Streamlit reruns, so this outlives each WebUI instance.
+default_cache = ResultCache()
+
+
+# Results that depend on the current time (or a time budget) rather than only on the arguments
+TIME_DEPENDENT = {
+    "calculate_update_score": lambda args, kwargs: True,
+    "sampled_analysis": lambda args, kwargs: True,
+    "temporal_consistency_checks": lambda args, kwargs: kwargs.get("now", args[3] if len(args) > 3 else None) is None,
+}
+
+
+def key_part(value: Any) -> Hashable:
+    """
+    A cache-key component for an argument. DataFrames and Series, also inside lists,
+    tuples and dicts, are identified by a hash of their full content rather than by
+    their (truncated) repr.
+
+    Parameters:
+        value (Any): The argument.
+
+    Returns:
+        Hashable: The key component.
+    """
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        frame = value.to_frame() if isinstance(value, pd.Series) else value
+        hashes = pd.util.hash_pandas_object(frame, index=True).to_numpy()
+        return (type(value).__name__, repr(list(frame.columns)), repr(list(frame.dtypes)),
+                column_digest(hashes).hexdigest())
+    if isinstance(value, (list, tuple)):
+        return (type(value).__name__,) + tuple(key_part(v) for v in value)
+    if isinstance(value, dict):
+        return ("dict",) + tuple((repr(k), key_part(v)) for k, v in value.items())
+    return repr(value)
+
+
+class CachedAnalyzer:
+    """
+    Drop-in stand-in for DataAnalyzer whose check results are cached per source version.
+
+    Every DataAnalyzer method is looked up by name; its result is keyed on the
+    source fingerprint, the method name and the remaining arguments, so the
+    dataset itself is never hashed. Only pass it the frame loaded from that source,
+    as the first DataFrame argument; other frames (e.g. integrity_report's parent
+    tables) are hashed into the key. Time-dependent calls (TIME_DEPENDENT) are not cached.
+    """
+
+    def __init__(self, source_key: str, cache: Optional[ResultCache] = None, analyzer=DataAnalyzer):
+        self.source_key = source_key
+        self.cache = cache if cache is not None else default_cache
+        self.analyzer = analyzer
+
+    def __getattr__(self, name: str):
+        method = getattr(self.analyzer, name)
+        if not callable(method) or name.startswith('_'):
+            return method
+
+        def cached(*args, **kwargs):
+            if name in TIME_DEPENDENT and TIME_DEPENDENT[name](args, kwargs):
+                return method(*args, **kwargs)
+            # The dataset is identified by source_key; every other argument goes into the key.
+            source = next((i for i, a in enumerate(args) if isinstance(a, pd.DataFrame)), None)
+            extra = [a for i, a in enumerate(args) if i != source]
+            key = (self.source_key, name, key_part(extra), key_part(dict(sorted(kwargs.items()))))
+            return self.cache.get_or_compute(key, lambda: method(*args, **kwargs))
+
+        return cached
@@ -0,0 +1,455 @@
+"""
+Declarative data rules, compiled into one vectorized pass per chunk.
+
+A rule is a dict, e.g. loaded from a JSON file with load_rules:
+
+    {"name": "valid_latitude", "type": "range", "column": "latitude", "min": -90, "max": 90}
+    {"name": "email_format", "type": "regex", "column": "email", "pattern": "[^@ ]+@[^@ ]+"}
+    {"name": "known_status", "type": "allowed", "column": "status", "values": ["open", "closed"]}
+    {"name": "ends_after_start", "type": "compare", "left": "end_date", "op": ">=", "right": "start_date",
+     "as": "date"}
+
+Every rule also takes "allow_null" (default true): when false, missing values are violations
+instead of being skipped. A range's bounds are inclusive unless "inclusive" is false; a regex
+must match the whole value; a compare rule takes a column ("right") or a literal ("value") and
+compares as "number", "date" or "text" (default: number when both sides are numeric).
+
+Rules are grouped by column when the engine is built, so each column is converted once per
+chunk whatever the number of rules on it: range rules are one broadcast comparison against all
+their bounds, and regex and allowed-value rules are evaluated once per distinct value and
+counted through the column's factorized codes. Results feed the trust score through
+validity_score.
+
+Example:
+    engine = RuleEngine.run(load_rules("rules.json"), DataFetcher("data.csv").iter_chunks())
+    engine.report()["valid_latitude"]["violations"]
+"""
+import hashlib
+import json
+import re
+from typing import Dict, Iterable, Iterator, List
+
+import numpy as np
+import pandas as pd
+
+from data_analyzer import DataAnalyzer
+
+RULE_TYPES = ('range', 'regex', 'allowed', 'compare')
+
+COMPARE_OPERATORS = {'==': np.equal, '!=': np.not_equal, '<': np.less, '<=': np.less_equal,
+                     '>': np.greater, '>=': np.greater_equal}
+
+# Built-in rules of DataAnalyzer.context_specific_checks, by context.
+CONTEXT_RULES = {
+    'geo': [
+        {"name": "Invalid latitudes", "type": "range", "column": "latitude", "min": -90, "max": 90},
+        {"name": "Invalid longitudes", "type": "range", "column": "longitude", "min": -180, "max": 180},
+    ],
+    'finance': [
+        {"name": "Negative prices", "type": "range", "column": "price", "min": 0},
+    ],
+}
+
+
+def load_rules(path: str) -> List[dict]:
+    """
+    Load rules from a JSON file holding a list of rules or {"rules": [...]}.
+
+    Parameters:
+        path (str): The JSON file.
+
+    Returns:
+        List[dict]: The rules.
+    """
+    with open(path, encoding="utf-8") as f:
+        rules = json.load(f)
+    return rules["rules"] if isinstance(rules, dict) else rules
+
+
+def validate_rule(rule: dict) -> dict:
+    """
+    Check a rule and fill in its defaults.
+
+    Parameters:
+        rule (dict): The rule.
+
+    Returns:
+        dict: The rule with every option set.
+
+    Raises:
+        ValueError: If the rule is malformed.
+    """
+    name = rule.get("name")
+    kind = rule.get("type")
+    if not name:
+        raise ValueError(f"Rule without a name: {rule!r}")
+    if kind not in RULE_TYPES:
+        raise ValueError(f"Rule {name}: invalid type {kind!r}. Use one of {', '.join(RULE_TYPES)}.")
+    rule = {"allow_null": True, **rule}
+    if kind == 'compare':
+        if not rule.get("left") or rule.get("op") not in COMPARE_OPERATORS:
+            raise ValueError(f"Rule {name}: a compare rule needs 'left' and an 'op' in {', '.join(COMPARE_OPERATORS)}.")
+        if ("right" in rule) == ("value" in rule):
+            raise ValueError(f"Rule {name}: a compare rule needs either 'right' (a column) or 'value'.")
+        if rule.setdefault("as", None) not in (None, 'number', 'date', 'text'):
+            raise ValueError(f"Rule {name}: 'as' must be 'number', 'date' or 'text'.")
+        return rule
+    if not rule.get("column"):
+        raise ValueError(f"Rule {name}: a {kind} rule needs a 'column'.")
+    if kind == 'range':
+        if rule.get("min") is None and rule.get("max") is None:
+            raise ValueError(f"Rule {name}: a range rule needs 'min', 'max' or both.")
+        rule.setdefault("inclusive", True)
+    elif kind == 'regex':
+        try:
+            re.compile(rule.get("pattern") or "")
+        except re.error as e:
+            raise ValueError(f"Rule {name}: invalid pattern: {e}") from None
+    elif not isinstance(rule.get("values"), (list, tuple, set)):
+        raise ValueError(f"Rule {name}: an allowed rule needs a list of 'values'.")
+    return rule
+
+
+def rule_columns(rule: dict) -> List[str]:
+    """The columns a rule reads."""
+    if rule["type"] == 'compare':
+        return [rule["left"]] + ([rule["right"]] if "right" in rule else [])
+    return [rule["column"]]
+
+
+def validity_score(report: Dict[str, dict]) -> float:
+    """
+    Share of rule checks that passed, for the trust score (1.0 when nothing was checked).
+
+    Parameters:
+        report (Dict[str, dict]): A rule report (RuleEngine.report or DataAnalyzer.context_specific_checks).
+
+    Returns:
+        float: 1 - violations / checked values over all rules.
+    """
+    checked = sum(result["checked"] for result in report.values())
+    violations = sum(result["violations"] for result in report.values())
+    return round(1 - violations / checked, 4) if checked else 1.0
+
+
+def _default_kind(left: pd.Series, right) -> str:
+    # Compare as numbers when both sides are numeric, else as text
+    def numeric(side):
+        if isinstance(side, pd.Series):
+            return pd.api.types.is_numeric_dtype(side.dtype) and not pd.api.types.is_bool_dtype(side.dtype)
+        return isinstance(side, (int, float)) and not isinstance(side, bool)
+    return 'number' if numeric(left) and numeric(right) else 'text'
+
+
+def _convert(frame: pd.DataFrame, column: str, kind: str):
+    # A column as numbers, dates or text, and which present values didn't convert
+    series = frame[column]
+    missing = series.isna().to_numpy()
+    if kind == 'number':
+        values = pd.to_numeric(series, errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+        return values, np.isnan(values) & ~missing
+    if kind == 'date':
+        parsed, _ = DataAnalyzer.parse_dates(frame, column)
+        if parsed.dt.tz is not None:
+            parsed = parsed.dt.tz_convert(None)  # Compare in UTC
+        values = parsed.to_numpy(dtype='datetime64[ns]')
+        return values, np.isnat(values) & ~missing
+    return series.astype(str).to_numpy(dtype=object), np.zeros(len(series), dtype=bool)
+
+
+def _convert_literal(value, kind: str):
+    # A compare rule's literal, converted like the column it is compared with
+    if kind == 'number':
+        return pd.to_numeric(pd.Series([value]), errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)[0]
+    if kind == 'date':
+        parsed = pd.to_datetime(value, errors='coerce')
+        if parsed is pd.NaT:
+            return np.datetime64('NaT', 'ns')
+        if parsed.tzinfo is not None:
+            parsed = parsed.tz_convert(None)  # Compare in UTC
+        return parsed.as_unit('ns').to_datetime64()
+    return str(value)
+
+
+class RuleEngine:
+    """
+    Evaluates a set of rules over chunks of a dataset and accumulates violation counts
+    and sample rows. Memory is bounded by the block size times the rules on one column.
+    """
+
+    def __init__(self, rules: List[dict], sample_size: int = 10, block_rows: int = 65536):
+        """
+        Parameters:
+            rules (List[dict]): The rules (see the module docstring).
+            sample_size (int): Violating row numbers kept per rule.
+            block_rows (int): Rows evaluated at once; larger chunks are split.
+        """
+        self.rules = [validate_rule(rule) for rule in rules]
+        names = [rule["name"] for rule in self.rules]
+        if len(set(names)) != len(names):
+            raise ValueError("Rule names must be unique.")
+        self.sample_size = sample_size
+        self.block_rows = block_rows
+
+        # Compiled plan: per column, the range rules (with their bounds as arrays) and the
+        # rules decided per distinct value; compare rules read their columns through a cache.
+        self._ranges: Dict[str, List[int]] = {}
+        self._per_value: Dict[str, List[int]] = {}
+        self._compares: List[int] = []
+        for i, rule in enumerate(self.rules):
+            if rule["type"] == 'range':
+                self._ranges.setdefault(rule["column"], []).append(i)
+            elif rule["type"] == 'compare' and "right" in rule:
+                self._compares.append(i)
+            else:
+                self._per_value.setdefault(rule_columns(rule)[0], []).append(i)
+        self._bounds = {column: self._range_bounds(members) for column, members in self._ranges.items()}
+        self._require = np.array([not rule["allow_null"] for rule in self.rules], dtype=bool)
+        self._literals: Dict[tuple, object] = {}  # Converted compare literals, by rule and kind
+
+        self.rows = 0
+        self.rows_with_violations = 0
+        self.checked = np.zeros(len(self.rules), dtype=np.int64)
+        self.violations = np.zeros(len(self.rules), dtype=np.int64)
+        self.samples: List[List[int]] = [[] for _ in self.rules]
+        self.missing_columns: List[set] = [set() for _ in self.rules]
+
+    def _range_bounds(self, members: List[int]):
+        # Exclusive bounds become inclusive ones on the next float, so one comparison serves both.
+        lows, highs = np.full(len(members), -np.inf), np.full(len(members), np.inf)
+        for j, i in enumerate(members):
+            rule = self.rules[i]
+            if rule.get("min") is not None:
+                lows[j] = float(rule["min"])
+                if not rule["inclusive"]:
+                    lows[j] = np.nextafter(lows[j], np.inf)
+            if rule.get("max") is not None:
+                highs[j] = float(rule["max"])
+                if not rule["inclusive"]:
+                    highs[j] = np.nextafter(highs[j], -np.inf)
+        return lows, highs
+
+    def update(self, chunk: pd.DataFrame) -> "RuleEngine":
+        """
+        Evaluate every rule on the next chunk of rows.
+
+        Parameters:
+            chunk (pd.DataFrame): The next slice of the dataset.
+
+        Returns:
+            RuleEngine: self, for chaining.
+        """
+        for start in range(0, len(chunk), self.block_rows):
+            self._update_block(chunk.iloc[start:start + self.block_rows])
+        return self
+
+    def _update_block(self, block: pd.DataFrame) -> None:
+        rows = len(block)
+        violating = np.zeros(rows, dtype=bool)
+        for column, members in self._ranges.items():
+            if self._present(block, members, [column]):
+                violating |= self._tally(members, self._range_violations(block[column], column))
+        for column, members in self._per_value.items():
+            if self._present(block, members, [column]):
+                violating |= self._tally_codes(members, block[column])
+        converted = {}
+        for i in self._compares:
+            if self._present(block, [i], rule_columns(self.rules[i])):
+                violating |= self._tally([i], self._compare_violations(block, i, converted)[:, None])
+        self.rows += rows
+        self.rows_with_violations += int(violating.sum())
+
+    def _present(self, block: pd.DataFrame, members: List[int], columns: List[str]) -> bool:
+        absent = [column for column in columns if column not in block.columns]
+        for i in members:
+            self.missing_columns[i].update(absent)
+        return not absent
+
+    def _range_violations(self, series: pd.Series, column: str):
+        # (rows x rules) violations of every range rule on the column, and the missing mask
+        values = pd.to_numeric(series, errors='coerce') if not pd.api.types.is_numeric_dtype(series.dtype) \
+            else series
+        values = values.to_numpy(dtype=np.float64, na_value=np.nan)
+        missing = series.isna().to_numpy()
+        lows, highs = self._bounds[column]
+        bad = (values[:, None] < lows) | (values[:, None] > highs)
+        bad |= (np.isnan(values) & ~missing)[:, None]  # Present, but not a number
+        return bad, missing
+
+    def _tally(self, members: List[int], outcome) -> np.ndarray:
+        # Count a (rows x rules) violation matrix; returns the rows violating any of the rules
+        if isinstance(outcome, tuple):
+            bad, missing = outcome
+        else:
+            bad, missing = outcome, None
+        if missing is not None:
+            require = self._require[members]
+            if require.any():
+                bad = bad | (missing[:, None] & require)
+            self.checked[members] += np.where(require, len(missing), len(missing) - int(missing.sum()))
+        counts = np.count_nonzero(bad, axis=0)
+        self.violations[members] += counts
+        for j, i in enumerate(members):
+            if counts[j] and len(self.samples[i]) < self.sample_size:
+                rows = np.flatnonzero(bad[:, j])[:self.sample_size - len(self.samples[i])]
+                self.samples[i].extend((rows + self.rows).tolist())
+        return bad.any(axis=1)
+
+    def _tally_codes(self, members: List[int], series: pd.Series) -> np.ndarray:
+        # Decide the rules once per distinct value; a last code stands for missing values.
+        codes, uniques = pd.factorize(series, use_na_sentinel=True)
+        distinct = len(uniques)
+        codes = np.where(codes < 0, distinct, codes)
+        bad = np.empty((distinct + 1, len(members)), dtype=bool)
+        prepared = {}  # The distinct values as text or numbers, shared by the column's rules
+        for j, i in enumerate(members):
+            bad[:distinct, j] = self._value_violations(i, uniques, prepared)
+        bad[distinct] = self._require[members]
+        frequency = np.bincount(codes, minlength=distinct + 1)
+        counts = frequency @ bad
+        self.violations[members] += counts
+        self.checked[members] += np.where(self._require[members], len(codes), len(codes) - frequency[distinct])
+        for j, i in enumerate(members):
+            if counts[j] and len(self.samples[i]) < self.sample_size:
+                rows = np.flatnonzero(bad[codes, j])[:self.sample_size - len(self.samples[i])]
+                self.samples[i].extend((rows + self.rows).tolist())
+        return bad.any(axis=1)[codes]
+
+    def _value_violations(self, i: int, uniques, prepared: dict) -> np.ndarray:
+        rule = self.rules[i]
+        if rule["type"] == 'allowed':
+            return ~pd.Index(uniques).isin(list(rule["values"]))
+        if rule["type"] == 'compare':
+            # Against a literal, so decided per distinct value like the others
+            kind = rule["as"] or _default_kind(pd.Series(uniques[:0]), rule["value"])
+            if kind not in prepared:
+                prepared[kind] = _convert(pd.DataFrame({"value": pd.Series(uniques)}), "value", kind)
+            values, invalid = prepared[kind]
+            if (i, kind) not in self._literals:
+                self._literals[i, kind] = _convert_literal(rule["value"], kind)
+            return invalid | ~COMPARE_OPERATORS[rule["op"]](values, self._literals[i, kind])
+        # Values are matched as text; RE2 (via Arrow) where it accepts the pattern, else Python's re.
+        if "text" not in prepared:
+            prepared["text"] = pd.Index(uniques).astype(str)
+        text = prepared["text"]
+        try:
+            import pyarrow as pa
+            import pyarrow.compute as pc
+        except ImportError:
+            pa = None
+        if pa is not None:
+            try:
+                matched = pc.match_substring_regex(pa.array(text, type=pa.string()),
+                                                   pattern=f"^(?:{rule['pattern']})$")
+                return ~matched.to_numpy(zero_copy_only=False)
+            except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+                pass
+        regex = re.compile(rule["pattern"])
+        return np.fromiter((regex.fullmatch(value) is None for value in text), dtype=bool, count=len(text))
+
+    def _compare_violations(self, block: pd.DataFrame, i: int, converted: dict) -> np.ndarray:
+        # A comparison between two columns, which are converted once per block for all rules
+        rule = self.rules[i]
+        kind = rule["as"] or _default_kind(block[rule["left"]], block[rule["right"]])
+        sides = []
+        for column in (rule["left"], rule["right"]):
+            if (column, kind) not in converted:
+                converted[column, kind] = _convert(block, column, kind) + (block[column].isna().to_numpy(),)
+            sides.append(converted[column, kind])
+        (left, left_invalid, left_missing), (right, right_invalid, right_missing) = sides
+        missing = left_missing | right_missing
+        invalid = (left_invalid | right_invalid) & ~missing
+        present = ~missing & ~invalid
+        holds = np.zeros(len(block), dtype=bool)
+        holds[present] = COMPARE_OPERATORS[rule["op"]](left[present], right[present])
+        bad = invalid | (present & ~holds)
+        if not rule["allow_null"]:
+            bad |= missing
+        self.checked[i] += len(block) if not rule["allow_null"] else int((~missing).sum())
+        return bad
+
+    def merge(self, other: "RuleEngine") -> "RuleEngine":
+        """
+        Merge the results of the same rules on the rows that follow this engine's rows.
+
+        Returns:
+            RuleEngine: self, for chaining.
+        """
+        if [rule["name"] for rule in other.rules] != [rule["name"] for rule in self.rules]:
+            raise ValueError("Only engines with the same rules can be merged.")
+        for i in range(len(self.rules)):
+            room = self.sample_size - len(self.samples[i])
+            self.samples[i].extend(row + self.rows for row in other.samples[i][:max(room, 0)])
+            self.missing_columns[i] |= other.missing_columns[i]
+        self.checked += other.checked
+        self.violations += other.violations
+        self.rows += other.rows
+        self.rows_with_violations += other.rows_with_violations
+        return self
+
+    @classmethod
+    def run(cls, rules: List[dict], chunks, **kwargs) -> "RuleEngine":
+        """
+        Evaluate rules over a DataFrame or an iterable of chunks, e.g. DataFetcher.iter_chunks().
+
+        Returns:
+            RuleEngine: The engine with the accumulated results.
+        """
+        engine = cls(rules, **kwargs)
+        for chunk in [chunks] if isinstance(chunks, pd.DataFrame) else chunks:
+            engine.update(chunk)
+        return engine
+
+    def tap(self, chunks: Iterable[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+        """
+        Yield the chunks unchanged while evaluating the rules on them, so the rules run in
+        the same pass as another consumer, e.g. StreamingProfiler.profile(engine.tap(chunks)).
+        """
+        for chunk in chunks:
+            self.update(chunk)
+            yield chunk
+
+    def report(self) -> Dict[str, dict]:
+        """
+        Returns:
+            Dict[str, dict]: Per rule name: 'type', 'columns', 'checked' (values evaluated),
+                'violations', 'violation_rate', 'sample_rows' (0-based row numbers in the
+                dataset), 'missing_columns' (columns absent from some chunk) and 'passed'.
+        """
+        report = {}
+        for i, rule in enumerate(self.rules):
+            checked, violations = int(self.checked[i]), int(self.violations[i])
+            report[rule["name"]] = {
+                "type": rule["type"],
+                "columns": rule_columns(rule),
+                "checked": checked,
+                "violations": violations,
+                "violation_rate": violations / checked if checked else 0.0,
+                "sample_rows": list(self.samples[i]),
+                "missing_columns": sorted(self.missing_columns[i]),
+                "passed": violations == 0 and not self.missing_columns[i],
+            }
+        return report
+
+    def validity_score(self) -> float:
+        """Share of rule checks that passed (see validity_score)."""
+        return validity_score(self.report())
+
+    def fingerprint(self) -> str:
+        """Hash of the rules, to key stored results by the rule set that produced them."""
+        return hashlib.sha1(json.dumps(self.rules, sort_keys=True, default=str).encode()).hexdigest()[:16]
+
+
+# Example usage (replace with your actual dataset URL)
+if __name__ == "__main__":
+    from data_fetcher import DataFetcher
+
+    rules = [
+        {"name": "Age in range", "type": "range", "column": "Age", "min": 0, "max": 120},
+        {"name": "Known gender", "type": "allowed", "column": "Gender", "values": ["Male", "Female"]},
+        {"name": "Size code", "type": "regex", "column": "Size", "pattern": "XS|S|M|L|XL|XXL"},
+        {"name": "Rating below 5", "type": "compare", "left": "Review Rating", "op": "<=", "value": 5},
+    ]
+    engine = RuleEngine.run(rules, DataFetcher("shopping_trends.csv").iter_chunks(chunksize=1000))
+    print(pd.DataFrame(engine.report()).T)
+    print("Validity score:", engine.validity_score())
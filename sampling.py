@@ -0,0 +1,479 @@
+import io
+import os
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from data_analyzer import DataAnalyzer
+from data_fetcher import DataFetcher, read_csv_header, read_csv_sample_block
+
+SUMMARY_INDEX = ['count', 'mean', 'std', 'min', '25%', '50%', '75%', 'max']
+
+
+def weighted_quantile(values: np.ndarray, weights: np.ndarray, q) -> np.ndarray:
+    """
+    Quantiles of a weighted sample (inverse of the weighted empirical CDF).
+
+    Parameters:
+        values (np.ndarray): Sample values without NaNs.
+        weights (np.ndarray): Non-negative weight of each value.
+        q (float or array-like): Quantile(s) in [0, 1].
+
+    Returns:
+        np.ndarray: The value at each quantile.
+    """
+    return _cdf_quantile(*_weighted_cdf(values, weights), q)
+
+
+def _weighted_cdf(values: np.ndarray, weights: np.ndarray):
+    order = np.argsort(values)
+    cumulative = np.cumsum(weights[order])
+    return values[order], cumulative / cumulative[-1]
+
+
+def _cdf_quantile(sorted_values: np.ndarray, cdf: np.ndarray, q) -> np.ndarray:
+    positions = np.searchsorted(cdf, np.asarray(q, dtype=np.float64), side='left')
+    return sorted_values[np.clip(positions, 0, len(sorted_values) - 1)]
+
+
+def _type_codes(series: pd.Series) -> Optional[np.ndarray]:
+    # One small integer per row naming the value's Python type, as seen by
+    # DataAnalyzer._is_type_consistent; None for dtypes that are always consistent.
+    dtype = series.dtype
+    if isinstance(dtype, np.dtype) and dtype.kind in 'iufcb':
+        return None
+    if isinstance(dtype, (pd.StringDtype, pd.CategoricalDtype)) or (isinstance(dtype, np.dtype) and dtype.kind in 'mM'):
+        if not isinstance(dtype, pd.CategoricalDtype) or len({type(v) for v in dtype.categories}) == 1:
+            return series.isna().to_numpy().astype(np.int64)
+    elif dtype == object and pd.api.types.infer_dtype(series, skipna=True) == 'string':
+        return series.isna().to_numpy().astype(np.int64)
+    codes, _ = pd.factorize(pd.Series([type(v) for v in series.to_numpy(dtype=object)], dtype=object))
+    return codes.astype(np.int64)
+
+
+class SampledAnalysis:
+    """
+    Estimates the quality scores of a dataset, with confidence intervals, from a sample
+    that keeps growing until a wall-clock budget or a target error is reached.
+
+    Local CSV files are sampled in blocks of whole lines read at random byte offsets,
+    so the cost does not depend on the file's size. Each row is weighted by the inverse
+    of its chance of being picked, which depends on its length. Other sources are
+    streamed through DataFetcher.iter_chunks into a reservoir sample. Intervals come
+    from a bootstrap over the sampled blocks, which accounts for neighbouring rows
+    being alike. A source small enough to read outright is analysed exactly.
+    """
+
+    # Column pairs that differ in more sampled blocks than this are never equal in a
+    # bootstrap replicate with any practical probability (about exp(-8) = 0.03%).
+    MAX_MISMATCH_BLOCKS = 8
+
+    def __init__(self,
+                 fetcher: DataFetcher,
+                 time_budget: Optional[float] = 5.0,
+                 target_error: Optional[float] = None,
+                 confidence: float = 0.95,
+                 method: str = 'IQR',
+                 column_descriptions: Optional[dict] = None,
+                 block_bytes: int = 64 * 1024,
+                 initial_blocks: int = 16,
+                 max_rows: int = 1_000_000,
+                 chunksize: int = 100_000,
+                 n_boot: int = 200,
+                 seed: Optional[int] = None):
+        """
+        Parameters:
+            fetcher (DataFetcher): The source to sample.
+            time_budget (float, optional): Seconds to spend; the sample stops growing before
+                                           the next round would overrun it.
+            target_error (float, optional): Stop once the completeness and metadata quality
+                                            intervals are at most this wide on either side.
+            confidence (float): Confidence level of the intervals.
+            method (str): Outlier method ('IQR' or 'zscore').
+            column_descriptions (dict, optional): Passed to the metadata quality score.
+            block_bytes (int): Bytes per sampled block of a CSV file. Lines longer than
+                               this are never sampled.
+            initial_blocks (int): Blocks in the first round; each round doubles the sample.
+            max_rows (int): Largest number of sampled rows kept.
+            chunksize (int): Rows per chunk when streaming non-CSV sources.
+            n_boot (int): Bootstrap replicates.
+            seed (int, optional): Seed for reproducible samples.
+        """
+        if time_budget is None and target_error is None:
+            raise ValueError("Pass a time_budget, a target_error or both.")
+        if method not in ('IQR', 'zscore'):
+            raise ValueError("Invalid method. Use 'IQR' or 'zscore'.")
+        self.fetcher = fetcher
+        self.time_budget = time_budget
+        self.target_error = target_error
+        self.confidence = confidence
+        self.method = method
+        self.column_descriptions = column_descriptions
+        self.block_bytes = block_bytes
+        self.initial_blocks = initial_blocks
+        self.max_rows = max_rows
+        self.chunksize = chunksize
+        self.n_boot = n_boot
+        self._rng = np.random.default_rng(seed)
+        self._started = 0.0
+
+    def run(self) -> Dict[str, object]:
+        """
+        Draw the sample and estimate the scores.
+
+        Returns:
+            Dict[str, object]:
+                - exact (bool): True if the whole source was analysed.
+                - coverage ('full' or 'prefix'): 'prefix' if a streamed source was cut off by
+                  the time budget; the estimates then describe only the rows read.
+                - stopped_by: 'exact', 'target_error', 'time_budget', 'max_rows' or 'exhausted'.
+                - elapsed_seconds, sampled_rows, confidence.
+                - estimated_rows, completeness_score, metadata_quality_score: dicts with
+                  'estimate', 'lower' and 'upper'.
+                - outliers (pd.DataFrame): Per numerical column, the 'lower'/'upper' bounds,
+                  the outlier 'rate' with 'rate_lower'/'rate_upper', and 'estimated_count'.
+                - statistical_summary (dict): 'estimate', 'lower' and 'upper' DataFrames in the
+                  layout of DataFrame.describe(). Sample min/max have no interval (NaN).
+                - sample (pd.DataFrame): The sampled rows, e.g. for a preview.
+        """
+        self._started = time.perf_counter()
+        path = self.fetcher.source_url
+        if path.endswith('.csv') and os.path.exists(path):
+            self.fetcher.refresh_metadata()
+            try:
+                return self._run_blocks(path)
+            except ValueError as e:
+                print(f"Block sampling is not possible for this file ({e}); streaming a sample instead.")
+                self._started = time.perf_counter()
+        return self._run_stream()
+
+    def _elapsed(self) -> float:
+        return time.perf_counter() - self._started
+
+    def _stop_reason(self, result: dict, next_round_seconds: float) -> Optional[str]:
+        if self.target_error is not None:
+            half_width = max((result[name]["upper"] - result[name]["lower"]) / 2
+                             for name in ("completeness_score", "metadata_quality_score"))
+            if half_width <= self.target_error:
+                return "target_error"
+        if result["sampled_rows"] >= self.max_rows:
+            return "max_rows"
+        if self.time_budget is not None and self._elapsed() + next_round_seconds > self.time_budget:
+            return "time_budget"
+        return None
+
+    def _run_blocks(self, path: str) -> Dict[str, object]:
+        names, data_start = read_csv_header(path)
+        data_bytes = os.path.getsize(path) - data_start
+        block_bytes = self.block_bytes
+        # Offsets are drawn from the range in which a block can contain at least one line start.
+        low, high = data_start - block_bytes + 1, data_start + data_bytes
+        parts: List[bytes] = []
+        lengths: List[np.ndarray] = []
+        batch = self.initial_blocks
+        while True:
+            if (len(parts) + batch) * block_bytes >= data_bytes:
+                return self._exact("exact")  # The sample would be about as large as the file
+            round_started = time.perf_counter()
+            for offset in self._rng.integers(low, high, size=batch):
+                data, line_lengths = read_csv_sample_block(path, data_start, int(offset), block_bytes)
+                parts.append(data)
+                lengths.append(line_lengths)
+            line_lengths = np.concatenate(lengths)
+            if len(line_lengths) == 0:
+                batch = len(parts)
+                continue
+            sample = pd.read_csv(io.BytesIO(b''.join(parts)), header=None, names=names, encoding='utf-8')
+            if len(sample) != len(line_lengths):
+                raise ValueError("quoted fields span several lines")
+            weights = 1.0 / (block_bytes - line_lengths + 1)
+            groups = np.repeat(np.arange(len(parts)), [len(part) for part in lengths])
+            # Hansen-Hurwitz: every draw picks a line with probability weight**-1 / (high - low)
+            result = self._estimate(sample, weights, groups, len(parts), rows_scale=(high - low) / len(parts))
+            reason = self._stop_reason(result, 2 * (time.perf_counter() - round_started))
+            if reason:
+                return self._finish(result, reason, "full")
+            batch = len(parts)
+
+    def _run_stream(self) -> Dict[str, object]:
+        frames: List[pd.DataFrame] = []
+        keys: List[np.ndarray] = []
+        kept = rows_read = 0
+        dropped = False
+        next_estimate = self.chunksize
+        estimate_seconds = 0.0
+        result = None
+
+        def reservoir():
+            # Keep the max_rows rows with the smallest random keys: a uniform sample of all rows read
+            nonlocal frames, keys, kept, dropped
+            sample = frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+            sample_keys = np.concatenate(keys)
+            if len(sample) > self.max_rows:
+                keep = np.sort(np.argpartition(sample_keys, self.max_rows)[:self.max_rows])
+                sample, sample_keys = sample.iloc[keep].reset_index(drop=True), sample_keys[keep]
+                dropped = True
+            frames, keys, kept = [sample], [sample_keys], len(sample)
+            return sample
+
+        for chunk in self.fetcher.iter_chunks(self.chunksize):
+            chunk_started = time.perf_counter()
+            frames.append(chunk.reset_index(drop=True))
+            keys.append(self._rng.random(len(chunk)))
+            kept += len(chunk)
+            rows_read += len(chunk)
+            if kept > 2 * self.max_rows:
+                reservoir()
+            if rows_read >= next_estimate:
+                started = time.perf_counter()
+                result = self._estimate_uniform(reservoir(), rows_read)
+                estimate_seconds = time.perf_counter() - started
+                next_estimate = 2 * rows_read
+                reason = self._stop_reason(dict(result, sampled_rows=0), 0.0)  # max_rows only caps memory here
+                if reason:
+                    return self._finish(result, reason, "prefix")
+            chunk_seconds = time.perf_counter() - chunk_started
+            if self.time_budget is not None and self._elapsed() + chunk_seconds + 2 * estimate_seconds > self.time_budget:
+                return self._finish(self._estimate_uniform(reservoir(), rows_read), "time_budget", "prefix")
+
+        if not frames:
+            print("The source returned no rows to sample.")
+            return self._exact("exact", pd.DataFrame())
+        sample = reservoir()
+        if not dropped:
+            return self._exact("exact", sample)
+        return self._finish(self._estimate_uniform(sample, rows_read), "exhausted", "full")
+
+    def _estimate_uniform(self, sample: pd.DataFrame, rows_read: int) -> Dict[str, object]:
+        # Rows of a reservoir are independent, so random groups serve as bootstrap units.
+        n_groups = max(1, min(256, len(sample)))
+        groups = self._rng.integers(0, n_groups, size=len(sample))
+        return self._estimate(sample, np.ones(len(sample)), groups, n_groups, rows_total=rows_read)
+
+    def _finish(self, result: dict, reason: str, coverage: str) -> Dict[str, object]:
+        result.update(stopped_by=reason, coverage=coverage, elapsed_seconds=round(self._elapsed(), 3))
+        return result
+
+    def _interval(self, estimate, replicates) -> Dict[str, float]:
+        tail = (1 - self.confidence) / 2 * 100
+        replicates = np.asarray(replicates, dtype=np.float64)
+        replicates = replicates[~np.isnan(replicates)]
+        if len(replicates) == 0:
+            return {"estimate": float(estimate), "lower": np.nan, "upper": np.nan}
+        lower, upper = np.percentile(replicates, [tail, 100 - tail])
+        return {"estimate": float(estimate), "lower": float(lower), "upper": float(upper)}
+
+    def _estimate(self,
+                  df: pd.DataFrame,
+                  weights: np.ndarray,
+                  groups: np.ndarray,
+                  n_groups: int,
+                  rows_scale: float = 1.0,
+                  rows_total: Optional[int] = None) -> Dict[str, object]:
+        # Every statistic is a ratio of weighted sums. Summing per group first lets each
+        # bootstrap replicate (a multiset of groups) be evaluated with one matrix product.
+        replicates = self._rng.multinomial(n_groups, np.full(n_groups, 1.0 / n_groups),
+                                           size=self.n_boot).astype(np.float64)
+
+        def totals(values):
+            per_group = np.bincount(groups, weights=weights * values, minlength=n_groups)
+            return per_group.sum(), replicates @ per_group
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            weight, weight_rep = totals(np.ones(len(df)))
+            if rows_total is None:
+                rows = self._interval(rows_scale * weight, rows_scale * weight_rep)
+            else:
+                rows = {"estimate": float(rows_total), "lower": float(rows_total), "upper": float(rows_total)}
+
+            filled, filled_rep = totals(df.notna().sum(axis=1).to_numpy() / max(df.shape[1], 1))
+            completeness = self._interval(filled / weight, filled_rep / weight_rep)
+            metadata = self._metadata_quality(df, groups, n_groups, replicates)
+
+            numeric_df = df.select_dtypes(include=[np.number])
+            outliers = {}
+            summary = {key: {} for key in ("estimate", "lower", "upper")}
+            for column in numeric_df.columns:
+                x = numeric_df[column].to_numpy(dtype=np.float64)
+                valid = ~np.isnan(x)
+                if not valid.any():
+                    continue
+                cdf = _weighted_cdf(x[valid], weights[valid])
+                outliers[column] = self._outlier_rate(x, valid, weights, cdf, totals, weight, weight_rep, rows)
+                for key, values in self._summary(x, valid, weights, cdf, totals, weight, weight_rep, rows).items():
+                    summary[key][column] = values
+
+        return {
+            "exact": False,
+            "sampled_rows": len(df),
+            "confidence": self.confidence,
+            "estimated_rows": rows,
+            "completeness_score": completeness,
+            "metadata_quality_score": metadata,
+            "outliers": pd.DataFrame.from_dict(outliers, orient='index',
+                                               columns=["lower", "upper", "rate", "rate_lower", "rate_upper",
+                                                        "estimated_count"]),
+            "statistical_summary": {key: pd.DataFrame(values, index=SUMMARY_INDEX) for key, values in summary.items()},
+            "sample": df,
+        }
+
+    def _outlier_rate(self, x, valid, weights, cdf, totals, weight, weight_rep, rows) -> list:
+        # Bounds come from the weighted sample and are held fixed across replicates.
+        values, value_weights = x[valid], weights[valid]
+        if self.method == 'IQR':
+            q1, q3 = _cdf_quantile(*cdf, [0.25, 0.75])
+            lower, upper = q1 - 1.5 * (q3 - q1), q3 + 1.5 * (q3 - q1)
+        else:
+            mean = np.average(values, weights=value_weights)
+            std = np.sqrt(np.average((values - mean) ** 2, weights=value_weights))
+            lower, upper = mean - 3 * std, mean + 3 * std
+        flagged, flagged_rep = totals(((x < lower) | (x > upper)).astype(np.float64))
+        rate = self._interval(flagged / weight, flagged_rep / weight_rep)
+        return [float(lower), float(upper), rate["estimate"], rate["lower"], rate["upper"],
+                int(round(rate["estimate"] * rows["estimate"]))]
+
+    def _summary(self, x, valid, weights, cdf, totals, weight, weight_rep, rows) -> Dict[str, list]:
+        values = x[valid]
+        count, count_rep = totals(valid.astype(np.float64))
+        count_interval = self._interval(rows["estimate"] * count / weight,
+                                        rows["estimate"] * count_rep / weight_rep)
+
+        # Moments around the sample mean, so replicates don't lose precision to cancellation
+        center = values.mean()
+        centered = np.where(valid, x - center, 0.0)
+        s1, s1_rep = totals(centered)
+        s2, s2_rep = totals(centered ** 2)
+        correction = valid.sum() / (valid.sum() - 1) if valid.sum() > 1 else np.nan
+        mean = self._interval(center + s1 / count, center + s1_rep / count_rep)
+        std = self._interval(np.sqrt((s2 / count - (s1 / count) ** 2) * correction),
+                             np.sqrt(np.maximum(s2_rep / count_rep - (s1_rep / count_rep) ** 2, 0) * correction))
+
+        # Woodruff intervals: bootstrap the share of values below each quantile, then map
+        # the share's interval back through the sample's distribution function.
+        quantiles = []
+        tail = (1 - self.confidence) / 2 * 100
+        for q in (0.25, 0.5, 0.75):
+            estimate = _cdf_quantile(*cdf, [q])[0]
+            below, below_rep = totals((valid & (x <= estimate)).astype(np.float64))
+            shares = below_rep / count_rep
+            shares = shares[~np.isnan(shares)]
+            lower, upper = _cdf_quantile(*cdf, np.percentile(shares, [tail, 100 - tail]))
+            quantiles.append({"estimate": float(estimate), "lower": float(lower), "upper": float(upper)})
+
+        sample_min = {"estimate": float(values.min()), "lower": np.nan, "upper": np.nan}
+        sample_max = {"estimate": float(values.max()), "lower": np.nan, "upper": np.nan}
+        stats = [count_interval, mean, std, sample_min] + quantiles + [sample_max]
+        return {key: [stat[key] for stat in stats] for key in ("estimate", "lower", "upper")}
+
+    def _metadata_quality(self, df: pd.DataFrame, groups: np.ndarray, n_groups: int,
+                          replicates: np.ndarray) -> Dict[str, float]:
+        # Same components as DataAnalyzer.calculate_metadata_quality_score, evaluated on the
+        # sample and on every bootstrap replicate from per-group summaries.
+        num_columns = df.shape[1]
+        if len(df) == 0 or num_columns == 0:
+            return {"estimate": 0.0, "lower": 0.0, "upper": 0.0}
+        fixed = sum(1 for col in df.columns if col and "Unnamed" not in col)
+        max_score = 3 * num_columns
+        if self.column_descriptions:
+            fixed += sum(1 for col in df.columns if col in self.column_descriptions and self.column_descriptions[col])
+            max_score += num_columns
+
+        # Type consistency: a column is consistent if the rows drawn show a single type.
+        consistent, consistent_rep = 0, np.zeros(len(replicates))
+        for i in range(num_columns):
+            codes = _type_codes(df.iloc[:, i])
+            if codes is None:
+                consistent += 1
+                consistent_rep += 1
+                continue
+            k = int(codes.max()) + 1
+            present = np.bincount(groups * k + codes, minlength=n_groups * k).reshape(n_groups, k) > 0
+            consistent += int(present.any(axis=0).sum() == 1)
+            consistent_rep += ((replicates @ present) > 0).sum(axis=1) == 1
+
+        # Duplicate columns: compare per-group digests of each column's values; a pair is
+        # equal in a replicate if none of the groups where it differs was drawn.
+        order = np.argsort(groups, kind='stable')
+        sorted_groups = groups[order]
+        present_groups = np.unique(sorted_groups)
+        starts = np.searchsorted(sorted_groups, present_groups)
+        row_keys = self._rng.integers(1, np.iinfo(np.int64).max, size=len(df)).astype(np.uint64)
+        digests = np.zeros((n_groups, num_columns), dtype=np.uint64)
+        with np.errstate(over='ignore'):
+            for i in range(num_columns):
+                hashes = DataAnalyzer._column_hashes(df.iloc[:, i])[order] * row_keys
+                digests[present_groups, i] = np.add.reduceat(hashes, starts)
+        pairs = []
+        for a in range(num_columns - 1):
+            differing = digests[:, a + 1:] != digests[:, [a]]
+            for offset in np.flatnonzero(differing.sum(axis=0) <= self.MAX_MISMATCH_BLOCKS):
+                pairs.append((a, a + 1 + offset, np.flatnonzero(differing[:, offset])))
+
+        def duplicates(equal_pairs) -> int:
+            parent = list(range(num_columns))
+
+            def find(i):
+                while parent[i] != i:
+                    parent[i] = parent[parent[i]]
+                    i = parent[i]
+                return i
+
+            merged = 0
+            for a, b in equal_pairs:
+                ra, rb = find(a), find(b)
+                if ra != rb:
+                    parent[rb] = ra
+                    merged += 1
+            return merged
+
+        duplicate = duplicates((a, b) for a, b, blocks in pairs if len(blocks) == 0)
+        duplicate_rep = np.array([
+            duplicates((a, b) for a, b, blocks in pairs if not replicate[blocks].any())
+            for replicate in replicates
+        ]) if pairs else np.zeros(len(replicates))
+
+        score = (fixed + consistent + num_columns - duplicate) / max_score
+        score_rep = (fixed + consistent_rep + num_columns - duplicate_rep) / max_score
+        return self._interval(score, score_rep)
+
+    def _exact(self, reason: str, df: Optional[pd.DataFrame] = None) -> Dict[str, object]:
+        if df is None:
+            df, _ = self.fetcher.fetch_data()
+
+        def point(value) -> Dict[str, float]:
+            return {"estimate": float(value), "lower": float(value), "upper": float(value)}
+
+        bounds = DataAnalyzer.outlier_bounds(df, method=self.method)
+        counts = DataAnalyzer.outlier_mask(df, method=self.method).sum()
+        rates = counts / max(len(df), 1)
+        outliers = bounds.assign(rate=rates, rate_lower=rates, rate_upper=rates, estimated_count=counts.astype(int))
+        summary = df.describe() if not df.select_dtypes(include=[np.number]).empty else pd.DataFrame(index=SUMMARY_INDEX)
+        return {
+            "exact": True,
+            "coverage": "full",
+            "stopped_by": reason,
+            "elapsed_seconds": round(self._elapsed(), 3),
+            "sampled_rows": len(df),
+            "confidence": self.confidence,
+            "estimated_rows": point(len(df)),
+            "completeness_score": point(DataAnalyzer.calculate_completeness_score(df)),
+            "metadata_quality_score": point(
+                DataAnalyzer.calculate_metadata_quality_score(df, self.column_descriptions)),
+            "outliers": outliers,
+            "statistical_summary": {"estimate": summary, "lower": summary, "upper": summary},
+            "sample": df,
+        }
+
+
+# Example usage (replace with your actual dataset URL)
+if __name__ == "__main__":
+    analysis = SampledAnalysis(DataFetcher("shopping_trends.csv"), time_budget=2.0, block_bytes=4096,
+                               initial_blocks=4, seed=0)
+    result = analysis.run()
+    print("Stopped by:", result["stopped_by"], "after", result["elapsed_seconds"], "s")
+    print("Completeness Score:", result["completeness_score"])
+    print("Metadata Quality Score:", result["metadata_quality_score"])
+    print("Outliers:\n", result["outliers"])
+    print("Statistical Summary:\n", result["statistical_summary"]["estimate"])
@@ -0,0 +1,347 @@
+"""
+Local HTTP/JSON scoring service shared by dashboards and pipelines.
+
+Example:
+    python scoring_service.py --port 8765 --workers 4 --timeout 600 --snapshot-dir snapshots
+    curl -s localhost:8765/score -d '{"source": "data/sales.csv"}'
+    curl -s "localhost:8765/score?source=data/sales.csv&chunksize=100000"
+    curl -s localhost:8765/metrics
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from batch_score import score_task
+from data_fetcher import DataFetcher
+from instrumentation import Instrumentation
+from result_cache import ResultCache
+
+# Upper bounds of the request latency histogram, in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+
+_STATUS_CODES = {"ok": 200, "error": 500, "timeout": 504}
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            413: "Payload Too Large", 500: "Internal Server Error", 504: "Gateway Timeout"}
+_MAX_BODY_BYTES = 1024 ** 2
+
+
+def _service_task(source: str, timeout: Optional[float], chunksize: Optional[int], weights: Optional[List[float]],
+                  snapshot_dir: Optional[str]) -> Dict:
+    # Runs in a worker process: batch_score's task plus the CPU time it took.
+    cpu = time.process_time()
+    record = score_task(source, timeout, chunksize, weights, snapshot_dir)
+    record["cpu_seconds"] = round(time.process_time() - cpu, 4)
+    return record
+
+
+class ScoringService:
+    """
+    Trust scoring behind an asyncio front end and a process-pool back end.
+
+    Concurrent requests for the same source version and options share one
+    computation, and successful results are cached per source version (see
+    DataFetcher.fingerprint), so repeated requests return without rescoring. Sources
+    whose version can't be determined (URLs without ETag or Last-Modified) are cached
+    for unversioned_ttl seconds.
+    """
+
+    def __init__(self, workers: Optional[int] = None, timeout: Optional[float] = None,
+                 snapshot_dir: Optional[str] = None, cache: Optional[ResultCache] = None,
+                 unversioned_ttl: float = 60.0, recorder: Optional[Instrumentation] = None):
+        self.workers = workers or os.cpu_count() or 1
+        self.timeout = timeout
+        self.snapshot_dir = snapshot_dir
+        self.cache = cache if cache is not None else ResultCache(max_bytes=64 * 1024 ** 2, max_entries=4096)
+        self.unversioned_ttl = unversioned_ttl
+        self.recorder = recorder if recorder is not None else Instrumentation(track_memory=False)
+        self.started = time.time()
+        self.waiting = 0  # Requests waiting for a computation
+        self.requests: Dict[str, int] = {"hit": 0, "coalesced": 0, "computed": 0, "rejected": 0}
+        self.latency: Dict[str, List[float]] = {}  # outcome -> bucket counts, then sum
+        self._in_flight: Dict[Tuple, asyncio.Task] = {}
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def in_flight(self) -> int:
+        """Computations submitted to the worker pool and not finished yet."""
+        return len(self._in_flight)
+
+    @property
+    def queue_depth(self) -> int:
+        """Computations waiting for a free worker."""
+        return max(0, self.in_flight - self.workers)
+
+    def _observe(self, outcome: str, seconds: float) -> None:
+        counts = self.latency.setdefault(outcome, [0] * (len(LATENCY_BUCKETS) + 1) + [0.0])
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                counts[i] += 1
+        counts[len(LATENCY_BUCKETS)] += 1  # +Inf, i.e. the total count
+        counts[-1] += seconds
+
+    async def _key(self, source: str, chunksize: Optional[int], weights: Optional[List[float]]) -> Tuple:
+        # Fingerprinting a URL is a blocking HEAD request, so it runs on a thread.
+        loop = asyncio.get_running_loop()
+        version = await loop.run_in_executor(None, DataFetcher(source).fingerprint)
+        if version is None:
+            version = f"{source}@{int(time.time() // self.unversioned_ttl)}"
+        return version, chunksize, tuple(weights) if weights else None
+
+    async def _compute(self, key: Tuple, source: str, chunksize: Optional[int],
+                       weights: Optional[List[float]]) -> Dict:
+        loop = asyncio.get_running_loop()
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        pool = self._pool
+        started = time.perf_counter()
+        try:
+            record = await loop.run_in_executor(pool, _service_task, source, self.timeout, chunksize,
+                                                weights, self.snapshot_dir)
+        except BrokenProcessPool as e:
+            # A worker died (e.g. killed for memory); the pool is unusable, so the next
+            # request starts a new one. Every request on the broken pool fails here.
+            if self._pool is pool:
+                pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+            record = {"source": source, "status": "error", "error": f"{type(e).__name__}: {e}",
+                      "elapsed_seconds": round(time.perf_counter() - started, 4), "cpu_seconds": None}
+        finally:
+            self._in_flight.pop(key, None)
+        self.recorder.add({"step": "score_source", "detail": source, "rows": record.get("rows"),
+                           "columns": record.get("columns"), "wall_seconds": record["elapsed_seconds"],
+                           "cpu_seconds": record.pop("cpu_seconds"), "peak_bytes": None})
+        if record["status"] == "ok":
+            self.cache.put(key, record)
+        return record
+
+    async def score(self, source: str, chunksize: Optional[int] = None, weights: Optional[List[float]] = None,
+                    refresh: bool = False) -> Dict:
+        """
+        Score a source, from the cache or an in-flight computation when possible.
+
+        Parameters:
+            source (str): Path or URL of the dataset.
+            chunksize (int, optional): Profile the source in streaming mode with this many rows per chunk.
+            weights (List[float], optional): (alpha, beta, gamma) for the trust score.
+            refresh (bool): Ignore a cached result.
+
+        Returns:
+            Dict: The batch_score record (source, status, error, scores, elapsed_seconds)
+                  plus 'served' ('hit', 'coalesced' or 'computed') and 'latency_seconds'.
+        """
+        started = time.perf_counter()
+        key = await self._key(source, chunksize, weights)
+        record = None if refresh else self.cache.get(key)
+        if record is not None:
+            served = "hit"
+        else:
+            task = self._in_flight.get(key)
+            served = "coalesced" if task is not None else "computed"
+            if task is None:
+                task = asyncio.ensure_future(self._compute(key, source, chunksize, weights))
+                self._in_flight[key] = task
+            self.waiting += 1
+            try:
+                # shield: a client hanging up must not cancel the computation others wait for
+                record = await asyncio.shield(task)
+            finally:
+                self.waiting -= 1
+        latency = time.perf_counter() - started
+        self.requests[served] += 1
+        self._observe(served, latency)
+        return {**record, "served": served, "latency_seconds": round(latency, 4)}
+
+    def stats(self) -> Dict:
+        """
+        Current load and counters.
+
+        Returns:
+            Dict: in_flight, queue_depth, waiting requests, requests per outcome, cache
+                  stats and uptime.
+        """
+        return {
+            "workers": self.workers,
+            "in_flight": self.in_flight,
+            "queue_depth": self.queue_depth,
+            "waiting": self.waiting,
+            "requests": dict(self.requests),
+            "cache": self.cache.stats(),
+            "uptime_seconds": round(time.time() - self.started, 3),
+        }
+
+    def metrics(self, prefix: str = "dataset_trust") -> str:
+        """
+        Service metrics in the OpenMetrics text format: the per-step totals of the
+        computations (see Instrumentation.to_openmetrics), load gauges, request counters
+        and a request latency histogram per outcome.
+
+        Parameters:
+            prefix (str): Metric name prefix.
+
+        Returns:
+            str: The exposition, ending with '# EOF'.
+        """
+        lines = self.recorder.to_openmetrics(prefix).rstrip("\n").split("\n")[:-1]  # Without '# EOF'
+        gauges = [
+            ("in_flight", self.in_flight, "Computations submitted to the worker pool and not finished."),
+            ("queue_depth", self.queue_depth, "Computations waiting for a free worker."),
+            ("waiting_requests", self.waiting, "Requests waiting for a computation."),
+            ("workers", self.workers, "Worker processes."),
+            ("cache_entries", len(self.cache), "Cached results."),
+            ("cache_bytes", self.cache.bytes, "Estimated size of the cached results."),
+        ]
+        for name, value, help_text in gauges:
+            metric = f"{prefix}_service_{name}"
+            lines += [f"# TYPE {metric} gauge", f"# HELP {metric} {help_text}", f"{metric} {value:g}"]
+
+        metric = f"{prefix}_service_requests"
+        lines += [f"# TYPE {metric} counter", f"# HELP {metric} Score requests by how they were served."]
+        lines += [f"{metric}_total{{served=\"{served}\"}} {count}" for served, count in self.requests.items()]
+
+        metric = f"{prefix}_service_request_seconds"
+        lines += [f"# TYPE {metric} histogram", f"# UNIT {metric} seconds",
+                  f"# HELP {metric} Score request latency by how the request was served."]
+        for served, counts in self.latency.items():
+            for bound, count in zip(LATENCY_BUCKETS + ("+Inf",), counts):
+                lines.append(f"{metric}_bucket{{served=\"{served}\",le=\"{bound}\"}} {count}")
+            lines.append(f"{metric}_count{{served=\"{served}\"}} {counts[len(LATENCY_BUCKETS)]}")
+            lines.append(f"{metric}_sum{{served=\"{served}\"}} {counts[-1]:g}")
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    # HTTP front end
+
+    async def _route(self, method: str, target: str, body: bytes) -> Tuple[int, str, bytes]:
+        url = urlsplit(target)
+        if url.path == "/health":
+            return 200, "application/json", json.dumps({"status": "ok"}).encode()
+        if url.path == "/stats":
+            return 200, "application/json", json.dumps(self.stats()).encode()
+        if url.path == "/metrics":
+            return 200, "application/openmetrics-text; version=1.0.0; charset=utf-8", self.metrics().encode()
+        if url.path != "/score":
+            return 404, "application/json", json.dumps({"error": f"Unknown path {url.path}."}).encode()
+        if method not in ("GET", "POST"):
+            return 405, "application/json", json.dumps({"error": "Use GET or POST."}).encode()
+
+        try:
+            if method == "POST":
+                params = json.loads(body or b"{}")
+                if not isinstance(params, dict):
+                    raise ValueError("The body must be a JSON object.")
+            else:
+                query = parse_qs(url.query)
+                params = {name: values[-1] for name, values in query.items()}
+                if "weights" in params:
+                    params["weights"] = params["weights"].split(",")
+                if "refresh" in params:
+                    params["refresh"] = params["refresh"].lower() in ("1", "true", "yes")
+            source = params.get("source")
+            if not source or not isinstance(source, str):
+                raise ValueError("'source' is required.")
+            chunksize = int(params["chunksize"]) if params.get("chunksize") else None
+            weights = [float(w) for w in params["weights"]] if params.get("weights") else None
+            if weights is not None and len(weights) != 3:
+                raise ValueError("'weights' needs exactly three values.")
+        except (ValueError, TypeError) as e:
+            self.requests["rejected"] += 1
+            return 400, "application/json", json.dumps({"error": str(e)}).encode()
+
+        record = await self.score(source, chunksize, weights, refresh=bool(params.get("refresh")))
+        return _STATUS_CODES.get(record["status"], 500), "application/json", json.dumps(record).encode()
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve HTTP/1.1 requests on one connection (keep-alive unless the client closes)."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    await self._respond(writer, 400, "application/json", b'{"error": "Malformed request."}', False)
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get("content-length") or 0)
+                if length > _MAX_BODY_BYTES:
+                    await self._respond(writer, 413, "application/json", b'{"error": "Body too large."}', False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                try:
+                    status, content_type, payload = await self._route(method.upper(), target, body)
+                except Exception as e:
+                    status, content_type = 500, "application/json"
+                    payload = json.dumps({"error": f"{type(e).__name__}: {e}"}).encode()
+                await self._respond(writer, status, content_type, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _respond(writer: asyncio.StreamWriter, status: int, content_type: str, payload: bytes,
+                       keep_alive: bool) -> None:
+        head = (f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+                f"Content-Type: {content_type}\r\n"
+                f"Content-Length: {len(payload)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode("latin-1") + payload)
+        await writer.drain()
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 8765) -> None:
+        """Listen on host:port until cancelled."""
+        server = await asyncio.start_server(self.handle, host, port)
+        print(f"Scoring service listening on http://{host}:{port} ({self.workers} workers)", file=sys.stderr)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Serve trust scores over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to listen on.")
+    parser.add_argument("--port", type=int, default=8765, help="Port to listen on.")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count).")
+    parser.add_argument("--timeout", type=float, default=None, help="Per-source timeout in seconds.")
+    parser.add_argument("--snapshot-dir", help="Keep columnar snapshots here so unchanged files load without reparsing.")
+    parser.add_argument("--cache-mb", type=float, default=64, help="Memory cap of the result cache.")
+    parser.add_argument("--unversioned-ttl", type=float, default=60.0,
+                        help="Seconds to cache results of sources without a version (e.g. URLs without ETag).")
+    args = parser.parse_args(argv)
+
+    service = ScoringService(workers=args.workers, timeout=args.timeout, snapshot_dir=args.snapshot_dir,
+                             cache=ResultCache(max_bytes=int(args.cache_mb * 1024 ** 2), max_entries=4096),
+                             unversioned_ttl=args.unversioned_ttl)
+    try:
+        asyncio.run(service.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
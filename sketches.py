@@ -0,0 +1,298 @@
+import hashlib
+import math
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+
+def value_hashes(values: pd.Series) -> np.ndarray:
+    """
+    Hash every value of a Series to a uint64, independent of its dtype width.
+
+    Numeric and boolean values are hashed by value (1, 1.0 and True collide, and
+    -0.0 equals 0.0) so that the same column hashes identically whether a chunk
+    was parsed as int64 or float64.
+
+    Parameters:
+        values (pd.Series): The values to hash.
+
+    Returns:
+        np.ndarray: One uint64 hash per value, in order.
+    """
+    if pd.api.types.is_bool_dtype(values.dtype) or pd.api.types.is_numeric_dtype(values.dtype):
+        if not isinstance(values.dtype, pd.CategoricalDtype):
+            values = values.astype('float64') + 0.0
+    return pd.util.hash_pandas_object(values, index=False).to_numpy()
+
+
+def column_digest(hashes: np.ndarray, digest=None):
+    """
+    Fold per-value hashes into an order-sensitive content digest.
+
+    Parameters:
+        hashes (np.ndarray): uint64 hashes as returned by value_hashes.
+        digest (hashlib object, optional): A running digest to continue.
+
+    Returns:
+        hashlib object: The updated digest.
+    """
+    if digest is None:
+        digest = hashlib.blake2b(digest_size=16)
+    digest.update(np.ascontiguousarray(hashes, dtype=np.uint64).tobytes())
+    return digest
+
+
+class RollingDigest:
+    """
+    Order-sensitive content digest over uint64 value hashes that can be updated
+    chunk by chunk and merged, giving the same result however the rows were split.
+
+    It is a polynomial hash modulo 2**64 in two independent lanes (128 bits).
+    """
+
+    _BASES = (0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F)
+
+    def __init__(self):
+        self.length = 0
+        self.lanes = [0, 0]
+
+    def update(self, hashes: np.ndarray) -> "RollingDigest":
+        """
+        Append a chunk of hashes.
+
+        Parameters:
+            hashes (np.ndarray): uint64 hashes as returned by value_hashes.
+
+        Returns:
+            RollingDigest: self, for chaining.
+        """
+        n = len(hashes)
+        if n == 0:
+            return self
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        with np.errstate(over='ignore'):
+            for lane, base in enumerate(self._BASES):
+                # powers[i] = base ** (n - 1 - i), wrapping modulo 2**64
+                powers = np.full(n, base, dtype=np.uint64)
+                powers[-1] = 1
+                powers = np.cumprod(powers[::-1], dtype=np.uint64)[::-1]
+                chunk = int(np.sum(hashes * powers, dtype=np.uint64))
+                self.lanes[lane] = (self.lanes[lane] * pow(base, n, 1 << 64) + chunk) % (1 << 64)
+        self.length += n
+        return self
+
+    def merge(self, other: "RollingDigest") -> "RollingDigest":
+        """
+        Append the digest of the rows that follow this digest's rows.
+
+        Returns:
+            RollingDigest: self, for chaining.
+        """
+        for lane, base in enumerate(self._BASES):
+            self.lanes[lane] = (self.lanes[lane] * pow(base, other.length, 1 << 64) + other.lanes[lane]) % (1 << 64)
+        self.length += other.length
+        return self
+
+    def digest(self) -> bytes:
+        return self.length.to_bytes(8, 'little') + b''.join(lane.to_bytes(8, 'little') for lane in self.lanes)
+
+
+class HyperLogLog:
+    """
+    Mergeable distinct-count sketch with 2**precision one-byte registers.
+
+    The relative standard error is about 1.04 / sqrt(2**precision), i.e. ~0.8%
+    with the default precision of 14 (16 KiB of registers).
+    """
+
+    def __init__(self, precision: int = 14):
+        if not 4 <= precision <= 18:
+            raise ValueError("HyperLogLog precision must be between 4 and 18.")
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def update_hashes(self, hashes: np.ndarray) -> None:
+        """
+        Add a batch of uint64 hashes to the sketch.
+
+        Parameters:
+            hashes (np.ndarray): uint64 hashes of the values to count.
+        """
+        if len(hashes) == 0:
+            return
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        p = self.precision
+        width = 64 - p
+        index = (hashes >> np.uint64(width)).astype(np.intp)
+        rest = hashes & np.uint64((1 << width) - 1)
+
+        # Position of the highest set bit of `rest`; float log2 can round up
+        # right below a power of two, so correct those cases exactly.
+        nonzero = rest != 0
+        top = np.zeros(len(rest), dtype=np.int64)
+        top[nonzero] = np.floor(np.log2(rest[nonzero].astype(np.float64))).astype(np.int64)
+        overshoot = nonzero & ((rest >> top.astype(np.uint64)) == 0)
+        top[overshoot] -= 1
+        rank = np.where(nonzero, width - top, width + 1).astype(np.uint8)
+
+        np.maximum.at(self.registers, index, rank)
+
+    def update(self, values: pd.Series) -> None:
+        """
+        Add the non-null values of a Series to the sketch.
+
+        Parameters:
+            values (pd.Series): The values to count.
+        """
+        self.update_hashes(value_hashes(values.dropna()))
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        """
+        Merge another sketch of the same precision into this one.
+
+        Returns:
+            HyperLogLog: self, for chaining.
+        """
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLog sketches of different precision.")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def count(self) -> int:
+        """
+        Estimate the number of distinct values added so far.
+
+        Returns:
+            int: Estimated distinct count.
+        """
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)  # Linear counting for small cardinalities
+        return int(round(estimate))
+
+
+class KLLSketch:
+    """
+    Mergeable quantile sketch (Karnin, Lang and Liberty compactors).
+
+    Items are kept in levels whose weight doubles at every level; a level that
+    grows past its capacity is sorted and every other item is promoted. The rank
+    error is roughly 1.7 / k, independent of the number of items.
+    """
+
+    def __init__(self, k: int = 200, seed: Optional[int] = None):
+        self.k = k
+        self.count = 0
+        self.levels = [np.empty(0, dtype=np.float64)]
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.levels) - level - 1
+        return max(2, int(math.ceil(self.k * (2.0 / 3.0) ** depth)))
+
+    def _compress(self) -> None:
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) > self._capacity(level):
+                items = np.sort(items)
+                keep = items[-1:] if len(items) % 2 else items[:0]
+                pairs = items[:len(items) - len(keep)]
+                promoted = pairs[self._rng.integers(2)::2]
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0, dtype=np.float64))
+                self.levels[level] = keep
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+            level += 1
+
+    def update(self, values) -> None:
+        """
+        Add a batch of values to the sketch; NaNs are ignored.
+
+        Parameters:
+            values (array-like): Numeric values to add.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return
+        self.count += len(values)
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+
+    def merge(self, other: "KLLSketch") -> "KLLSketch":
+        """
+        Merge another sketch into this one.
+
+        Returns:
+            KLLSketch: self, for chaining.
+        """
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0, dtype=np.float64))
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self.count += other.count
+        self._compress()
+        return self
+
+    def _weighted_items(self):
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(lvl), 2.0 ** h) for h, lvl in enumerate(self.levels)])
+        order = np.argsort(items, kind='mergesort')
+        return items[order], np.cumsum(weights[order])
+
+    def quantile(self, q):
+        """
+        Estimate one or more quantiles.
+
+        Parameters:
+            q (float or array-like): Quantile(s) in [0, 1].
+
+        Returns:
+            float or np.ndarray: Estimated value(s), NaN if the sketch is empty.
+        """
+        scalar = np.ndim(q) == 0
+        q = np.atleast_1d(np.asarray(q, dtype=np.float64))
+        if self.count == 0:
+            result = np.full(len(q), np.nan)
+        else:
+            items, cumulative = self._weighted_items()
+            targets = q * cumulative[-1]
+            positions = np.searchsorted(cumulative, targets, side='left')
+            result = items[np.clip(positions, 0, len(items) - 1)]
+        return float(result[0]) if scalar else result
+
+    def rank(self, x):
+        """
+        Estimate the fraction of values strictly below x.
+
+        Parameters:
+            x (float or array-like): Value(s) to rank.
+
+        Returns:
+            float or np.ndarray: Normalized rank(s) in [0, 1].
+        """
+        scalar = np.ndim(x) == 0
+        x = np.atleast_1d(np.asarray(x, dtype=np.float64))
+        if self.count == 0:
+            result = np.full(len(x), np.nan)
+        else:
+            items, cumulative = self._weighted_items()
+            positions = np.searchsorted(items, x, side='left')
+            below = np.where(positions > 0, cumulative[np.maximum(positions - 1, 0)], 0.0)
+            result = below / cumulative[-1]
+        return float(result[0]) if scalar else result
+
+    def cdf_points(self):
+        """
+        Return the sketch's retained items with their estimated CDF values.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Sorted items and the fraction of values <= each item.
+        """
+        items, cumulative = self._weighted_items()
+        return items, cumulative / cumulative[-1]
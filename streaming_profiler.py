@@ -0,0 +1,443 @@
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from distribution_tests import DISTRIBUTIONS, TABLE_COLUMNS, sketch_tests
+from sketches import HyperLogLog, KLLSketch, RollingDigest, value_hashes
+
+
+class ColumnAccumulator:
+    """
+    Mergeable single-column statistics: null counts, moments, min/max, a
+    distinct-count sketch, a quantile sketch and a content digest.
+    """
+
+    def __init__(self, name: str, sketch_k: int = 200, hll_precision: int = 14):
+        self.name = name
+        self.rows = 0
+        self.nulls = 0
+        self.empty = 0  # Strings that are empty after stripping whitespace
+        self.kinds = set()  # 'numeric', 'bool', 'string' or 'mixed' per chunk
+        self.numeric = True
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.m3 = 0.0
+        self.m4 = 0.0
+        self.min = np.nan
+        self.max = np.nan
+        self.distinct = HyperLogLog(hll_precision)
+        self.quantiles = KLLSketch(sketch_k)
+        self.digest = RollingDigest()
+
+    def _merge_moments(self, n, mean, m2, m3, m4) -> None:
+        # Pebay (2008) pairwise update of central moments.
+        na, nb = self.count, n
+        if nb == 0:
+            return
+        if na == 0:
+            self.count, self.mean, self.m2, self.m3, self.m4 = n, mean, m2, m3, m4
+            return
+        total = na + nb
+        delta = mean - self.mean
+        self.m4 = (self.m4 + m4
+                   + delta ** 4 * na * nb * (na * na - na * nb + nb * nb) / total ** 3
+                   + 6 * delta ** 2 * (na * na * m2 + nb * nb * self.m2) / total ** 2
+                   + 4 * delta * (na * m3 - nb * self.m3) / total)
+        self.m3 = (self.m3 + m3
+                   + delta ** 3 * na * nb * (na - nb) / total ** 2
+                   + 3 * delta * (na * m2 - nb * self.m2) / total)
+        self.m2 = self.m2 + m2 + delta ** 2 * na * nb / total
+        self.mean = self.mean + delta * nb / total
+        self.count = total
+
+    def update(self, series: pd.Series) -> None:
+        """
+        Fold one chunk of the column into the accumulator.
+
+        Parameters:
+            series (pd.Series): The column's values for this chunk.
+        """
+        self.rows += len(series)
+        nulls = series.isna()
+        self.nulls += int(nulls.sum())
+        self.digest.update(value_hashes(series))
+        self.distinct.update_hashes(value_hashes(series[~nulls]))
+
+        dtype = series.dtype
+        if pd.api.types.is_bool_dtype(dtype):
+            self.kinds.add('bool')
+            self.numeric = False
+        elif pd.api.types.is_numeric_dtype(dtype):
+            self.kinds.add('numeric')
+            values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+            values = values[~np.isnan(values)]
+            if len(values):
+                mean = values.mean()
+                centered = values - mean
+                c2 = centered * centered
+                self._merge_moments(len(values), mean, c2.sum(), (c2 * centered).sum(), (c2 * c2).sum())
+                self.min = np.fmin(self.min, values.min())
+                self.max = np.fmax(self.max, values.max())
+                self.quantiles.update(values)
+        else:
+            self.numeric = False
+            inferred = pd.api.types.infer_dtype(series, skipna=False)
+            self.kinds.add('string' if inferred == 'string' else 'mixed')
+            if inferred in ('string', 'mixed', 'empty'):
+                try:
+                    self.empty += int((series.str.strip() == '').sum())
+                except AttributeError:
+                    pass
+
+    def merge(self, other: "ColumnAccumulator") -> "ColumnAccumulator":
+        """
+        Merge the accumulator of the next slice of rows into this one.
+
+        Returns:
+            ColumnAccumulator: self, for chaining.
+        """
+        self.rows += other.rows
+        self.nulls += other.nulls
+        self.empty += other.empty
+        self.kinds |= other.kinds
+        self.numeric = self.numeric and other.numeric
+        self._merge_moments(other.count, other.mean, other.m2, other.m3, other.m4)
+        self.min = np.fmin(self.min, other.min)
+        self.max = np.fmax(self.max, other.max)
+        self.distinct.merge(other.distinct)
+        self.quantiles.merge(other.quantiles)
+        self.digest.merge(other.digest)
+        return self
+
+    @property
+    def is_numeric(self) -> bool:
+        """True if every chunk of the column was parsed as a numeric dtype."""
+        return self.numeric and self.kinds == {'numeric'}
+
+    @property
+    def is_type_consistent(self) -> bool:
+        """True if the column would hold a single Python type when loaded in full."""
+        if self.rows == 0:
+            return False
+        if self.kinds == {'numeric'}:
+            return True  # Missing values are float NaN, like the rest of the column
+        return self.kinds in ({'string'}, {'bool'}) and self.nulls == 0
+
+    def std(self, ddof: int = 1) -> float:
+        return float(np.sqrt(self.m2 / (self.count - ddof))) if self.count > ddof else np.nan
+
+    def skewness(self) -> float:
+        if self.count < 2 or self.m2 == 0:
+            return np.nan
+        return float(np.sqrt(self.count) * self.m3 / self.m2 ** 1.5)
+
+    def kurtosis(self) -> float:
+        """Excess kurtosis (0 for a normal distribution)."""
+        if self.count < 2 or self.m2 == 0:
+            return np.nan
+        return float(self.count * self.m4 / (self.m2 * self.m2) - 3.0)
+
+
+class StreamingProfiler:
+    """
+    Single-pass profiler: feed it chunks of a dataset and read every score and
+    summary from the merged accumulators. Memory is bounded by the chunk size
+    plus a fixed-size sketch per column.
+    """
+
+    def __init__(self, sketch_k: int = 200, hll_precision: int = 14):
+        self.sketch_k = sketch_k
+        self.hll_precision = hll_precision
+        self.columns: Dict[str, ColumnAccumulator] = {}
+        self.rows = 0
+
+    def update(self, chunk: pd.DataFrame) -> "StreamingProfiler":
+        """
+        Fold one chunk of rows into the profile.
+
+        Parameters:
+            chunk (pd.DataFrame): The next slice of the dataset.
+
+        Returns:
+            StreamingProfiler: self, for chaining.
+        """
+        self.rows += len(chunk)
+        for column in chunk.columns:
+            if column not in self.columns:
+                self.columns[column] = ColumnAccumulator(column, self.sketch_k, self.hll_precision)
+            self.columns[column].update(chunk[column])
+        return self
+
+    def merge(self, other: "StreamingProfiler") -> "StreamingProfiler":
+        """
+        Merge the profile of the rows that follow this profile's rows.
+
+        Returns:
+            StreamingProfiler: self, for chaining.
+        """
+        self.rows += other.rows
+        for column, accumulator in other.columns.items():
+            if column in self.columns:
+                self.columns[column].merge(accumulator)
+            else:
+                self.columns[column] = accumulator
+        return self
+
+    @classmethod
+    def profile(cls, chunks: Iterable[pd.DataFrame], **kwargs) -> "StreamingProfiler":
+        """
+        Build a profile from an iterable of chunks, e.g. DataFetcher.iter_chunks().
+
+        Returns:
+            StreamingProfiler: The populated profiler.
+        """
+        profiler = cls(**kwargs)
+        for chunk in chunks:
+            profiler.update(chunk)
+        return profiler
+
+    def _numeric_columns(self) -> List[str]:
+        return [name for name, acc in self.columns.items() if acc.is_numeric]
+
+    def calculate_completeness_score(self) -> float:
+        """
+        Completeness score, identical to DataAnalyzer.calculate_completeness_score.
+
+        Returns:
+            float: The completeness score (0 to 1).
+        """
+        total_cells = self.rows * len(self.columns)
+        if total_cells == 0:
+            return 0.0
+        non_null_cells = total_cells - sum(acc.nulls for acc in self.columns.values())
+        return round(non_null_cells / total_cells, 4)
+
+    def calculate_metadata_quality_score(self, column_descriptions=None) -> float:
+        """
+        Metadata quality score, computed like DataAnalyzer.calculate_metadata_quality_score
+        with duplicate columns detected from the per-column content digests.
+
+        Args:
+            column_descriptions (dict, optional): Column names mapped to their descriptions.
+
+        Returns:
+            float: Metadata quality score in the range [0, 1].
+        """
+        if self.rows == 0 or not self.columns:
+            return 0.0
+        names = list(self.columns)
+        num_columns = len(names)
+
+        total_score = sum(1 for col in names if col and "Unnamed" not in col)
+        total_score += sum(1 for acc in self.columns.values() if acc.is_type_consistent)
+        digests = [acc.digest.digest() for acc in self.columns.values()]
+        total_score += len(set(digests))  # Columns minus duplicates
+        max_score = 3 * num_columns
+
+        if column_descriptions:
+            total_score += sum(1 for col in names if col in column_descriptions and column_descriptions[col])
+            max_score += num_columns
+
+        return total_score / max_score
+
+    def statistical_summary(self) -> pd.DataFrame:
+        """
+        Descriptive statistics for numeric columns in the layout of DataFrame.describe().
+        Quantiles are approximate (quantile sketch); all other rows are exact.
+
+        Returns:
+            pd.DataFrame: Summary statistics for numerical columns.
+        """
+        index = ['count', 'mean', 'std', 'min', '25%', '50%', '75%', 'max']
+        summary = {}
+        for name in self._numeric_columns():
+            acc = self.columns[name]
+            q25, q50, q75 = acc.quantiles.quantile([0.25, 0.5, 0.75])
+            mean = acc.mean if acc.count else np.nan
+            summary[name] = [float(acc.count), mean, acc.std(), acc.min, q25, q50, q75, acc.max]
+        return pd.DataFrame(summary, index=index)
+
+    def outlier_bounds(self, method: str = 'IQR') -> Dict[str, Dict[str, float]]:
+        """
+        Outlier bounds per numeric column with an estimated outlier count.
+
+        Parameters:
+            method (str): Method to detect outliers ('IQR' or 'zscore').
+
+        Returns:
+            Dict[str, Dict[str, float]]: 'lower', 'upper' and 'estimated_count' per column.
+        """
+        bounds = {}
+        for name in self._numeric_columns():
+            acc = self.columns[name]
+            if acc.count == 0:
+                continue
+            if method == 'IQR':
+                q1, q3 = acc.quantiles.quantile([0.25, 0.75])
+                lower, upper = q1 - 1.5 * (q3 - q1), q3 + 1.5 * (q3 - q1)
+            elif method == 'zscore':
+                std = acc.std(ddof=0)
+                lower, upper = acc.mean - 3 * std, acc.mean + 3 * std
+            else:
+                raise ValueError("Invalid method. Use 'IQR' or 'zscore'.")
+            below = acc.quantiles.rank(lower)
+            above = 1.0 - acc.quantiles.rank(np.nextafter(upper, np.inf))
+            bounds[name] = {
+                "lower": float(lower),
+                "upper": float(upper),
+                "estimated_count": int(round((below + above) * acc.count)),
+            }
+        return bounds
+
+    def outlier_bitmaps(self, chunks: Iterable[pd.DataFrame], method: str = 'IQR') -> Dict[str, Dict[str, object]]:
+        """
+        Second streaming pass: flag outliers against this profile's bounds.
+
+        Each column's flags are packed into a bitmap (one bit per row, in file
+        order), so row numbers are positions in the source, matching the index
+        labels of a full pd.read_csv load.
+
+        Parameters:
+            chunks (Iterable[pd.DataFrame]): The same source streamed again, e.g. DataFetcher.iter_chunks().
+            method (str): Method to detect outliers ('IQR' or 'zscore').
+
+        Returns:
+            Dict[str, Dict[str, object]]: 'lower', 'upper', 'count', 'rows' and packed 'bitmap' per column.
+        """
+        from data_analyzer import DataAnalyzer
+
+        bounds = self.outlier_bounds(method=method)
+        packed = {column: [] for column in bounds}
+        pending = {column: np.empty(0, dtype=bool) for column in bounds}
+        counts = dict.fromkeys(bounds, 0)
+        rows = 0
+        for chunk in chunks:
+            mask = DataAnalyzer.outlier_mask(chunk, bounds=bounds)
+            for column in bounds:
+                flags = mask[column].to_numpy() if column in mask else np.zeros(len(chunk), dtype=bool)
+                counts[column] += int(flags.sum())
+                # Carry the bits that don't fill a whole byte over to the next chunk.
+                flags = np.concatenate([pending[column], flags])
+                whole = len(flags) - len(flags) % 8
+                packed[column].append(np.packbits(flags[:whole]))
+                pending[column] = flags[whole:]
+            rows += len(chunk)
+
+        return {
+            column: {
+                "lower": bounds[column]["lower"],
+                "upper": bounds[column]["upper"],
+                "count": counts[column],
+                "rows": rows,
+                "bitmap": np.concatenate(packed[column] + [np.packbits(pending[column])]),
+            }
+            for column in bounds
+        }
+
+    def validate_distributions(self, columns: Optional[List[str]] = None, expected_distribution: str = 'normal',
+                               max_samples: int = 5000, alpha: float = 0.05) -> pd.DataFrame:
+        """
+        Distribution tests per numeric column from the accumulated moments and quantile
+        sketches, in the layout of DataAnalyzer.validate_distributions.
+
+        Parameters:
+            columns (List[str], optional): Columns to test; defaults to all numeric columns.
+            expected_distribution (str): 'normal' or 'uniform'.
+            max_samples (int): Sample size the p-values are computed for, at most.
+            alpha (float): Significance level.
+
+        Returns:
+            pd.DataFrame: One row of statistics and p-values per column.
+        """
+        if expected_distribution not in DISTRIBUTIONS:
+            raise ValueError("Invalid expected distribution. Use 'normal' or 'uniform'.")
+        if columns is None:
+            columns = self._numeric_columns()
+        table = {}
+        for column in columns:
+            if column in self.columns:
+                table[column] = sketch_tests(self.columns[column], expected_distribution, max_samples, alpha)
+            else:
+                print(f"Column {column} not found in dataset.")
+        return pd.DataFrame.from_dict(table, orient='index', columns=TABLE_COLUMNS)
+
+    def text_data_analysis(self, text_columns: Optional[List[str]] = None) -> Dict[str, Dict[str, int]]:
+        """
+        Text quality counts per column; 'unique' is a HyperLogLog estimate.
+
+        Parameters:
+            text_columns (List[str], optional): Columns to report; defaults to all non-numeric columns.
+
+        Returns:
+            Dict[str, Dict[str, int]]: Analysis results per column.
+        """
+        if text_columns is None:
+            text_columns = [name for name, acc in self.columns.items() if not acc.is_numeric]
+        results = {}
+        for column in text_columns:
+            if column in self.columns:
+                acc = self.columns[column]
+                results[column] = {
+                    "missing": acc.nulls,
+                    "empty": acc.empty,
+                    "unique": acc.distinct.count(),
+                }
+            else:
+                print(f"Text column {column} not found in dataset.")
+        return results
+
+    def column_statistics(self) -> pd.DataFrame:
+        """
+        One row of accumulated statistics per column.
+
+        Returns:
+            pd.DataFrame: Nulls, distinct estimate, moments and range per column.
+        """
+        rows = []
+        for name, acc in self.columns.items():
+            rows.append({
+                "column": name,
+                "rows": acc.rows,
+                "nulls": acc.nulls,
+                "distinct_estimate": acc.distinct.count(),
+                "numeric": acc.is_numeric,
+                "mean": acc.mean if acc.count else np.nan,
+                "std": acc.std(),
+                "skewness": acc.skewness(),
+                "kurtosis": acc.kurtosis(),
+                "min": acc.min,
+                "max": acc.max,
+            })
+        return pd.DataFrame(rows).set_index("column") if rows else pd.DataFrame()
+
+
+def bitmap_rows(bitmap: np.ndarray, rows: int, start: int = 0, stop: Optional[int] = None) -> np.ndarray:
+    """
+    Row numbers flagged in a packed outlier bitmap, sliced for paging.
+
+    Parameters:
+        bitmap (np.ndarray): Packed bits as returned by StreamingProfiler.outlier_bitmaps.
+        rows (int): Number of rows the bitmap covers.
+        start (int): Index of the first flagged row to return.
+        stop (int, optional): Index one past the last flagged row to return.
+
+    Returns:
+        np.ndarray: Positions of the flagged rows in [start, stop).
+    """
+    return np.flatnonzero(np.unpackbits(bitmap, count=rows))[start:stop]
+
+
+# Example usage (replace with your actual dataset URL)
+if __name__ == "__main__":
+    from data_fetcher import DataFetcher
+
+    fetcher = DataFetcher("shopping_trends.csv")
+    profiler = StreamingProfiler.profile(fetcher.iter_chunks(chunksize=1000))
+    print("Completeness Score:", profiler.calculate_completeness_score())
+    print("Metadata Quality Score:", profiler.calculate_metadata_quality_score())
+    print("Statistical Summary:\n", profiler.statistical_summary())
+    print("Outlier Bounds:", profiler.outlier_bounds(method='IQR'))
+    bitmaps = profiler.outlier_bitmaps(fetcher.iter_chunks(chunksize=1000), method='IQR')
+    print("Outlier Counts:", {column: result["count"] for column, result in bitmaps.items()})
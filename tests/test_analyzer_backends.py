@@ -0,0 +1,53 @@
+import warnings
+
+import pandas as pd
+import pytest
+
+from analyzer_backends import get_analyzer, parity_report
+from benchmarks import generate_dataset
+from data_analyzer import DataAnalyzer
+
+
+def installed_backends():
+    backends = ["arrow"]
+    try:
+        get_analyzer("polars")
+        backends.append("polars")
+    except ImportError:
+        pass
+    return backends
+
+
+def assert_parity(df, backend, **columns):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        report = parity_report(df, backend, **columns)
+    differences = [f"{check}: {detail}" for check, equal, detail in report if not equal]
+    assert not differences, "\n".join(differences)
+
+
+@pytest.mark.parametrize("backend", installed_backends())
+@pytest.mark.parametrize("dtype_mix", ["mixed", "numeric", "string"])
+@pytest.mark.parametrize("null_rate", [0.0, 0.1])
+def test_backend_matches_data_analyzer(backend, dtype_mix, null_rate):
+    df = generate_dataset(2000, 10, null_rate, dtype_mix, 100)
+    assert_parity(df, backend,
+                  text_columns=[c for c in df.columns if c.startswith(("string_", "flag_"))],
+                  date_columns=[c for c in df.columns if c.startswith("date_")],
+                  key_columns=["id"])
+
+
+@pytest.mark.parametrize("backend", installed_backends())
+def test_completeness_rounds_ties_like_pandas(backend):
+    # 18155 of 20000 cells present: the ratio 0.90775 sits on a rounding tie
+    df = pd.DataFrame({"x": [1.0] * 18155 + [None] * 1845})
+    analyzer = get_analyzer(backend)
+    expected = DataAnalyzer.calculate_completeness_score(df)
+    assert analyzer.calculate_completeness_score(df) == expected
+    assert analyzer.calculate_completeness_score(analyzer.to_native(df)) == expected
+
+
+@pytest.mark.parametrize("backend", installed_backends())
+def test_backend_matches_data_analyzer_on_empty_frame(backend):
+    assert_parity(pd.DataFrame({"id": pd.Series([], dtype="int64"), "value": pd.Series([], dtype="float64")}),
+                  backend, text_columns=[], key_columns=["id"])
@@ -0,0 +1,43 @@
+import os
+
+import pandas as pd
+
+import batch_score
+from batch_score import _read_journal, _write_parquet, run_batch
+
+
+def test_parquet_keeps_score_columns_when_first_source_failed(tmp_path):
+    records = [
+        {"source": "missing.csv", "status": "error", "error": "FileNotFoundError", "elapsed_seconds": 0.1},
+        {"source": "a.csv", "status": "ok", "error": None, "rows": 10, "trust_score": 0.9, "elapsed_seconds": 0.2},
+        {"source": "b.csv", "status": "ok", "error": None, "rows": 20, "trust_score": 0.8, "profile_id": 3,
+         "elapsed_seconds": 0.3},
+    ]
+    output = str(tmp_path / "out.parquet")
+    _write_parquet(records, output, row_group_size=1)
+
+    result = pd.read_parquet(output)
+    assert list(result.columns) == ["source", "status", "error", "elapsed_seconds", "rows", "trust_score",
+                                    "profile_id"]
+    assert result["trust_score"].tolist()[1:] == [0.9, 0.8]
+    assert pd.isna(result.loc[0, "trust_score"])
+    assert result["profile_id"].tolist()[2] == 3
+
+
+def _dying_task(source, *args):
+    if source == "die.csv":
+        os._exit(1)
+    return {"source": source, "status": "ok", "error": None, "elapsed_seconds": 0.0}
+
+
+def test_worker_crash_is_journaled_and_the_pool_restarted(tmp_path, monkeypatch):
+    monkeypatch.setattr(batch_score, "score_task", _dying_task)
+    sources = ["a.csv", "die.csv", "b.csv", "c.csv", "d.csv"]
+    output = str(tmp_path / "out.jsonl")
+    summary = run_batch(sources, output, workers=1)
+
+    records = {record["source"]: record for record in _read_journal(output)}
+    assert sorted(records) == sorted(sources)
+    assert records["die.csv"]["status"] == "error" and "BrokenProcessPool" in records["die.csv"]["error"]
+    assert records["d.csv"]["status"] == "ok"
+    assert summary["ok"] + summary["error"] == len(sources)
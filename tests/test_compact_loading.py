@@ -0,0 +1,93 @@
+import contextlib
+import io
+import os
+import shutil
+import warnings
+
+import pandas as pd
+import pytest
+
+from data_analyzer import DataAnalyzer
+from data_fetcher import DataFetcher
+
+DATASET = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "shopping_trends.csv")
+
+
+@pytest.fixture(scope="module")
+def frames(tmp_path_factory):
+    directory = tmp_path_factory.mktemp("data")
+    path = str(directory / "shopping_trends.csv")
+    shutil.copy(DATASET, path)
+    default, _ = DataFetcher(path).fetch_data()
+    compact, metadata = DataFetcher(path).fetch_data(compact=True)
+    # A second compact load comes from the snapshot written by the first
+    snapshot_dir = str(directory / "snapshots")
+    DataFetcher(path, snapshot_dir=snapshot_dir).fetch_data(compact=True)
+    snapshot, _ = DataFetcher(path, snapshot_dir=snapshot_dir).fetch_data(compact=True)
+    return default, compact, snapshot, metadata
+
+
+def run(check, df):
+    with contextlib.redirect_stdout(io.StringIO()) as printed, warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        return check(df), printed.getvalue()
+
+
+def assert_same(left, right):
+    if isinstance(left, pd.DataFrame):
+        pd.testing.assert_frame_equal(left, right, check_dtype=False)
+    elif isinstance(left, pd.Series):
+        pd.testing.assert_series_equal(left, right, check_dtype=False)
+    else:
+        assert left == right
+
+
+def schema(default):
+    return {column: str(dtype) for column, dtype in default.dtypes.items()}
+
+
+def text_columns(default):
+    return [column for column in default.columns if not pd.api.types.is_numeric_dtype(default[column])]
+
+
+# Check name -> call on a frame, given the default frame for the parameters
+CHECKS = {
+    "schema_validation": lambda df, default: DataAnalyzer.schema_validation(df, schema(default)),
+    "schema_validation[object]": lambda df, default: DataAnalyzer.schema_validation(
+        df, {"Gender": "object", "Subscription Status": "object", "Age": "int64"}),
+    "detect_outliers[IQR]": lambda df, default: DataAnalyzer.detect_outliers(df),
+    "detect_outliers[zscore]": lambda df, default: DataAnalyzer.detect_outliers(df, method='zscore'),
+    "outlier_bounds": lambda df, default: DataAnalyzer.outlier_bounds(df),
+    "integrity_checks": lambda df, default: DataAnalyzer.integrity_checks(df, ["Customer ID"]),
+    "integrity_report": lambda df, default: DataAnalyzer.integrity_report(df, ["Customer ID", "Gender"]),
+    "statistical_summary": lambda df, default: DataAnalyzer.statistical_summary(df),
+    "validate_distributions": lambda df, default: DataAnalyzer.validate_distributions(df),
+    "text_data_analysis": lambda df, default: DataAnalyzer.text_data_analysis(df, text_columns(default)),
+    "multivariate_analysis": lambda df, default: DataAnalyzer.multivariate_analysis(df),
+    "context_specific_checks": lambda df, default: DataAnalyzer.context_specific_checks(
+        df, rules=[{"name": "Adult", "type": "range", "column": "Age", "min": 18}]),
+    "calculate_completeness_score": lambda df, default: DataAnalyzer.calculate_completeness_score(df),
+    "calculate_metadata_quality_score": lambda df, default: DataAnalyzer.calculate_metadata_quality_score(df),
+}
+
+
+def test_compact_frame_uses_less_memory(frames):
+    default, compact, _, metadata = frames
+    assert metadata["memory"]["saved_bytes"] > 0
+    assert compact.memory_usage(deep=True).sum() < default.memory_usage(deep=True).sum()
+    assert compact.attrs["compact_dtypes"]["Age"] == "int64"
+    assert compact["Subscription Status"].dtype == bool
+
+
+def test_default_frame_matches_its_own_schema(frames):
+    assert run(lambda df: CHECKS["schema_validation"](df, df), frames[0])[0] is True
+
+
+@pytest.mark.parametrize("variant", ["compact", "snapshot"])
+@pytest.mark.parametrize("name", list(CHECKS))
+def test_check_matches_the_default_frame(frames, variant, name):
+    default, compact, snapshot = frames[:3]
+    expected, expected_output = run(lambda df: CHECKS[name](df, default), default)
+    result, output = run(lambda df: CHECKS[name](df, default), compact if variant == "compact" else snapshot)
+    assert_same(expected, result)
+    assert output == expected_output
@@ -0,0 +1,150 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from http_source import HttpSource, JsonDocument, iter_json_records
+
+PAGES = {1: [{"id": 1}, {"id": 2}], 2: [{"id": 3}], 3: [{"id": 4}, {"id": 5}], 4: [{"id": 6}]}
+ETAG = '"v1"'
+LAST_MODIFIED = "Wed, 01 Jan 2025 00:00:00 GMT"
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def send_body(self, body: bytes, content_type: str = "application/json", headers: dict = None):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        server = self.server
+        url = urlsplit(self.path)
+        query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        with server.lock:
+            server.requests.append((url.path, query, dict(self.headers)))
+
+        if url.path == "/pages":
+            with server.lock:
+                server.active += 1
+                server.peak = max(server.peak, server.active)
+            time.sleep(0.05)  # Long enough for concurrent requests to overlap
+            with server.lock:
+                server.active -= 1
+            self.send_body(json.dumps(PAGES.get(int(query["page"]), [])).encode())
+        elif url.path == "/cached":
+            if self.headers.get("If-None-Match") == ETAG or self.headers.get("If-Modified-Since") == LAST_MODIFIED:
+                self.send_response(304)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self.send_body(json.dumps(PAGES[1]).encode(), headers={"ETag": ETAG, "Last-Modified": LAST_MODIFIED})
+        elif url.path == "/linked":
+            page = int(query.get("p", 1))
+            headers = {}
+            if page < 3:
+                headers["Link"] = f'<http://{self.headers["Host"]}/linked?p={page + 1}>; rel="next"'
+            self.send_body(json.dumps(PAGES[page]).encode(), headers=headers)
+        elif url.path == "/lines":
+            body = "\n".join(json.dumps(record) for page in (1, 2) for record in PAGES[page]) + "\n"
+            self.send_body(body.encode(), content_type="application/x-ndjson")
+        else:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    httpd.daemon_threads = True
+    httpd.lock = threading.Lock()
+    httpd.requests = []
+    httpd.active = httpd.peak = 0
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    httpd.url = f"http://127.0.0.1:{httpd.server_address[1]}"
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def requested(server, path):
+    return [request for request in server.requests if request[0] == path]
+
+
+def test_revalidated_response_is_read_from_the_disk_cache(server, tmp_path):
+    first = HttpSource(server.url + "/cached", cache_dir=str(tmp_path)).fetch()
+    second_source = HttpSource(server.url + "/cached", cache_dir=str(tmp_path))
+    second = second_source.fetch()
+
+    assert first["id"].tolist() == second["id"].tolist() == [1, 2]
+    (_, _, initial), (_, _, revalidation) = requested(server, "/cached")
+    assert "If-None-Match" not in initial
+    assert revalidation["If-None-Match"] == ETAG
+    assert revalidation["If-Modified-Since"] == LAST_MODIFIED
+    assert second_source.last_modified == LAST_MODIFIED
+
+
+def test_paged_requests_stay_within_max_in_flight(server):
+    frame = HttpSource(server.url + "/pages", page_param="page", max_in_flight=2, batch_size=100).fetch()
+
+    assert frame["id"].tolist() == [1, 2, 3, 4, 5, 6]
+    assert server.peak == 2
+    assert sorted(int(query["page"]) for _, query, _ in requested(server, "/pages"))[:5] == [1, 2, 3, 4, 5]
+
+
+def test_max_pages_limits_paged_requests(server):
+    frame = HttpSource(server.url + "/pages", page_param="page", max_in_flight=4, max_pages=2).fetch()
+
+    assert frame["id"].tolist() == [1, 2, 3]
+    assert len(requested(server, "/pages")) == 2
+
+
+def test_link_header_pagination(server):
+    batches = list(HttpSource(server.url + "/linked", batch_size=100).iter_batches())
+
+    assert [batch["id"].tolist() for batch in batches] == [[1, 2], [3], [4, 5]]
+    assert [query.get("p") for _, query, _ in requested(server, "/linked")] == [None, "2", "3"]
+
+
+def test_json_lines_body(server):
+    frame = HttpSource(server.url + "/lines", batch_size=2).fetch()
+
+    assert frame["id"].tolist() == [1, 2, 3]
+
+
+def one_byte_blocks(text: str):
+    data = text.encode("utf-8")
+    return (data[i:i + 1] for i in range(len(data)))
+
+
+@pytest.mark.parametrize("text, expected", [
+    ('[{"name": "Zoë", "v": 7.5}, {"name": "名", "v": -12}, 3.25e2, "x"]',
+     [{"name": "Zoë", "v": 7.5}, {"name": "名", "v": -12}, 325.0, "x"]),
+    ('{"a": 1, "b": [1, 2]}\n{"a": 22}\n\n{"a": 333.5}\n',
+     [{"a": 1, "b": [1, 2]}, {"a": 22}, {"a": 333.5}]),
+    ('\ufeff [ 10 , 200 ,3000 ] ', [10, 200, 3000]),
+])
+def test_records_split_across_read_boundaries(text, expected):
+    assert list(iter_json_records(one_byte_blocks(text))) == expected
+    assert list(iter_json_records([text.encode("utf-8")])) == expected
+
+
+def test_whole_document_and_truncated_array():
+    records = list(iter_json_records(one_byte_blocks('{"a": [1, 2], "b": [3, 4]}')))
+    assert records == [{"a": [1, 2], "b": [3, 4]}] and isinstance(records[0], JsonDocument)
+
+    with pytest.raises(ValueError):
+        list(iter_json_records(one_byte_blocks('[{"a": 1}, {"a": 2}')))
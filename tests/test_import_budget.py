@@ -0,0 +1,38 @@
+import pytest
+
+from benchmarks import DEFERRED_IMPORTS, import_times
+
+# Seconds each module may add on top of importing pandas, measured with python -X importtime
+# in a fresh interpreter. web_ui imports streamlit itself, which accounts for most of its budget.
+BUDGETS = {
+    "data_analyzer": 0.3,
+    "trust_score_calculator": 0.3,
+    "web_ui": 1.0,
+}
+
+# Heavy modules that only the code paths needing them may import
+HEAVY_MODULES = DEFERRED_IMPORTS + ["polars", "altair", "matplotlib", "plotly", "pydeck"]
+
+
+@pytest.fixture(scope="module")
+def records():
+    return {record["module"]: record for record in import_times(list(BUDGETS), runs=2,
+                                                                deferred=HEAVY_MODULES)}
+
+
+@pytest.mark.parametrize("module", list(BUDGETS))
+def test_import_has_no_side_effects(records, module):
+    record = records[module]
+    assert "error" not in record, record.get("error")
+    assert record["output"] == ""
+
+
+@pytest.mark.parametrize("module", list(BUDGETS))
+def test_import_defers_heavy_modules(records, module):
+    allowed = {"streamlit"} if module == "web_ui" else set()
+    assert set(records[module]["deferred"]) <= allowed
+
+
+@pytest.mark.parametrize("module", list(BUDGETS))
+def test_import_time_within_budget(records, module):
+    assert records[module]["overhead_seconds"] <= BUDGETS[module], records[module]
@@ -0,0 +1,139 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_analyzer import DataAnalyzer
+from incremental_analyzer import IncrementalAnalyzer
+
+
+# Large enough for the quantile sketches to keep every value, so quantiles are exact
+SKETCH_K = 4096
+
+
+def rows(start, stop, seed):
+    rng = np.random.default_rng(seed)
+    count = stop - start
+    value = rng.normal(50, 10, count)
+    value[rng.random(count) < 0.1] = np.nan
+    value[::37] = 500.0  # Outliers
+    return pd.DataFrame({
+        "id": np.arange(start, stop) % 260,  # Ids repeat after 260 rows
+        "value": value,
+        "name": rng.choice(["alpha", "beta", None], count),
+    })
+
+
+def append(path, frame):
+    frame.to_csv(path, mode="a", header=not os.path.exists(path), index=False)
+
+
+def touch_later(path):
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+
+def assert_same_profile(incremental, full):
+    assert incremental.profiler.rows == full.profiler.rows
+    assert incremental.calculate_completeness_score() == full.calculate_completeness_score()
+    pd.testing.assert_frame_equal(incremental.statistical_summary(), full.statistical_summary(), rtol=1e-12)
+    for method in ("IQR", "zscore"):
+        expected = full.outlier_bounds(method)
+        for column, bounds in incremental.outlier_bounds(method).items():
+            assert bounds == pytest.approx(expected[column])
+    assert incremental.integrity_checks() == full.integrity_checks()
+
+
+def full_scan(path):
+    analyzer = IncrementalAnalyzer(path, key_columns=["id"], block_bytes=512, sketch_k=SKETCH_K)
+    assert analyzer.refresh()["mode"] == "full"
+    return analyzer
+
+
+def test_append_then_refresh_matches_a_full_rescan(tmp_path):
+    path = str(tmp_path / "data.csv")
+    append(path, rows(0, 200, seed=1))
+    analyzer = IncrementalAnalyzer(path, key_columns=["id"], block_bytes=512, sketch_k=SKETCH_K)
+
+    assert analyzer.refresh() == {"mode": "full", "new_rows": 200}
+    assert analyzer.refresh() == {"mode": "unchanged", "new_rows": 0}
+    offset = analyzer.offset
+    assert offset == os.path.getsize(path)
+
+    append(path, rows(200, 320, seed=2))
+    assert analyzer.refresh() == {"mode": "incremental", "new_rows": 120}
+    assert analyzer.offset == os.path.getsize(path) > offset
+
+    full = full_scan(path)
+    assert_same_profile(analyzer, full)
+    frame = pd.read_csv(path)
+    assert analyzer.calculate_completeness_score() == DataAnalyzer.calculate_completeness_score(frame)
+    assert analyzer.integrity_checks() == {"unique": False, "duplicate_rows": int(frame["id"].duplicated().sum()),
+                                           "distinct_keys": frame["id"].nunique()}
+
+
+def test_partial_last_line_is_read_on_the_next_refresh(tmp_path):
+    path = str(tmp_path / "data.csv")
+    append(path, rows(0, 50, seed=3))
+    analyzer = IncrementalAnalyzer(path, key_columns=["id"])
+    analyzer.refresh()
+
+    with open(path, "a", encoding="utf-8") as f:
+        f.write("50,1.5,al")  # A line still being written
+    assert analyzer.refresh() == {"mode": "incremental", "new_rows": 0}
+    with open(path, "a", encoding="utf-8") as f:
+        f.write("pha\n")
+    assert analyzer.refresh() == {"mode": "incremental", "new_rows": 1}
+    assert analyzer.profiler.rows == 51
+
+
+@pytest.mark.parametrize("where", ["head", "tail"])
+def test_changed_prefix_forces_a_full_rescan(tmp_path, where):
+    path = str(tmp_path / "data.csv")
+    append(path, rows(0, 300, seed=4))
+    analyzer = IncrementalAnalyzer(path, key_columns=["id"], block_bytes=512, sketch_k=SKETCH_K)
+    analyzer.CHECK_BYTES = 256  # Head and tail checks cover different bytes
+    analyzer.refresh()
+
+    # Rewrite one digit in place: same size, different content
+    with open(path, "r+b") as f:
+        data = f.read()
+        line_start = data.index(b"\n") + 1 if where == "head" else data.rindex(b"\n", 0, len(data) - 1) + 1
+        position = line_start + data[line_start:].index(b",") - 1  # Last digit of an id
+        f.seek(position)
+        f.write(b"7" if data[position:position + 1] != b"7" else b"8")
+    touch_later(path)
+
+    assert analyzer.refresh() == {"mode": "full", "new_rows": 300}
+    assert_same_profile(analyzer, full_scan(path))
+
+
+def test_truncated_file_forces_a_full_rescan(tmp_path):
+    path = str(tmp_path / "data.csv")
+    append(path, rows(0, 100, seed=5))
+    analyzer = IncrementalAnalyzer(path, key_columns=["id"])
+    analyzer.refresh()
+
+    os.remove(path)
+    append(path, rows(0, 40, seed=6))
+    assert analyzer.refresh() == {"mode": "full", "new_rows": 40}
+    assert analyzer.profiler.rows == 40
+
+
+def test_saved_state_refreshes_incrementally(tmp_path):
+    path = str(tmp_path / "data.csv")
+    state = str(tmp_path / "state.pkl")
+    append(path, rows(0, 150, seed=7))
+    analyzer = IncrementalAnalyzer(path, key_columns=["id"], block_bytes=512, sketch_k=SKETCH_K)
+    analyzer.refresh()
+    analyzer.save(state)
+
+    loaded = IncrementalAnalyzer.load(state)
+    assert loaded.offset == analyzer.offset and loaded.head_digest == analyzer.head_digest
+    assert_same_profile(loaded, analyzer)
+    assert loaded.refresh() == {"mode": "unchanged", "new_rows": 0}
+
+    append(path, rows(150, 300, seed=8))
+    assert loaded.refresh() == {"mode": "incremental", "new_rows": 150}
+    assert_same_profile(loaded, full_scan(path))
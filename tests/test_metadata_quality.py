@@ -0,0 +1,79 @@
+import itertools
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_analyzer import DataAnalyzer
+
+ROWS = 6
+
+COLUMNS = {
+    "all_nat": pd.Series([pd.NaT] * ROWS, dtype="datetime64[ns]"),
+    "some_nat": pd.Series(pd.to_datetime(["2020-01-01", None] * 3)),
+    "dates": pd.Series(pd.date_range("2020-01-01", periods=ROWS)),
+    "all_na_string": pd.Series([pd.NA] * ROWS, dtype="string"),
+    "some_na_string": pd.Series(["a", None] * 3, dtype="string"),
+    "str": pd.Series(["a", "b"] * 3, dtype="str"),
+    "all_nan_str": pd.Series([None] * ROWS, dtype="str"),
+    "all_nan_float": pd.Series([np.nan] * ROWS),
+    "all_none_object": pd.Series([None] * ROWS, dtype=object),
+    "all_nan_object": pd.Series([np.nan] * ROWS, dtype=object),
+    "mixed_object": pd.Series([1, "a", 2.0, None, "b", 3], dtype=object),
+    "text_object": pd.Series(["x", "y"] * 3, dtype=object),
+    "ints": pd.Series(range(ROWS)),
+    "floats": pd.Series(np.arange(ROWS, dtype=float)),
+    "all_na_Int64": pd.Series([pd.NA] * ROWS, dtype="Int64"),
+    "some_na_Int64": pd.Series([1, None] * 3, dtype="Int64"),
+    "category": pd.Series(["a", None] * 3, dtype="category"),
+    "all_na_category": pd.Series([None] * ROWS, dtype="category"),
+    "bools": pd.Series([True, False] * 3),
+    "all_na_boolean": pd.Series([pd.NA] * ROWS, dtype="boolean"),
+}
+
+
+def assert_parity(df):
+    fast = DataAnalyzer.calculate_metadata_quality_score(df)
+    slow = DataAnalyzer.calculate_metadata_quality_score(df, fast=False)
+    assert fast == pytest.approx(slow, abs=1e-12)
+
+
+@pytest.mark.parametrize("name", list(COLUMNS))
+def test_single_column_parity(name):
+    assert_parity(pd.DataFrame({"x": COLUMNS[name]}))
+
+
+@pytest.mark.parametrize("first, second", list(itertools.combinations(COLUMNS, 2)))
+def test_column_pair_parity(first, second):
+    assert_parity(pd.DataFrame({"x": COLUMNS[first], "y": COLUMNS[second]}))
+
+
+def test_all_null_columns_are_consistent_and_duplicates():
+    df = pd.DataFrame({"a": COLUMNS["all_nan_float"], "b": COLUMNS["all_none_object"], "c": COLUMNS["ints"]})
+    assert DataAnalyzer.calculate_metadata_quality_score(df) == pytest.approx(8 / 9)
+    assert DataAnalyzer.calculate_metadata_quality_score(pd.DataFrame({"d": COLUMNS["all_nat"]})) == 1.0
+
+
+@pytest.mark.parametrize("kind", ["mixed", "object", "numeric"])
+def test_generated_frame_parity(kind):
+    rng = np.random.default_rng(0)
+    rows = 500
+    numeric = {
+        "int": rng.integers(0, 5, rows),
+        "float": rng.normal(size=rows).round(1),
+        "float_copy_of_int": rng.integers(0, 5, rows).astype(float),
+        "nan_float": np.where(rng.random(rows) < 0.2, np.nan, rng.normal(size=rows)),
+    }
+    objects = {
+        "text": rng.choice(["a", "b", "c"], rows).astype(object),
+        "text_with_none": np.where(rng.random(rows) < 0.2, None, rng.choice(["a", "b"], rows)).astype(object),
+        "numbers_as_objects": rng.integers(0, 5, rows).astype(object),
+        "mixed": np.where(rng.random(rows) < 0.5, rng.integers(0, 5, rows), "x").astype(object),
+    }
+    data = numeric if kind == "numeric" else objects if kind == "object" else {**numeric, **objects}
+    df = pd.DataFrame(data)
+    # Duplicated columns, including an int column repeated as floats and objects
+    df["dup"] = df.iloc[:, 0]
+    df["dup_float"] = df.iloc[:, 0].astype(float) if kind != "object" else df.iloc[:, 1]
+    df["dup_object"] = df.iloc[:, 0].astype(object)
+    assert_parity(df)
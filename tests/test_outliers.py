@@ -0,0 +1,28 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_analyzer import DataAnalyzer
+
+
+def nullable_frame():
+    return pd.DataFrame({
+        "ints": pd.array([1, 2, 3, None, 1000] + [2] * 20, dtype="Int64"),
+        "floats": pd.array([1.0, None] + [1.5] * 22 + [500.0], dtype="Float64"),
+        "plain": [1.0] * 24 + [np.nan],
+    })
+
+
+@pytest.mark.parametrize("method", ["IQR", "zscore"])
+def test_outlier_mask_is_bool_for_nullable_columns(method):
+    mask = DataAnalyzer.outlier_mask(nullable_frame(), method=method)
+    assert all(dtype == bool for dtype in mask.dtypes)
+    assert not mask.loc[3, "ints"] and not mask.loc[1, "floats"]
+
+
+@pytest.mark.parametrize("method", ["IQR", "zscore"])
+def test_detect_outliers_on_nullable_columns(method):
+    outliers = DataAnalyzer.detect_outliers(nullable_frame(), method=method)
+    assert 4 in outliers["ints"]
+    assert 24 in outliers["floats"]
+    assert "plain" not in outliers
@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+
+from data_analyzer import DataAnalyzer
+from result_cache import CachedAnalyzer, ResultCache, estimate_size
+
+FK = "fk:dataset(id)->parent0(id)"
+
+
+def frames():
+    child = pd.DataFrame({"id": np.arange(1000)})
+    parent = pd.DataFrame({"id": np.arange(1000)})
+    changed = parent.copy()
+    changed.loc[500, "id"] = -1  # Beyond what repr() shows
+    return child, parent, changed
+
+
+def test_nested_frames_are_part_of_the_key():
+    child, parent, changed = frames()
+    analyzer = CachedAnalyzer("source", ResultCache())
+    first = analyzer.integrity_report(child, ["id"], foreign_keys=[(["id"], parent, ["id"])])
+    second = analyzer.integrity_report(child, ["id"], foreign_keys=[(["id"], changed, ["id"])])
+    assert first[FK]["passed"] is True
+    assert second[FK]["passed"] is False
+    assert second == DataAnalyzer.integrity_report(child, ["id"], foreign_keys=[(["id"], changed, ["id"])])
+
+
+def test_frames_passed_as_keywords_are_part_of_the_key():
+    child, parent, changed = frames()
+    analyzer = CachedAnalyzer("source", ResultCache())
+    analyzer.integrity_report(child, ["id"], foreign_keys=[(["id"], parent, ["id"])])
+    assert analyzer.integrity_report(df=child, primary_key=["id"],
+                                     foreign_keys=[(["id"], changed, ["id"])])[FK]["passed"] is False
+
+
+def test_same_arguments_hit_and_other_arguments_miss():
+    child, parent, _ = frames()
+    cache = ResultCache()
+    analyzer = CachedAnalyzer("source", cache)
+    analyzer.integrity_report(child, ["id"], foreign_keys=[(["id"], parent, ["id"])])
+    analyzer.integrity_report(child, ["id"], foreign_keys=[(["id"], parent.copy(), ["id"])])
+    assert cache.stats()["hits"] == 1
+    analyzer.detect_outliers(child, method="IQR")
+    analyzer.detect_outliers(child, method="zscore")
+    CachedAnalyzer("other-source", cache).detect_outliers(child, method="IQR")
+    assert cache.stats()["hits"] == 1 and len(cache) == 4
+
+
+def test_time_dependent_calls_are_not_cached():
+    df = pd.DataFrame({"when": pd.date_range("2020-01-01", periods=5).astype(str)})
+    cache = ResultCache()
+    analyzer = CachedAnalyzer("source", cache)
+    analyzer.temporal_consistency_checks(df, "when")
+    analyzer.calculate_update_score({"last_update_time": "2020-01-01T00:00:00"})
+    assert len(cache) == 0
+    analyzer.temporal_consistency_checks(df, "when", now="2021-01-01")
+    assert len(cache) == 1
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = ResultCache(max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # "b" is now the least recently used
+    cache.put("c", 3)
+    assert "b" not in cache and "a" in cache and "c" in cache
+
+
+def test_byte_cap():
+    value = np.zeros(1000)
+    size = estimate_size(value)
+    cache = ResultCache(max_bytes=int(size * 2.5))
+    for key in "abc":
+        cache.put(key, value.copy())
+    assert len(cache) == 2 and "a" not in cache
+    assert cache.bytes == 2 * size
+    cache.put("huge", np.zeros(10_000))  # Larger than the whole cache: not stored, nothing evicted
+    assert "huge" not in cache and len(cache) == 2
+    cache.pop("b")
+    assert cache.bytes == size
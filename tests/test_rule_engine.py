@@ -0,0 +1,121 @@
+import builtins
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from rule_engine import RuleEngine, validate_rule, validity_score
+
+
+def frame():
+    return pd.DataFrame({
+        "lat": [10.0, -95.0, None, 90.0, "north", 45.5],
+        "code": ["AB-1", "ab-2", "AB-33", None, "XY-9", "AB-1"],
+        "status": ["open", "closed", "open", "lost", None, "open"],
+        "start": ["2024-01-01", "2024-02-01", "2024-03-01", "2024-04-01", None, "2024-06-01"],
+        "end": ["2024-01-05", "2024-01-15", "2024-03-01", "2024-05-01", "2024-05-02", "2024-05-31"],
+        "qty": [1, 5, 0, 12, 3, None],
+    })
+
+
+RULES = [
+    {"name": "lat", "type": "range", "column": "lat", "min": -90, "max": 90},
+    {"name": "lat_open", "type": "range", "column": "lat", "min": -90, "max": 90, "inclusive": False},
+    {"name": "code", "type": "regex", "column": "code", "pattern": "[A-Z]{2}-[0-9]"},
+    {"name": "status", "type": "allowed", "column": "status", "values": ["open", "closed"]},
+    {"name": "order", "type": "compare", "left": "end", "op": ">=", "right": "start", "as": "date"},
+    {"name": "qty", "type": "compare", "left": "qty", "op": "<=", "value": 10},
+]
+
+
+def test_rule_results():
+    report = RuleEngine.run(RULES, frame()).report()
+
+    # 'north' is present but not a number; the missing latitude is skipped
+    assert report["lat"]["checked"] == 5 and report["lat"]["sample_rows"] == [1, 4]
+    assert report["lat_open"]["sample_rows"] == [1, 3, 4]
+    # The whole value must match: 'AB-33' is one digit too long
+    assert report["code"]["checked"] == 5 and report["code"]["sample_rows"] == [1, 2]
+    assert report["status"]["sample_rows"] == [3]
+    assert report["order"]["checked"] == 5 and report["order"]["sample_rows"] == [1, 5]
+    assert report["qty"]["checked"] == 5 and report["qty"]["sample_rows"] == [3]
+    assert report["qty"]["violation_rate"] == pytest.approx(1 / 5)
+    assert not report["lat"]["passed"]
+
+
+def test_allow_null_false_counts_missing_values():
+    rules = [{**rule, "allow_null": False} for rule in RULES]
+    report = RuleEngine.run(rules, frame()).report()
+
+    assert report["lat"]["checked"] == 6 and report["lat"]["sample_rows"] == [1, 2, 4]
+    assert report["code"]["sample_rows"] == [1, 2, 3]
+    assert report["status"]["sample_rows"] == [3, 4]
+    assert report["order"]["checked"] == 6 and report["order"]["sample_rows"] == [1, 4, 5]
+    assert report["qty"]["sample_rows"] == [3, 5]
+
+
+def test_regex_without_pyarrow(monkeypatch):
+    expected = RuleEngine.run(RULES, frame()).report()
+    real_import = builtins.__import__
+
+    def no_pyarrow(name, globals=None, *args, **kwargs):
+        # Only for rule_engine: pandas itself keeps using pyarrow
+        if name.startswith("pyarrow") and (globals or {}).get("__name__") == "rule_engine":
+            raise ImportError(name)
+        return real_import(name, globals, *args, **kwargs)
+
+    monkeypatch.setattr(builtins, "__import__", no_pyarrow)
+
+    assert RuleEngine.run(RULES, frame()).report() == expected
+
+
+def test_regex_rejected_by_re2_falls_back_to_re():
+    # Backreferences aren't supported by RE2
+    rules = [{"name": "pair", "type": "regex", "column": "code", "pattern": r"(\w)\1.*"}]
+    codes = pd.DataFrame({"code": ["AA-1", "AB-1", "BB"]})
+
+    assert RuleEngine.run(rules, codes).report()["pair"]["sample_rows"] == [1]
+
+
+def test_chunks_blocks_and_merge_match_one_pass():
+    data = pd.concat([frame()] * 5, ignore_index=True)
+    whole = RuleEngine.run(RULES, data).report()
+
+    chunked = RuleEngine.run(RULES, (data.iloc[i:i + 7] for i in range(0, len(data), 7)), block_rows=3)
+    assert chunked.report() == whole
+
+    merged = RuleEngine(RULES).update(data.iloc[:13]).merge(RuleEngine(RULES).update(data.iloc[13:]))
+    assert merged.report() == whole
+    assert merged.rows == len(data)
+
+
+def test_sample_rows_are_capped_and_offset_by_chunk():
+    values = pd.DataFrame({"lat": np.arange(40, dtype=float) * 10})
+    engine = RuleEngine.run(RULES[:1], [values.iloc[:20], values.iloc[20:]], sample_size=3)
+
+    assert engine.report()["lat"]["violations"] == 30
+    assert engine.report()["lat"]["sample_rows"] == [10, 11, 12]
+
+    engine = RuleEngine.run(RULES[:1], [values.iloc[:5], values.iloc[5:15], values.iloc[15:]], sample_size=3)
+    assert engine.report()["lat"]["sample_rows"] == [10, 11, 12]
+
+
+def test_missing_columns_and_validity_score():
+    engine = RuleEngine.run(RULES, frame()[["lat", "status"]])
+    report = engine.report()
+
+    assert report["code"]["missing_columns"] == ["code"] and not report["code"]["passed"]
+    assert report["order"]["missing_columns"] == ["end", "start"]
+    assert engine.rows_with_violations == 3
+    assert engine.validity_score() == validity_score(report) == round(1 - 6 / 15, 4)
+
+
+def test_invalid_rules():
+    with pytest.raises(ValueError):
+        validate_rule({"name": "r", "type": "range", "column": "a"})
+    with pytest.raises(ValueError):
+        validate_rule({"name": "r", "type": "regex", "column": "a", "pattern": "("})
+    with pytest.raises(ValueError):
+        validate_rule({"name": "r", "type": "compare", "left": "a", "op": "<", "right": "b", "value": 1})
+    with pytest.raises(ValueError):
+        RuleEngine([RULES[0], RULES[0]])
@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_fetcher import DataFetcher
+from sampling import SampledAnalysis, weighted_quantile
+
+ROWS = 20000
+
+
+@pytest.fixture(scope="module")
+def population(tmp_path_factory):
+    # Long lines are less likely to be sampled, and their values are missing more often
+    rng = np.random.default_rng(0)
+    long = rng.random(ROWS) < 0.3
+    value = rng.normal(100, 15, ROWS)
+    value[long & (rng.random(ROWS) < 0.5)] = np.nan
+    frame = pd.DataFrame({"id": np.arange(ROWS), "value": value, "note": np.where(long, "x" * 80, "a")})
+    path = str(tmp_path_factory.mktemp("sampling") / "population.csv")
+    frame.to_csv(path, index=False)
+    return path, frame
+
+
+def sample(path, seed, **options):
+    options = {"time_budget": None, "target_error": 1e-9, "max_rows": 1000, "block_bytes": 2048, **options}
+    return SampledAnalysis(DataFetcher(path), seed=seed, **options).run()
+
+
+def test_block_sample_intervals_cover_the_population(population):
+    path, frame = population
+    truth = {
+        "completeness": frame.notna().to_numpy().mean(),
+        "rows": len(frame),
+        "mean": frame["value"].mean(),
+    }
+    runs = 60
+    covered = dict.fromkeys(truth, 0)
+    completeness, rows = [], []
+    for seed in range(runs):
+        result = sample(path, seed)
+        assert result["stopped_by"] == "max_rows" and not result["exact"]
+        summary = result["statistical_summary"]
+        intervals = {
+            "completeness": result["completeness_score"],
+            "rows": result["estimated_rows"],
+            "mean": {bound: summary[bound].loc["mean", "value"] for bound in ("lower", "upper")},
+        }
+        for name, interval in intervals.items():
+            covered[name] += interval["lower"] <= truth[name] <= interval["upper"]
+        completeness.append(result["completeness_score"]["estimate"])
+        rows.append(result["estimated_rows"]["estimate"])
+
+    # 95% intervals; the bootstrap over blocks is approximate, so allow some slack
+    for name, count in covered.items():
+        assert count / runs >= 0.85, name
+    # Hansen-Hurwitz estimates are unbiased: their average is close to the truth
+    assert np.mean(completeness) == pytest.approx(truth["completeness"], abs=0.003)
+    assert np.mean(rows) == pytest.approx(truth["rows"], rel=0.02)
+
+
+def test_rows_are_weighted_by_inverse_selection_probability():
+    analysis = SampledAnalysis(DataFetcher("unused.csv"), n_boot=50, seed=0)
+    df = pd.DataFrame({"a": [1.0, np.nan, 3.0], "b": ["x", "y", None]})
+    weights = np.array([1.0, 3.0, 0.5])
+    result = analysis._estimate(df, weights, np.array([0, 1, 2]), 3, rows_scale=10.0)
+
+    filled = np.array([1.0, 0.5, 0.5])
+    assert result["completeness_score"]["estimate"] == pytest.approx(np.average(filled, weights=weights))
+    assert result["estimated_rows"]["estimate"] == pytest.approx(10.0 * weights.sum())
+    assert result["statistical_summary"]["estimate"].loc["mean", "a"] == pytest.approx((1.0 + 1.5) / 1.5)
+    assert result["completeness_score"]["lower"] <= result["completeness_score"]["upper"]
+
+
+def test_small_file_is_analysed_exactly(tmp_path):
+    path = str(tmp_path / "small.csv")
+    pd.DataFrame({"a": [1, None, 3], "b": ["x", "y", None]}).to_csv(path, index=False)
+    fetcher = DataFetcher(path)
+    result = SampledAnalysis(fetcher, seed=0).run()
+
+    assert result["exact"] and result["stopped_by"] == "exact"
+    assert result["completeness_score"]["estimate"] == pytest.approx(4 / 6, abs=1e-4)
+    assert fetcher.get_metadata()["source"] == path
+
+
+def test_weighted_quantile():
+    values = np.array([1.0, 2.0, 3.0, 4.0])
+    assert weighted_quantile(values, np.ones(4), 0.5) == 2.0
+    assert weighted_quantile(values, np.array([1.0, 1.0, 1.0, 5.0]), 0.5) == 4.0
+    np.testing.assert_array_equal(weighted_quantile(values, np.ones(4), [0.0, 1.0]), [1.0, 4.0])
@@ -0,0 +1,35 @@
+import asyncio
+import os
+
+import pandas as pd
+
+import scoring_service
+from scoring_service import ScoringService
+
+
+def _die(*args):
+    os._exit(1)
+
+
+def test_broken_pool_fails_the_request_and_is_rebuilt(tmp_path, monkeypatch):
+    source = str(tmp_path / "data.csv")
+    pd.DataFrame({"a": [1, 2, 3], "b": ["x", "y", None]}).to_csv(source, index=False)
+    service = ScoringService(workers=1)
+
+    async def run():
+        try:
+            monkeypatch.setattr(scoring_service, "_service_task", _die)
+            failed = await service.score(source)
+            monkeypatch.undo()
+            scored = await service.score(source)
+            return failed, scored
+        finally:
+            service.close()
+
+    failed, scored = asyncio.run(run())
+    assert failed["status"] == "error" and "BrokenProcessPool" in failed["error"]
+    assert failed["served"] == "computed"
+    assert scored["status"] == "ok" and scored["served"] == "computed"
+    assert 0.0 <= scored["trust_score"] <= 1.0
+    assert service.in_flight == 0
+    assert service.metrics().endswith("# EOF\n")
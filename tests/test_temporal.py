@@ -0,0 +1,36 @@
+import gc
+
+import pandas as pd
+
+import data_analyzer
+from data_analyzer import DataAnalyzer
+
+
+def test_temporal_validation_on_object_column_of_ints():
+    frame = pd.DataFrame({"a": pd.Series([20200101, 20200102, None, 20200105], dtype=object)})
+    result = DataAnalyzer.temporal_validation(frame, ["a"])["a"]
+    assert result["format"] == "%Y%m%d"
+    assert result["parsed"] == 3 and result["missing"] == 1 and result["unparseable"] == 0
+
+
+def test_parsed_dates_are_cached_per_frame():
+    DataAnalyzer.clear_parsed_dates()
+    frame = pd.DataFrame({"d": ["2021-01-01", "2021-02-01", None]})
+    first, _ = DataAnalyzer.parse_dates(frame, "d")
+    second, _ = DataAnalyzer.parse_dates(frame, "d")
+    assert first.equals(second)
+    assert id(frame) in data_analyzer._PARSED_DATES
+
+    DataAnalyzer.clear_parsed_dates(frame)
+    assert id(frame) not in data_analyzer._PARSED_DATES
+
+
+def test_parsed_dates_are_released_with_the_frame():
+    DataAnalyzer.clear_parsed_dates()
+    frame = pd.DataFrame({"d": ["2021-01-01", "2021-02-01"]})
+    DataAnalyzer.parse_dates(frame, "d")
+    key = id(frame)
+    assert key in data_analyzer._PARSED_DATES
+    del frame
+    gc.collect()
+    assert key not in data_analyzer._PARSED_DATES
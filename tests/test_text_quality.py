@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_analyzer import DataAnalyzer
+from text_quality import text_quality
+
+COLUMNS = {
+    "str": pd.Series(["a", " b", None, "cc"], dtype="str"),
+    "object": pd.Series(["a", 1, None, "cc"], dtype=object),
+    "category": pd.Series(["a", "b", None, "a"], dtype="category"),
+    "int": pd.Series([1, 2, 3, 4]),
+    "float": pd.Series([1.5, np.nan, 2.5, 3.5]),
+    "Int64": pd.Series([1, None, 3, 4], dtype="Int64"),
+    "bool": pd.Series([True, False, True, True]),
+    "datetime": pd.Series(pd.to_datetime(["2020-01-01", None, "2020-01-03", "2020-01-04"])),
+    "all_missing": pd.Series([None] * 4, dtype="str"),
+    "empty": pd.Series([], dtype="str"),
+}
+
+KEYS = list(text_quality(COLUMNS["str"]))
+
+
+@pytest.mark.parametrize("name", list(COLUMNS))
+def test_every_column_gets_the_same_fields(name):
+    assert list(text_quality(COLUMNS[name])) == KEYS
+
+
+@pytest.mark.parametrize("name", ["int", "float", "Int64", "bool", "datetime"])
+def test_columns_without_strings(name):
+    series = COLUMNS[name]
+    result = text_quality(series)
+    assert result["missing"] == series.isna().sum()
+    assert result["mean_length"] is None and result["length_histogram"] == {}
+    assert result["non_string"] == series.notna().sum()
+
+
+def test_text_data_analysis_shape_is_the_same_for_every_column():
+    names = [name for name in COLUMNS if name != "empty"]
+    results = DataAnalyzer.text_data_analysis(pd.DataFrame({name: COLUMNS[name] for name in names}), names)
+    assert all(list(result) == KEYS for result in results.values())
+    assert results["int"]["mean_length"] is None
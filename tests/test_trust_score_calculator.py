@@ -0,0 +1,99 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import trust_score_calculator
+from trust_score_calculator import (METRIC_COLUMNS, TrustScoreCalculator, _WEIGHTS_CACHE, fit_simplex_weights,
+                                    training_fingerprint)
+
+
+def training_frame(X, y):
+    frame = pd.DataFrame(X, columns=METRIC_COLUMNS)
+    frame["trustworthiness"] = y
+    return frame
+
+
+def mse(X, y, weights):
+    return np.mean((y - X @ weights) ** 2)
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    _WEIGHTS_CACHE.clear()
+    yield
+    _WEIGHTS_CACHE.clear()
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_exact_fit_is_at_least_as_good_as_slsqp(seed):
+    rng = np.random.default_rng(seed)
+    X = rng.random((200, 3))
+    y = np.clip(X @ rng.dirichlet(np.ones(3)) + rng.normal(0, 0.05, 200) + rng.uniform(-0.3, 0.3), 0, 1)
+
+    weights = fit_simplex_weights(X, y)
+    calculator = TrustScoreCalculator()
+    calculator.optimize_weights(training_frame(X, y), solver="slsqp")
+
+    assert weights.min() >= 0 and weights.sum() == pytest.approx(1.0)
+    # SLSQP stops at its default tolerance, so it can only come close to the exact optimum
+    assert mse(X, y, weights) <= mse(X, y, calculator.weights) + 1e-12
+    assert mse(X, y, calculator.weights) == pytest.approx(mse(X, y, weights), rel=1e-3)
+    np.testing.assert_allclose(weights, calculator.weights, atol=1e-2)
+
+
+@pytest.mark.parametrize("true_weights", [
+    [1.0, 0.0, 0.0],
+    [0.0, 0.0, 1.0],
+    [0.5, 0.0, 0.5],
+    [0.0, 0.3, 0.7],
+])
+def test_weights_on_the_simplex_boundary(true_weights):
+    rng = np.random.default_rng(1)
+    X = rng.random((100, 3))
+    y = X @ np.array(true_weights)
+
+    np.testing.assert_allclose(fit_simplex_weights(X, y), true_weights, atol=1e-9)
+
+
+def test_target_outside_the_simplex_is_projected_onto_a_vertex():
+    rng = np.random.default_rng(2)
+    X = rng.random((100, 3))
+    y = 2 * X[:, 1]  # Best fit wants beta = 2, the constraint caps it at 1
+
+    weights = fit_simplex_weights(X, y)
+    assert weights[1] == pytest.approx(1.0) and weights.min() >= 0
+
+
+def test_fitted_weights_are_cached_per_training_frame(monkeypatch):
+    calls = []
+    fit = trust_score_calculator.fit_simplex_weights
+    monkeypatch.setattr(trust_score_calculator, "fit_simplex_weights", lambda X, y: calls.append(1) or fit(X, y))
+    rng = np.random.default_rng(3)
+    frame = training_frame(rng.random((50, 3)), rng.random(50))
+
+    first = TrustScoreCalculator()
+    first.optimize_weights(frame)
+    second = TrustScoreCalculator()
+    second.optimize_weights(frame.copy())  # Same content, another frame
+    assert len(calls) == 1 and len(_WEIGHTS_CACHE) == 1
+    np.testing.assert_array_equal(first.weights, second.weights)
+
+    changed = frame.copy()
+    changed.loc[0, "trustworthiness"] += 0.01
+    assert training_fingerprint(changed) != training_fingerprint(frame)
+    TrustScoreCalculator().optimize_weights(changed)
+    assert len(calls) == 2 and len(_WEIGHTS_CACHE) == 2
+
+    # Unused columns aren't part of the fingerprint
+    TrustScoreCalculator().optimize_weights(frame.assign(note="x"))
+    assert len(calls) == 2
+
+
+def test_weights_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(trust_score_calculator, "_WEIGHTS_CACHE_SIZE", 3)
+    rng = np.random.default_rng(4)
+    frames = [training_frame(rng.random((20, 3)), rng.random(20)) for _ in range(5)]
+    for frame in frames:
+        TrustScoreCalculator().optimize_weights(frame)
+
+    assert list(_WEIGHTS_CACHE) == [training_fingerprint(frame) for frame in frames[2:]]
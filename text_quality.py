@@ -0,0 +1,328 @@
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from sketches import HyperLogLog, value_hashes
+
+# pyarrow and pyarrow.compute, imported by the first text check (see _load_pyarrow)
+pa = pc = None
+_PYARROW_LOADED = False
+
+# Whitespace as str.isspace() sees it, spelled so that both RE2 (pyarrow) and re accept it.
+_SPACE = "[ \\t\\n\\r\\f\\v\x1c-\x1f\x85\xa0\u1680\u2000-\u200a\u2028\u2029\u202f\u205f\u3000]"
+
+# Value-level anomalies: name -> regular expression matched anywhere in the value.
+ANOMALY_PATTERNS = {
+    "edge_whitespace": f"^{_SPACE}|{_SPACE}$",  # Leading or trailing whitespace
+    "repeated_whitespace": f"{_SPACE}{_SPACE}",
+    "line_breaks": "[\\r\\n]",
+    "tabs": "\\t",
+    "control_characters": "[\\x00-\\x08\\x0b\\x0c\\x0e-\\x1f\\x7f]",
+    "unusual_whitespace": "[\xa0\u2000-\u200b\u202f\u205f\u3000\ufeff]",  # NBSP, zero-width spaces, BOM
+    "replacement_characters": "\ufffd",  # Bytes that failed to decode upstream
+    # UTF-8 text decoded as Latin-1/cp1252, e.g. 'Ã©' for 'é' or 'â€™' for '’'
+    "mojibake": "[\xc2\xc3][\u0080-\xbf\u0152\u0153\u0160\u0161\u0178\u017d\u017e\u0192\u02c6\u02dc"
+                "\u2013-\u203a\u20ac\u2122]|\xe2\u20ac",
+}
+
+_HASH_MULTIPLIER = 0x100000001B3
+_HASH_BATCH_BYTES = 1 << 20
+_HASH_POWERS = None  # (P**i, P**-i) mod 2**64 for i < _HASH_BATCH_BYTES, built on first use
+
+
+def _hash_powers():
+    global _HASH_POWERS
+    if _HASH_POWERS is None:
+        inverse = pow(_HASH_MULTIPLIER, -1, 1 << 64)  # P is odd, so invertible mod 2**64
+        powers = np.full(_HASH_BATCH_BYTES, _HASH_MULTIPLIER, dtype=np.uint64)
+        inverses = np.full(_HASH_BATCH_BYTES, inverse, dtype=np.uint64)
+        powers[0] = inverses[0] = 1
+        _HASH_POWERS = (np.cumprod(powers), np.cumprod(inverses))
+    return _HASH_POWERS
+
+
+def _load_pyarrow() -> bool:
+    # Deferred so that importing the package doesn't pay for pyarrow.compute
+    global pa, pc, _PYARROW_LOADED
+    if not _PYARROW_LOADED:
+        try:
+            import pyarrow
+            import pyarrow.compute
+            pa, pc = pyarrow, pyarrow.compute
+        except ImportError:
+            pass  # Falls back to pandas string methods
+        _PYARROW_LOADED = True
+    return pa is not None
+
+
+def _mix(h: np.ndarray) -> np.ndarray:
+    # splitmix64 finalizer
+    h = (h ^ (h >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    h = (h ^ (h >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return h ^ (h >> np.uint64(31))
+
+
+def utf8_hashes(offsets: np.ndarray, data: np.ndarray) -> np.ndarray:
+    """
+    Hash strings stored Arrow-style (one UTF-8 byte buffer plus offsets) to uint64
+    without materializing them as Python objects.
+
+    Each string is hashed as the polynomial sum((byte + 1) * P**position) mod 2**64,
+    mixed with its length. Bytes are weighted by their position in the batch and each
+    sum is then shifted back by the power of its start, which avoids building a
+    per-byte position array.
+
+    Parameters:
+        offsets (np.ndarray): n + 1 offsets into data.
+        data (np.ndarray): The uint8 byte buffer.
+
+    Returns:
+        np.ndarray: One uint64 hash per string.
+    """
+    offsets = np.asarray(offsets, dtype=np.int64)
+    lengths = np.diff(offsets)
+    hashes = np.empty(len(lengths), dtype=np.uint64)
+    powers, inverses = _hash_powers()
+    start = 0
+    with np.errstate(over='ignore'):
+        while start < len(lengths):
+            # Rows whose bytes fit in one batch; a longer string gets a batch of its own
+            stop = int(np.searchsorted(offsets, offsets[start] + _HASH_BATCH_BYTES, side='right')) - 1
+            stop = min(max(stop, start + 1), len(lengths))
+            base = offsets[start]
+            starts, batch_lengths = offsets[start:stop] - base, lengths[start:stop]
+            chunk = data[base:offsets[stop]].astype(np.uint64) + np.uint64(1)
+            sums = np.zeros(stop - start, dtype=np.uint64)
+            nonempty = batch_lengths > 0
+            if len(chunk) > _HASH_BATCH_BYTES:
+                steps = np.full(len(chunk), _HASH_MULTIPLIER, dtype=np.uint64)
+                steps[0] = 1
+                sums[nonempty] = (chunk * np.cumprod(steps)).sum()
+            elif nonempty.any():
+                weighted = np.add.reduceat(chunk * powers[:len(chunk)], starts[nonempty])
+                sums[nonempty] = weighted * inverses[starts[nonempty]]
+            hashes[start:stop] = _mix(sums ^ (batch_lengths.astype(np.uint64) * np.uint64(0x9E3779B97F4A7C15)))
+            start = stop
+    return hashes
+
+
+def _arrow_buffers(array):
+    # Offsets (int64, n + 1) and UTF-8 bytes of a string array, without copying the bytes
+    array = array.cast(pa.large_string())
+    _, offsets, data = array.buffers()
+    offsets = np.frombuffer(offsets, dtype=np.int64)[array.offset:array.offset + len(array) + 1]
+    data = np.frombuffer(data, dtype=np.uint8) if data is not None else np.zeros(0, dtype=np.uint8)
+    return offsets, data
+
+
+def _rows_with(byte_flags: np.ndarray, starts: np.ndarray, stops: np.ndarray) -> np.ndarray:
+    # Whether any flagged byte lies in [start, stop) of each row; rows are contiguous in the buffer
+    rows = np.zeros(len(starts), dtype=bool)
+    nonempty = stops > starts
+    if nonempty.any():
+        rows[nonempty] = np.logical_or.reduceat(byte_flags[:stops[-1]], starts[nonempty])
+    return rows
+
+
+def _bool(array) -> np.ndarray:
+    return np.asarray(array.fill_null(False), dtype=bool)
+
+
+def _arrow_features(array) -> Dict[str, np.ndarray]:
+    """Per-value lengths, blank flags, anomaly flags and hashes of a string Arrow array."""
+    if isinstance(array, pa.ChunkedArray):
+        array = array.combine_chunks()
+    valid = np.asarray(array.is_valid(), dtype=bool)
+    lengths = np.asarray(pc.utf8_length(array).fill_null(0), dtype=np.int64)
+    offsets, data = _arrow_buffers(array)
+    features = {
+        "valid": valid,
+        "length": lengths,
+        "blank": valid & ((lengths == 0) | _bool(pc.utf8_is_space(array))),
+        "hash": utf8_hashes(offsets, data),
+    }
+
+    # One scan over the bytes: ASCII spaces are checked directly, and only rows with a byte
+    # outside printable ASCII (control characters, any non-ASCII text) go through the regexes.
+    starts, stops = offsets[:-1], offsets[1:]
+    data = data[:offsets[-1]]
+    space = data == 0x20
+    nonempty = stops > starts
+    edge = np.zeros(len(array), dtype=bool)
+    edge[nonempty] = space[starts[nonempty]] | space[stops[nonempty] - 1]
+    repeated = np.zeros(len(data), dtype=bool)
+    repeated[1:] = space[1:] & space[:-1]
+    repeated[starts[nonempty]] = False  # A pair must not straddle two rows
+    ascii_flags = {"edge_whitespace": edge, "repeated_whitespace": _rows_with(repeated, starts, stops)}
+    special = np.flatnonzero(_rows_with((data < 0x20) | (data > 0x7e), starts, stops))
+    subset = array.take(pa.array(special, type=pa.int64()))
+    for name, pattern in ANOMALY_PATTERNS.items():
+        flags = ascii_flags[name].copy() if name in ascii_flags else np.zeros(len(array), dtype=bool)
+        if len(special):
+            flags[special] |= _bool(pc.match_substring_regex(subset, pattern))
+        features[name] = flags & ~features["blank"] if name.endswith("whitespace") else flags
+    return features
+
+
+def _pandas_features(values: pd.Series) -> Dict[str, np.ndarray]:
+    """Same as _arrow_features with pandas string methods, for when pyarrow is missing."""
+    values = values.astype(object)
+    valid = values.notna().to_numpy()
+    lengths = values.str.len().fillna(0).to_numpy(dtype=np.int64)
+    features = {
+        "valid": valid,
+        "length": lengths,
+        "blank": valid & values.str.fullmatch(f"{_SPACE}*").fillna(False).to_numpy(dtype=bool),
+        "hash": value_hashes(values),
+    }
+    for name, pattern in ANOMALY_PATTERNS.items():
+        flags = values.str.contains(pattern, regex=True).fillna(False).to_numpy(dtype=bool)
+        features[name] = flags & ~features["blank"] if name.endswith("whitespace") else flags
+    return features
+
+
+def _string_values(series: pd.Series):
+    """
+    The column as an Arrow string array (zero-copy for Arrow-backed columns), or as an
+    object Series without pyarrow. Values that aren't profiled as text -- non-strings
+    in an object column, and strings that can't be encoded as UTF-8 -- become null.
+
+    Returns:
+        (values, non_string, invalid_utf8): The values and boolean masks of the two
+                                            kinds of excluded values.
+    """
+    non_string = invalid = np.zeros(len(series), dtype=bool)
+    if series.dtype == object and pd.api.types.infer_dtype(series, skipna=True) not in ('string', 'empty'):
+        is_string = np.fromiter((isinstance(v, str) for v in series.to_numpy()), dtype=bool, count=len(series))
+        non_string = ~is_string & series.notna().to_numpy()
+        series = series.where(is_string)
+    if pa is None:
+        return series, non_string, invalid
+    try:
+        return pa.array(series.array if series.dtype != object else series, type=pa.large_string(),
+                        from_pandas=True), non_string, invalid
+    except (pa.ArrowInvalid, UnicodeEncodeError):
+        # e.g. lone surrogates left by decoding with errors='surrogateescape'
+        invalid = series.map(_unencodable).to_numpy(dtype=bool)
+        return pa.array(series.where(~invalid), type=pa.large_string(), from_pandas=True), non_string, invalid
+
+
+def _unencodable(value) -> bool:
+    if not isinstance(value, str):
+        return False
+    try:
+        value.encode('utf-8')
+        return False
+    except UnicodeEncodeError:
+        return True
+
+
+def _length_histogram(lengths: np.ndarray, weights: Optional[np.ndarray] = None) -> Dict[str, int]:
+    # Power-of-two buckets: 0, 1, 2-3, 4-7, 8-15, ...
+    buckets = np.zeros(len(lengths), dtype=np.int64)
+    positive = lengths > 0
+    buckets[positive] = np.floor(np.log2(lengths[positive])).astype(np.int64) + 1
+    counts = np.bincount(buckets, weights=weights).astype(np.int64) if len(buckets) else np.zeros(0, dtype=np.int64)
+    histogram = {}
+    for bucket, count in enumerate(counts):
+        low, high = (0, 0) if bucket == 0 else (1 << (bucket - 1), (1 << bucket) - 1)
+        histogram[str(low) if low == high else f"{low}-{high}"] = int(count)
+    return histogram
+
+
+def text_quality(series: pd.Series, hll_precision: int = 14, exact_categories: bool = True) -> Dict[str, object]:
+    """
+    Quality profile of a text column in one vectorized pass over its storage.
+
+    Arrow-backed strings are read in place; object columns are converted to Arrow once
+    (never to new Python strings, as .str.strip() would). Categorical columns are
+    profiled per category and weighted by the category counts, so the work depends
+    on the number of categories rather than rows.
+
+    Parameters:
+        series (pd.Series): The text column.
+        hll_precision (int): Precision of the HyperLogLog used for the distinct count.
+        exact_categories (bool): Count a categorical column's distinct values exactly. False
+                                 estimates them like the same column stored as strings.
+
+    Returns:
+        Dict[str, object]: 'missing', 'empty' (empty or whitespace-only), 'unique'
+            (HyperLogLog estimate, exact for categorical columns) and 'unique_exact';
+            'min_length', 'mean_length', 'max_length' and 'length_histogram' (in
+            characters, power-of-two buckets); a count per ANOMALY_PATTERNS entry;
+            'non_string' values in object columns and 'invalid_utf8' values. Every
+            column gets all of these; a column without strings (e.g. numbers) has None
+            lengths, an empty histogram and all of its present values as 'non_string'.
+    """
+    _load_pyarrow()
+    sketch = HyperLogLog(hll_precision)
+    missing = int(series.isna().sum())
+    is_categorical = isinstance(series.dtype, pd.CategoricalDtype)
+    if not (is_categorical or pd.api.types.is_object_dtype(series.dtype)
+            or pd.api.types.is_string_dtype(series.dtype)):
+        # e.g. a numeric column: the same fields, with no lengths and every present value a non-string
+        sketch.update(series.dropna())
+        result = {"missing": missing, "empty": 0, "unique": sketch.count(), "unique_exact": False,
+                  "min_length": None, "mean_length": None, "max_length": None, "length_histogram": {}}
+        result.update(dict.fromkeys(ANOMALY_PATTERNS, 0))
+        result["non_string"] = len(series) - missing
+        result["invalid_utf8"] = 0
+        return result
+
+    if is_categorical:
+        codes = series.cat.codes.to_numpy()
+        counts = np.bincount(codes[codes >= 0], minlength=len(series.cat.categories))
+        values, non_string, invalid = _string_values(pd.Series(series.cat.categories, dtype=object))
+        weights = counts.astype(np.float64)
+    else:
+        values, non_string, invalid = _string_values(series)
+        counts = weights = None
+
+    features = _arrow_features(values) if pa is not None else _pandas_features(values)
+    valid = features["valid"]
+    if weights is None:
+        weights = valid.astype(np.float64)
+        sketch.update_hashes(features["hash"][valid])
+        excluded = non_string | invalid
+        if excluded.any():
+            # repr() keeps 1 and '1' apart and is always encodable
+            sketch.update(series[excluded].map(repr).astype(object))
+        unique = sketch.count()
+    else:
+        if exact_categories:
+            # Exact: every category that occurs is one distinct value
+            unique = int((counts > 0).sum())
+        else:
+            # The sketch ignores repeats, so sketching the categories that occur is sketching every row
+            sketch.update_hashes(features["hash"][valid & (counts > 0)])
+            unique = sketch.count()
+        non_string, invalid = counts * non_string, counts * invalid
+        weights = np.where(valid, weights, 0.0)
+    present = weights > 0
+    rows = weights.sum()
+    lengths = features["length"]
+
+    result = {
+        "missing": missing,
+        "empty": int(weights[features["blank"]].sum()),
+        "unique": int(unique),
+        "unique_exact": is_categorical and exact_categories,
+        "min_length": int(lengths[present].min()) if present.any() else None,
+        "mean_length": float((lengths * weights).sum() / rows) if rows else None,
+        "max_length": int(lengths[present].max()) if present.any() else None,
+        "length_histogram": _length_histogram(lengths[present], weights[present]),
+    }
+    for name in ANOMALY_PATTERNS:
+        result[name] = int(weights[features[name]].sum())
+    result["non_string"] = int(non_string.sum())
+    result["invalid_utf8"] = int(invalid.sum())
+    return result
+
+
+# Example usage (replace with your actual dataset URL)
+if __name__ == "__main__":
+    df = pd.read_csv("shopping_trends.csv")
+    for column in ["Item Purchased", "Location"]:
+        print(column, text_quality(df[column]))
+    print("Categorical:", text_quality(df["Location"].astype("category")))
@@ -1,14 +1,103 @@
-from scipy.optimize import minimize
+from collections import OrderedDict
+from itertools import combinations
+import hashlib
 import numpy as np
 import pandas as pd
 
+METRIC_COLUMNS = ["completeness_score", "freshness_score", "metadata_quality_score"]
+
+# Fitted weights shared by all calculators, keyed by a fingerprint of the training frame
+_WEIGHTS_CACHE = OrderedDict()
+_WEIGHTS_CACHE_SIZE = 128
+
+
+def fit_simplex_weights(X, y):
+    """
+    Exactly solve min ||X w - y||^2 subject to w >= 0 and sum(w) == 1.
+
+    The optimum lies in the relative interior of one face of the simplex, so
+    solving the equality-constrained problem on every support and keeping the
+    best feasible solution is exact. With three weights that is seven tiny
+    KKT systems.
+
+    :param X: (N, k) array of metric rows
+    :param y: (N,) array of targets
+    :return: (k,) array of weights
+    """
+    X = np.asarray(X, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    k = X.shape[1]
+    best_weights, best_error = None, np.inf
+    for size in range(1, k + 1):
+        for support in combinations(range(k), size):
+            Xs = X[:, support]
+            kkt = np.zeros((size + 1, size + 1))
+            kkt[:size, :size] = 2 * Xs.T @ Xs
+            kkt[:size, size] = kkt[size, :size] = 1.0
+            rhs = np.append(2 * Xs.T @ y, 1.0)
+            solution = np.linalg.lstsq(kkt, rhs, rcond=None)[0][:size]
+            if solution.min() < -1e-12 or not np.isclose(solution.sum(), 1.0):
+                continue
+            weights = np.zeros(k)
+            weights[list(support)] = np.clip(solution, 0.0, None)
+            weights /= weights.sum()
+            error = np.mean((y - X @ weights) ** 2)
+            if error < best_error - 1e-15:
+                best_weights, best_error = weights, error
+    return best_weights
+
+
+def training_fingerprint(df, target_column="trustworthiness"):
+    """
+    Content hash of the columns used to fit the weights.
+
+    :param df: Training dataset
+    :param target_column: Target column
+    :return: Hex digest identifying the training data
+    """
+    columns = METRIC_COLUMNS + [target_column]
+    digest = hashlib.blake2b(repr(columns).encode(), digest_size=16)
+    digest.update(pd.util.hash_pandas_object(df[columns], index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
 class TrustScoreCalculator:
     def __init__(self):
         self.alpha = 0.4
         self.beta = 0.3
         self.gamma = 0.3
 
-    def optimize_weights(self, df, target_column="trustworthiness", random_initial=False):
+    @property
+    def weights(self):
+        """Current (alpha, beta, gamma) as a NumPy array."""
+        return np.array([self.alpha, self.beta, self.gamma])
+
+    def optimize_weights(self, df, target_column="trustworthiness", random_initial=False, solver="exact"):
+        """
+        Fit the weights to a training dataset.
+
+        :param df: Dataset with the three metric columns and the target column
+        :param target_column: Target column
+        :param random_initial: Start SLSQP from random weights (solver="slsqp" only)
+        :param solver: "exact" (closed-form, cached per training frame) or "slsqp"
+        """
+        if solver == "exact":
+            key = training_fingerprint(df, target_column)
+            if key in _WEIGHTS_CACHE:
+                _WEIGHTS_CACHE.move_to_end(key)
+            else:
+                data = df[METRIC_COLUMNS + [target_column]].dropna().to_numpy(dtype=np.float64)
+                if len(data) == 0:
+                    raise ValueError("Optimization failed!")
+                _WEIGHTS_CACHE[key] = fit_simplex_weights(data[:, :3], data[:, 3])
+                if len(_WEIGHTS_CACHE) > _WEIGHTS_CACHE_SIZE:
+                    _WEIGHTS_CACHE.popitem(last=False)
+            self.alpha, self.beta, self.gamma = _WEIGHTS_CACHE[key]
+            return
+        if solver != "slsqp":
+            raise ValueError("Invalid solver. Use 'exact' or 'slsqp'.")
+        from scipy.optimize import minimize  # Imported here: scipy.optimize alone takes ~0.5 s to import
+
         def objective_function(weights):
             alpha, beta, gamma = weights
             predicted_scores = (
@@ -42,7 +131,9 @@ class TrustScoreCalculator:
                               metadata_quality_score, 
                               method="default", 
                               df=None, 
-                              target_column="trustworthiness"):
+                              target_column="trustworthiness",
+                              solver="exact",
+                              validity_score=None):
         """
         Calculate the Trust Score using the specified method.
         
@@ -52,12 +143,14 @@ class TrustScoreCalculator:
         :param method: The method to use ("default", "optimized")
         :param df: Dataset required for "optimized" method
         :param target_column: Target column for "optimized" method
+        :param solver: Weight solver for "optimized" method ("exact", "slsqp")
+        :param validity_score: Optional share of rule checks passed (0-1); scales the score
         :return: Calculated Trust Score
         """
         if method == "optimized":
             if df is None:
                 raise ValueError("Dataset (df) is required for the 'optimized' method.")
-            self.optimize_weights(df, target_column)
+            self.optimize_weights(df, target_column, solver=solver)
 
         # Calculate the Trust Score using the current weights
         trust_score = (
@@ -65,23 +158,38 @@ class TrustScoreCalculator:
             + self.beta * freshness_score
             + self.gamma * metadata_quality_score
         )
+        if validity_score is not None:
+            trust_score *= validity_score
         return trust_score
 
+    def score_batch(self, metrics):
+        """
+        Score many datasets at once with the current weights.
+
+        :param metrics: (N, 3) array of completeness, freshness and metadata quality scores
+        :return: (N,) array of Trust Scores
+        """
+        metrics = np.asarray(metrics, dtype=np.float64)
+        if metrics.ndim != 2 or metrics.shape[1] != 3:
+            raise ValueError("metrics must be an (N, 3) array.")
+        return metrics @ self.weights
+
 # Example Usage
-data = {
-    "completeness_score": [0.8, 0.9, 0.7, 0.85],
-    "freshness_score": [0.6, 0.75, 0.8, 0.65],
-    "metadata_quality_score": [0.7, 0.8, 0.9, 0.85],
-    "trustworthiness": [0.75, 0.85, 0.8, 0.8]  # Target column
-}
-df = pd.DataFrame(data)
-
-calculator = TrustScoreCalculator()
-
-# Default method
-default_score = calculator.calculate_trust_score(0.85, 0.65, 0.9, method="default")
-print(f"Default Trust Score: {default_score}")
-
-# Optimized method
-optimized_score = calculator.calculate_trust_score(0.85, 0.65, 0.9, method="optimized", df=df)
-print(f"Optimized Trust Score: {optimized_score}")
+if __name__ == "__main__":
+    data = {
+        "completeness_score": [0.8, 0.9, 0.7, 0.85],
+        "freshness_score": [0.6, 0.75, 0.8, 0.65],
+        "metadata_quality_score": [0.7, 0.8, 0.9, 0.85],
+        "trustworthiness": [0.75, 0.85, 0.8, 0.8]  # Target column
+    }
+    df = pd.DataFrame(data)
+
+    calculator = TrustScoreCalculator()
+
+    # Default method
+    default_score = calculator.calculate_trust_score(0.85, 0.65, 0.9, method="default")
+    print(f"Default Trust Score: {default_score}")
+
+    # Optimized method
+    optimized_score = calculator.calculate_trust_score(0.85, 0.65, 0.9, method="optimized", df=df)
+    print(f"Optimized Trust Score: {optimized_score}")
@@ -1,90 +1,346 @@
+import json
+import os
+
 import streamlit as st
 import pandas as pd
 from data_fetcher import DataFetcher
+from data_preview import FILTER_OPERATORS
 from data_analyzer import DataAnalyzer
 from trust_score_calculator import TrustScoreCalculator
+from result_cache import CachedAnalyzer, default_cache
+from instrumentation import Instrumentation, instrument
+from profile_store import ProfileStore, column_profile
+from rule_engine import CONTEXT_RULES, RuleEngine, validity_score
 
 class WebUI:
     def __init__(self):
         # Initialize backend classes
         url = "shopping_trends.csv"  # Replace with a valid URL or path
-        self.fetcher = DataFetcher(url)
-        self.analyzer = DataAnalyzer()
-        self.calculator = TrustScoreCalculator()
+        # Every backend call is timed; memory is traced only while the panel is shown.
+        self.show_performance = st.sidebar.checkbox("Performance panel", help="Show where this run spent its time.")
+        self.recorder = Instrumentation(track_memory=self.show_performance)
+        self.fetcher = instrument(DataFetcher(url, snapshot_dir=".snapshots"), self.recorder)
+        self.analyzer = instrument(DataAnalyzer(), self.recorder)
+        self.calculator = instrument(TrustScoreCalculator(), self.recorder)
+        # Profiles and trust-score history of every dataset scored here
+        self.store = ProfileStore("profiles.sqlite")
 
         # Initialize attributes
-        self.df = None
+        self.df = None  # The full dataset, loaded only by the sections that need it (see load_frame)
+        self.preview = None  # Pages of rows for the Data Preview
+        self.source_key = None
         self.metadata = None
         self.completeness_score = 0.0
         self.update_score = 0.0
         self.trust_score = 0.0
         self.metadata_quality_score = 0.0
         self.method = "default"  # Default method for calculating trust score
+        self.sample_result = None  # Estimates with confidence intervals in sampling mode
+        self.profile_id = None  # Stored profile of the current content
+        self.checks = {}  # Check outcomes computed in this run, saved with the profile
+        self.validity_score = None  # Share of context checks passed, when they are run
 
     def load_data(self):
-        self.df, self.metadata = self.fetcher.fetch_data()
-        print(self.df)
+        sampling = st.sidebar.checkbox(
+            "Sampling mode",
+            help="Estimate the scores from a sample, with confidence intervals, instead of reading the whole dataset."
+        )
+        if sampling:
+            time_budget = st.sidebar.slider("Time budget (seconds)", min_value=1, max_value=60, value=5)
+            self.load_sample(time_budget)
+            return
+        # Page the preview from the source itself; the full frame waits until a section asks for it.
+        self.source_key = self.fetcher.fingerprint()
+        if self.source_key is None:
+            self.preview = self.fetcher.preview()
+            self.metadata = self.fetcher.get_metadata()
+        else:
+            # The pager (and its row index) is kept across reruns; a new snapshot gets a new pager.
+            snapshot = self.fetcher.snapshot_path()
+            key = (self.source_key, "preview", snapshot is not None and os.path.exists(snapshot))
+            self.preview, self.metadata = default_cache.get_or_compute(
+                key, lambda: (self.fetcher.preview(), self.fetcher.get_metadata()))
+
+    def load_frame(self) -> pd.DataFrame:
+        # Reuse the parsed frame and every check result until the source itself changes.
+        if self.df is not None:
+            return self.df
+        if self.source_key is None:
+            self.df, self.metadata = self.fetcher.fetch_data()
+        else:
+            key = (self.source_key, "fetch_data")
+            self.df, self.metadata = default_cache.get_or_compute(key, self.fetcher.fetch_data)
+            if self.df.empty:
+                default_cache.pop(key)  # Don't keep a failed fetch around
+            else:
+                self.analyzer = instrument(CachedAnalyzer(self.source_key), self.recorder, name="DataAnalyzer")
+        return self.df
+
+    def load_sample(self, time_budget: float):
+        def sample():
+            result = self.analyzer.sampled_analysis(self.fetcher, time_budget=time_budget)
+            return result, self.fetcher.get_metadata()
+
+        # Like full loads, estimates are reused until the source changes.
+        source_key = self.fetcher.fingerprint()
+        if source_key is None:
+            self.sample_result, self.metadata = sample()
+        else:
+            key = (source_key, "sampled_analysis", time_budget)
+            self.sample_result, self.metadata = default_cache.get_or_compute(key, sample)
+        self.df = self.sample_result["sample"]
 
     def analyze_data(self):
-        if self.df is not None and self.metadata is not None:
-            self.completeness_score = self.analyzer.calculate_completeness_score(self.df)
+        if self.sample_result is not None:
+            self.completeness_score = self.sample_result["completeness_score"]["estimate"]
             self.update_score = self.analyzer.calculate_update_score(self.metadata)
-            self.metadata_quality_score = self.analyzer.calculate_metadata_quality_score(self.df, self.metadata)
+            self.metadata_quality_score = self.sample_result["metadata_quality_score"]["estimate"]
+        elif self.preview is not None and self.metadata is not None:
+            # Content scored before is scored from its stored profile, without loading the data.
+            source = self.fetcher.source_url
+            profile, version, content_hash = self.store.lookup(self.fetcher)
+            if profile is not None:
+                self.profile_id = profile["id"]
+                self.completeness_score = profile["completeness_score"]
+                self.metadata_quality_score = profile["metadata_quality_score"]
+            else:
+                df = self.load_frame()
+                self.completeness_score = self.analyzer.calculate_completeness_score(df)
+                self.metadata_quality_score = self.analyzer.calculate_metadata_quality_score(df)
+                if not df.empty:
+                    self.profile_id = self.store.save_profile(
+                        source, content_hash or self.store.frame_hash(df), len(df), df.shape[1],
+                        self.completeness_score, self.metadata_quality_score,
+                        column_stats=column_profile(df), version=version)
+            metadata = self.metadata
+            if self.profile_id is not None:
+                self.store.add_checks(self.profile_id, self.checks)
+                metadata = {**metadata, "last_update_time": self.store.last_update_time(source, self.profile_id,
+                                                                                        metadata)}
+            self.update_score = self.analyzer.calculate_update_score(metadata)
 
     def compute_trust_score(self):
-        if self.method == "optimized" and self.df is not None:
+        if self.method == "optimized" and (self.df is not None or self.preview is not None):
             self.trust_score = self.calculator.calculate_trust_score(
                 self.completeness_score, 
                 self.update_score, 
                 self.metadata_quality_score, 
                 method="optimized", 
-                df=self.df, 
-                target_column="trustworthiness"
+                df=self.load_frame(), 
+                target_column="trustworthiness",
+                validity_score=self.validity_score
             )
         else:
             self.trust_score = self.calculator.calculate_trust_score(
                 self.completeness_score, 
                 self.update_score, 
                 self.metadata_quality_score, 
-                method="default"
+                method="default",
+                validity_score=self.validity_score
             )
 
+    def record_run(self):
+        # Streamlit reruns on every interaction; record a run only when its outcome is new.
+        latest = self.store.latest_run(self.fetcher.source_url)
+        if (latest is None or latest["profile_id"] != self.profile_id or latest["method"] != self.method
+                or round(latest["trust_score"], 4) != round(self.trust_score, 4)):
+            self.store.record_run(self.profile_id, self.update_score, self.trust_score,
+                                  weights=self.calculator.weights, method=self.method)
+
+    def render_outlier_rows(self, mask: pd.DataFrame, page_size: int = 50):
+        # Page through the flagged rows of one column instead of listing every index.
+        column = st.selectbox("Show outlier rows for column", options=list(mask.columns))
+        flagged = mask.index[mask[column].to_numpy(dtype=bool, na_value=False)]
+        pages = max(1, -(-len(flagged) // page_size))
+        page = st.number_input(f"Page (1-{pages})", min_value=1, max_value=pages, value=1, step=1)
+        start = (int(page) - 1) * page_size
+        st.dataframe(self.df.loc[flagged[start:start + page_size]])
+
+    def render_sample_results(self):
+        result = self.sample_result
+        level = f"{result['confidence']:.0%}"
+        if result["exact"]:
+            st.info(f"The dataset is small enough to analyse in full ({result['sampled_rows']} rows).")
+        else:
+            scope = "the rows read so far" if result["coverage"] == "prefix" else "the whole dataset"
+            st.info(f"Sampling mode: {result['sampled_rows']} rows sampled in {result['elapsed_seconds']:.1f}s; "
+                    f"estimates cover {scope} (about {result['estimated_rows']['estimate']:,.0f} rows) "
+                    f"with {level} confidence intervals.")
+
+        st.subheader("Data Preview")
+        st.dataframe(self.df.head())
+
+        st.subheader("Statistical Summary")
+        summary = result["statistical_summary"]
+        st.dataframe(summary["estimate"])
+        with st.expander(f"{level} confidence intervals"):
+            st.write("Lower bounds")
+            st.dataframe(summary["lower"])
+            st.write("Upper bounds")
+            st.dataframe(summary["upper"])
+
+        st.subheader("Outlier Detection")
+        outliers = result["outliers"]
+        if outliers["estimated_count"].any():
+            st.write("Using method: IQR")
+            st.dataframe(outliers)
+        else:
+            st.write("No outliers detected using method: IQR.")
+
+        st.subheader("Analysis Results")
+        for label, name in (("Completeness Score", "completeness_score"),
+                            ("Metadata Quality Score", "metadata_quality_score")):
+            score = result[name]
+            st.write(f"{label}: {score['estimate']:.2f} ({level} CI {score['lower']:.2f} - {score['upper']:.2f})")
+        st.write(f"Update Frequency Score: {self.update_score:.2f}")
+
     def render_page(self):
         st.title("Data Trustworthiness Scoring System")
 
         st.subheader("Metadata")
         st.write(self.metadata)
 
-        st.subheader("Data Preview")
-        if self.df is not None:
-            st.dataframe(self.df.head())
+        if self.sample_result is not None:
+            self.analyze_data()
+            self.render_sample_results()
+            self.render_trust_score()
+            if self.show_performance:
+                self.render_performance()
+            return
+
+        self.render_preview()
 
+        # Each section computes only when it is switched on; the full frame is loaded on first use.
         st.subheader("Statistical Summary")
-        if self.df is not None:
-            stats_summary = self.analyzer.statistical_summary(self.df)
+        if self.preview is None:
+            st.write("No data available for a statistical summary.")
+        elif st.checkbox("Compute the statistical summary", key="show_summary"):
+            stats_summary = self.analyzer.statistical_summary(self.load_frame())
             st.dataframe(stats_summary)
 
         st.subheader("Outlier Detection")
-        if self.df is not None:
+        if self.preview is None:
+            st.write("No data available for outlier detection.")
+        elif st.checkbox("Detect outliers", key="show_outliers"):
             # Dropdown menu for selecting the outlier detection method
             method = st.selectbox("Select Outlier Detection Method", options=["IQR", "zscore"])
 
             # Perform outlier detection
-            outliers = self.analyzer.detect_outliers(self.df, method=method)
-            if outliers:
+            df = self.load_frame()
+            bounds = self.analyzer.outlier_bounds(df, method=method)
+            mask = self.analyzer.outlier_mask(df, method=method)
+            counts = mask.sum()
+            self.checks[f"outliers_{method}"] = counts
+            if counts.any():
                 st.write(f"Using method: {method}")
-                for column, indices in outliers.items():
-                    st.write(f"Column: {column}, Outliers at indices: {indices}")
+                st.dataframe(bounds.assign(outliers=counts))
+                self.render_outlier_rows(mask[counts[counts > 0].index])
             else:
                 st.write(f"No outliers detected using method: {method}.")
-        else:
-            st.write("No data available for outlier detection.")
+
+        st.subheader("Context Checks")
+        if self.preview is None:
+            st.write("No data available for context checks.")
+        elif st.checkbox("Run context checks", key="show_rules"):
+            self.render_context_checks()
 
         st.subheader("Analysis Results")
-        st.write(f"Completeness Score: {self.completeness_score:.2f}")
-        st.write(f"Update Frequency Score: {self.update_score:.2f}")
-        st.write(f"Metadata Quality Score: {self.metadata_quality_score:.2f}")
+        if st.checkbox("Compute the scores", value=True, key="show_scores",
+                       help="Scoring reads the whole dataset; switch it off to browse large files quickly."):
+            self.analyze_data()
+            st.write(f"Completeness Score: {self.completeness_score:.2f}")
+            st.write(f"Update Frequency Score: {self.update_score:.2f}")
+            st.write(f"Metadata Quality Score: {self.metadata_quality_score:.2f}")
+            if self.validity_score is not None:
+                st.write(f"Validity Score: {self.validity_score:.2f}")
+            self.render_trust_score()
 
+        st.subheader("History")
+        if st.checkbox("Show the score history", key="show_history"):
+            self.render_history()
+        if self.show_performance:
+            self.render_performance()
+
+    def render_context_checks(self):
+        context = st.selectbox("Dataset context", options=["general"] + list(CONTEXT_RULES))
+        uploaded = st.file_uploader("Additional rules (JSON)", type="json",
+                                    help="A list of rules; see rule_engine.py for the format.")
+        try:
+            rules = json.load(uploaded) if uploaded is not None else []
+            rules = rules["rules"] if isinstance(rules, dict) else rules
+            # All rules are evaluated together in one pass over the data.
+            report = self.analyzer.context_specific_checks(self.load_frame(), context, rules=rules)
+        except ValueError as e:
+            st.error(f"Invalid rules: {e}")
+            return
+        if not report:
+            st.write("No specific checks implemented for this context.")
+            return
+        self.validity_score = validity_score(report)
+        rules = list(CONTEXT_RULES.get(context, [])) + rules
+        self.checks[f"rules:{RuleEngine(rules).fingerprint()}"] = report
+        st.dataframe(pd.DataFrame(report).T)
+
+    def render_history(self):
+        # Everything here comes from the profile store; the data itself is not read.
+        source = self.fetcher.source_url
+        history = self.store.history(source)
+        if history.empty:
+            st.write("No scored runs recorded yet.")
+            return
+        scores = ["trust_score", "completeness_score", "update_score", "metadata_quality_score"]
+        st.line_chart(history.set_index("scored_at")[scores])
+
+        versions = self.store.profiles(source)
+        if len(versions) < 2:
+            st.write("Only one version of the data has been profiled so far.")
+            return
+        alerts = self.store.drift_alerts(source)
+        if alerts.empty:
+            st.write("No drift between the two latest versions.")
+        else:
+            st.warning(f"{len(alerts)} columns drifted between the two latest versions.")
+            st.dataframe(alerts)
+        with st.expander("Compare versions"):
+            labels = {f"#{i} (first seen {row.first_seen[:19]})": i for i, row in versions.iterrows()}
+            names = list(labels)
+            old = st.selectbox("Older version", options=names, index=len(names) - 2)
+            new = st.selectbox("Newer version", options=names, index=len(names) - 1)
+            st.dataframe(self.store.diff(labels[old], labels[new]))
+
+    def render_preview(self, page_size: int = 50):
+        st.subheader("Data Preview")
+        if self.preview is None:
+            st.write("No data available.")
+            return
+        # Rows are filtered, sorted and paged by the pager, so only the page shown is in memory.
+        columns = self.preview.columns
+        with st.expander("Filter and sort"):
+            filter_column = st.selectbox("Filter on column", options=["(none)"] + columns)
+            condition = st.selectbox("Condition", options=list(FILTER_OPERATORS))
+            value = st.text_input("Value")
+            sort_column = st.selectbox("Sort by", options=["(file order)"] + columns)
+            descending = st.checkbox("Descending")
+        filters = [(filter_column, condition, value)] if filter_column != "(none)" and value != "" else []
+        sort_by = None if sort_column == "(file order)" else sort_column
+
+        page = st.number_input("Page", min_value=1, value=1, step=1, key="preview_page")
+        try:
+            rows, total = self.preview.page(int(page) - 1, page_size, filters=filters, sort_by=sort_by,
+                                            ascending=not descending)
+        except ValueError as e:
+            st.warning(str(e))
+            return
+        if total is None:
+            st.caption(f"Page {int(page)}; at least {self.preview.rows_seen:,} rows.")
+        else:
+            st.caption(f"Page {int(page)} of {max(1, -(-total // page_size)):,}; {total:,} rows.")
+        if rows.empty:
+            st.write("No rows on this page.")
+        else:
+            st.dataframe(rows)
+
+    def render_trust_score(self):
         # Dropdown to select the trust score calculation method
         self.method = st.selectbox(
             "Select Trust Score Calculation Method", 
@@ -93,6 +349,8 @@ class WebUI:
 
         # Recompute trust score based on selected method
         self.compute_trust_score()
+        if self.profile_id is not None:
+            self.record_run()
         st.write(f"Trust Score ({self.method.capitalize()}): {self.trust_score:.2f}")
 
         # Simple Visualization - Use a bar chart to display the scores
@@ -102,3 +360,13 @@ class WebUI:
         })
 
         st.bar_chart(chart_data.set_index('Metric'))
+
+    def render_performance(self):
+        st.subheader("Performance")
+        summary = self.recorder.summary()
+        summary["peak_mib"] = summary.pop("peak_bytes") / 2 ** 20
+        st.dataframe(summary)
+        st.download_button("Download as JSON", self.recorder.to_json(), file_name="performance.json",
+                           mime="application/json")
+        st.download_button("Download as OpenMetrics", self.recorder.to_openmetrics(), file_name="performance.prom",
+                           mime="text/plain")